@@ -25,6 +25,8 @@ class Settings(BaseSettings):
     )
 
     OPENAI_API_KEY: str = ""
+    OPENAI_API_BASE_URL: str = "https://api.openai.com/v1"
+    CAPTION_CACHE_TTL_HOURS: int = 7 * 24
     TWILIO_ACCOUNT_SID: str = ""
     TWILIO_AUTH_TOKEN: str = ""
     TWILIO_FROM_NUMBER: str = ""
@@ -59,9 +61,40 @@ class Settings(BaseSettings):
     CLIENT_APP_URL: AnyHttpUrl = cast(AnyHttpUrl, "http://localhost:3000")
 
     ACTION_DISPATCH_BATCH_SIZE: int = 50
+    ACTION_DISPATCH_TIME_BUDGET_SECONDS: float = 45.0
+    # Celery rate_limit strings ("30/m") and worker concurrency per action queue.
+    ACTION_QUEUE_RATE_LIMITS: dict[str, str] = {
+        "publish": "",
+        "sync": "120/m",
+        "planning": "60/m",
+        "analytics": "30/m",
+        "default": "",
+    }
+    ACTION_QUEUE_CONCURRENCY: dict[str, int] = {
+        "publish": 4,
+        "sync": 4,
+        "planning": 2,
+        "analytics": 2,
+        "default": 2,
+    }
     ACTION_MAX_ATTEMPTS: int = 5
     ACTION_BASE_BACKOFF_SECONDS: int = 30
     ACTION_MAX_BACKOFF_SECONDS: int = 60 * 60
+    # Composition reuses a location's imported GBP media until it is this old, then queues a resync.
+    GBP_MEDIA_SYNC_MIN_INTERVAL_MINUTES: int = 6 * 60
+    # Shared Google API transport: attempts per request and the jittered backoff between them.
+    GBP_HTTP_MAX_ATTEMPTS: int = 4
+    GBP_HTTP_BACKOFF_BASE_SECONDS: float = 0.5
+    GBP_HTTP_BACKOFF_MAX_SECONDS: float = 30.0
+    GBP_HTTP_MAX_CONNECTIONS: int = 20
+    # OAuth tokens are refreshed once they are this close to expiry; decrypted tokens are cached
+    # per process this long. The refresh lock is a database lock unless set to "redis".
+    GBP_TOKEN_REFRESH_LEAD_SECONDS: int = 5 * 60
+    GBP_TOKEN_CACHE_SECONDS: int = 60
+    GBP_TOKEN_REFRESH_LOCK: str = "database"
+    # Sync fan-out: locations of one Google account synced at once, and worker threads per fan-out.
+    GBP_SYNC_MAX_CONCURRENCY_PER_ACCOUNT: int = 4
+    GBP_SYNC_MAX_WORKERS: int = 16
     GLOBAL_POSTING_PAUSE: bool = False
     DRY_RUN_MODE: bool = False
     SHADOW_MODE: bool = False
@@ -0,0 +1,32 @@
+"""Add action claim owner and a composite index for the dispatch claim query."""
+
+from sqlalchemy import text
+
+from backend.app.db.session import engine
+
+
+revision = "0019_action_claim_index"
+down_revision = "0018_stripe_webhook_events"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE actions ADD COLUMN IF NOT EXISTS locked_by VARCHAR(255)"))
+        connection.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_action_status_priority_run_at "
+                "ON actions (status, priority DESC, run_at)"
+            )
+        )
+
+
+def downgrade():
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX IF EXISTS ix_action_status_priority_run_at"))
+        connection.execute(text("ALTER TABLE actions DROP COLUMN IF EXISTS locked_by"))
+
+
+if __name__ == "__main__":
+    upgrade()
@@ -0,0 +1,43 @@
+"""Store the rendered keyword dashboard payload on its cycle aggregate."""
+
+from sqlalchemy import text
+
+from backend.app.db.session import engine
+
+
+revision = "0020_keyword_dashboard_payload"
+down_revision = "0019_action_claim_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE keyword_dashboard_aggregates ADD COLUMN IF NOT EXISTS payload_json JSONB"))
+        connection.execute(
+            text(
+                "ALTER TABLE keyword_dashboard_aggregates "
+                "ADD COLUMN IF NOT EXISTS payload_version INTEGER NOT NULL DEFAULT 0"
+            )
+        )
+        connection.execute(
+            text("ALTER TABLE keyword_dashboard_aggregates ADD COLUMN IF NOT EXISTS payload_etag VARCHAR(64)")
+        )
+        connection.execute(
+            text(
+                "ALTER TABLE keyword_dashboard_aggregates "
+                "ADD COLUMN IF NOT EXISTS payload_refreshed_at TIMESTAMP WITH TIME ZONE"
+            )
+        )
+
+
+def downgrade():
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE keyword_dashboard_aggregates DROP COLUMN IF EXISTS payload_refreshed_at"))
+        connection.execute(text("ALTER TABLE keyword_dashboard_aggregates DROP COLUMN IF EXISTS payload_etag"))
+        connection.execute(text("ALTER TABLE keyword_dashboard_aggregates DROP COLUMN IF EXISTS payload_version"))
+        connection.execute(text("ALTER TABLE keyword_dashboard_aggregates DROP COLUMN IF EXISTS payload_json"))
+
+
+if __name__ == "__main__":
+    upgrade()
@@ -0,0 +1,76 @@
+"""Per-location embedding index for post near-duplicate detection."""
+
+from sqlalchemy import text
+
+from backend.app.db.session import engine
+
+
+revision = "0021_post_embeddings"
+down_revision = "0020_keyword_dashboard_payload"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                """
+                CREATE TABLE IF NOT EXISTS post_embeddings (
+                    id UUID PRIMARY KEY,
+                    tenant_id UUID NOT NULL REFERENCES organizations(id),
+                    location_id UUID NOT NULL REFERENCES locations(id),
+                    post_id UUID NOT NULL REFERENCES posts(id) ON DELETE CASCADE,
+                    model VARCHAR(64) NOT NULL,
+                    dimensions INTEGER NOT NULL,
+                    vector JSONB NOT NULL,
+                    norm DOUBLE PRECISION NOT NULL,
+                    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+                    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+                    CONSTRAINT uq_post_embedding_post UNIQUE (post_id)
+                )
+                """
+            )
+        )
+        connection.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_post_embedding_location_created "
+                "ON post_embeddings (location_id, created_at)"
+            )
+        )
+        # Backfill from the vectors composition already stored on each post's prompt context.
+        connection.execute(
+            text(
+                """
+                INSERT INTO post_embeddings
+                    (id, tenant_id, location_id, post_id, model, dimensions, vector, norm, created_at, updated_at)
+                SELECT
+                    gen_random_uuid(),
+                    p.tenant_id,
+                    p.location_id,
+                    p.id,
+                    'text-embedding-3-small',
+                    jsonb_array_length(p.ai_prompt_context -> 'embedding'),
+                    p.ai_prompt_context -> 'embedding',
+                    (
+                        SELECT sqrt(sum((value::text)::double precision ^ 2))
+                        FROM jsonb_array_elements(p.ai_prompt_context -> 'embedding') AS value
+                    ),
+                    p.created_at,
+                    p.created_at
+                FROM posts p
+                WHERE jsonb_typeof(p.ai_prompt_context -> 'embedding') = 'array'
+                  AND jsonb_array_length(p.ai_prompt_context -> 'embedding') > 0
+                ON CONFLICT (post_id) DO NOTHING
+                """
+            )
+        )
+
+
+def downgrade():
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE IF EXISTS post_embeddings"))
+
+
+if __name__ == "__main__":
+    upgrade()
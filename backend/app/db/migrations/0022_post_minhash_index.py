@@ -0,0 +1,45 @@
+"""MinHash signatures and LSH band keys for post content-reuse lookups."""
+
+from sqlalchemy import text
+
+from backend.app.db.session import engine
+
+
+revision = "0022_post_minhash_index"
+down_revision = "0021_post_embeddings"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE posts ADD COLUMN IF NOT EXISTS minhash_signature JSONB"))
+        connection.execute(
+            text(
+                """
+                CREATE TABLE IF NOT EXISTS post_minhash_bands (
+                    post_id UUID NOT NULL REFERENCES posts(id) ON DELETE CASCADE,
+                    band SMALLINT NOT NULL,
+                    location_id UUID NOT NULL REFERENCES locations(id),
+                    band_key BIGINT NOT NULL,
+                    PRIMARY KEY (post_id, band)
+                )
+                """
+            )
+        )
+        connection.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_post_minhash_band_lookup "
+                "ON post_minhash_bands (location_id, band_key)"
+            )
+        )
+
+
+def downgrade():
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE IF EXISTS post_minhash_bands"))
+        connection.execute(text("ALTER TABLE posts DROP COLUMN IF EXISTS minhash_signature"))
+
+
+if __name__ == "__main__":
+    upgrade()
@@ -0,0 +1,71 @@
+"""Inverted tag index for media asset selection."""
+
+from types import SimpleNamespace
+
+from sqlalchemy import text
+
+from backend.app.db.session import engine
+from backend.app.features.posts.media_tag_index import tag_rows
+
+
+revision = "0023_media_asset_tags"
+down_revision = "0022_post_minhash_index"
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH = 1000
+
+
+def upgrade():
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                """
+                CREATE TABLE IF NOT EXISTS media_asset_tags (
+                    asset_id UUID NOT NULL REFERENCES media_assets(id) ON DELETE CASCADE,
+                    tag VARCHAR(64) NOT NULL,
+                    location_id UUID REFERENCES locations(id),
+                    PRIMARY KEY (asset_id, tag)
+                )
+                """
+            )
+        )
+        connection.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_media_asset_tag_lookup "
+                "ON media_asset_tags (location_id, tag)"
+            )
+        )
+        assets = connection.execute(
+            text(
+                "SELECT id, location_id, categories, job_type, season, shot_stage, description, "
+                "file_name, metadata_json FROM media_assets"
+            )
+        ).mappings()
+        rows = []
+        for asset in assets:
+            rows.extend(tag_rows(SimpleNamespace(**asset)))
+            if len(rows) >= BACKFILL_BATCH:
+                _insert_tags(connection, rows)
+                rows = []
+        if rows:
+            _insert_tags(connection, rows)
+
+
+def _insert_tags(connection, rows):
+    connection.execute(
+        text(
+            "INSERT INTO media_asset_tags (asset_id, tag, location_id) "
+            "VALUES (:asset_id, :tag, :location_id) ON CONFLICT DO NOTHING"
+        ),
+        rows,
+    )
+
+
+def downgrade():
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE IF EXISTS media_asset_tags"))
+
+
+if __name__ == "__main__":
+    upgrade()
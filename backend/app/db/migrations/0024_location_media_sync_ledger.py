@@ -0,0 +1,30 @@
+"""Per-location GBP media sync timestamp and the sync_gbp_media action type."""
+
+from sqlalchemy import text
+
+from backend.app.db.session import engine
+
+
+revision = "0024_location_media_sync_ledger"
+down_revision = "0023_media_asset_tags"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with engine.begin() as connection:
+        connection.execute(
+            text("ALTER TABLE locations ADD COLUMN IF NOT EXISTS media_last_synced_at TIMESTAMPTZ")
+        )
+        if engine.url.get_backend_name() == "postgresql":
+            connection.execute(text("ALTER TYPE action_type ADD VALUE IF NOT EXISTS 'sync_gbp_media'"))
+
+
+def downgrade():
+    # The enum label stays: PostgreSQL cannot drop enum labels without rebuilding the type.
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE locations DROP COLUMN IF EXISTS media_last_synced_at"))
+
+
+if __name__ == "__main__":
+    upgrade()
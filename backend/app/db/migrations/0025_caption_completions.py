@@ -0,0 +1,44 @@
+"""Prompt-hash keyed cache of caption completions."""
+
+from sqlalchemy import text
+
+from backend.app.db.session import engine
+
+
+revision = "0025_caption_completions"
+down_revision = "0024_location_media_sync_ledger"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                """
+                CREATE TABLE IF NOT EXISTS caption_completions (
+                    prompt_hash VARCHAR(64) PRIMARY KEY,
+                    model VARCHAR(64) NOT NULL,
+                    variants JSONB NOT NULL DEFAULT '[]'::jsonb,
+                    expires_at TIMESTAMPTZ NOT NULL,
+                    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+                )
+                """
+            )
+        )
+        connection.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_caption_completions_expires_at "
+                "ON caption_completions (expires_at)"
+            )
+        )
+
+
+def downgrade():
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE IF EXISTS caption_completions"))
+
+
+if __name__ == "__main__":
+    upgrade()
@@ -0,0 +1,125 @@
+"""Fold per-use rotation memory rows into one compact state row per location and key."""
+
+from collections import defaultdict
+import json
+import uuid
+
+from sqlalchemy import text
+
+from backend.app.db.session import engine
+from backend.app.features.posts.rotation import fold_uses, last_used_map
+
+
+revision = "0026_post_rotation_state"
+down_revision = "0025_caption_completions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                """
+                CREATE TABLE IF NOT EXISTS post_rotation_state (
+                    tenant_id UUID NOT NULL REFERENCES organizations(id),
+                    location_id UUID NOT NULL REFERENCES locations(id) ON DELETE CASCADE,
+                    key VARCHAR(128) NOT NULL,
+                    counts JSONB NOT NULL DEFAULT '{}'::jsonb,
+                    recent JSONB NOT NULL DEFAULT '[]'::jsonb,
+                    version INTEGER NOT NULL DEFAULT 0,
+                    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                    PRIMARY KEY (location_id, key)
+                )
+                """
+            )
+        )
+        exists = connection.execute(text("SELECT to_regclass('post_rotation_memory')")).scalar()
+        if not exists:
+            return
+        history = defaultdict(list)
+        tenants = {}
+        rows = connection.execute(
+            text(
+                "SELECT tenant_id, location_id, key, value, last_used_at FROM post_rotation_memory "
+                "WHERE last_used_at IS NOT NULL ORDER BY last_used_at"
+            )
+        )
+        for row in rows:
+            history[(row.location_id, row.key)].append((row.value, row.last_used_at))
+            tenants[row.location_id] = row.tenant_id
+        states = []
+        for (location_id, key), uses in history.items():
+            counts, recent = fold_uses({}, [], uses)
+            states.append(
+                {
+                    "tenant_id": tenants[location_id],
+                    "location_id": location_id,
+                    "key": key,
+                    "counts": json.dumps(counts),
+                    "recent": json.dumps(recent),
+                }
+            )
+        if states:
+            connection.execute(
+                text(
+                    "INSERT INTO post_rotation_state (tenant_id, location_id, key, counts, recent) "
+                    "VALUES (:tenant_id, :location_id, :key, CAST(:counts AS JSONB), CAST(:recent AS JSONB)) "
+                    "ON CONFLICT (location_id, key) DO NOTHING"
+                ),
+                states,
+            )
+        connection.execute(text("DROP TABLE post_rotation_memory"))
+
+
+def downgrade():
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                """
+                CREATE TABLE IF NOT EXISTS post_rotation_memory (
+                    id UUID PRIMARY KEY,
+                    tenant_id UUID NOT NULL REFERENCES organizations(id),
+                    location_id UUID NOT NULL REFERENCES locations(id),
+                    key VARCHAR(128) NOT NULL,
+                    value VARCHAR(255) NOT NULL,
+                    last_used_at TIMESTAMPTZ,
+                    metadata_json JSONB DEFAULT '{}'::jsonb,
+                    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+                )
+                """
+            )
+        )
+        connection.execute(
+            text("CREATE INDEX IF NOT EXISTS ix_rotation_location ON post_rotation_memory (location_id)")
+        )
+        # Only each value's last use survives the fold; restore one memory row per ring entry.
+        memories = []
+        for state in connection.execute(text("SELECT tenant_id, location_id, key, recent FROM post_rotation_state")):
+            recent = state.recent if isinstance(state.recent, list) else json.loads(state.recent or "[]")
+            for value, used_at in last_used_map(recent).items():
+                memories.append(
+                    {
+                        "id": uuid.uuid4(),
+                        "tenant_id": state.tenant_id,
+                        "location_id": state.location_id,
+                        "key": state.key,
+                        "value": value,
+                        "last_used_at": used_at,
+                    }
+                )
+        if memories:
+            connection.execute(
+                text(
+                    "INSERT INTO post_rotation_memory (id, tenant_id, location_id, key, value, last_used_at) "
+                    "VALUES (:id, :tenant_id, :location_id, :key, :value, :last_used_at)"
+                ),
+                memories,
+            )
+        connection.execute(text("DROP TABLE IF EXISTS post_rotation_state"))
+
+
+if __name__ == "__main__":
+    upgrade()
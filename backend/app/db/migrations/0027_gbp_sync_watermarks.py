@@ -0,0 +1,62 @@
+"""Per-location GBP sync watermarks and the external keys incremental sync upserts on."""
+
+from sqlalchemy import text
+
+from backend.app.db.session import engine
+
+
+revision = "0027_gbp_sync_watermarks"
+down_revision = "0026_post_rotation_state"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                """
+                CREATE TABLE IF NOT EXISTS gbp_sync_watermarks (
+                    tenant_id UUID NOT NULL REFERENCES organizations(id),
+                    location_id UUID NOT NULL REFERENCES locations(id) ON DELETE CASCADE,
+                    resource VARCHAR(32) NOT NULL,
+                    update_time TIMESTAMPTZ,
+                    page_token VARCHAR(1024),
+                    cursor_update_time TIMESTAMPTZ,
+                    last_synced_at TIMESTAMPTZ,
+                    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                    PRIMARY KEY (location_id, resource)
+                )
+                """
+            )
+        )
+        connection.execute(text("ALTER TABLE reviews ADD COLUMN IF NOT EXISTS external_updated_at TIMESTAMPTZ"))
+        connection.execute(text("ALTER TABLE posts ADD COLUMN IF NOT EXISTS external_updated_at TIMESTAMPTZ"))
+        connection.execute(text("ALTER TABLE media_assets ADD COLUMN IF NOT EXISTS external_hash VARCHAR(64)"))
+        connection.execute(
+            text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS uq_post_tenant_external "
+                "ON posts (tenant_id, external_post_id)"
+            )
+        )
+        connection.execute(
+            text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS uq_media_asset_gbp_external "
+                "ON media_assets (location_id, source_external_id) WHERE source = 'gbp'"
+            )
+        )
+
+
+def downgrade():
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX IF EXISTS uq_media_asset_gbp_external"))
+        connection.execute(text("DROP INDEX IF EXISTS uq_post_tenant_external"))
+        connection.execute(text("ALTER TABLE media_assets DROP COLUMN IF EXISTS external_hash"))
+        connection.execute(text("ALTER TABLE posts DROP COLUMN IF EXISTS external_updated_at"))
+        connection.execute(text("ALTER TABLE reviews DROP COLUMN IF EXISTS external_updated_at"))
+        connection.execute(text("DROP TABLE IF EXISTS gbp_sync_watermarks"))
+
+
+if __name__ == "__main__":
+    upgrade()
@@ -0,0 +1,130 @@
+"""Dialect-aware SQL expressions for set-based action fan-out.
+
+Beat ticks build a single ``INSERT INTO actions (...) SELECT ...`` statement, so the
+per-row values (ids, dedupe keys, JSON payloads) must be computed by the database.
+Postgres and SQLite (used by the test suite) spell these differently. The module also
+picks the dialect ``insert`` construct that upserts (``ON CONFLICT``) are built from.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Sequence
+import uuid
+
+from sqlalchemy import Boolean, Integer, String, and_, any_, case, cast, func, literal, select, type_coerce
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+
+def dialect_name(db: Session) -> str:
+    bind = db.get_bind()
+    return bind.dialect.name if bind is not None else ""
+
+
+def dialect_insert(db: Session) -> Callable[..., Any] | None:
+    """The dialect ``insert`` supporting ``on_conflict_*``, or None on other databases."""
+    name = dialect_name(db)
+    if name == "postgresql":
+        return postgresql.insert
+    if name == "sqlite":
+        return sqlite.insert
+    return None
+
+
+class FanOutSql:
+    def __init__(self, dialect_name: str) -> None:
+        if dialect_name not in {"postgresql", "sqlite"}:
+            raise ValueError(f"Set-based fan-out is not supported on {dialect_name}")
+        self.dialect_name = dialect_name
+
+    @property
+    def is_postgres(self) -> bool:
+        return self.dialect_name == "postgresql"
+
+    def new_uuid(self) -> ColumnElement[Any]:
+        if self.is_postgres:
+            return func.gen_random_uuid()
+        # SQLite stores UUID columns as 32 hex characters.
+        return func.lower(func.hex(func.randomblob(16)))
+
+    def uuid_text(self, column: ColumnElement[Any]) -> ColumnElement[str]:
+        """Canonical dashed form, matching ``str(uuid.UUID)`` in Python."""
+        if self.is_postgres:
+            return cast(column, String)
+        hexed = func.lower(column)
+        return self.concat(
+            func.substr(hexed, 1, 8),
+            "-",
+            func.substr(hexed, 9, 4),
+            "-",
+            func.substr(hexed, 13, 4),
+            "-",
+            func.substr(hexed, 17, 4),
+            "-",
+            func.substr(hexed, 21, 12),
+        )
+
+    def uuid_in(self, column: ColumnElement[Any], ids: Sequence[uuid.UUID]) -> ColumnElement[bool]:
+        """``column IN ids`` bound as one parameter, so large id lists stay one statement."""
+        if self.is_postgres:
+            return column == any_(literal(list(ids), ARRAY(UUID(as_uuid=True))))
+        values = func.json_each(literal(json.dumps([value.hex for value in ids]), String)).table_valued("value")
+        return column.in_(select(values.c.value))
+
+    def concat(self, *parts: ColumnElement[Any] | str) -> ColumnElement[str]:
+        # `||` on both dialects; SQLite only gained concat() in 3.44.
+        elements = [literal(part, String) if isinstance(part, str) else part for part in parts]
+        result = type_coerce(elements[0], String)
+        for element in elements[1:]:
+            result = result + type_coerce(element, String)
+        return result
+
+    def json_object(self, values: dict[str, ColumnElement[Any] | Any]) -> ColumnElement[Any]:
+        args: list[Any] = []
+        for key, value in values.items():
+            args.append(literal(key, String))
+            args.append(self._json_value(value))
+        if self.is_postgres:
+            return func.jsonb_build_object(*args)
+        return func.json_object(*args)
+
+    def _json_value(self, value: ColumnElement[Any] | Any) -> ColumnElement[Any]:
+        if isinstance(value, ColumnElement):
+            return value
+        if isinstance(value, bool):
+            if self.is_postgres:
+                return literal(value, Boolean)
+            return func.json("true" if value else "false")
+        if isinstance(value, int):
+            return literal(value, Integer)
+        return literal(str(value), String)
+
+    def json_string(self, column: ColumnElement[Any], *path: str) -> ColumnElement[str]:
+        """Text at ``path`` when it is a JSON string, else NULL."""
+        if self.is_postgres:
+            node = func.jsonb_extract_path(column, *path)
+            return case((func.jsonb_typeof(node) == "string", func.jsonb_extract_path_text(column, *path)))
+        json_path = self._sqlite_path(path)
+        return case((func.json_type(column, json_path) == "text", func.json_extract(column, json_path)))
+
+    def json_is_true(self, column: ColumnElement[Any], *path: str) -> ColumnElement[bool]:
+        """True only for a JSON boolean ``true`` at ``path`` (mirrors ``value is True``)."""
+        if self.is_postgres:
+            node = func.jsonb_extract_path(column, *path)
+            return and_(func.jsonb_typeof(node) == "boolean", func.jsonb_extract_path_text(column, *path) == "true")
+        return func.json_type(column, self._sqlite_path(path)) == "true"
+
+    def json_nonempty_array(self, column: ColumnElement[Any]) -> ColumnElement[bool]:
+        if self.is_postgres:
+            return and_(func.jsonb_typeof(column) == "array", func.jsonb_array_length(column) > 0)
+        return and_(func.json_type(column) == "array", func.json_array_length(column) > 0)
+
+    def nonblank(self, value: ColumnElement[Any]) -> ColumnElement[Any]:
+        return func.nullif(func.trim(value), "")
+
+    @staticmethod
+    def _sqlite_path(path: tuple[str, ...]) -> str:
+        return "$." + ".".join(path)
@@ -1,21 +1,24 @@
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 import json
 import logging
-from typing import Any, Callable
+from typing import Any, Callable, Sequence
 import uuid
 
-from sqlalchemy import bindparam, inspect, select, text
+from sqlalchemy import DateTime, Integer, String, bindparam, cast, distinct, exists, func, inspect, literal, null, select, text, update
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.exc import DataError, IntegrityError, SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, aliased, sessionmaker
+from sqlalchemy.sql.elements import ColumnElement
 
 from backend.app.core.config import settings
 from backend.app.models.automation.action import Action
 from backend.app.models.enums import ActionStatus, ActionType, PostStatus, QnaStatus, AlertSeverity
 from backend.app.models.posts.post import Post
 from backend.app.models.google_business.qna_entry import QnaEntry
+from backend.app.services.automation.action_fanout import FanOutSql, dialect_insert, dialect_name
 from backend.app.services.operations.audit import AuditService
 from backend.app.services.posts.posts import PostService
 from backend.app.services.google_business.qna import QnaService
@@ -25,27 +28,71 @@ from backend.app.services.rank_tracking.competitor_monitoring import CompetitorM
 from backend.app.services.automation.automation_rules import AutomationRuleService
 from backend.app.services.google_business.gbp_publishing import GbpPublishingService
 from backend.app.services.google_business.gbp_sync import GbpSyncService
+from backend.app.services.google_business.gbp_sync_fanout import GbpSyncCoordinator
 from backend.app.services.content.daily_signals import DailySignalService
 from backend.app.services.posts.post_candidates import PostCandidateService
 from backend.app.services.posts.post_composition import PostCompositionService
 from backend.app.services.posts.post_scheduler import PostSchedulerService
 from backend.app.services.posts.post_metrics import PostMetricsService
+from backend.app.services.content.batch_planner import BatchContentPlanner
 from backend.app.services.content.content_planner import ContentPlannerService
 from backend.app.services.posts.post_jobs import PostJobService
 from backend.app.services.rank_tracking.keyword_strategy import KeywordCampaignService
+from backend.app.models.google_business.connected_account import ConnectedAccount
 from backend.app.models.google_business.location import Location
+from backend.app.models.operations.audit_log import AuditLog
 from backend.app.models.posts.post_job import PostJob
 from backend.app.models.google_business.gbp_connection import GbpConnection
 from backend.app.models.identity.organization import Organization
 from backend.app.services.google_business.gbp_connections import GbpConnectionService
 from backend.app.services.operations.alerts import AlertService
+from backend.app.services.operations.rate_limits import RateLimitError
 from backend.app.services.google_business.google import GoogleOAuthService
 from backend.app.models.media.media_upload_request import MediaUploadRequest
 from backend.app.services.onboarding.tenant_bridge import ensure_tenant_row
+from backend.app.services.shared.batching import chunks
+from backend.app.services.shared.dates import as_utc
 from backend.app.services.shared.validators import assert_location_in_org, assert_connected_account_in_org
 
 logger = logging.getLogger(__name__)
 
+# Rows per multi-row INSERT; keeps bind parameters well under the Postgres (65535)
+# and SQLite (32766) limits for both the actions and audit_logs column sets.
+BULK_INSERT_CHUNK_SIZE = 500
+
+# action_type enum labels per database URL, shared by every ActionService in the process.
+_ACTION_TYPE_ENUM_VALUES_BY_BIND: dict[str, set[str]] = {}
+
+
+@dataclass(frozen=True)
+class ActionSpec:
+    organization_id: uuid.UUID
+    action_type: ActionType
+    run_at: datetime
+    payload: dict[str, Any] | None = None
+    location_id: uuid.UUID | None = None
+    connected_account_id: uuid.UUID | None = None
+    max_attempts: int | None = None
+    dedupe_key: str | None = None
+    priority: int = 0
+
+
+@dataclass
+class BulkScheduleResult:
+    created: list[ActionSpec] = field(default_factory=list)
+    created_ids: list[uuid.UUID] = field(default_factory=list)
+    deduplicated: list[ActionSpec] = field(default_factory=list)
+
+
+@dataclass
+class FanOutResult:
+    created_ids: list[uuid.UUID] = field(default_factory=list)
+    deduplicated: int = 0
+
+    @property
+    def created(self) -> int:
+        return len(self.created_ids)
+
 
 class ActionService:
     def __init__(self, db: Session) -> None:
@@ -130,6 +177,247 @@ class ActionService:
         )
         return action
 
+    def schedule_actions_bulk(self, specs: Sequence[ActionSpec]) -> BulkScheduleResult:
+        """Schedule many actions with a constant number of statements per chunk.
+
+        Dedupe keys are resolved by the database (`ON CONFLICT (dedupe_key) DO NOTHING`),
+        so specs whose key already exists, or repeats earlier in `specs`, are reported
+        as deduplicated instead of being looked up one by one.
+        """
+        result = BulkScheduleResult()
+        if not specs:
+            return result
+        insert = dialect_insert(self.db)
+        if insert is None:
+            for spec in specs:
+                if spec.dedupe_key and self._get_by_dedupe_key(spec.dedupe_key):
+                    result.deduplicated.append(spec)
+                    continue
+                action = self.schedule_action(**spec.__dict__)
+                result.created.append(spec)
+                result.created_ids.append(action.id)
+            return result
+
+        self._assert_specs_in_org(specs)
+        for action_type_value in sorted({spec.action_type.value for spec in specs}):
+            self._ensure_action_type_enum_value(action_type_value)
+        if self._actions_has_legacy_tenant_id():
+            for organization_id in sorted({spec.organization_id for spec in specs}, key=str):
+                self._ensure_legacy_tenant_row(organization_id)
+
+        rows: list[dict[str, Any]] = []
+        spec_by_id: dict[uuid.UUID, ActionSpec] = {}
+        seen_keys: set[str] = set()
+        for spec in specs:
+            if spec.dedupe_key:
+                if spec.dedupe_key in seen_keys:
+                    result.deduplicated.append(spec)
+                    continue
+                seen_keys.add(spec.dedupe_key)
+            action_id = uuid.uuid4()
+            spec_by_id[action_id] = spec
+            rows.append(
+                {
+                    "id": action_id,
+                    "tenant_id": spec.organization_id,
+                    "organization_id": spec.organization_id,
+                    "location_id": spec.location_id,
+                    "connected_account_id": spec.connected_account_id,
+                    "action_type": spec.action_type,
+                    "status": ActionStatus.PENDING,
+                    "payload": spec.payload or {},
+                    "run_at": as_utc(spec.run_at),
+                    "attempts": 0,
+                    "max_attempts": spec.max_attempts or settings.ACTION_MAX_ATTEMPTS,
+                    "priority": spec.priority,
+                    "dedupe_key": spec.dedupe_key,
+                }
+            )
+
+        table = Action.__table__
+        inserted_ids: set[uuid.UUID] = set()
+        for chunk in chunks(rows, BULK_INSERT_CHUNK_SIZE):
+            stmt = (
+                insert(table)
+                .values(chunk)
+                .on_conflict_do_nothing(index_elements=[table.c.dedupe_key])
+                .returning(table.c.id)
+            )
+            inserted_ids.update(self.db.execute(stmt).scalars().all())
+
+        audit_rows: list[dict[str, Any]] = []
+        for row in rows:
+            spec = spec_by_id[row["id"]]
+            if row["id"] not in inserted_ids:
+                result.deduplicated.append(spec)
+                continue
+            result.created.append(spec)
+            result.created_ids.append(row["id"])
+            audit_rows.append(
+                {
+                    "id": uuid.uuid4(),
+                    "action": "action.scheduled",
+                    "organization_id": spec.organization_id,
+                    "location_id": spec.location_id,
+                    "actor_user_id": None,
+                    "entity_type": "action",
+                    "entity_id": str(row["id"]),
+                    "before_json": {},
+                    "after_json": {},
+                    "metadata_json": {"action_type": spec.action_type.value},
+                }
+            )
+        for chunk in chunks(audit_rows, BULK_INSERT_CHUNK_SIZE):
+            self.db.execute(AuditLog.__table__.insert().values(chunk))
+        self.db.commit()
+        return result
+
+    def fanout_sql(self) -> FanOutSql:
+        return FanOutSql(dialect_name(self.db))
+
+    def schedule_actions_from_select(
+        self,
+        *,
+        action_type: ActionType,
+        run_at: datetime,
+        select_from: Any,
+        where: Sequence[ColumnElement[bool]],
+        organization_id: ColumnElement[Any],
+        dedupe_key: ColumnElement[str],
+        payload: ColumnElement[Any],
+        location_id: ColumnElement[Any] | None = None,
+        max_attempts: int | None = None,
+        priority: int = 0,
+    ) -> FanOutResult:
+        """Fan out one action per source row with a single `INSERT ... SELECT`.
+
+        Rows whose `dedupe_key` already exists are skipped by an anti-join (and by
+        `ON CONFLICT DO NOTHING` for concurrent ticks) and reported as deduplicated.
+        The `action.scheduled` audit rows for the created actions are written by a
+        second `INSERT ... SELECT`, so the statement count does not grow with the source.
+        """
+        insert = dialect_insert(self.db)
+        if insert is None:
+            raise RuntimeError("Set-based action scheduling requires Postgres or SQLite")
+        self._ensure_action_type_enum_value(action_type.value)
+        if self._actions_has_legacy_tenant_id():
+            org_ids = self.db.execute(
+                select(distinct(organization_id)).select_from(select_from).where(*where)
+            ).scalars()
+            for org_id in list(org_ids):
+                self._ensure_legacy_tenant_row(org_id)
+
+        sql = self.fanout_sql()
+        table = Action.__table__
+        existing = aliased(Action)
+        rows = (
+            select(
+                sql.new_uuid(),
+                organization_id,
+                organization_id,
+                location_id if location_id is not None else null(),
+                # Explicit casts: Postgres has no assignment cast from text to an enum.
+                cast(literal(action_type, table.c.action_type.type), table.c.action_type.type),
+                cast(literal(ActionStatus.PENDING, table.c.status.type), table.c.status.type),
+                payload,
+                literal(as_utc(run_at), DateTime(timezone=True)),
+                literal(0, Integer),
+                literal(max_attempts or settings.ACTION_MAX_ATTEMPTS, Integer),
+                literal(priority, Integer),
+                dedupe_key,
+            )
+            .select_from(select_from)
+            .where(*where)
+            .where(~exists(select(existing.id).where(existing.dedupe_key == dedupe_key)))
+        )
+        stmt = (
+            insert(table)
+            .from_select(
+                [
+                    table.c.id,
+                    table.c.tenant_id,
+                    table.c.organization_id,
+                    table.c.location_id,
+                    table.c.action_type,
+                    table.c.status,
+                    table.c.payload,
+                    table.c.run_at,
+                    table.c.attempts,
+                    table.c.max_attempts,
+                    table.c.priority,
+                    table.c.dedupe_key,
+                ],
+                rows,
+            )
+            .on_conflict_do_nothing(index_elements=[table.c.dedupe_key])
+            .returning(table.c.id)
+        )
+        source_rows = self.db.execute(
+            select(func.count()).select_from(select_from).where(*where)
+        ).scalar_one()
+        created_ids = list(self.db.execute(stmt).scalars())
+        if created_ids:
+            audit = AuditLog.__table__
+            self.db.execute(
+                audit.insert().from_select(
+                    [
+                        audit.c.id,
+                        audit.c.action,
+                        audit.c.organization_id,
+                        audit.c.location_id,
+                        audit.c.entity_type,
+                        audit.c.entity_id,
+                        audit.c.before_json,
+                        audit.c.after_json,
+                        audit.c.metadata_json,
+                    ],
+                    select(
+                        sql.new_uuid(),
+                        literal("action.scheduled", String),
+                        table.c.organization_id,
+                        table.c.location_id,
+                        literal("action", String),
+                        sql.uuid_text(table.c.id),
+                        sql.json_object({}),
+                        sql.json_object({}),
+                        sql.json_object({"action_type": action_type.value}),
+                    ).where(sql.uuid_in(table.c.id, created_ids)),
+                )
+            )
+        self.db.commit()
+        return FanOutResult(created_ids=created_ids, deduplicated=source_rows - len(created_ids))
+
+    def _assert_specs_in_org(self, specs: Sequence[ActionSpec]) -> None:
+        location_ids = {spec.location_id for spec in specs if spec.location_id}
+        account_ids = {spec.connected_account_id for spec in specs if spec.connected_account_id}
+        location_orgs: dict[uuid.UUID, uuid.UUID] = {}
+        account_orgs: dict[uuid.UUID, uuid.UUID] = {}
+        if location_ids:
+            location_orgs = dict(
+                self.db.execute(
+                    select(Location.id, Location.organization_id).where(Location.id.in_(location_ids))
+                ).all()
+            )
+        if account_ids:
+            account_orgs = dict(
+                self.db.execute(
+                    select(ConnectedAccount.id, ConnectedAccount.organization_id).where(
+                        ConnectedAccount.id.in_(account_ids)
+                    )
+                ).all()
+            )
+        for spec in specs:
+            if spec.location_id:
+                if spec.location_id not in location_orgs:
+                    raise ValueError("Location not found")
+                if location_orgs[spec.location_id] != spec.organization_id:
+                    raise ValueError("Location does not belong to organization")
+            if spec.connected_account_id:
+                if spec.connected_account_id not in account_orgs:
+                    raise ValueError("Connected account not found")
+                if account_orgs[spec.connected_account_id] != spec.organization_id:
+                    raise ValueError("Connected account does not belong to organization")
+
     def _get_by_dedupe_key(self, dedupe_key: str) -> Action | None:
         return (
             self.db.query(Action)
@@ -193,6 +481,16 @@ class ActionService:
     def _action_type_enum_values(self) -> set[str]:
         if self._action_type_enum_values_cache is not None:
             return self._action_type_enum_values_cache
+        bind = self.db.get_bind()
+        if not bind or bind.dialect.name != "postgresql":
+            # Only Postgres stores action_type as a native enum that can drift.
+            self._action_type_enum_values_cache = {item.value for item in ActionType}
+            return self._action_type_enum_values_cache
+        bind_key = str(bind.engine.url)
+        cached = _ACTION_TYPE_ENUM_VALUES_BY_BIND.get(bind_key)
+        if cached is not None:
+            self._action_type_enum_values_cache = cached
+            return cached
         try:
             rows = self.db.execute(
                 text(
@@ -205,6 +503,7 @@ class ActionService:
                 )
             ).fetchall()
             self._action_type_enum_values_cache = {str(row[0]) for row in rows}
+            _ACTION_TYPE_ENUM_VALUES_BY_BIND[bind_key] = self._action_type_enum_values_cache
         except SQLAlchemyError:
             # If introspection fails, avoid blocking action scheduling.
             self._action_type_enum_values_cache = {item.value for item in ActionType}
@@ -218,6 +517,7 @@ class ActionService:
             self.db.execute(text(f"ALTER TYPE action_type ADD VALUE IF NOT EXISTS '{escaped_value}'"))
             self.db.commit()
             self._action_type_enum_values_cache = None
+            _ACTION_TYPE_ENUM_VALUES_BY_BIND.clear()
         except SQLAlchemyError as exc:
             self.db.rollback()
             logger.warning(
@@ -355,6 +655,44 @@ class ActionService:
             self.db.commit()
         return actions
 
+    def claim_due_actions(
+        self,
+        limit: int,
+        *,
+        locked_by: str,
+        action_types: Sequence[ActionType] | None = None,
+    ) -> list[uuid.UUID]:
+        """Claim up to `limit` due actions in one statement and return their ids.
+
+        Claimed rows move to QUEUED (as with `fetch_due_actions`); `_execute_action`
+        still marks them RUNNING when a worker picks them up. Concurrent dispatchers
+        skip each other's rows via `FOR UPDATE SKIP LOCKED` on Postgres.
+        """
+        now = datetime.now(timezone.utc)
+        due_ids = (
+            select(Action.id)
+            .where(Action.status == ActionStatus.PENDING)
+            .where(Action.run_at <= now)
+        )
+        if action_types is not None:
+            due_ids = due_ids.where(Action.action_type.in_(list(action_types)))
+        due_ids = (
+            due_ids.order_by(Action.priority.desc(), Action.run_at.asc())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(Action)
+            .where(Action.id.in_(due_ids))
+            .values(status=ActionStatus.QUEUED, locked_by=locked_by, locked_at=now)
+            .returning(Action.id)
+            .execution_options(synchronize_session=False)
+        )
+        claimed = list(self.db.execute(stmt).scalars().all())
+        self.db.commit()
+        return claimed
+
     def mark_running(self, action: Action) -> None:
         action.status = ActionStatus.RUNNING
         action.attempts += 1
@@ -432,30 +770,121 @@ class ActionService:
         return min(backoff, settings.ACTION_MAX_BACKOFF_SECONDS)
 
 
+ServiceFactory = Callable[["ServiceContainer"], Any]
+
+_EXECUTOR_SERVICE_FACTORIES: dict[str, ServiceFactory] = {
+    "action_service": lambda c: ActionService(c.db),
+    "post_service": lambda c: PostService(c.db, c.get("action_service")),
+    "qna_service": lambda c: QnaService(c.db, c.get("action_service")),
+    "rank_service": lambda c: RankTrackingService(c.db, c.get("action_service")),
+    "media_service": lambda c: MediaManagementService(c.db, c.get("action_service")),
+    "competitor_service": lambda c: CompetitorMonitoringService(c.db, c.get("action_service")),
+    "automation_service": lambda c: AutomationRuleService(c.db, c.get("action_service")),
+    "gbp_publisher": lambda c: GbpPublishingService(c.db),
+    "gbp_sync": lambda c: GbpSyncService(c.db),
+    "gbp_sync_coordinator": lambda c: GbpSyncCoordinator(sessionmaker(bind=c.db.get_bind(), expire_on_commit=False)),
+    "daily_signals": lambda c: DailySignalService(c.db),
+    "post_candidates": lambda c: PostCandidateService(c.db),
+    "post_composer": lambda c: PostCompositionService(c.db),
+    "post_scheduler_service": lambda c: PostSchedulerService(c.db),
+    "post_metrics": lambda c: PostMetricsService(c.db),
+    "content_planner": lambda c: ContentPlannerService(c.db),
+    "batch_planner": lambda c: BatchContentPlanner(c.db),
+    "post_jobs": lambda c: PostJobService(c.db),
+    "keyword_campaigns": lambda c: KeywordCampaignService(c.db),
+    "connection_service": lambda c: GbpConnectionService(c.db),
+    "alerts": lambda c: AlertService(c.db),
+    "oauth": lambda c: GoogleOAuthService(),
+}
+
+
+class ServiceContainer:
+    """Builds executor services on first access and caches them for the session's lifetime."""
+
+    SESSION_INFO_KEY = "action_executor_services"
+
+    def __init__(self, db: Session, factories: dict[str, ServiceFactory] | None = None) -> None:
+        self.db = db
+        self._factories = factories or _EXECUTOR_SERVICE_FACTORIES
+        self._instances: dict[str, Any] = {}
+
+    @classmethod
+    def for_session(cls, db: Session) -> "ServiceContainer":
+        container = db.info.get(cls.SESSION_INFO_KEY)
+        if container is None:
+            container = cls(db)
+            db.info[cls.SESSION_INFO_KEY] = container
+        return container
+
+    def get(self, name: str) -> Any:
+        if name not in self._instances:
+            factory = self._factories.get(name)
+            if factory is None:
+                raise KeyError(f"Unknown executor service '{name}'")
+            self._instances[name] = factory(self)
+        return self._instances[name]
+
+    def resolve_all(self) -> None:
+        for name in self._factories:
+            self.get(name)
+
+    @property
+    def built(self) -> set[str]:
+        return set(self._instances)
+
+
+class _LazyService:
+    """Executor attribute resolved through the session's ServiceContainer.
+
+    A non-data descriptor, so assigning the attribute on an executor (e.g. a test stub)
+    shadows the container-built service.
+    """
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: "ActionExecutor | None", owner: type) -> Any:
+        if instance is None:
+            return self
+        return instance.services.get(self.name)
+
+
+def _requires(*service_names: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    def decorator(handler: Callable[..., Any]) -> Callable[..., Any]:
+        handler.required_services = service_names  # type: ignore[attr-defined]
+        return handler
+
+    return decorator
+
+
 class ActionExecutor:
+    action_service = _LazyService()
+    post_service = _LazyService()
+    qna_service = _LazyService()
+    rank_service = _LazyService()
+    media_service = _LazyService()
+    competitor_service = _LazyService()
+    automation_service = _LazyService()
+    gbp_publisher = _LazyService()
+    gbp_sync = _LazyService()
+    gbp_sync_coordinator = _LazyService()
+    daily_signals = _LazyService()
+    post_candidates = _LazyService()
+    post_composer = _LazyService()
+    post_scheduler_service = _LazyService()
+    post_metrics = _LazyService()
+    content_planner = _LazyService()
+    batch_planner = _LazyService()
+    post_jobs = _LazyService()
+    keyword_campaigns = _LazyService()
+    connection_service = _LazyService()
+    alerts = _LazyService()
+    oauth = _LazyService()
+
     def __init__(self, db: Session) -> None:
         self.db = db
         self.audit = AuditService(db)
-        self.action_service = ActionService(db)
-        self.post_service = PostService(db, self.action_service)
-        self.qna_service = QnaService(db, self.action_service)
-        self.rank_service = RankTrackingService(db, self.action_service)
-        self.media_service = MediaManagementService(db, self.action_service)
-        self.competitor_service = CompetitorMonitoringService(db, self.action_service)
-        self.automation_service = AutomationRuleService(db, self.action_service)
-        self.gbp_publisher = GbpPublishingService(db)
-        self.gbp_sync = GbpSyncService(db)
-        self.daily_signals = DailySignalService(db)
-        self.post_candidates = PostCandidateService(db)
-        self.post_composer = PostCompositionService(db)
-        self.post_scheduler_service = PostSchedulerService(db)
-        self.post_metrics = PostMetricsService(db)
-        self.content_planner = ContentPlannerService(db)
-        self.post_jobs = PostJobService(db)
-        self.keyword_campaigns = KeywordCampaignService(db)
-        self.connection_service = GbpConnectionService(db)
-        self.alerts = AlertService(db)
-        self.oauth = GoogleOAuthService()
+        self.services = ServiceContainer.for_session(db)
         self.handlers: dict[ActionType, Callable[[Action], dict[str, Any]]] = {
             ActionType.PUBLISH_GBP_POST: self._handle_publish_post,
             ActionType.PUBLISH_QA: self._handle_publish_qna,
@@ -467,6 +896,7 @@ class ActionExecutor:
             ActionType.SYNC_GOOGLE_LOCATIONS: self._handle_sync_locations,
             ActionType.SYNC_GBP_REVIEWS: self._handle_sync_reviews,
             ActionType.SYNC_GBP_POSTS: self._handle_sync_posts,
+            ActionType.SYNC_GBP_MEDIA: self._handle_sync_media,
             ActionType.COMPUTE_DAILY_SIGNALS: self._handle_compute_daily_signals,
             ActionType.GENERATE_POST_CANDIDATES: self._handle_generate_post_candidates,
             ActionType.COMPOSE_POST_CANDIDATE: self._handle_compose_post_candidate,
@@ -478,10 +908,15 @@ class ActionExecutor:
             ActionType.CUSTOM: self._handle_noop,
         }
 
+    def required_services(self, action_type: ActionType) -> tuple[str, ...]:
+        handler = self.handlers.get(action_type, self._handle_noop)
+        return getattr(handler, "required_services", ())
+
     def execute(self, action: Action) -> dict[str, Any]:
         handler = self.handlers.get(action.action_type, self._handle_noop)
         return handler(action)
 
+    @_requires("post_service", "gbp_publisher", "post_metrics")
     def _handle_publish_post(self, action: Action) -> dict[str, Any]:
         post_id = action.payload.get("post_id") if action.payload else None
         post: Post | None = self.db.get(Post, uuid.UUID(post_id)) if post_id else None
@@ -521,6 +956,7 @@ class ActionExecutor:
             self.post_metrics.record_publish_outcome(post, metrics)
         return {"status": "published", "payload": action.payload, "result": result}
 
+    @_requires("qna_service")
     def _handle_publish_qna(self, action: Action) -> dict[str, Any]:
         qna_id = action.payload.get("qna_id") if action.payload else None
         qna: QnaEntry | None = self.db.get(QnaEntry, uuid.UUID(qna_id)) if qna_id else None
@@ -538,6 +974,7 @@ class ActionExecutor:
         )
         return {"status": "qna_published"}
 
+    @_requires("rank_service")
     def _handle_rank_check(self, action: Action) -> dict[str, Any]:
         payload = action.payload or {}
         keyword_ids = payload.get("keyword_ids", [])
@@ -558,6 +995,7 @@ class ActionExecutor:
                 )
         return {"status": "rank_snapshots_recorded"}
 
+    @_requires("media_service")
     def _handle_request_media_upload(self, action: Action) -> dict[str, Any]:
         payload = action.payload or {}
         request_id = payload.get("media_upload_request_id")
@@ -577,6 +1015,7 @@ class ActionExecutor:
         )
         return {"status": "request_notified"}
 
+    @_requires("competitor_service")
     def _handle_monitor_competitors(self, action: Action) -> dict[str, Any]:
         payload = action.payload or {}
         location_id = payload.get("location_id") or (
@@ -598,6 +1037,7 @@ class ActionExecutor:
         )
         return result
 
+    @_requires("automation_service")
     def _handle_run_automation_rules(self, action: Action) -> dict[str, Any]:
         payload = action.payload or {}
         org_value = payload.get("organization_id") or str(action.organization_id)
@@ -618,6 +1058,7 @@ class ActionExecutor:
         )
         return {"status": "automation_run", "triggered": len(results)}
 
+    @_requires("connection_service", "alerts", "oauth")
     def _handle_refresh_token(self, action: Action) -> dict[str, Any]:
         org_id = action.organization_id
         connection = self.connection_service.get_by_org(org_id)
@@ -647,6 +1088,7 @@ class ActionExecutor:
             )
             raise
 
+    @_requires()
     def _handle_sync_locations(self, action: Action) -> dict[str, Any]:
         self.audit.log(
             action="gbp.locations.sync_requested",
@@ -656,14 +1098,20 @@ class ActionExecutor:
         )
         return {"status": "sync_stubbed"}
 
+    @_requires("gbp_sync", "gbp_sync_coordinator")
     def _handle_sync_reviews(self, action: Action) -> dict[str, Any]:
+        if action.payload and action.payload.get("location_ids"):
+            return self._fan_out_sync(action, ("reviews",), "reviews_synced")
         location_id = action.payload.get("location_id") if action.payload else None
         if not location_id:
             return {"status": "missing_location"}
         count = self.gbp_sync.sync_reviews(action.organization_id, uuid.UUID(location_id))
         return {"status": "reviews_synced", "count": count}
 
+    @_requires("gbp_sync", "gbp_sync_coordinator")
     def _handle_sync_posts(self, action: Action) -> dict[str, Any]:
+        if action.payload and action.payload.get("location_ids"):
+            return self._fan_out_sync(action, ("posts", "media"), "posts_synced")
         location_id = action.payload.get("location_id") if action.payload else None
         if not location_id:
             return {"status": "missing_location"}
@@ -671,6 +1119,32 @@ class ActionExecutor:
         media_count = self.gbp_sync.sync_media(action.organization_id, uuid.UUID(location_id))
         return {"status": "posts_synced", "count": count, "media_count": media_count}
 
+    @_requires("gbp_sync", "gbp_sync_coordinator")
+    def _handle_sync_media(self, action: Action) -> dict[str, Any]:
+        if action.payload and action.payload.get("location_ids"):
+            return self._fan_out_sync(action, ("media",), "media_synced")
+        location_id = action.payload.get("location_id") if action.payload else None
+        if not location_id:
+            return {"status": "missing_location"}
+        count = self.gbp_sync.sync_media(action.organization_id, uuid.UUID(location_id))
+        return {"status": "media_synced", "count": count}
+
+    def _fan_out_sync(self, action: Action, resources: tuple[str, ...], status: str) -> dict[str, Any]:
+        """Sync every location in `payload["location_ids"]` concurrently, within the account's cap."""
+        location_ids = [uuid.UUID(str(value)) for value in action.payload["location_ids"]]
+        outcomes = self.gbp_sync_coordinator.sync_locations(action.organization_id, location_ids, resources=resources)
+        retry_after = [outcome.retry_after_seconds for outcome in outcomes if outcome.retry_after_seconds]
+        if retry_after and all(not outcome.ok for outcome in outcomes):
+            raise RateLimitError(max(retry_after))
+        return {
+            "status": status,
+            "locations": {
+                str(outcome.location_id): {"counts": outcome.counts, "error": outcome.error} for outcome in outcomes
+            },
+            "failed": sum(1 for outcome in outcomes if not outcome.ok),
+        }
+
+    @_requires("daily_signals")
     def _handle_compute_daily_signals(self, action: Action) -> dict[str, Any]:
         location_id = action.payload.get("location_id") if action.payload else None
         if not location_id:
@@ -682,6 +1156,7 @@ class ActionExecutor:
         )
         return {"status": "signals_computed", "signal_date": snapshot.signal_date.isoformat()}
 
+    @_requires("post_candidates")
     def _handle_generate_post_candidates(self, action: Action) -> dict[str, Any]:
         location_id = action.payload.get("location_id") if action.payload else None
         if not location_id:
@@ -694,6 +1169,7 @@ class ActionExecutor:
             return {"status": "no_candidate"}
         return {"status": "candidate_created", "candidate_id": str(candidate.id)}
 
+    @_requires("post_composer")
     def _handle_compose_post_candidate(self, action: Action) -> dict[str, Any]:
         candidate_id = action.payload.get("candidate_id")
         if not candidate_id:
@@ -701,6 +1177,7 @@ class ActionExecutor:
         candidate = self.post_composer.compose(uuid.UUID(candidate_id))
         return {"status": "candidate_composed", "candidate_id": str(candidate.id)}
 
+    @_requires("post_scheduler_service")
     def _handle_schedule_post(self, action: Action) -> dict[str, Any]:
         candidate_id = action.payload.get("candidate_id")
         if not candidate_id:
@@ -708,25 +1185,30 @@ class ActionExecutor:
         candidate = self.post_scheduler_service.schedule(uuid.UUID(candidate_id))
         return {"status": "post_scheduled", "candidate_id": str(candidate.id)}
 
+    @_requires("batch_planner")
     def _handle_plan_content(self, action: Action) -> dict[str, Any]:
         organization_id = action.organization_id
-        horizon = action.payload.get("horizon_days", 14) if action.payload else 14
+        payload = action.payload or {}
         locations = (
             self.db.query(Location)
             .filter(Location.organization_id == organization_id)
             .filter(Location.posting_paused == False)  # noqa: E712
             .all()
         )
-        total = 0
-        for loc in locations:
-            plans = self.content_planner.plan_horizon(
-                organization_id=organization_id,
-                location=loc,
-                horizon_days=horizon,
-            )
-            total += len(plans)
-        return {"status": "planned", "plans_created": total}
+        plan = self.batch_planner.plan(
+            organization_id=organization_id,
+            locations=locations,
+            horizon_days=payload.get("horizon_days", 14),
+            dry_run=bool(payload.get("dry_run", False)),
+        )
+        return {
+            "status": "dry_run" if plan.dry_run else "planned",
+            "plans_created": 0 if plan.dry_run else len(plan.planned),
+            "days_planned": len(plan.planned),
+            "days_skipped": len(plan.skipped),
+        }
 
+    @_requires("post_jobs")
     def _handle_execute_post_job(self, action: Action) -> dict[str, Any]:
         job_id = action.payload.get("post_job_id") if action.payload else None
         if not job_id:
@@ -734,6 +1216,7 @@ class ActionExecutor:
         result = self.post_jobs.execute(uuid.UUID(job_id))
         return result
 
+    @_requires("keyword_campaigns")
     def _handle_run_keyword_campaign(self, action: Action) -> dict[str, Any]:
         payload = action.payload or {}
         location_id = payload.get("location_id") or (str(action.location_id) if action.location_id else None)
@@ -754,6 +1237,7 @@ class ActionExecutor:
             "cycle_month": cycle.cycle_month,
         }
 
+    @_requires("keyword_campaigns")
     def _handle_run_keyword_followup_scan(self, action: Action) -> dict[str, Any]:
         payload = action.payload or {}
         cycle_id = payload.get("cycle_id")
@@ -766,5 +1250,6 @@ class ActionExecutor:
             "followup_scanned_at": cycle.followup_scanned_at.isoformat() if cycle.followup_scanned_at else None,
         }
 
+    @_requires()
     def _handle_noop(self, action: Action) -> dict[str, Any]:
         return {"status": "no-op"}
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import logging
+import math
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Iterator, NamedTuple
 from urllib.parse import urlencode
 
 import httpx
@@ -10,6 +11,8 @@ from fastapi import HTTPException, status
 from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
 
 from backend.app.core.config import settings
+from backend.app.services.google_business.transport import GbpTransport, get_transport, retry_after_seconds
+from backend.app.services.operations.rate_limits import RateLimitError
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +20,17 @@ GBP_REQUIRED_SCOPE = "https://www.googleapis.com/auth/business.manage"
 DEFAULT_GBP_SCOPES = [GBP_REQUIRED_SCOPE]
 FRONTEND_GOOGLE_CALLBACK_PATH = "/onboarding/google/callback"
 GOOGLE_OAUTH_STATE_MAX_AGE_SECONDS = 15 * 60
+# Guard against list endpoints that keep returning page tokens; 1000 pages of 50 reviews is
+# far beyond any real location.
+DEFAULT_MAX_PAGES = 1000
+
+
+class GbpPage(NamedTuple):
+    items: list[dict[str, Any]]
+    # Token for the page after this one; None on the last page.
+    next_page_token: str | None
+    # Set on the last page when paging stopped early, so the listing is incomplete.
+    truncated: bool = False
 
 
 def validate_gbp_oauth_scopes(scopes: list[str] | None) -> list[str]:
@@ -172,21 +186,20 @@ class GoogleOAuthService:
 
     @staticmethod
     def _post(url: str, data: dict[str, Any]) -> dict[str, Any]:
-        with httpx.Client(timeout=30) as client:
-            response = client.post(url, data=data)
-            try:
-                response.raise_for_status()
-            except httpx.HTTPStatusError as exc:
-                logger.warning(
-                    "Google OAuth request failed status=%s url=%s",
-                    exc.response.status_code,
-                    url,
-                )
-                raise HTTPException(
-                    status_code=status.HTTP_502_BAD_GATEWAY,
-                    detail="Google OAuth request failed",
-                ) from exc
-            return response.json()
+        response = get_transport().request("POST", url, endpoint_class="oauth", data=data)
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as exc:
+            logger.warning(
+                "Google OAuth request failed status=%s url=%s",
+                exc.response.status_code,
+                url,
+            )
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail="Google OAuth request failed",
+            ) from exc
+        return response.json()
 
 
 class GoogleBusinessClient:
@@ -209,8 +222,9 @@ class GoogleBusinessClient:
         ]
     )
 
-    def __init__(self, access_token: str) -> None:
+    def __init__(self, access_token: str, *, transport: GbpTransport | None = None) -> None:
         self.access_token = access_token
+        self.transport = transport or get_transport()
         self.base_url = str(settings.GOOGLE_BUSINESS_API_BASE_URL).rstrip("/")
         self.account_management_base_url = str(
             settings.GOOGLE_ACCOUNT_MANAGEMENT_API_BASE_URL
@@ -223,47 +237,102 @@ class GoogleBusinessClient:
         }
 
     def _get(
-        self, endpoint: str, params: dict[str, Any] | None = None
+        self,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        *,
+        endpoint_class: str = "read",
     ) -> dict[str, Any]:
-        with httpx.Client(timeout=30) as client:
-            resp = client.get(endpoint, headers=self._headers(), params=params)
-            self._raise_if_error(resp)
-            return resp.json()
+        resp = self.transport.request(
+            "GET",
+            endpoint,
+            endpoint_class=endpoint_class,
+            headers=self._headers(),
+            params=params,
+        )
+        self._raise_if_error(resp)
+        return resp.json()
 
     def _post(self, endpoint: str, payload: dict[str, Any]) -> dict[str, Any]:
-        with httpx.Client(timeout=30) as client:
-            resp = client.post(endpoint, headers=self._headers(), json=payload)
-            self._raise_if_error(resp)
-            return resp.json()
+        resp = self.transport.request(
+            "POST",
+            endpoint,
+            endpoint_class="write",
+            headers=self._headers(),
+            json=payload,
+        )
+        self._raise_if_error(resp)
+        return resp.json()
 
-    def list_accounts(self) -> list[dict[str, Any]]:
-        accounts: list[dict[str, Any]] = []
-        params: dict[str, Any] = {"pageSize": 20}
+    def pages(
+        self,
+        endpoint: str,
+        items_key: str,
+        *,
+        params: dict[str, Any] | None = None,
+        page_size: int | None = None,
+        page_token: str | None = None,
+        max_pages: int | None = DEFAULT_MAX_PAGES,
+        endpoint_class: str = "read",
+    ) -> Iterator[GbpPage]:
+        """Yield each page with its continuation token, following `nextPageToken` lazily.
+
+        `page_size` is sent as the `pageSize` hint (the API may return fewer) and
+        `page_token` resumes a listing part-way. Paging stops at `max_pages` or when the API
+        repeats a token, with a warning, instead of looping; that last page is marked
+        `truncated`.
+        """
+        query = dict(params or {})
+        if page_size:
+            query["pageSize"] = page_size
+        if page_token:
+            query["pageToken"] = page_token
+        seen_tokens: set[str] = set()
+        pages = 0
         while True:
-            data = self._get(
-                f"{self.account_management_base_url}/accounts", params=params
-            )
-            accounts.extend(data.get("accounts", []))
-            next_page_token = data.get("nextPageToken")
+            data = self._get(endpoint, params=dict(query), endpoint_class=endpoint_class)
+            pages += 1
+            next_page_token = data.get("nextPageToken") or None
+            stop = next_page_token in seen_tokens or (max_pages is not None and pages >= max_pages)
+            truncated = bool(next_page_token and stop)
+            if truncated:
+                logger.warning(
+                    "Stopped paging Google Business API endpoint=%s pages=%s repeated_token=%s",
+                    endpoint,
+                    pages,
+                    next_page_token in seen_tokens,
+                )
+                next_page_token = None
+            yield GbpPage(data.get(items_key, []), next_page_token, truncated)
             if not next_page_token:
-                return accounts
-            params["pageToken"] = next_page_token
+                return
+            seen_tokens.add(next_page_token)
+            query["pageToken"] = next_page_token
+
+    def paginate(self, endpoint: str, items_key: str, **kwargs: Any) -> Iterator[list[dict[str, Any]]]:
+        """`pages`, as each page's item list."""
+        for page in self.pages(endpoint, items_key, **kwargs):
+            yield page.items
+
+    def iter_items(self, endpoint: str, items_key: str, **kwargs: Any) -> Iterator[dict[str, Any]]:
+        """`paginate`, flattened to items."""
+        for page in self.paginate(endpoint, items_key, **kwargs):
+            yield from page
+
+    def list_accounts(self) -> list[dict[str, Any]]:
+        return list(
+            self.iter_items(f"{self.account_management_base_url}/accounts", "accounts", page_size=20)
+        )
 
     def list_locations(self, account_name: str) -> list[dict[str, Any]]:
-        locations: list[dict[str, Any]] = []
-        params: dict[str, Any] = {
-            "pageSize": 100,
-            "readMask": self.DEFAULT_LOCATION_READ_MASK,
-        }
-        while True:
-            data = self._get(
-                f"{self.base_url}/{account_name}/locations", params=params
+        return list(
+            self.iter_items(
+                f"{self.base_url}/{account_name}/locations",
+                "locations",
+                params={"readMask": self.DEFAULT_LOCATION_READ_MASK},
+                page_size=100,
             )
-            locations.extend(data.get("locations", []))
-            next_page_token = data.get("nextPageToken")
-            if not next_page_token:
-                return locations
-            params["pageToken"] = next_page_token
+        )
 
     def get_location(self, location_name: str) -> dict[str, Any]:
         return self._get(
@@ -271,13 +340,34 @@ class GoogleBusinessClient:
             params={"readMask": self.DEFAULT_LOCATION_READ_MASK},
         )
 
+    def iter_reviews(self, location_name: str, **kwargs: Any) -> Iterator[dict[str, Any]]:
+        kwargs.setdefault("page_size", 50)
+        return self.iter_items(f"{self.base_url}/{location_name}/reviews", "reviews", **kwargs)
+
     def list_reviews(self, location_name: str) -> list[dict[str, Any]]:
-        data = self._get(f"{self.base_url}/{location_name}/reviews")
-        return data.get("reviews", [])
+        return list(self.iter_reviews(location_name))
+
+    def review_pages(self, location_name: str, *, page_token: str | None = None) -> Iterator[GbpPage]:
+        """Review pages, most recently updated first."""
+        return self.pages(
+            f"{self.base_url}/{location_name}/reviews",
+            "reviews",
+            params={"orderBy": "updateTime desc"},
+            page_size=50,
+            page_token=page_token,
+        )
+
+    def iter_local_posts(self, location_name: str, **kwargs: Any) -> Iterator[dict[str, Any]]:
+        kwargs.setdefault("page_size", 100)
+        return self.iter_items(f"{self.base_url}/{location_name}/localPosts", "localPosts", **kwargs)
 
     def list_local_posts(self, location_name: str) -> list[dict[str, Any]]:
-        data = self._get(f"{self.base_url}/{location_name}/localPosts")
-        return data.get("localPosts", [])
+        return list(self.iter_local_posts(location_name))
+
+    def local_post_pages(self, location_name: str, *, page_token: str | None = None) -> Iterator[GbpPage]:
+        return self.pages(
+            f"{self.base_url}/{location_name}/localPosts", "localPosts", page_size=100, page_token=page_token
+        )
 
     def create_local_post(self, location_name: str, payload: dict[str, Any]) -> dict[str, Any]:
         return self._post(f"{self.base_url}/{location_name}/localPosts", payload)
@@ -285,12 +375,33 @@ class GoogleBusinessClient:
     def reply_to_review(self, review_name: str, comment: str) -> dict[str, Any]:
         return self._post(f"{self.base_url}/{review_name}:reply", {"comment": comment})
 
+    def iter_media(self, location_name: str, **kwargs: Any) -> Iterator[dict[str, Any]]:
+        kwargs.setdefault("page_size", 100)
+        kwargs.setdefault("endpoint_class", "media")
+        return self.iter_items(f"{self.base_url}/{location_name}/media", "mediaItems", **kwargs)
+
     def list_media(self, location_name: str) -> list[dict[str, Any]]:
-        data = self._get(f"{self.base_url}/{location_name}/media")
-        return data.get("mediaItems", [])
+        return list(self.iter_media(location_name))
+
+    def media_pages(self, location_name: str, *, page_token: str | None = None) -> Iterator[GbpPage]:
+        return self.pages(
+            f"{self.base_url}/{location_name}/media",
+            "mediaItems",
+            page_size=100,
+            page_token=page_token,
+            endpoint_class="media",
+        )
 
     @staticmethod
     def _raise_if_error(response: httpx.Response) -> None:
+        if response.status_code == 429:
+            retry_after = retry_after_seconds(response)
+            logger.warning(
+                "Google Business API rate limited retry_after=%s url=%s",
+                retry_after,
+                str(response.request.url) if response.request else "",
+            )
+            raise RateLimitError(math.ceil(retry_after) if retry_after is not None else 60)
         try:
             response.raise_for_status()
         except httpx.HTTPStatusError as exc:
@@ -1,16 +1,24 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
+import logging
 from typing import Any, Callable
 import uuid
 
 from sqlalchemy.orm import Session
 
+from backend.app.core.config import settings
 from backend.app.models.enums import GbpConnectionStatus, LocationStatus
 from backend.app.models.google_business.gbp_connection import GbpConnection
 from backend.app.models.google_business.location import Location
 from backend.app.services.shared.encryption import get_encryption_service
 from backend.app.services.google_business.google import GoogleBusinessClient, GoogleOAuthService
+from backend.app.services.google_business.token_refresh import refresh_lock, token_cache
+
+logger = logging.getLogger(__name__)
+
+# Tokens closer to expiry than this are not handed out; callers wait for a refresh.
+TOKEN_EXPIRY_SKEW = timedelta(seconds=60)
 
 
 class GbpConnectionService:
@@ -74,35 +82,74 @@ class GbpConnectionService:
         *,
         refresh_callback: Callable[[str], dict[str, Any]],
     ) -> str:
+        """A valid access token, refreshed at most once per expiry window across workers.
+
+        Within `GBP_TOKEN_REFRESH_LEAD_SECONDS` of expiry one caller refreshes ahead of time
+        while the others keep using the still-valid token; once the token is about to expire
+        every caller waits for the refresh in flight and then reuses its result.
+        """
         if not connection.encrypted_access_token:
             raise ValueError("Google account is disconnected; reconnect Google Business Profile")
-        decrypt = self.encryptor.decrypt
-        access_token = decrypt(connection.encrypted_access_token)
-        expires_at = connection.access_token_expires_at or datetime.now(timezone.utc)
+        remaining = self._remaining(connection)
+        if remaining > timedelta(seconds=settings.GBP_TOKEN_REFRESH_LEAD_SECONDS):
+            return self._access_token(connection)
+        urgent = remaining <= TOKEN_EXPIRY_SKEW
+        with refresh_lock(self.db, connection.id, blocking=urgent) as acquired:
+            if not acquired:
+                return self._access_token(connection)
+            self.db.refresh(connection)
+            if not connection.encrypted_access_token:
+                self.db.commit()
+                raise ValueError("Google account is disconnected; reconnect Google Business Profile")
+            remaining = self._remaining(connection)
+            if remaining > timedelta(seconds=settings.GBP_TOKEN_REFRESH_LEAD_SECONDS):
+                # Another caller refreshed while this one waited for the lock.
+                self.db.commit()
+                return self._access_token(connection)
+            urgent = remaining <= TOKEN_EXPIRY_SKEW
+            if not connection.encrypted_refresh_token:
+                if not urgent:
+                    self.db.commit()
+                    return self._access_token(connection)
+                self._mark_expired(connection)
+                raise ValueError("Google authorization expired; reconnect Google Business Profile")
+            decrypt = self.encryptor.decrypt
+            try:
+                payload = refresh_callback(decrypt(connection.encrypted_refresh_token))
+            except Exception as exc:  # noqa: BLE001
+                if not urgent:
+                    logger.warning("Proactive GBP token refresh failed connection=%s", connection.id)
+                    self.db.commit()
+                    return self._access_token(connection)
+                self._mark_expired(connection)
+                raise ValueError("Google authorization expired; reconnect Google Business Profile") from exc
+            access_token = payload["access_token"]
+            expires_in = payload.get("expires_in", 3600)
+            new_refresh = payload.get("refresh_token")
+            connection.encrypted_access_token = self.encryptor.encrypt(access_token)
+            if new_refresh:
+                connection.encrypted_refresh_token = self.encryptor.encrypt(new_refresh)
+            connection.access_token_expires_at = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
+            self.db.add(connection)
+            self.db.commit()
+            self.db.refresh(connection)
+        token_cache.put(connection.id, connection.encrypted_access_token, access_token)
+        return access_token
+
+    def _access_token(self, connection: GbpConnection) -> str:
+        token = token_cache.get(connection.id, connection.encrypted_access_token)
+        if token is None:
+            token = self.encryptor.decrypt(connection.encrypted_access_token)
+            token_cache.put(connection.id, connection.encrypted_access_token, token)
+        return token
+
+    @staticmethod
+    def _remaining(connection: GbpConnection) -> timedelta:
+        now = datetime.now(timezone.utc)
+        expires_at = connection.access_token_expires_at or now
         if expires_at.tzinfo is None or expires_at.tzinfo.utcoffset(expires_at) is None:
             expires_at = expires_at.replace(tzinfo=timezone.utc)
-        now = datetime.now(timezone.utc)
-        if expires_at - now > timedelta(seconds=60):
-            return access_token
-        if not connection.encrypted_refresh_token:
-            self._mark_expired(connection)
-            raise ValueError("Google authorization expired; reconnect Google Business Profile")
-        try:
-            payload = refresh_callback(decrypt(connection.encrypted_refresh_token))
-        except Exception as exc:  # noqa: BLE001
-            self._mark_expired(connection)
-            raise ValueError("Google authorization expired; reconnect Google Business Profile") from exc
-        access_token = payload["access_token"]
-        expires_in = payload.get("expires_in", 3600)
-        new_refresh = payload.get("refresh_token")
-        connection.encrypted_access_token = self.encryptor.encrypt(access_token)
-        if new_refresh:
-            connection.encrypted_refresh_token = self.encryptor.encrypt(new_refresh)
-        connection.access_token_expires_at = now + timedelta(seconds=expires_in)
-        self.db.add(connection)
-        self.db.commit()
-        self.db.refresh(connection)
-        return access_token
+        return expires_at - now
 
     def disconnect(self, organization_id: uuid.UUID) -> GbpConnection | None:
         connection = self.get_by_org(organization_id)
@@ -112,6 +159,7 @@ class GbpConnectionService:
         connection.encrypted_access_token = None
         connection.encrypted_refresh_token = None
         connection.access_token_expires_at = None
+        token_cache.discard(connection.id)
         metadata = connection.metadata_json or {}
         metadata["disconnected_at"] = datetime.now(timezone.utc).isoformat()
         connection.metadata_json = metadata
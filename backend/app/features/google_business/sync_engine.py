@@ -0,0 +1,573 @@
+"""Incremental sync of a location's GBP reviews, local posts and media.
+
+Each (location, resource) keeps a `GbpSyncWatermark`: the newest remote `updateTime` a
+completed run has written, plus the page token and cursor of a run in progress. Reviews are
+listed newest-update first, so paging stops at the first item at or below the watermark;
+local posts stop after a page with nothing newer. GBP media has no `updateTime`, so media is
+always scanned in full and compared by a hash of the item, which also reveals removals.
+
+Each page is upserted with one `INSERT ... ON CONFLICT (external id) DO UPDATE ... WHERE`
+statement whose guard only overwrites rows holding older data; rows already up to date are
+filtered out beforehand with one lookup, so replaying an unchanged listing writes nothing.
+Every write is reported to listeners as a `SyncChange` once its page is committed.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import hashlib
+import json
+import logging
+from typing import Any, Callable, Iterator, Sequence
+import uuid
+
+from sqlalchemy import and_, bindparam, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from backend.app.models.enums import MediaStatus, MediaType, PostStatus, PostType, ReviewRating, ReviewStatus
+from backend.app.models.google_business.gbp_sync_watermark import GbpSyncWatermark
+from backend.app.models.google_business.location import Location
+from backend.app.models.media.media_asset import MediaAsset
+from backend.app.models.posts.post import Post
+from backend.app.models.reviews.review import Review
+from backend.app.services.automation.action_fanout import dialect_insert
+from backend.app.services.google_business.google import GbpPage, GoogleBusinessClient
+from backend.app.services.media.media_tag_index import MediaTagIndex
+from backend.app.services.posts.content_reuse import ContentReuseIndex
+
+logger = logging.getLogger(__name__)
+
+RESOURCE_REVIEWS = "reviews"
+RESOURCE_POSTS = "localPosts"
+RESOURCE_MEDIA = "media"
+
+REVIEW_CREATED = "review.created"
+REVIEW_EDITED = "review.edited"
+POST_CREATED = "post.created"
+POST_EDITED = "post.edited"
+MEDIA_CREATED = "media.created"
+MEDIA_UPDATED = "media.updated"
+MEDIA_REMOVED = "media.removed"
+
+
+@dataclass(frozen=True)
+class SyncChange:
+    kind: str
+    organization_id: uuid.UUID
+    location_id: uuid.UUID
+    external_id: str
+    record_id: uuid.UUID
+    data: dict[str, Any] | None = None
+
+
+@dataclass
+class SyncResult:
+    resource: str
+    seen: int = 0
+    written: int = 0
+    pages: int = 0
+    changes: list[SyncChange] = field(default_factory=list)
+
+
+SyncListener = Callable[[SyncChange], None]
+PageUpserter = Callable[[Location, list[dict[str, Any]]], list[SyncChange]]
+
+
+def parse_time(raw: Any) -> datetime | None:
+    if not raw or not isinstance(raw, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _aware(value: datetime | None) -> datetime | None:
+    # SQLite hands back naive datetimes for timezone-aware columns.
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+def is_newer(incoming: datetime | None, current: datetime | None) -> bool:
+    """Whether remote data stamped `incoming` should overwrite a row stamped `current`.
+
+    Unstamped rows are always overwritten; unstamped remote data only overwrites them.
+    """
+    if current is None:
+        return True
+    if incoming is None:
+        return False
+    return incoming > _aware(current)
+
+
+def item_hash(data: dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def media_file_name(source_external_id: str) -> str:
+    value = source_external_id.rsplit("/", 1)[-1]
+    return f"{value}.jpg" if "." not in value else value
+
+
+def media_categories(data: dict) -> list[str]:
+    values: list[str] = []
+    media_format = data.get("mediaFormat")
+    if media_format:
+        values.append(str(media_format).lower())
+    category = data.get("category")
+    if category:
+        values.append(str(category).lower())
+    association = data.get("association") if isinstance(data.get("association"), dict) else {}
+    if association.get("category"):
+        values.append(str(association["category"]).lower())
+    description = data.get("description")
+    if isinstance(description, str):
+        for token in description.lower().replace("_", " ").split():
+            if len(token) >= 4:
+                values.append(token)
+    return merge_categories([], values)
+
+
+def merge_categories(current: list[str] | None, incoming: list[str] | None) -> list[str]:
+    merged: list[str] = []
+    for value in (current or []) + (incoming or []):
+        if value not in merged:
+            merged.append(value)
+    return merged
+
+
+def media_type(raw: str | None) -> MediaType:
+    return MediaType.VIDEO if "VIDEO" in (raw or "").upper() else MediaType.IMAGE
+
+
+def review_rating(data: dict) -> ReviewRating:
+    value = str(data.get("starRating", "3"))
+    return ReviewRating[value] if value in ReviewRating.__members__ else ReviewRating.THREE
+
+
+class GbpSyncEngine:
+    def __init__(self, db: Session, *, listeners: Sequence[SyncListener] = ()) -> None:
+        self.db = db
+        self.listeners = list(listeners)
+        self.reuse_index = ContentReuseIndex(db)
+        self.media_tags = MediaTagIndex(db)
+
+    def sync_reviews(self, client: GoogleBusinessClient, location: Location) -> SyncResult:
+        result = self._sync_incremental(
+            location,
+            RESOURCE_REVIEWS,
+            lambda token: client.review_pages(location.google_location_id, page_token=token),
+            self._upsert_reviews,
+            ordered=True,
+        )
+        location.reviews_last_synced_at = datetime.now(timezone.utc)
+        self.db.add(location)
+        self.db.commit()
+        return result
+
+    def sync_posts(self, client: GoogleBusinessClient, location: Location) -> SyncResult:
+        result = self._sync_incremental(
+            location,
+            RESOURCE_POSTS,
+            lambda token: client.local_post_pages(location.google_location_id, page_token=token),
+            self._upsert_posts,
+            ordered=False,
+        )
+        self.db.commit()
+        return result
+
+    def sync_media(self, client: GoogleBusinessClient, location: Location) -> SyncResult:
+        """Scan every media page, upsert changed items and mark unlisted imports removed.
+
+        Removals are only marked after a complete listing; a truncated one leaves them as is.
+        """
+        result = SyncResult(RESOURCE_MEDIA)
+        watermark = self._watermark(location, RESOURCE_MEDIA)
+        newest = _aware(watermark.update_time)
+        listed: set[str] = set()
+        complete = True
+        for page in client.media_pages(location.google_location_id):
+            result.pages += 1
+            complete = complete and not page.truncated
+            result.seen += len(page.items)
+            listed.update(item["name"] for item in page.items if item.get("name"))
+            for item in page.items:
+                created = parse_time(item.get("createTime"))
+                if created and (newest is None or created > newest):
+                    newest = created
+            self._apply(result, self._upsert_media(location, page.items))
+        if complete:
+            self._apply(result, self._mark_removed_media(location, listed))
+        if result.written or newest != _aware(watermark.update_time):
+            watermark.update_time = newest
+            watermark.last_synced_at = datetime.now(timezone.utc)
+            self.db.add(watermark)
+        location.last_sync_at = datetime.now(timezone.utc)
+        location.media_last_synced_at = location.last_sync_at
+        self.db.add(location)
+        self.db.commit()
+        return result
+
+    def _sync_incremental(
+        self,
+        location: Location,
+        resource: str,
+        fetch_pages: Callable[[str | None], Iterator[GbpPage]],
+        upsert_page: PageUpserter,
+        *,
+        ordered: bool,
+    ) -> SyncResult:
+        """Page until items reach the watermark, checkpointing progress after every page.
+
+        `ordered` listings (newest update first) stop at the first already-seen item;
+        unordered ones stop after a page holding nothing newer than the watermark.
+        """
+        result = SyncResult(resource)
+        watermark = self._watermark(location, resource)
+        since = _aware(watermark.update_time)
+        cursor = _aware(watermark.cursor_update_time)
+        resumed = watermark.page_token
+        for page in fetch_pages(resumed):
+            result.pages += 1
+            result.seen += len(page.items)
+            fresh = []
+            newer = False
+            for item in page.items:
+                updated = parse_time(item.get("updateTime"))
+                if updated is not None and (cursor is None or updated > cursor):
+                    cursor = updated
+                if since is None or updated is None or updated >= since:
+                    # Items stamped exactly at the watermark are re-checked against the rows.
+                    fresh.append(item)
+                    newer = newer or since is None or updated is None or updated > since
+            if fresh:
+                self._apply(result, upsert_page(location, fresh))
+            reached = len(fresh) < len(page.items) if ordered else not newer
+            if reached or not page.next_page_token:
+                break
+            watermark.page_token = page.next_page_token
+            watermark.cursor_update_time = cursor
+            self.db.add(watermark)
+            self.db.commit()
+        if result.written or resumed or watermark.page_token or (cursor and cursor != since):
+            watermark.update_time = max(filter(None, (since, cursor)), default=None)
+            watermark.page_token = None
+            watermark.cursor_update_time = None
+            watermark.last_synced_at = datetime.now(timezone.utc)
+            self.db.add(watermark)
+        logger.info(
+            "GBP %s sync location=%s pages=%s seen=%s written=%s",
+            resource,
+            location.id,
+            result.pages,
+            result.seen,
+            result.written,
+        )
+        return result
+
+    def _apply(self, result: SyncResult, changes: list[SyncChange]) -> None:
+        """Commit the page's writes, then hand its changes to the listeners."""
+        if not changes:
+            return
+        self.db.commit()
+        result.written += len(changes)
+        result.changes.extend(changes)
+        for change in changes:
+            for listener in self.listeners:
+                try:
+                    listener(change)
+                except Exception:  # noqa: BLE001
+                    logger.exception("GBP sync listener failed kind=%s external_id=%s", change.kind, change.external_id)
+
+    def _watermark(self, location: Location, resource: str) -> GbpSyncWatermark:
+        watermark = self.db.get(GbpSyncWatermark, (location.id, resource))
+        if watermark is None:
+            watermark = GbpSyncWatermark(
+                organization_id=location.organization_id, location_id=location.id, resource=resource
+            )
+        return watermark
+
+    def _upsert_reviews(self, location: Location, items: list[dict[str, Any]]) -> list[SyncChange]:
+        rows = {
+            item["name"]: {
+                "id": uuid.uuid4(),
+                "tenant_id": location.organization_id,
+                "location_id": location.id,
+                "external_review_id": item["name"],
+                "rating": review_rating(item),
+                "comment": item.get("comment", ""),
+                "author_name": (item.get("reviewer") or {}).get("displayName"),
+                "status": ReviewStatus.NEW,
+                "topics": [],
+                "metadata_json": item,
+                "external_updated_at": parse_time(item.get("updateTime")),
+            }
+            for item in items
+            if item.get("name")
+        }
+        if not rows:
+            return []
+        existing = {
+            row.external_review_id: row
+            for row in self.db.execute(
+                select(Review.id, Review.external_review_id, Review.external_updated_at).where(
+                    Review.organization_id == location.organization_id, Review.external_review_id.in_(rows)
+                )
+            )
+        }
+        changed = {
+            name: row
+            for name, row in rows.items()
+            if name not in existing or is_newer(row["external_updated_at"], existing[name].external_updated_at)
+        }
+        if not changed:
+            return []
+        table = Review.__table__
+        stmt = self._dialect_insert()(table).values(list(changed.values()))
+        # Review ids are unique across tenants; another organization's row is never taken over,
+        # and only the rows actually written are reported.
+        written = self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.external_review_id],
+                set_={
+                    "rating": stmt.excluded.rating,
+                    "comment": stmt.excluded.comment,
+                    "author_name": func.coalesce(stmt.excluded.author_name, table.c.author_name),
+                    "metadata_json": stmt.excluded.metadata_json,
+                    "external_updated_at": stmt.excluded.external_updated_at,
+                    "updated_at": func.now(),
+                },
+                where=and_(
+                    table.c.tenant_id == stmt.excluded.tenant_id,
+                    or_(
+                        table.c.external_updated_at.is_(None),
+                        table.c.external_updated_at < stmt.excluded.external_updated_at,
+                    ),
+                ),
+            ).returning(table.c.external_review_id)
+        )
+        written_names = set(written.scalars())
+        return [
+            SyncChange(
+                REVIEW_EDITED if name in existing else REVIEW_CREATED,
+                location.organization_id,
+                location.id,
+                name,
+                existing[name].id if name in existing else row["id"],
+                row["metadata_json"],
+            )
+            for name, row in changed.items()
+            if name in written_names
+        ]
+
+    def _upsert_posts(self, location: Location, items: list[dict[str, Any]]) -> list[SyncChange]:
+        now = datetime.now(timezone.utc)
+        rows = {
+            item["name"]: {
+                "id": uuid.uuid4(),
+                "tenant_id": location.organization_id,
+                "location_id": location.id,
+                "post_type": PostType.UPDATE,
+                "status": PostStatus.DRAFT,
+                "body": item.get("summary") or "",
+                "ai_prompt_context": {},
+                "cta": {},
+                "rotation_context": {},
+                "topic_tags": [],
+                "external_post_id": item["name"],
+                "publish_result": item,
+                "published_at": now,
+                "external_updated_at": parse_time(item.get("updateTime")),
+            }
+            for item in items
+            if item.get("name")
+        }
+        if not rows:
+            return []
+        existing = {
+            row.external_post_id: row
+            for row in self.db.execute(
+                select(Post.id, Post.external_post_id, Post.external_updated_at).where(
+                    Post.organization_id == location.organization_id, Post.external_post_id.in_(rows)
+                )
+            )
+        }
+        changed = {
+            name: row
+            for name, row in rows.items()
+            if name not in existing or is_newer(row["external_updated_at"], existing[name].external_updated_at)
+        }
+        if not changed:
+            return []
+        table = Post.__table__
+        stmt = self._dialect_insert()(table).values(list(changed.values()))
+        self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.tenant_id, table.c.external_post_id],
+                set_={
+                    "publish_result": stmt.excluded.publish_result,
+                    "published_at": func.coalesce(table.c.published_at, stmt.excluded.published_at),
+                    "external_updated_at": stmt.excluded.external_updated_at,
+                    "updated_at": func.now(),
+                },
+                where=or_(
+                    table.c.external_updated_at.is_(None),
+                    table.c.external_updated_at < stmt.excluded.external_updated_at,
+                ),
+            )
+        )
+        created = [row["id"] for name, row in changed.items() if name not in existing]
+        if created:
+            for post in self.db.scalars(select(Post).where(Post.id.in_(created))):
+                self.reuse_index.index(post)
+        return [
+            SyncChange(
+                POST_EDITED if name in existing else POST_CREATED,
+                location.organization_id,
+                location.id,
+                name,
+                existing[name].id if name in existing else row["id"],
+                row["publish_result"],
+            )
+            for name, row in changed.items()
+        ]
+
+    def _upsert_media(self, location: Location, items: list[dict[str, Any]]) -> list[SyncChange]:
+        listed = {
+            item["name"]: item
+            for item in items
+            if item.get("name") and (item.get("googleUrl") or item.get("thumbnailUrl"))
+        }
+        if not listed:
+            return []
+        existing = {
+            row.source_external_id: row
+            for row in self.db.execute(
+                select(
+                    MediaAsset.id,
+                    MediaAsset.source_external_id,
+                    MediaAsset.external_hash,
+                    MediaAsset.file_name,
+                    MediaAsset.categories,
+                    MediaAsset.description,
+                    MediaAsset.metadata_json,
+                ).where(
+                    MediaAsset.location_id == location.id,
+                    MediaAsset.source == "gbp",
+                    MediaAsset.source_external_id.in_(listed),
+                )
+            )
+        }
+        now = datetime.now(timezone.utc)
+        rows: dict[str, dict[str, Any]] = {}
+        for name, item in listed.items():
+            digest = item_hash(item)
+            current = existing.get(name)
+            if current is not None and current.external_hash == digest:
+                continue
+            metadata = dict(current.metadata_json or {}) if current is not None else {}
+            metadata.pop("gbp_removed_at", None)
+            metadata.update({"gbp_media": item, "source": "gbp", "imported_at": now.isoformat()})
+            categories = media_categories(item)
+            rows[name] = {
+                "id": current.id if current is not None else uuid.uuid4(),
+                "tenant_id": location.organization_id,
+                "location_id": location.id,
+                "source": "gbp",
+                "source_external_id": name,
+                "storage_url": item.get("googleUrl") or item.get("thumbnailUrl"),
+                "file_name": (current.file_name if current is not None else None) or media_file_name(name),
+                "media_type": media_type(item.get("mediaFormat")),
+                "categories": merge_categories(current.categories, categories) if current is not None else categories,
+                "description": (current.description if current is not None else None) or item.get("description"),
+                "status": MediaStatus.APPROVED,
+                "metadata_json": metadata,
+                "usage_count": 0,
+                "external_hash": digest,
+                "created_at": parse_time(item.get("createTime")) or now,
+            }
+        if not rows:
+            return []
+        table = MediaAsset.__table__
+        stmt = self._dialect_insert()(table).values(list(rows.values()))
+        self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.location_id, table.c.source_external_id],
+                index_where=table.c.source == "gbp",
+                set_={
+                    "storage_url": stmt.excluded.storage_url,
+                    "file_name": stmt.excluded.file_name,
+                    "categories": stmt.excluded.categories,
+                    "description": stmt.excluded.description,
+                    "status": stmt.excluded.status,
+                    "metadata_json": stmt.excluded.metadata_json,
+                    "external_hash": stmt.excluded.external_hash,
+                    "updated_at": func.now(),
+                },
+                where=or_(
+                    table.c.external_hash.is_(None),
+                    table.c.external_hash != stmt.excluded.external_hash,
+                ),
+            )
+        )
+        written = self.db.scalars(
+            select(MediaAsset)
+            .where(MediaAsset.id.in_([row["id"] for row in rows.values()]))
+            .execution_options(populate_existing=True)
+        ).all()
+        self.media_tags.index_many(written)
+        return [
+            SyncChange(
+                MEDIA_UPDATED if name in existing else MEDIA_CREATED,
+                location.organization_id,
+                location.id,
+                name,
+                row["id"],
+                listed[name],
+            )
+            for name, row in rows.items()
+        ]
+
+    def _mark_removed_media(self, location: Location, listed: set[str]) -> list[SyncChange]:
+        """Stamp imported assets GBP no longer lists; the asset itself is kept for history.
+
+        The hash is cleared so the item is rewritten if it is ever listed again.
+        """
+        removed = [
+            row
+            for row in self.db.execute(
+                select(MediaAsset.id, MediaAsset.source_external_id, MediaAsset.metadata_json).where(
+                    MediaAsset.location_id == location.id,
+                    MediaAsset.source == "gbp",
+                    MediaAsset.source_external_id.is_not(None),
+                )
+            )
+            if row.source_external_id not in listed and "gbp_removed_at" not in (row.metadata_json or {})
+        ]
+        if not removed:
+            return []
+        removed_at = datetime.now(timezone.utc).isoformat()
+        table = MediaAsset.__table__
+        self.db.execute(
+            update(table)
+            .where(table.c.id == bindparam("asset_id"))
+            .values(metadata_json=bindparam("metadata"), external_hash=None, updated_at=func.now()),
+            [
+                {"asset_id": row.id, "metadata": {**(row.metadata_json or {}), "gbp_removed_at": removed_at}}
+                for row in removed
+            ],
+        )
+        return [
+            SyncChange(MEDIA_REMOVED, location.organization_id, location.id, row.source_external_id, row.id)
+            for row in removed
+        ]
+
+    def _dialect_insert(self) -> Callable[..., Any]:
+        insert = dialect_insert(self.db)
+        if insert is None:
+            raise RuntimeError("GBP sync upserts require Postgres or SQLite")
+        return insert
+
@@ -0,0 +1,161 @@
+"""Concurrent GBP sync of many locations of one connected Google account.
+
+Location syncs are blocking (sessions and the pooled `GbpTransport` are synchronous), so the
+coordinator runs them on a thread pool; each worker uses its own database session, while
+all of them share the process-wide HTTP connection pool. How many locations of one Google
+account sync at once is capped by a process-wide semaphore per account, so one tenant's
+fan-out cannot take every connection and all of the API quota from the others. Once a
+location is throttled (`RateLimitError`), the account's locations still queued are skipped
+and reported as rate limited instead of adding to the pressure.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+import logging
+import threading
+from typing import Callable, Iterable, Sequence
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.app.core.config import settings
+from backend.app.models.google_business.gbp_connection import GbpConnection
+from backend.app.models.google_business.location import Location
+from backend.app.services.google_business.gbp_connections import GbpConnectionService
+from backend.app.services.google_business.gbp_sync_engine import GbpSyncEngine, SyncListener
+from backend.app.services.google_business.google import GoogleBusinessClient, GoogleOAuthService
+from backend.app.services.operations.rate_limits import RateLimitError
+
+logger = logging.getLogger(__name__)
+
+SYNC_RESOURCES: tuple[str, ...] = ("reviews", "posts", "media")
+
+_account_slots: dict[str, threading.BoundedSemaphore] = {}
+_account_slots_lock = threading.Lock()
+
+
+@dataclass
+class LocationSyncOutcome:
+    location_id: uuid.UUID
+    counts: dict[str, int] = field(default_factory=dict)
+    error: str | None = None
+    retry_after_seconds: int | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def account_key(connection: GbpConnection) -> str:
+    """The Google account a connection authenticates as; organizations may share one."""
+    return (
+        connection.account_resource_name
+        or (connection.google_account_email or "").lower()
+        or f"org:{connection.organization_id}"
+    )
+
+
+def account_slots(key: str, limit: int) -> threading.BoundedSemaphore:
+    """The process-wide semaphore capping concurrent location syncs of account `key`.
+
+    The first caller's `limit` sizes it; later callers share it as is.
+    """
+    with _account_slots_lock:
+        slots = _account_slots.get(key)
+        if slots is None:
+            slots = _account_slots[key] = threading.BoundedSemaphore(max(limit, 1))
+        return slots
+
+
+class GbpSyncCoordinator:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        *,
+        max_concurrency: int | None = None,
+        max_workers: int | None = None,
+        listeners: Sequence[SyncListener] = (),
+    ) -> None:
+        self.session_factory = session_factory
+        self.max_concurrency = max_concurrency or settings.GBP_SYNC_MAX_CONCURRENCY_PER_ACCOUNT
+        self.max_workers = max_workers or settings.GBP_SYNC_MAX_WORKERS
+        self.listeners = list(listeners)
+        self.oauth = GoogleOAuthService()
+
+    def sync_locations(
+        self,
+        organization_id: uuid.UUID,
+        location_ids: Iterable[uuid.UUID] | None = None,
+        *,
+        resources: Sequence[str] = SYNC_RESOURCES,
+    ) -> list[LocationSyncOutcome]:
+        """Sync `resources` for the locations (default: every linked one), in the given order.
+
+        One location's failure is recorded in its outcome and does not stop the others.
+        """
+        unknown = set(resources) - set(SYNC_RESOURCES)
+        if unknown:
+            raise ValueError(f"Unknown GBP sync resources: {sorted(unknown)}")
+        with self.session_factory() as db:
+            connections = GbpConnectionService(db)
+            connection = connections.get_by_org(organization_id)
+            if not connection:
+                raise ValueError("Organization does not have a GBP connection")
+            token = connections.ensure_access_token(connection, refresh_callback=self.oauth.refresh_access_token)
+            key = account_key(connection)
+            query = select(Location.id).where(
+                Location.organization_id == organization_id, Location.google_location_id.is_not(None)
+            )
+            if location_ids is not None:
+                requested = list(dict.fromkeys(location_ids))
+                linked = set(db.scalars(query.where(Location.id.in_(requested))))
+                ids = [location_id for location_id in requested if location_id in linked]
+            else:
+                ids = list(db.scalars(query.order_by(Location.name, Location.id)))
+        if not ids:
+            return []
+        slots = account_slots(key, self.max_concurrency)
+        throttled = threading.Event()
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, self.max_concurrency, len(ids)), thread_name_prefix="gbp-sync"
+        ) as pool:
+            return list(
+                pool.map(lambda location_id: self._sync_location(location_id, token, resources, slots, throttled), ids)
+            )
+
+    def _sync_location(
+        self,
+        location_id: uuid.UUID,
+        token: str,
+        resources: Sequence[str],
+        slots: threading.BoundedSemaphore,
+        throttled: threading.Event,
+    ) -> LocationSyncOutcome:
+        outcome = LocationSyncOutcome(location_id)
+        with slots:
+            if throttled.is_set():
+                outcome.error = "rate_limited"
+                return outcome
+            client = GoogleBusinessClient(token)
+            with self.session_factory() as db:
+                engine = GbpSyncEngine(db, listeners=self.listeners)
+                location = db.get(Location, location_id)
+                for resource in resources:
+                    try:
+                        result = getattr(engine, f"sync_{resource}")(client, location)
+                    except RateLimitError as exc:
+                        db.rollback()
+                        throttled.set()
+                        outcome.error = "rate_limited"
+                        outcome.retry_after_seconds = exc.retry_after_seconds
+                        break
+                    except Exception as exc:  # noqa: BLE001
+                        db.rollback()
+                        logger.exception("GBP sync failed location=%s resource=%s", location_id, resource)
+                        outcome.error = f"{resource}: {exc}"
+                        break
+                    outcome.counts[resource] = result.written
+        return outcome
@@ -0,0 +1,113 @@
+"""Single-flight refresh of GBP OAuth access tokens across threads and workers.
+
+Callers serialize on a per-connection lock before refreshing and re-read the connection
+once they hold it, so a burst of actions for one connection triggers one refresh and the
+rest reuse its result. The lock is a transaction-scoped Postgres advisory lock (released
+by the commit that stores the new token), a Redis lock when `GBP_TOKEN_REFRESH_LOCK` is
+"redis", or a process-local lock on other databases. Decrypted tokens are cached briefly
+per process, keyed by their ciphertext so a rotated token is never served from the cache.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+import threading
+import time
+from typing import Iterator
+import uuid
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from backend.app.core.config import settings
+
+LOCK_NAMESPACE = "gbp:token-refresh"
+
+
+class TokenCache:
+    def __init__(self, ttl_seconds: float) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[uuid.UUID, tuple[str, str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, connection_id: uuid.UUID, ciphertext: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(connection_id)
+        if entry is None:
+            return None
+        cached_ciphertext, token, cached_at = entry
+        if cached_ciphertext != ciphertext or time.monotonic() - cached_at > self.ttl_seconds:
+            return None
+        return token
+
+    def put(self, connection_id: uuid.UUID, ciphertext: str, token: str) -> None:
+        with self._lock:
+            self._entries[connection_id] = (ciphertext, token, time.monotonic())
+
+    def discard(self, connection_id: uuid.UUID) -> None:
+        with self._lock:
+            self._entries.pop(connection_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+token_cache = TokenCache(settings.GBP_TOKEN_CACHE_SECONDS)
+
+_local_locks: dict[uuid.UUID, threading.Lock] = {}
+_local_locks_guard = threading.Lock()
+
+
+def advisory_key(connection_id: uuid.UUID) -> int:
+    """Signed 64-bit advisory lock key for a connection."""
+    value = connection_id.int >> 64
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+@contextmanager
+def refresh_lock(db: Session, connection_id: uuid.UUID, *, blocking: bool = True) -> Iterator[bool]:
+    """Hold the connection's refresh lock; yields False when not blocking and it is taken.
+
+    The Postgres lock belongs to the session's transaction, so it is released by the
+    caller's commit or rollback rather than on leaving this block.
+    """
+    if settings.GBP_TOKEN_REFRESH_LOCK == "redis":
+        with _redis_lock(connection_id, blocking=blocking) as acquired:
+            yield acquired
+        return
+    bind = db.get_bind()
+    if bind is not None and bind.dialect.name == "postgresql":
+        function = "pg_advisory_xact_lock" if blocking else "pg_try_advisory_xact_lock"
+        result = db.execute(text(f"SELECT {function}(:key)"), {"key": advisory_key(connection_id)}).scalar()
+        yield True if blocking else bool(result)
+        return
+    with _local_lock(connection_id, blocking=blocking) as acquired:
+        yield acquired
+
+
+@contextmanager
+def _local_lock(connection_id: uuid.UUID, *, blocking: bool) -> Iterator[bool]:
+    with _local_locks_guard:
+        lock = _local_locks.setdefault(connection_id, threading.Lock())
+    acquired = lock.acquire(blocking=blocking)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            lock.release()
+
+
+@contextmanager
+def _redis_lock(connection_id: uuid.UUID, *, blocking: bool) -> Iterator[bool]:
+    import redis
+
+    client = redis.Redis.from_url(settings.REDIS_URL)
+    # The timeout outlives a slow token exchange but frees the lock if a worker dies holding it.
+    lock = client.lock(f"{LOCK_NAMESPACE}:{connection_id}", timeout=60)
+    acquired = bool(lock.acquire(blocking=blocking))
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            lock.release()
@@ -0,0 +1,178 @@
+"""Shared HTTP transport for Google Business Profile and Google OAuth requests.
+
+One pooled `httpx.Client` per process keeps connections (and TLS sessions) alive across
+requests, negotiating HTTP/2 when the `h2` package is installed. Throttled and transient
+failures are retried with jittered exponential backoff that honors `Retry-After`; a wait
+longer than the backoff cap is not slept through but handed back to the caller, which
+maps a final 429 to `RateLimitError` so the job is rescheduled instead of blocking a worker.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Callable
+
+import httpx
+
+from backend.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover
+    HTTP2_AVAILABLE = False
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Per endpoint class: reads are small and should fail fast, writes (posts, replies) and
+# media listings may take longer on Google's side, token exchanges are small but critical.
+TIMEOUTS = {
+    "read": httpx.Timeout(15.0, connect=5.0),
+    "media": httpx.Timeout(30.0, connect=5.0),
+    "write": httpx.Timeout(30.0, connect=5.0),
+    "oauth": httpx.Timeout(20.0, connect=5.0),
+}
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+
+    def backoff(self, attempt: int, rng: random.Random) -> float:
+        """Full-jitter exponential delay before retry number `attempt` (1-based)."""
+        return rng.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+    @staticmethod
+    def from_settings() -> "RetryPolicy":
+        return RetryPolicy(
+            max_attempts=settings.GBP_HTTP_MAX_ATTEMPTS,
+            base_delay=settings.GBP_HTTP_BACKOFF_BASE_SECONDS,
+            max_delay=settings.GBP_HTTP_BACKOFF_MAX_SECONDS,
+        )
+
+
+def retry_after_seconds(response: httpx.Response) -> float | None:
+    """The response's `Retry-After` in seconds (delta-seconds or HTTP date), if present."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class GbpTransport:
+    def __init__(
+        self,
+        *,
+        policy: RetryPolicy | None = None,
+        transport: httpx.BaseTransport | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: random.Random | None = None,
+    ) -> None:
+        self.policy = policy or RetryPolicy.from_settings()
+        self.sleep = sleep
+        self.rng = rng or random.Random()
+        self.client = httpx.Client(
+            http2=HTTP2_AVAILABLE and transport is None,
+            transport=transport,
+            timeout=TIMEOUTS["read"],
+            limits=httpx.Limits(
+                max_connections=settings.GBP_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.GBP_HTTP_MAX_CONNECTIONS,
+                keepalive_expiry=60.0,
+            ),
+        )
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        endpoint_class: str = "read",
+        idempotent: bool | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send with retries and return the last response; callers map error statuses.
+
+        429 is always retried (the request was rejected unprocessed). 5xx and read timeouts
+        are only retried for idempotent requests (GET by default), and connection failures
+        for any request, since nothing reached the server.
+        """
+        if idempotent is None:
+            idempotent = method.upper() == "GET"
+        timeout = TIMEOUTS.get(endpoint_class, TIMEOUTS["read"])
+        attempt = 1
+        while True:
+            try:
+                response = self.client.request(method, url, timeout=timeout, **kwargs)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as exc:
+                if attempt >= self.policy.max_attempts:
+                    raise
+                self._wait(attempt, None, url=url, reason=type(exc).__name__)
+            except httpx.TimeoutException as exc:
+                if not idempotent or attempt >= self.policy.max_attempts:
+                    raise
+                self._wait(attempt, None, url=url, reason=type(exc).__name__)
+            else:
+                retryable = response.status_code == 429 or (idempotent and response.status_code in RETRY_STATUSES)
+                if not retryable or attempt >= self.policy.max_attempts:
+                    return response
+                retry_after = retry_after_seconds(response)
+                if retry_after is not None and retry_after > self.policy.max_delay:
+                    return response
+                response.close()
+                self._wait(attempt, retry_after, url=url, reason=str(response.status_code))
+            attempt += 1
+
+    def close(self) -> None:
+        self.client.close()
+
+    def _wait(self, attempt: int, retry_after: float | None, *, url: str, reason: str) -> None:
+        delay = retry_after if retry_after is not None else self.policy.backoff(attempt, self.rng)
+        logger.info("Retrying Google API request reason=%s attempt=%s delay=%.2fs url=%s", reason, attempt, delay, url)
+        self.sleep(delay)
+
+
+_transport: GbpTransport | None = None
+_transport_pid: int | None = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> GbpTransport:
+    """The process-wide transport; recreated after a fork so workers never share sockets."""
+    global _transport, _transport_pid
+    with _transport_lock:
+        if _transport is None or _transport_pid != os.getpid():
+            _transport = GbpTransport()
+            _transport_pid = os.getpid()
+        return _transport
+
+
+def set_transport(transport: GbpTransport | None) -> None:
+    """Replace (or with None, drop) the process-wide transport, closing the previous one."""
+    global _transport, _transport_pid
+    with _transport_lock:
+        if _transport is not None and _transport is not transport and _transport_pid == os.getpid():
+            _transport.close()
+        _transport = transport
+        _transport_pid = os.getpid() if transport is not None else None
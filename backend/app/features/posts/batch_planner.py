@@ -0,0 +1,901 @@
+"""Batch planning of the content horizon for many locations at once.
+
+`ContentPlannerService.plan_horizon` plans one location a day at a time, and every day
+re-reads signals, settings, post history, rotation memory and window stats and commits
+several times. `BatchContentPlanner` loads all of that once for every location and the
+whole horizon, plans each day in memory (later days see the posts planned for earlier
+ones), and writes candidates, plans, posts, jobs and their executor actions in a single
+transaction with bulk inserts. `dry_run=True` returns the planned horizon without writing.
+
+Captions go through the composer's completion cache, so repeated prompts across the
+horizon share one multi-choice request, and through the same embedding near-duplicate
+check as the per-post path (both fall back to templates without an OpenAI key). Days that
+would break a posting-safety rule are reported as skipped instead of aborting the run.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any, Sequence
+import uuid
+
+from sqlalchemy import func, insert, or_, select, update
+from sqlalchemy.orm import Session, selectinload
+
+from backend.app.core.config import settings
+from backend.app.models.automation.approval_request import ApprovalRequest
+from backend.app.models.content.brand_voice import BrandVoice
+from backend.app.models.content.content_plan import ContentPlan
+from backend.app.models.content.daily_signal import DailySignal
+from backend.app.models.enums import (
+    ActionType,
+    AlertSeverity,
+    ApprovalCategory,
+    ContentPlanStatus,
+    PostJobStatus,
+    PostStatus,
+    PostType,
+)
+from backend.app.models.google_business.location import Location
+from backend.app.models.identity.organization import Organization
+from backend.app.models.media.media_asset import MediaAsset
+from backend.app.models.operations.audit_log import AuditLog
+from backend.app.models.posts.post import Post
+from backend.app.models.posts.post_candidate import PostCandidate
+from backend.app.models.posts.post_job import PostJob
+from backend.app.models.posts.post_minhash_band import PostMinhashBand
+from backend.app.models.posts.post_rotation_state import PostRotationState
+from backend.app.models.posts.post_variant import PostVariant
+from backend.app.models.rank_tracking.gbp_post_keyword_mapping import GbpPostKeywordMapping
+from backend.app.services.content.captions import CaptionGenerator
+from backend.app.services.content.content_guardrails import ContentGuardrails
+from backend.app.services.posts.content_reuse import MIN_BAND_MATCHES, band_keys, minhash_signature, normalize_text
+from backend.app.services.posts.post_embeddings import cosine_similarity
+from backend.app.services.posts.post_candidates import (
+    BUCKETS,
+    COVERAGE_WINDOW_DAYS,
+    CandidateContext,
+    PostCandidateService,
+)
+from backend.app.services.posts.post_composition import ANGLES, CTAS, PostCompositionService
+from backend.app.services.posts.post_scheduler import resolve_window_datetime
+from backend.app.services.posts.posting_safety import PostingSafetyService
+from backend.app.services.posts.posting_windows import PostingWindowService
+from backend.app.services.posts.posts import PostService
+from backend.app.services.posts.rotation import RotationEngine, fold_uses, last_used_map
+from backend.app.services.media.media_selection import MediaSelector
+from backend.app.services.shared.dates import as_utc, day_start
+from backend.app.services.shared.settings import SettingsService
+
+# How far back composed captions are compared for repetition (matches PostCompositionService).
+RECENT_TEXT_DAYS = 60
+SIMILAR_EMBEDDING_DAYS = 45
+SIMILAR_EMBEDDING_THRESHOLD = 0.90
+ROTATION_KEYS = ("service", "angle", "cta")
+MEDIA_COLUMNS = (
+    MediaAsset.id,
+    MediaAsset.location_id,
+    MediaAsset.source,
+    MediaAsset.categories,
+    MediaAsset.description,
+    MediaAsset.file_name,
+    MediaAsset.metadata_json,
+    MediaAsset.job_type,
+    MediaAsset.season,
+    MediaAsset.shot_stage,
+    MediaAsset.last_used_at,
+    MediaAsset.usage_count,
+    MediaAsset.created_at,
+)
+
+
+@dataclass
+class PlannedPost:
+    organization_id: uuid.UUID
+    location_id: uuid.UUID
+    target_date: date
+    bucket: str
+    score: float
+    window_id: str
+    scheduled_at: datetime
+    post_type: PostType
+    caption: str
+    fingerprint: str
+    service: str
+    angle: str
+    cta: str
+    media_asset_id: uuid.UUID | None
+    variants: list[dict[str, Any]]
+    plan_reasons: dict[str, Any]
+    reasons: dict[str, Any]
+    keyword_mapping_id: uuid.UUID | None = None
+    # Pricing or discount language: saved as a draft with an approval request instead of a job.
+    requires_approval: bool = False
+    plan_id: uuid.UUID = field(default_factory=uuid.uuid4)
+    candidate_id: uuid.UUID = field(default_factory=uuid.uuid4)
+    post_id: uuid.UUID = field(default_factory=uuid.uuid4)
+    job_id: uuid.UUID = field(default_factory=uuid.uuid4)
+    approval_id: uuid.UUID = field(default_factory=uuid.uuid4)
+
+    @property
+    def dedupe_key(self) -> str:
+        return f"plan:{self.plan_id}:{self.scheduled_at.isoformat()}"
+
+
+@dataclass(frozen=True)
+class SkippedDay:
+    location_id: uuid.UUID
+    target_date: date
+    reason: str
+
+
+@dataclass
+class HorizonPlan:
+    dry_run: bool
+    planned: list[PlannedPost] = field(default_factory=list)
+    skipped: list[SkippedDay] = field(default_factory=list)
+
+
+@dataclass
+class _PriorPost:
+    body: str
+    fingerprint: str | None
+    created_at: datetime
+    active: bool
+    bands: frozenset[int] | None
+    embedding: list[float] | None = None
+
+
+@dataclass
+class _LocationState:
+    location: Location
+    settings: dict[str, Any]
+    offers: list[dict[str, Any]]
+    events: list[dict[str, Any]]
+    paused: bool
+    cap: int | None
+    signals: list[DailySignal] = field(default_factory=list)
+    planned_dates: set[date] = field(default_factory=set)
+    published: list[tuple[str, datetime]] = field(default_factory=list)
+    performance: list[Any] = field(default_factory=list)
+    mappings: dict[date, GbpPostKeywordMapping] = field(default_factory=dict)
+    # Loaded (counts, recent) per rotation key, and each value's last use including planned posts.
+    rotation_states: dict[str, tuple[dict[str, int], list[list[str]]]] = field(default_factory=dict)
+    rotation: dict[str, dict[str, datetime]] = field(default_factory=lambda: defaultdict(dict))
+    window_stats: dict[str, Any] = field(default_factory=dict)
+    assets: list[SimpleNamespace] = field(default_factory=list)
+    scheduled: list[tuple[datetime, str | None]] = field(default_factory=list)
+    prior_posts: list[_PriorPost] = field(default_factory=list)
+
+    def signal_for(self, target_date: date) -> DailySignal | None:
+        eligible = [signal for signal in self.signals if signal.signal_date <= target_date]
+        return eligible[-1] if eligible else None
+
+
+class BatchContentPlanner:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+        self.settings = SettingsService(db)
+        self.candidates = PostCandidateService(db)
+        self.composer = PostCompositionService(db)
+        self.windows = PostingWindowService(db)
+        self.rotation = RotationEngine(db)
+        self.media = MediaSelector(db)
+        self.guardrails = ContentGuardrails()
+
+    def plan(
+        self,
+        *,
+        organization_id: uuid.UUID,
+        locations: Sequence[Location],
+        horizon_days: int = 14,
+        dry_run: bool = False,
+        threshold: float = 25,
+    ) -> HorizonPlan:
+        now = datetime.now(timezone.utc)
+        dates = [now.date() + timedelta(days=offset) for offset in range(horizon_days)]
+        result = HorizonPlan(dry_run=dry_run)
+        if not locations or not dates:
+            return result
+        states = self._load(organization_id, [location.id for location in locations], dates, now, dry_run=dry_run)
+        voice = self.db.query(BrandVoice).filter(BrandVoice.organization_id == organization_id).one_or_none()
+        disconnected: set[uuid.UUID] = set()
+        for state in states:
+            for target_date in dates:
+                outcome = self._plan_day(state, target_date, now=now, voice=voice, threshold=threshold)
+                if isinstance(outcome, PlannedPost):
+                    result.planned.append(outcome)
+                elif outcome is not None:
+                    result.skipped.append(SkippedDay(state.location.id, target_date, outcome))
+                    if outcome == "gbp_disconnected":
+                        disconnected.add(state.location.id)
+        self._drop_existing_fingerprints(organization_id, result)
+        if not dry_run:
+            if result.planned:
+                self._persist(result, states={state.location.id: state for state in states}, now=now)
+            for location_id in sorted(disconnected, key=str):
+                self.candidates.alerts.create_alert(
+                    severity=AlertSeverity.WARNING,
+                    alert_type="gbp_disconnected",
+                    message="GBP connection lost",
+                    organization_id=organization_id,
+                    location_id=location_id,
+                )
+        return result
+
+    def _load(
+        self,
+        organization_id: uuid.UUID,
+        location_ids: list[uuid.UUID],
+        dates: list[date],
+        now: datetime,
+        *,
+        dry_run: bool,
+    ) -> list[_LocationState]:
+        horizon_start, horizon_end = dates[0], dates[-1]
+        organization = self.db.get(Organization, organization_id)
+        locations = {
+            location.id: location
+            for location in self.db.query(Location)
+            .options(selectinload(Location.settings))
+            .filter(Location.organization_id == organization_id, Location.id.in_(location_ids))
+        }
+        merged = self.settings.merged_many(organization_id, list(locations))
+        states: dict[uuid.UUID, _LocationState] = {}
+        for location_id in location_ids:
+            location = locations.get(location_id)
+            if location is None:
+                continue
+            states[location_id] = _LocationState(
+                location=location,
+                settings=merged[location_id],
+                offers=SettingsService.offers_in(merged[location_id]),
+                events=SettingsService.events_in(merged[location_id]),
+                paused=bool(
+                    settings.GLOBAL_POSTING_PAUSE
+                    or (organization and organization.posting_paused)
+                    or location.posting_paused
+                ),
+                cap=PostingSafetyService.resolve_cap(org=organization, location=location),
+            )
+        ids = list(states)
+        if not ids:
+            return []
+
+        for location_id, target_date in self.db.query(ContentPlan.location_id, ContentPlan.target_date).filter(
+            ContentPlan.location_id.in_(ids),
+            ContentPlan.target_date >= horizon_start,
+            ContentPlan.target_date <= horizon_end,
+        ):
+            states[location_id].planned_dates.add(target_date)
+
+        self._load_signals(organization_id, states, horizon_start, horizon_end, dry_run=dry_run)
+
+        bucket_ids = [bucket["id"] for bucket in BUCKETS]
+        lookback_days = max([COVERAGE_WINDOW_DAYS, *(bucket["cooldown_days"] for bucket in BUCKETS)])
+        for location_id, bucket, published_at in self.db.query(Post.location_id, Post.bucket, Post.published_at).filter(
+            Post.location_id.in_(ids),
+            Post.bucket.in_(bucket_ids),
+            Post.published_at >= day_start(horizon_start - timedelta(days=lookback_days)),
+        ):
+            states[location_id].published.append((bucket, published_at))
+
+        records = self.candidates.bucket_perf.records_by_location(
+            organization_id=organization_id, location_ids=ids, buckets=bucket_ids
+        )
+        for location_id, location_records in records.items():
+            states[location_id].performance = location_records
+
+        mappings = (
+            self.db.query(GbpPostKeywordMapping)
+            .filter(
+                GbpPostKeywordMapping.organization_id == organization_id,
+                GbpPostKeywordMapping.location_id.in_(ids),
+                GbpPostKeywordMapping.publish_date >= horizon_start,
+                GbpPostKeywordMapping.publish_date <= horizon_end,
+                GbpPostKeywordMapping.status.in_(["planned", "queued"]),
+            )
+            .order_by(GbpPostKeywordMapping.created_at.asc())
+            .all()
+        )
+        for mapping in mappings:
+            states[mapping.location_id].mappings.setdefault(mapping.publish_date, mapping)
+
+        for rotation in self.db.query(PostRotationState).filter(
+            PostRotationState.location_id.in_(ids),
+            PostRotationState.key.in_(ROTATION_KEYS),
+        ):
+            state = states[rotation.location_id]
+            state.rotation_states[rotation.key] = (dict(rotation.counts or {}), list(rotation.recent or []))
+            state.rotation[rotation.key] = last_used_map(rotation.recent)
+
+        for location_id, stats in self.windows.selector.load_stats(ids).items():
+            states[location_id].window_stats = dict(stats)
+
+        # Plain copies, so usage recorded while planning never dirties session objects.
+        for row in self.db.query(*MEDIA_COLUMNS).filter(MediaAsset.location_id.in_(ids)):
+            states[row.location_id].assets.append(SimpleNamespace(**row._asdict()))
+
+        history_start = now - timedelta(days=PostingSafetyService.CONTENT_REUSE_COOLDOWN_DAYS)
+        slot_start = day_start(horizon_start) - timedelta(days=PostingSafetyService.BUCKET_COOLDOWN_DAYS)
+        posts = self.db.query(
+            Post.location_id,
+            Post.status,
+            Post.bucket,
+            Post.body,
+            Post.fingerprint,
+            Post.minhash_signature,
+            Post.scheduled_at,
+            Post.created_at,
+        ).filter(
+            Post.location_id.in_(ids),
+            or_(Post.created_at >= history_start, Post.scheduled_at >= slot_start),
+        )
+        for row in posts:
+            state = states[row.location_id]
+            active = row.status in PostingSafetyService.ACTIVE_STATUSES
+            if active and row.scheduled_at is not None:
+                state.scheduled.append((row.scheduled_at, row.bucket))
+            if row.body:
+                state.prior_posts.append(
+                    _PriorPost(
+                        body=row.body,
+                        fingerprint=row.fingerprint,
+                        created_at=as_utc(row.created_at),
+                        active=active,
+                        bands=frozenset(band_keys(row.minhash_signature)) if row.minhash_signature else None,
+                    )
+                )
+        return [states[location_id] for location_id in ids]
+
+    def _load_signals(
+        self,
+        organization_id: uuid.UUID,
+        states: dict[uuid.UUID, _LocationState],
+        horizon_start: date,
+        horizon_end: date,
+        *,
+        dry_run: bool,
+    ) -> None:
+        """The latest signal on or before the horizon start plus any dated inside the horizon."""
+        latest = (
+            select(DailySignal.location_id, func.max(DailySignal.signal_date).label("signal_date"))
+            .where(
+                DailySignal.organization_id == organization_id,
+                DailySignal.location_id.in_(list(states)),
+                DailySignal.signal_date <= horizon_start,
+            )
+            .group_by(DailySignal.location_id)
+            .subquery()
+        )
+        signals = (
+            self.db.query(DailySignal)
+            .join(latest, DailySignal.location_id == latest.c.location_id)
+            .filter(
+                DailySignal.organization_id == organization_id,
+                DailySignal.signal_date >= latest.c.signal_date,
+                DailySignal.signal_date <= horizon_end,
+            )
+            .order_by(DailySignal.signal_date.asc())
+            .all()
+        )
+        for signal in signals:
+            states[signal.location_id].signals.append(signal)
+        if dry_run:
+            return
+        for state in states.values():
+            if not state.signals and not state.paused:
+                # Same fallback as PostCandidateService.generate; only new locations hit it.
+                state.signals.append(
+                    self.candidates.daily_signals.compute(
+                        organization_id=organization_id,
+                        location_id=state.location.id,
+                        target_date=horizon_start,
+                    )
+                )
+
+    def _plan_day(
+        self,
+        state: _LocationState,
+        target_date: date,
+        *,
+        now: datetime,
+        voice: BrandVoice | None,
+        threshold: float,
+    ) -> PlannedPost | str | None:
+        """A planned post, the reason the day was skipped, or None when it already has a plan."""
+        if target_date in state.planned_dates:
+            return None
+        if state.paused:
+            return "posting_paused"
+        signal = state.signal_for(target_date)
+        if signal is None:
+            return "missing_signal"
+        if not (signal.extra_metrics or {}).get("gbp_connection_ok", True):
+            return "gbp_disconnected"
+        location = state.location
+        bucket_ids = [bucket["id"] for bucket in BUCKETS]
+        context = CandidateContext.from_history(
+            target_date=target_date,
+            published=state.published,
+            performance=self.candidates.bucket_perf.scores_from(
+                state.performance, buckets=bucket_ids, as_of=day_start(target_date)
+            ),
+        )
+        mapping = state.mappings.get(target_date)
+        selection = self.candidates.select_bucket(
+            signal=signal,
+            location=location,
+            settings=state.settings,
+            verified_offers=state.offers,
+            verified_events=state.events,
+            planned_mapping=mapping,
+            context=context,
+            threshold=threshold,
+        )
+        if not selection:
+            return "below_threshold"
+
+        timezone_name = location.timezone or "UTC"
+        window = self.windows.choose_from_stats(
+            state.window_stats,
+            business_hours=state.settings.get("business_hours"),
+            timezone_name=location.timezone,
+            target_date=target_date,
+        )
+        scheduled_at = resolve_window_datetime(target_date, window["id"], timezone_name)
+        violation = PostingSafetyService.slot_violation(
+            state.scheduled, target_time=scheduled_at, bucket=selection.bucket, cap=state.cap
+        )
+        if violation:
+            return violation
+
+        # A transient candidate (never added to the session) lets the composer's helpers run as-is.
+        candidate = PostCandidate(
+            organization_id=location.organization_id,
+            location_id=location.id,
+            candidate_date=target_date,
+            bucket=selection.bucket,
+            reason_json=selection.reasons,
+        )
+        candidate.location = location
+        post_type = self.composer.choose_post_type(candidate, offers=state.offers, events=state.events)
+        service_name = self._rotate(state, "service", self.composer.service_candidates(candidate), now)
+        angle = self._rotate(state, "angle", ANGLES, now)
+        cta = self._rotate(state, "cta", CTAS, now)
+        media = self.media.choose_asset(
+            state.assets,
+            service=service_name,
+            theme=angle,
+            prefer_upload=True,
+            min_reuse_gap_days=int(state.settings.get("photo_reuse_gap_days", 14)),
+        )
+        raw_keyword = selection.reasons.get("target_keyword")
+        focus_keyword = raw_keyword.strip() if isinstance(raw_keyword, str) and raw_keyword.strip() else None
+        caption_inputs = {
+            "business_name": location.name,
+            "category": self.composer.location_category(candidate),
+            "service_name": service_name,
+            "location_text": self.composer.location_text(candidate),
+            "seasonal_hint": self.composer.seasonal_hint(target_date),
+            "angle": angle,
+            "tone": self.composer.voice_tone(voice, state.settings),
+            "cta": cta,
+            "offer_context": state.offers[0] if state.offers else None,
+            "event_context": state.events[0] if state.events else None,
+            "focus_keyword": focus_keyword,
+        }
+        generated = self.composer.generate_caption(
+            post_type=post_type,
+            media_tags=list(media.categories or []) if media else [],
+            variant_index=target_date.toordinal(),
+            **caption_inputs,
+        )
+        caption = self.composer.inject_focus_keyword(
+            generated or self.composer.fallback_caption(post_type=post_type, **caption_inputs), focus_keyword
+        )
+        errors = self._guardrail_errors(state, caption, post_type, caption_inputs, now=now)
+        if errors:
+            post_type = PostType.UPDATE
+            caption = self.composer.fallback_caption(post_type=post_type, **caption_inputs)
+            errors = self._guardrail_errors(state, caption, post_type, caption_inputs, now=now)
+            if errors:
+                return f"guardrails:{','.join(errors)}"
+
+        normalized = normalize_text(caption)
+        fingerprint = self.composer.fingerprint(caption)
+        reuse_cutoff = scheduled_at - timedelta(days=PostingSafetyService.CONTENT_REUSE_COOLDOWN_DAYS)
+        for prior in self._reuse_candidates(state, caption):
+            if not prior.active or prior.created_at < reuse_cutoff:
+                continue
+            violation = PostingSafetyService.reuse_violation(normalized, fingerprint, prior.body, prior.fingerprint)
+            if violation:
+                return violation
+        embedding = self.composer.embedding(caption)
+        if self._embedding_matches_recent(state, embedding, now=now):
+            return "Caption too similar to recent content"
+        generator = CaptionGenerator(
+            {"tone": state.settings.get("tone_of_voice")},
+            banned_phrases=state.settings["banned_phrases"],
+            completions=self.composer.completions,
+        )
+        variants = generator.generate_variants(
+            base_prompt=caption, services=[], keywords=[], locations=[], post_type=post_type
+        )
+        if any(variant["compliance_flags"].get("banned_phrases") for variant in variants):
+            return "Caption contains banned or profane language"
+
+        reasons = dict(selection.reasons)
+        reasons.update(
+            {
+                "post_type": post_type.value,
+                "angle": angle,
+                "service": service_name,
+                "cta": cta,
+                "tone": caption_inputs["tone"],
+                "location_text": caption_inputs["location_text"],
+                "business_category": caption_inputs["category"],
+                "photo_source": media.source if media else None,
+                "photo_id": str(media.id) if media else None,
+                "offer_context": caption_inputs["offer_context"],
+                "event_context": caption_inputs["event_context"],
+            }
+        )
+        if embedding:
+            reasons["embedding"] = embedding
+        planned = PlannedPost(
+            organization_id=location.organization_id,
+            location_id=location.id,
+            target_date=target_date,
+            bucket=selection.bucket,
+            score=selection.score,
+            window_id=window["id"],
+            scheduled_at=scheduled_at,
+            post_type=post_type,
+            caption=caption,
+            fingerprint=fingerprint,
+            service=service_name,
+            angle=angle,
+            cta=cta,
+            media_asset_id=media.id if media else None,
+            variants=variants,
+            plan_reasons=selection.reasons,
+            reasons=reasons,
+            keyword_mapping_id=mapping.id if mapping else None,
+            requires_approval=PostService.requires_pricing_approval(caption),
+        )
+
+        # Later days of this location see the post exactly as the sequential planner would.
+        # Planned posts also count as bucket history, so later days score other buckets first.
+        state.planned_dates.add(target_date)
+        state.scheduled.append((scheduled_at, selection.bucket))
+        state.published.append((selection.bucket, scheduled_at))
+        signature = minhash_signature(caption)
+        state.prior_posts.append(
+            _PriorPost(
+                body=caption,
+                fingerprint=fingerprint,
+                created_at=now,
+                active=True,
+                bands=frozenset(band_keys(signature)) if signature else None,
+                embedding=embedding,
+            )
+        )
+        for key, value in (("service", service_name), ("angle", angle), ("cta", cta)):
+            state.rotation[key][value] = now
+        if media:
+            media.last_used_at = now
+            media.usage_count = int(media.usage_count or 0) + 1
+        if mapping:
+            state.mappings.pop(target_date, None)
+        return planned
+
+    def _rotate(self, state: _LocationState, key: str, candidates: Sequence[str], now: datetime) -> str:
+        return self.rotation.pick(state.rotation[key], candidates, now=now) or candidates[0]
+
+    def _guardrail_errors(
+        self,
+        state: _LocationState,
+        caption: str,
+        post_type: PostType,
+        inputs: dict[str, Any],
+        *,
+        now: datetime,
+    ) -> list[str]:
+        cutoff = now - timedelta(days=RECENT_TEXT_DAYS)
+        recent = [prior.body for prior in self._reuse_candidates(state, caption) if prior.created_at >= cutoff]
+        errors = self.guardrails.validate(
+            caption,
+            post_type=post_type,
+            service=inputs["service_name"],
+            location=inputs["location_text"],
+            has_verified_offer=bool(state.offers),
+            has_verified_event=bool(state.events),
+            recent_texts=recent,
+            require_cta=True,
+        )
+        return errors
+
+    def _embedding_matches_recent(
+        self, state: _LocationState, embedding: list[float] | None, *, now: datetime
+    ) -> bool:
+        """PostCompositionService's embedding check, also covering posts planned earlier in this run."""
+        if not embedding:
+            return False
+        for prior in state.prior_posts:
+            if prior.embedding and cosine_similarity(prior.embedding, embedding) >= SIMILAR_EMBEDDING_THRESHOLD:
+                return True
+        return self.composer.embedding_matches_recent(
+            state.location.id,
+            embedding,
+            since=now - timedelta(days=SIMILAR_EMBEDDING_DAYS),
+            threshold=SIMILAR_EMBEDDING_THRESHOLD,
+        )
+
+    @staticmethod
+    def _reuse_candidates(state: _LocationState, text: str) -> list[_PriorPost]:
+        """In-memory equivalent of ContentReuseIndex.candidates over the location's loaded posts."""
+        signature = minhash_signature(text)
+        bands = set(band_keys(signature)) if signature else set()
+        return [
+            prior
+            for prior in state.prior_posts
+            if prior.bands is None or len(bands & prior.bands) >= MIN_BAND_MATCHES
+        ]
+
+    def _drop_existing_fingerprints(self, organization_id: uuid.UUID, result: HorizonPlan) -> None:
+        """PostService.create_post refuses content a location already has; check all planned posts at once."""
+        if not result.planned:
+            return
+        taken = set(
+            self.db.query(Post.location_id, Post.fingerprint).filter(
+                Post.organization_id == organization_id,
+                Post.location_id.in_({planned.location_id for planned in result.planned}),
+                Post.fingerprint.in_({planned.fingerprint for planned in result.planned}),
+            )
+        )
+        if not taken:
+            return
+        kept: list[PlannedPost] = []
+        for planned in result.planned:
+            if (planned.location_id, planned.fingerprint) in taken:
+                result.skipped.append(
+                    SkippedDay(planned.location_id, planned.target_date, "Similar content recently planned; deduped.")
+                )
+            else:
+                kept.append(planned)
+        result.planned = kept
+
+    def _persist(self, result: HorizonPlan, *, states: dict[uuid.UUID, _LocationState], now: datetime) -> None:
+        from backend.app.services.automation.actions import ActionService, ActionSpec
+
+        planned = result.planned
+        queued = [item for item in planned if not item.requires_approval]
+        try:
+            self.db.execute(
+                insert(PostCandidate),
+                [
+                    {
+                        "id": item.candidate_id,
+                        "organization_id": item.organization_id,
+                        "location_id": item.location_id,
+                        "candidate_date": item.target_date,
+                        "bucket": item.bucket,
+                        "score": item.score,
+                        "reason_json": {**item.reasons, "post_id": str(item.post_id)},
+                        "proposed_caption": item.caption,
+                        "media_asset_id": item.media_asset_id,
+                        "status": PostStatus.DRAFT if item.requires_approval else PostStatus.SCHEDULED,
+                        "window_id": item.window_id,
+                        "fingerprint": item.fingerprint,
+                    }
+                    for item in planned
+                ],
+            )
+            self.db.execute(
+                insert(ContentPlan),
+                [
+                    {
+                        "id": item.plan_id,
+                        "organization_id": item.organization_id,
+                        "location_id": item.location_id,
+                        "target_date": item.target_date,
+                        "window_id": item.window_id,
+                        "status": ContentPlanStatus.SELECTED
+                        if item.requires_approval
+                        else ContentPlanStatus.SCHEDULED,
+                        "candidate_id": item.candidate_id,
+                        "reason_json": item.plan_reasons,
+                    }
+                    for item in planned
+                ],
+            )
+            signatures = {item.post_id: minhash_signature(item.caption) for item in planned}
+            self.db.execute(
+                insert(Post),
+                [
+                    {
+                        "id": item.post_id,
+                        "organization_id": item.organization_id,
+                        "location_id": item.location_id,
+                        "connected_account_id": None,
+                        "post_type": item.post_type,
+                        "body": item.caption,
+                        "ai_prompt_context": item.reasons,
+                        "scheduled_at": item.scheduled_at,
+                        "status": PostStatus.DRAFT if item.requires_approval else PostStatus.SCHEDULED,
+                        "bucket": item.bucket,
+                        "topic_tags": [item.service, item.angle],
+                        "media_asset_id": item.media_asset_id,
+                        "window_id": item.window_id,
+                        "fingerprint": item.fingerprint,
+                        "minhash_signature": signatures[item.post_id],
+                    }
+                    for item in planned
+                ],
+            )
+            band_rows = [
+                {"post_id": item.post_id, "band": band, "location_id": item.location_id, "band_key": key}
+                for item in planned
+                if signatures[item.post_id]
+                for band, key in enumerate(band_keys(signatures[item.post_id]))
+            ]
+            if band_rows:
+                self.db.execute(insert(PostMinhashBand.__table__), band_rows)
+            self.composer.embedding_index.add_many(
+                [
+                    (item.organization_id, item.location_id, item.post_id, item.reasons["embedding"])
+                    for item in planned
+                    if item.reasons.get("embedding")
+                ]
+            )
+            self.db.execute(
+                insert(PostVariant),
+                [
+                    {
+                        "tenant_id": item.organization_id,
+                        "post_id": item.post_id,
+                        "body": variant["body"],
+                        "compliance_flags": variant["compliance_flags"],
+                    }
+                    for item in planned
+                    for variant in item.variants
+                ],
+            )
+            if queued:
+                self.db.execute(
+                    insert(PostJob),
+                    [
+                        {
+                            "id": item.job_id,
+                            "organization_id": item.organization_id,
+                            "location_id": item.location_id,
+                            "content_plan_id": item.plan_id,
+                            "dedupe_key": item.dedupe_key,
+                            "status": PostJobStatus.QUEUED,
+                            "run_at": item.scheduled_at,
+                        }
+                        for item in queued
+                    ],
+                )
+            approvals = [
+                {
+                    "id": item.approval_id,
+                    "organization_id": item.organization_id,
+                    "location_id": item.location_id,
+                    "category": ApprovalCategory.GBP_EDIT,
+                    "reason": "Pricing or discount language detected",
+                    "severity": "warning",
+                    "payload": {"post_id": str(item.post_id)},
+                    "before_state": {},
+                    "source_json": {"caption": item.caption},
+                    "proposal_json": {"caption": item.caption},
+                }
+                for item in planned
+                if item.requires_approval
+            ]
+            if approvals:
+                self.db.execute(insert(ApprovalRequest), approvals)
+            uses: dict[tuple[uuid.UUID, str], list[tuple[str, datetime]]] = defaultdict(list)
+            for item in planned:
+                for key, value in (("service", item.service), ("angle", item.angle), ("cta", item.cta)):
+                    uses[(item.location_id, key)].append((value, now))
+            rotation_rows = []
+            for (location_id, key), key_uses in uses.items():
+                counts, recent = states[location_id].rotation_states.get(key, ({}, []))
+                counts, recent = fold_uses(counts, recent, key_uses)
+                rotation_rows.append(
+                    {
+                        "organization_id": states[location_id].location.organization_id,
+                        "location_id": location_id,
+                        "key": key,
+                        "counts": counts,
+                        "recent": recent,
+                    }
+                )
+            self.rotation.record_many(rotation_rows)
+            mapping_rows = [
+                {"id": item.keyword_mapping_id, "post_candidate_id": item.candidate_id, "status": "scheduled"}
+                for item in planned
+                if item.keyword_mapping_id
+            ]
+            if mapping_rows:
+                self.db.execute(update(GbpPostKeywordMapping), mapping_rows)
+            used_assets = {item.media_asset_id for item in planned if item.media_asset_id}
+            media_rows = [
+                {"id": asset.id, "last_used_at": asset.last_used_at, "usage_count": asset.usage_count}
+                for state in states.values()
+                for asset in state.assets
+                if asset.id in used_assets
+            ]
+            if media_rows:
+                self.db.execute(update(MediaAsset), media_rows)
+            self.db.execute(insert(AuditLog), self._audit_rows(planned))
+            # Bulk scheduling commits, so everything above lands in the same transaction.
+            ActionService(self.db).schedule_actions_bulk(
+                [
+                    ActionSpec(
+                        organization_id=item.organization_id,
+                        action_type=ActionType.EXECUTE_POST_JOB,
+                        run_at=item.scheduled_at,
+                        payload={"post_job_id": str(item.job_id)},
+                        location_id=item.location_id,
+                        dedupe_key=f"postjob:{item.job_id}",
+                    )
+                    for item in queued
+                ]
+            )
+        except Exception:
+            self.db.rollback()
+            raise
+
+    @staticmethod
+    def _audit_rows(planned: list[PlannedPost]) -> list[dict[str, Any]]:
+        rows: list[dict[str, Any]] = []
+        for item in planned:
+            base = {"organization_id": item.organization_id, "location_id": item.location_id}
+            rows.append(
+                {
+                    **base,
+                    "action": "plan.created",
+                    "entity_type": "content_plan",
+                    "entity_id": str(item.plan_id),
+                    "metadata_json": {"target_date": str(item.target_date), "candidate_id": str(item.candidate_id)},
+                }
+            )
+            if item.requires_approval:
+                rows.append(
+                    {
+                        **base,
+                        "action": "approval.requested",
+                        "entity_type": "approval_request",
+                        "entity_id": str(item.approval_id),
+                        "metadata_json": {
+                            "approval_id": str(item.approval_id),
+                            "category": ApprovalCategory.GBP_EDIT.value,
+                        },
+                    }
+                )
+                continue
+            rows.extend(
+                [
+                    {
+                        **base,
+                        "action": "plan.scheduled",
+                        "entity_type": "content_plan",
+                        "entity_id": str(item.plan_id),
+                        "metadata_json": {"candidate_id": str(item.candidate_id), "window_id": item.window_id},
+                    },
+                    {
+                        **base,
+                        "action": "post_job.queued",
+                        "entity_type": "post_job",
+                        "entity_id": str(item.job_id),
+                        "metadata_json": {"plan_id": str(item.plan_id), "dedupe_key": item.dedupe_key},
+                    },
+                ]
+            )
+        return rows
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
+from typing import Iterable
 import uuid
 
 from sqlalchemy.orm import Session
@@ -33,11 +34,80 @@ class BucketPerformanceService:
             )
             .one_or_none()
         )
+        return self._decayed_score(record, as_of)
+
+    def get_scores(
+        self,
+        *,
+        organization_id: uuid.UUID,
+        location_id: uuid.UUID,
+        buckets: Iterable[str],
+        topic_tag: str | None = None,
+        as_of: datetime,
+    ) -> dict[str, float]:
+        """Decayed scores for several buckets in one query; buckets without a record score 0."""
+        scores = {bucket: 0.0 for bucket in buckets}
+        if not scores:
+            return scores
+        records = (
+            self.db.query(BucketPerformance)
+            .filter(
+                BucketPerformance.organization_id == organization_id,
+                BucketPerformance.location_id == location_id,
+                BucketPerformance.bucket.in_(list(scores)),
+                BucketPerformance.topic_tag == self._topic_key(topic_tag),
+            )
+            .all()
+        )
+        for record in records:
+            scores[record.bucket] = self._decayed_score(record, as_of)
+        return scores
+
+    def records_by_location(
+        self,
+        *,
+        organization_id: uuid.UUID,
+        location_ids: Iterable[uuid.UUID],
+        buckets: Iterable[str],
+        topic_tag: str | None = None,
+    ) -> dict[uuid.UUID, list[BucketPerformance]]:
+        """Performance records of several locations in one query, for scoring with `scores_from`."""
+        location_ids = list(location_ids)
+        grouped: dict[uuid.UUID, list[BucketPerformance]] = {location_id: [] for location_id in location_ids}
+        if not location_ids:
+            return grouped
+        records = (
+            self.db.query(BucketPerformance)
+            .filter(
+                BucketPerformance.organization_id == organization_id,
+                BucketPerformance.location_id.in_(location_ids),
+                BucketPerformance.bucket.in_(list(buckets)),
+                BucketPerformance.topic_tag == self._topic_key(topic_tag),
+            )
+            .all()
+        )
+        for record in records:
+            grouped[record.location_id].append(record)
+        return grouped
+
+    def scores_from(
+        self, records: Iterable[BucketPerformance], *, buckets: Iterable[str], as_of: datetime
+    ) -> dict[str, float]:
+        scores = {bucket: 0.0 for bucket in buckets}
+        for record in records:
+            if record.bucket in scores:
+                scores[record.bucket] = self._decayed_score(record, as_of)
+        return scores
+
+    def _decayed_score(self, record: BucketPerformance | None, as_of: datetime) -> float:
         if not record or record.score <= 0:
             return 0.0
         if not record.last_engaged_at:
             return record.score
-        elapsed = (as_of - record.last_engaged_at).days
+        last_engaged_at = record.last_engaged_at
+        if last_engaged_at.tzinfo is None:
+            last_engaged_at = last_engaged_at.replace(tzinfo=timezone.utc)
+        elapsed = (as_of - last_engaged_at).days
         decay = max(0.0, 1.0 - elapsed / self.DECAY_DAYS)
         return max(0.0, record.score * decay)
 
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone, date
-from typing import Any
+from typing import Any, Sequence
 import uuid
 
+from sqlalchemy import case, func
 from sqlalchemy.orm import Session
 
 from backend.app.models.operations.alert import AlertSeverity
@@ -18,6 +20,7 @@ from backend.app.services.content.bucket_performance import BucketPerformanceSer
 from backend.app.services.content.daily_signals import DailySignalService
 from backend.app.services.content.seasonal import SeasonalPlanner
 from backend.app.services.media.photo_requests import PhotoRequestService
+from backend.app.services.shared.dates import as_utc, day_start
 from backend.app.services.shared.settings import SettingsService
 from math import isclose
 
@@ -31,6 +34,60 @@ BUCKETS: list[dict[str, Any]] = [
     {"id": "local_highlight", "cooldown_days": 21},
 ]
 
+COVERAGE_WINDOW_DAYS = 30
+
+
+@dataclass(frozen=True)
+class CandidateContext:
+    """Per-bucket post history and performance for one location, loaded once per generation."""
+
+    target_date: date
+    recent_counts: dict[str, int]
+    last_published: dict[str, datetime]
+    performance: dict[str, float]
+
+    def coverage_gap_bonus(self, bucket_id: str) -> float:
+        return 10.0 if self.recent_counts.get(bucket_id, 0) == 0 else 0.0
+
+    def cooldown_ok(self, bucket_id: str, cooldown_days: int) -> bool:
+        last_published = self.last_published.get(bucket_id)
+        return last_published is None or last_published < day_start(self.target_date - timedelta(days=cooldown_days))
+
+    def performance_score(self, bucket_id: str) -> float:
+        return self.performance.get(bucket_id, 0.0)
+
+    @classmethod
+    def from_history(
+        cls,
+        *,
+        target_date: date,
+        published: Sequence[tuple[str, datetime]],
+        performance: dict[str, float],
+    ) -> "CandidateContext":
+        """Build the context from already-loaded `(bucket, published_at)` pairs of one location."""
+        coverage_cutoff = day_start(target_date - timedelta(days=COVERAGE_WINDOW_DAYS))
+        recent_counts: dict[str, int] = {}
+        last_published: dict[str, datetime] = {}
+        for bucket_id, published_at in published:
+            published_at = as_utc(published_at)
+            if published_at >= coverage_cutoff:
+                recent_counts[bucket_id] = recent_counts.get(bucket_id, 0) + 1
+            if bucket_id not in last_published or published_at > last_published[bucket_id]:
+                last_published[bucket_id] = published_at
+        return cls(
+            target_date=target_date,
+            recent_counts=recent_counts,
+            last_published=last_published,
+            performance=performance,
+        )
+
+
+@dataclass(frozen=True)
+class BucketSelection:
+    bucket: str
+    score: float
+    reasons: dict[str, Any]
+
 
 class PostCandidateService:
     def __init__(self, db: Session) -> None:
@@ -69,8 +126,82 @@ class PostCandidateService:
             location_id=location_id,
             target_date=target_date,
         )
-        best: tuple[dict[str, Any], float] | None = None
-        as_of = datetime.combine(target_date, datetime.min.time(), tzinfo=timezone.utc)
+        connection_ok = (signal.extra_metrics or {}).get("gbp_connection_ok", True)
+        if not connection_ok:
+            self.alerts.create_alert(
+                severity=AlertSeverity.WARNING,
+                alert_type="gbp_disconnected",
+                message="GBP connection lost",
+                organization_id=organization_id,
+                location_id=location_id,
+            )
+            return None
+        context = self._candidate_context(
+            organization_id=organization_id,
+            location_id=location_id,
+            target_date=target_date,
+            buckets=BUCKETS,
+            as_of=day_start(target_date),
+        )
+        selection = self.select_bucket(
+            signal=signal,
+            location=location,
+            settings=settings,
+            verified_offers=verified_offers,
+            verified_events=verified_events,
+            planned_mapping=planned_mapping,
+            context=context,
+            threshold=threshold,
+        )
+        if not selection:
+            return None
+        selected_bucket = selection.bucket
+        # trigger photo request if media is stale and bucket prefers visuals
+        photo_gap = settings.get("photo_cadence_days", 14)
+        if (signal.extra_metrics or {}).get("new_media_14d", 0) == 0 and selected_bucket in {
+            "proof",
+            "service_spotlight",
+            "local_highlight",
+        }:
+            self.photo_requests.request_if_stale(
+                organization_id=organization_id,
+                location_id=location_id,
+                reason="Fresh photos improve GBP engagement; none uploaded recently",
+                min_days_between_requests=photo_gap,
+            )
+        candidate = PostCandidate(
+            organization_id=organization_id,
+            location_id=location_id,
+            candidate_date=target_date,
+            bucket=selected_bucket,
+            score=selection.score,
+            reason_json=selection.reasons,
+            status=PostStatus.DRAFT,
+        )
+        self.db.add(candidate)
+        self.db.commit()
+        self.db.refresh(candidate)
+        if planned_mapping:
+            planned_mapping.post_candidate_id = candidate.id
+            planned_mapping.status = "scheduled"
+            self.db.add(planned_mapping)
+            self.db.commit()
+        return candidate
+
+    def select_bucket(
+        self,
+        *,
+        signal: DailySignal,
+        location: Location,
+        settings: dict[str, Any],
+        verified_offers: list[dict[str, Any]],
+        verified_events: list[dict[str, Any]],
+        planned_mapping: GbpPostKeywordMapping | None,
+        context: CandidateContext,
+        threshold: float = 25,
+    ) -> BucketSelection | None:
+        """Pick the best bucket for `context.target_date` from already-loaded inputs (no queries)."""
+        target_date = context.target_date
         reasons: dict[str, Any] = {
             "days_since_post": signal.days_since_post,
             "reviews_last_7d": signal.review_count_7d,
@@ -93,16 +224,7 @@ class PostCandidateService:
             reasons["seasonal_bucket"] = seasonal_bucket
         if event_trigger:
             reasons["event_trigger"] = event_trigger
-        connection_ok = (signal.extra_metrics or {}).get("gbp_connection_ok", True)
-        if not connection_ok:
-            self.alerts.create_alert(
-                severity=AlertSeverity.WARNING,
-                alert_type="gbp_disconnected",
-                message="GBP connection lost",
-                organization_id=organization_id,
-                location_id=location_id,
-            )
-            return None
+        best: tuple[dict[str, Any], float] | None = None
         mix = settings.get("content_mix", {})
         total_weight = sum(v for v in mix.values() if isinstance(v, (int, float)) and v > 0)
         if planned_mapping:
@@ -123,19 +245,13 @@ class PostCandidateService:
                 if raw_weight <= 0:
                     continue
                 norm_weight = raw_weight / total_weight if total_weight and not isclose(total_weight, 0.0) else 1.0
-                score = self._score_bucket(bucket, signal, location_id, target_date, as_of=as_of)
+                score = self._score_bucket(bucket, signal, context)
                 score = score * (0.5 + norm_weight)  # blend base score with mix weight
                 if seasonal_bucket and bucket["id"] == seasonal_bucket:
                     score += 10
                 if event_trigger and bucket["id"] == event_trigger.get("bucket"):
                     score += event_trigger.get("boost", 12)
-                perf_score = self.bucket_perf.get_score(
-                    organization_id=organization_id,
-                    location_id=location_id,
-                    bucket=bucket["id"],
-                    topic_tag=None,
-                    as_of=as_of,
-                )
+                perf_score = context.performance_score(bucket["id"])
                 reasons[f"bucket_{bucket['id']}_score"] = perf_score
                 score += min(20, perf_score)
                 if score <= 0:
@@ -145,15 +261,8 @@ class PostCandidateService:
         if not best or best[1] < threshold:
             return None
         selected_bucket = best[0]["id"]
-        performance_score = self.bucket_perf.get_score(
-            organization_id=organization_id,
-            location_id=location_id,
-            bucket=selected_bucket,
-            topic_tag=None,
-            as_of=as_of,
-        )
         reasons["selected_bucket"] = selected_bucket
-        reasons["bucket_performance_score"] = performance_score
+        reasons["bucket_performance_score"] = context.performance_score(selected_bucket)
         reasons["post_type_hint"] = self._post_type_hint(
             selected_bucket=selected_bucket,
             verified_offers=verified_offers,
@@ -163,37 +272,11 @@ class PostCandidateService:
             reasons["offer_context"] = verified_offers[0]
         if verified_events:
             reasons["event_context"] = verified_events[0]
-        # trigger photo request if media is stale and bucket prefers visuals
-        photo_gap = self.settings.merged(organization_id, location_id).get("photo_cadence_days", 14)
-        if (signal.extra_metrics or {}).get("new_media_14d", 0) == 0 and selected_bucket in {
-            "proof",
-            "service_spotlight",
-            "local_highlight",
-        }:
-            self.photo_requests.request_if_stale(
-                organization_id=organization_id,
-                location_id=location_id,
-                reason="Fresh photos improve GBP engagement; none uploaded recently",
-                min_days_between_requests=photo_gap,
-            )
-        candidate = PostCandidate(
-            organization_id=organization_id,
-            location_id=location_id,
-            candidate_date=target_date,
+        return BucketSelection(
             bucket=selected_bucket,
             score=best[1],
-            reason_json={**reasons, "selected_bucket": selected_bucket, "score": best[1]},
-            status=PostStatus.DRAFT,
+            reasons={**reasons, "selected_bucket": selected_bucket, "score": best[1]},
         )
-        self.db.add(candidate)
-        self.db.commit()
-        self.db.refresh(candidate)
-        if planned_mapping:
-            planned_mapping.post_candidate_id = candidate.id
-            planned_mapping.status = "scheduled"
-            self.db.add(planned_mapping)
-            self.db.commit()
-        return candidate
 
     def _latest_signal(self, organization_id: uuid.UUID, location_id: uuid.UUID, target_date: date) -> DailySignal | None:
         return (
@@ -207,15 +290,46 @@ class PostCandidateService:
             .first()
         )
 
-    def _score_bucket(
+    def _candidate_context(
         self,
-        bucket: dict[str, Any],
-        signal: DailySignal,
+        *,
+        organization_id: uuid.UUID,
         location_id: uuid.UUID,
         target_date: date,
-        *,
+        buckets: Sequence[dict[str, Any]],
         as_of: datetime,
-    ) -> float:
+    ) -> CandidateContext:
+        """Bucket post counts, last publish times and performance scores in two grouped queries."""
+        bucket_ids = [bucket["id"] for bucket in buckets]
+        lookback_days = max([COVERAGE_WINDOW_DAYS, *(bucket["cooldown_days"] for bucket in buckets)])
+        coverage_cutoff = day_start(target_date - timedelta(days=COVERAGE_WINDOW_DAYS))
+        rows = (
+            self.db.query(
+                Post.bucket,
+                func.count(case((Post.published_at >= coverage_cutoff, 1))),
+                func.max(Post.published_at),
+            )
+            .filter(Post.location_id == location_id)
+            .filter(Post.bucket.in_(bucket_ids))
+            .filter(Post.published_at >= day_start(target_date - timedelta(days=lookback_days)))
+            .group_by(Post.bucket)
+            .all()
+        )
+        performance = self.bucket_perf.get_scores(
+            organization_id=organization_id,
+            location_id=location_id,
+            buckets=bucket_ids,
+            topic_tag=None,
+            as_of=as_of,
+        )
+        return CandidateContext(
+            target_date=target_date,
+            recent_counts={bucket_id: int(count) for bucket_id, count, _ in rows},
+            last_published={bucket_id: as_utc(last) for bucket_id, _, last in rows if last is not None},
+            performance=performance,
+        )
+
+    def _score_bucket(self, bucket: dict[str, Any], signal: DailySignal, context: CandidateContext) -> float:
         extra = signal.extra_metrics or {}
         if extra.get("posts_last_7d", 0) >= 3:
             return 0
@@ -228,22 +342,11 @@ class PostCandidateService:
             base += min(20, abs(signal.rank_delta_7d) * 4)
         if extra.get("new_media_14d"):
             base += 10
-        base += self._coverage_gap_bonus(bucket["id"], location_id, target_date)
-        if not self._bucket_cooldown_ok(bucket["id"], location_id, target_date, bucket["cooldown_days"]):
+        base += context.coverage_gap_bonus(bucket["id"])
+        if not context.cooldown_ok(bucket["id"], bucket["cooldown_days"]):
             base -= 50
         return base
 
-    def _bucket_cooldown_ok(self, bucket_id: str, location_id: uuid.UUID, target_date: date, cooldown_days: int) -> bool:
-        cutoff = datetime.combine(target_date - timedelta(days=cooldown_days), datetime.min.time(), tzinfo=timezone.utc)
-        recent = (
-            self.db.query(Post)
-            .filter(Post.location_id == location_id)
-            .filter(Post.bucket == bucket_id)
-            .filter(Post.published_at >= cutoff)
-            .first()
-        )
-        return recent is None
-
     def _topic_cooldown_ok(self, topic_tag: str | None, location_id: uuid.UUID, target_date: date, cooldown_days: int) -> bool:
         if not topic_tag:
             return True
@@ -257,17 +360,6 @@ class PostCandidateService:
         )
         return recent is None
 
-    def _coverage_gap_bonus(self, bucket_id: str, location_id: uuid.UUID, target_date: date) -> float:
-        cutoff = datetime.combine(target_date - timedelta(days=30), datetime.min.time(), tzinfo=timezone.utc)
-        used = (
-            self.db.query(Post)
-            .filter(Post.location_id == location_id)
-            .filter(Post.bucket == bucket_id)
-            .filter(Post.published_at >= cutoff)
-            .count()
-        )
-        return 10.0 if used == 0 else 0.0
-
     @staticmethod
     def _post_type_hint(
         *,
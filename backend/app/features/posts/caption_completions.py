@@ -0,0 +1,113 @@
+"""Cached, batched chat completions for caption copy.
+
+A completion is keyed by the SHA-256 of its whole request (model, temperature, messages and
+variant count) and stored in `caption_completions` until it expires, so composing the same
+prompt again (same bucket, service, angle, CTA and location context) reuses the earlier copy
+instead of calling the API. Each request also sends a seed derived from that hash, so the
+provider regenerates the same copy for a prompt as far as it can. Several variants are
+requested as ``n`` choices of a single completion rather than one call per variant.
+Entries are written with an upsert, so workers composing the same prompt at once do not
+collide, and expired entries are purged periodically by a beat task.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from hashlib import sha256
+import json
+from typing import Any
+
+import httpx
+from sqlalchemy import delete, func
+from sqlalchemy.orm import Session
+
+from backend.app.core.config import settings
+from backend.app.models.content.caption_completion import CaptionCompletion
+from backend.app.services.automation.action_fanout import dialect_insert
+from backend.app.services.shared.dates import as_utc
+
+CAPTION_MODEL = "gpt-4o-mini"
+REQUEST_TIMEOUT_SECONDS = 20.0
+
+
+def prompt_hash(request: dict[str, Any]) -> str:
+    return sha256(json.dumps(request, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def prompt_seed(key: str) -> int:
+    # OpenAI accepts any integer seed; 31 bits keeps it portable across providers.
+    return int(key[:8], 16) & 0x7FFFFFFF
+
+
+class CaptionCompletionCache:
+    def __init__(self, db: Session, *, model: str = CAPTION_MODEL, ttl: timedelta | None = None) -> None:
+        self.db = db
+        self.model = model
+        self.ttl = ttl or timedelta(hours=settings.CAPTION_CACHE_TTL_HOURS)
+
+    def complete(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        n: int = 1,
+        temperature: float = 0.6,
+    ) -> list[str]:
+        """Up to `n` completions for `messages`, from the cache when an unexpired entry exists.
+
+        Returns an empty list when no API key is configured or the request fails; failures are
+        not cached.
+        """
+        if not settings.OPENAI_API_KEY or n <= 0:
+            return []
+        request = {"model": self.model, "temperature": temperature, "n": n, "messages": messages}
+        key = prompt_hash(request)
+        now = datetime.now(timezone.utc)
+        cached = self.db.get(CaptionCompletion, key)
+        if cached and as_utc(cached.expires_at) > now:
+            return list(cached.variants)
+        variants = self._request({**request, "seed": prompt_seed(key)})
+        if not variants:
+            return []
+        self._store(key, variants, expires_at=now + self.ttl)
+        if cached is not None:
+            self.db.expire(cached)
+        return variants
+
+    def purge_expired(self, *, now: datetime | None = None) -> int:
+        """Delete entries that expired before `now`; returns how many were removed."""
+        now = now or datetime.now(timezone.utc)
+        result = self.db.execute(delete(CaptionCompletion).where(CaptionCompletion.expires_at < now))
+        return result.rowcount or 0
+
+    def _store(self, key: str, variants: list[str], *, expires_at: datetime) -> None:
+        insert = dialect_insert(self.db)
+        if insert is None:
+            raise RuntimeError("Caption completion caching requires Postgres or SQLite")
+        table = CaptionCompletion.__table__
+        stmt = insert(table).values(prompt_hash=key, model=self.model, variants=variants, expires_at=expires_at)
+        self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.prompt_hash],
+                set_={
+                    "model": stmt.excluded.model,
+                    "variants": stmt.excluded.variants,
+                    "expires_at": stmt.excluded.expires_at,
+                    "updated_at": func.now(),
+                },
+            )
+        )
+
+    def _request(self, payload: dict[str, Any]) -> list[str]:
+        headers = {
+            "Authorization": f"Bearer {settings.OPENAI_API_KEY}",
+            "Content-Type": "application/json",
+        }
+        try:
+            with httpx.Client(timeout=REQUEST_TIMEOUT_SECONDS) as client:
+                response = client.post(f"{settings.OPENAI_API_BASE_URL}/chat/completions", headers=headers, json=payload)
+                response.raise_for_status()
+                data = response.json()
+            contents = [choice["message"]["content"] for choice in data["choices"]]
+        except Exception:  # noqa: BLE001
+            return []
+        return [str(content).strip() for content in contents if content and str(content).strip()]
@@ -1,22 +1,35 @@
 from __future__ import annotations
 
+import json
 import random
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from backend.app.models.enums import PostType
 
+if TYPE_CHECKING:
+    from backend.app.services.content.caption_completions import CaptionCompletionCache
+
 
 class CaptionGenerator:
     """
-    Placeholder AI-assisted caption generator.
-    In production this would call OpenAI or another provider.
+    AI-assisted caption generator.
+    With a completion cache, all variants come from one cached completion request;
+    otherwise (or when the request fails) they are assembled from templates. Completed
+    variants that trip the banned-phrase check are dropped, and when none is left the
+    template variants are used instead.
     """
 
     PROFANITY_LIST = {"damn", "hell", "shit", "fuck"}
 
-    def __init__(self, brand_voice: dict | None = None, banned_phrases: list[str] | None = None) -> None:
+    def __init__(
+        self,
+        brand_voice: dict | None = None,
+        banned_phrases: list[str] | None = None,
+        completions: "CaptionCompletionCache | None" = None,
+    ) -> None:
         self.brand_voice = brand_voice or {}
         self.banned = set((banned_phrases or [])) | self.PROFANITY_LIST
+        self.completions = completions
 
     def generate_variants(
         self,
@@ -31,6 +44,23 @@ class CaptionGenerator:
         variants: list[dict[str, Any]] = []
         tone = self.brand_voice.get("tone", "professional")
         voice = self.brand_voice.get("voice", "friendly and clear")
+        if self.completions is not None:
+            bodies = self._completed_variants(
+                base_prompt=base_prompt,
+                services=services,
+                keywords=keywords,
+                locations=locations,
+                count=count,
+                tone=tone,
+                voice=voice,
+            )
+            completed = [
+                {"body": body, "compliance_flags": self._run_compliance_checks(body, post_type=post_type)}
+                for body in bodies
+            ]
+            completed = [variant for variant in completed if not variant["compliance_flags"]["banned_phrases"]]
+            if completed:
+                return completed
         for _ in range(count):
             service = random.choice(services) if services else "your services"
             keyword = random.choice(keywords) if keywords else ""
@@ -44,6 +74,37 @@ class CaptionGenerator:
             variants.append({"body": body, "compliance_flags": compliance})
         return variants
 
+    def _completed_variants(
+        self,
+        *,
+        base_prompt: str,
+        services: list[str],
+        keywords: list[str],
+        locations: list[str],
+        count: int,
+        tone: str,
+        voice: str,
+    ) -> list[str]:
+        system = (
+            "You rewrite Google Business Profile post drafts for local businesses. "
+            "Keep the facts of the draft, stay non-spammy, and return plain text only."
+        )
+        user = {
+            "draft": base_prompt,
+            "services": services,
+            "keywords": keywords,
+            "locations": locations,
+            "tone": tone,
+            "voice": voice,
+        }
+        return self.completions.complete(
+            [
+                {"role": "system", "content": system},
+                {"role": "user", "content": json.dumps(user, sort_keys=True)},
+            ],
+            n=count,
+        )[:count]
+
     def _run_compliance_checks(self, body: str, *, post_type: PostType) -> dict[str, Any]:
         lowered = body.lower()
         banned_hit = any(phrase in lowered for phrase in self.banned)
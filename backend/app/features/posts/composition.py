@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import date, datetime, timedelta, timezone
 from difflib import SequenceMatcher
-import math
+import json
 import uuid
 
 import httpx
@@ -10,12 +10,13 @@ from sqlalchemy.orm import Session
 
 from backend.app.core.config import settings
 from backend.app.models.content.brand_voice import BrandVoice
-from backend.app.models.enums import PostType
-from backend.app.models.posts.post import Post
+from backend.app.models.enums import ActionType, PostType
 from backend.app.models.posts.post_candidate import PostCandidate
-from backend.app.services.content.content_guardrails import ContentGuardrails
-from backend.app.services.google_business.gbp_sync import GbpSyncService
+from backend.app.services.content.caption_completions import CaptionCompletionCache
+from backend.app.services.content.content_guardrails import ContentGuardrails, GuardrailError
 from backend.app.services.media.media_selection import MediaSelector
+from backend.app.services.posts.content_reuse import ContentReuseIndex
+from backend.app.services.posts.post_embeddings import EMBEDDING_MODEL, PostEmbeddingIndex
 from backend.app.services.posts.rotation import RotationEngine
 from backend.app.services.shared.settings import SettingsService
 
@@ -34,6 +35,9 @@ ANGLES = [
     "credibility",
 ]
 
+# Each caption prompt asks for this many alternatives in one completion.
+CAPTION_VARIANTS = 3
+
 TONE_INSTRUCTIONS = {
     "friendly": "Warm, approachable, and helpful.",
     "professional": "Clear, confident, and informative.",
@@ -49,7 +53,9 @@ class PostCompositionService:
         self.rotation = RotationEngine(db)
         self.media_selector = MediaSelector(db)
         self.guardrails = ContentGuardrails()
-        self.gbp_sync = GbpSyncService(db)
+        self.embedding_index = PostEmbeddingIndex(db)
+        self.reuse_index = ContentReuseIndex(db)
+        self.completions = CaptionCompletionCache(db)
 
     def compose(self, candidate_id: uuid.UUID, *, brand_voice: dict | None = None) -> PostCandidate:
         candidate = self.db.get(PostCandidate, candidate_id)
@@ -61,14 +67,14 @@ class PostCompositionService:
         merged = self.settings.merged(candidate.organization_id, candidate.location_id)
         offers = self.settings.verified_offers(candidate.organization_id, candidate.location_id)
         events = self.settings.verified_events(candidate.organization_id, candidate.location_id)
-        post_type = self._post_type(candidate, offers=offers, events=events)
+        post_type = self.choose_post_type(candidate, offers=offers, events=events)
         tone = self._tone(candidate.organization_id, merged, override=brand_voice)
         service_name = self._rotate_service(candidate)
         angle = self._rotate_angle(candidate)
         cta = self._rotate_cta(candidate)
-        location_text = self._location_text(candidate)
-        category = self._location_category(candidate)
-        seasonal_hint = self._seasonal_hint(candidate.candidate_date)
+        location_text = self.location_text(candidate)
+        category = self.location_category(candidate)
+        seasonal_hint = self.seasonal_hint(candidate.candidate_date)
         offer_context = offers[0] if offers else None
         event_context = events[0] if events else None
         focus_keyword = None
@@ -77,8 +83,8 @@ class PostCompositionService:
             if isinstance(raw_keyword, str) and raw_keyword.strip():
                 focus_keyword = raw_keyword.strip()
 
-        # Best effort GBP media import so existing GBP photos share the same local media pool.
-        self._sync_gbp_media_best_effort(candidate)
+        # GBP photos join the local media pool through a background sync; compose only queues it when stale.
+        self._queue_gbp_media_sync_if_stale(candidate)
         media = self.media_selector.pick_asset(
             location_id=candidate.location_id,
             service=service_name,
@@ -88,7 +94,7 @@ class PostCompositionService:
             mark_used=False,
         )
 
-        generated = self._generate_caption_openai(
+        generated = self.generate_caption(
             business_name=candidate.location.name,
             category=category,
             service_name=service_name,
@@ -102,8 +108,9 @@ class PostCompositionService:
             event_context=event_context,
             media_tags=list(media.categories or []) if media else [],
             focus_keyword=focus_keyword,
+            variant_index=candidate.candidate_date.toordinal(),
         )
-        caption = generated or self._fallback_caption(
+        caption = generated or self.fallback_caption(
             post_type=post_type,
             business_name=candidate.location.name,
             category=category,
@@ -117,9 +124,8 @@ class PostCompositionService:
             event_context=event_context,
             focus_keyword=focus_keyword,
         )
-        caption = self._inject_focus_keyword(caption, focus_keyword)
+        caption = self.inject_focus_keyword(caption, focus_keyword)
 
-        recent_bodies = self._recent_bodies(candidate.location_id)
         errors = self.guardrails.validate(
             caption,
             post_type=post_type,
@@ -127,11 +133,11 @@ class PostCompositionService:
             location=location_text,
             has_verified_offer=bool(offers),
             has_verified_event=bool(events),
-            recent_texts=recent_bodies,
+            recent_texts=self._recent_bodies(candidate.location_id, caption),
             require_cta=True,
         )
         if errors:
-            safe_fallback = self._fallback_caption(
+            safe_fallback = self.fallback_caption(
                 post_type=PostType.UPDATE if post_type != PostType.UPDATE else post_type,
                 business_name=candidate.location.name,
                 category=category,
@@ -152,20 +158,21 @@ class PostCompositionService:
                 location=location_text,
                 has_verified_offer=bool(offers),
                 has_verified_event=bool(events),
-                recent_texts=recent_bodies,
+                recent_texts=self._recent_bodies(candidate.location_id, safe_fallback),
                 require_cta=True,
             )
             if fallback_errors:
-                raise ValueError(f"Generated caption failed guardrails: {errors}")
+                raise GuardrailError(f"Generated caption failed guardrails: {errors}")
             caption = safe_fallback
             post_type = PostType.UPDATE if post_type != PostType.UPDATE else post_type
 
-        if self._is_similar_to_recent(caption, candidate.location_id):
-            raise ValueError("Caption too similar to recent content")
+        embedding = self.embedding(caption)
+        if self._is_similar_to_recent(caption, candidate.location_id, embedding=embedding):
+            raise GuardrailError("Caption too similar to recent content")
 
         candidate.proposed_caption = caption
         candidate.media_asset_id = media.id if media else None
-        candidate.fingerprint = self._fingerprint(caption)
+        candidate.fingerprint = self.fingerprint(caption)
         reason = dict(candidate.reason_json or {})
         reason.update(
             {
@@ -182,7 +189,6 @@ class PostCompositionService:
                 "event_context": event_context,
             }
         )
-        embedding = self._embedding(caption)
         if embedding:
             reason["embedding"] = embedding
         candidate.reason_json = reason
@@ -191,8 +197,8 @@ class PostCompositionService:
         self.db.refresh(candidate)
         return candidate
 
-    def _post_type(
-        self,
+    @staticmethod
+    def choose_post_type(
         candidate: PostCandidate,
         *,
         offers: list[dict],
@@ -209,7 +215,7 @@ class PostCompositionService:
         return PostType.UPDATE
 
     def _rotate_service(self, candidate: PostCandidate) -> str:
-        candidates = self._service_candidates(candidate)
+        candidates = self.service_candidates(candidate)
         selected = self.rotation.select_next(
             organization_id=candidate.organization_id,
             location_id=candidate.location_id,
@@ -236,7 +242,8 @@ class PostCompositionService:
         )
         return selected or CTAS[0]
 
-    def _service_candidates(self, candidate: PostCandidate) -> list[str]:
+    @staticmethod
+    def service_candidates(candidate: PostCandidate) -> list[str]:
         values: list[str] = []
         if candidate.location and candidate.location.settings and candidate.location.settings.services:
             for entry in candidate.location.settings.services:
@@ -270,13 +277,17 @@ class PostCompositionService:
             if tone in TONE_INSTRUCTIONS:
                 return tone
         voice = self.db.query(BrandVoice).filter(BrandVoice.organization_id == organization_id).one_or_none()
+        return self.voice_tone(voice, merged_settings)
+
+    @staticmethod
+    def voice_tone(voice: BrandVoice | None, merged_settings: dict) -> str:
         if voice and voice.tone and voice.tone.lower() in TONE_INSTRUCTIONS:
             return voice.tone.lower()
         configured = str(merged_settings.get("tone_of_voice", "friendly")).lower()
         return configured if configured in TONE_INSTRUCTIONS else "friendly"
 
     @staticmethod
-    def _location_text(candidate: PostCandidate) -> str:
+    def location_text(candidate: PostCandidate) -> str:
         if candidate.location and candidate.location.address:
             address = candidate.location.address or {}
             city = address.get("city") or address.get("locality")
@@ -288,7 +299,7 @@ class PostCompositionService:
         return candidate.location.name if candidate.location else "your area"
 
     @staticmethod
-    def _location_category(candidate: PostCandidate) -> str:
+    def location_category(candidate: PostCandidate) -> str:
         if candidate.location and candidate.location.address:
             address = candidate.location.address or {}
             category = address.get("category") or address.get("primaryCategory")
@@ -297,7 +308,7 @@ class PostCompositionService:
         return "service provider"
 
     @staticmethod
-    def _seasonal_hint(target_date: date) -> str:
+    def seasonal_hint(target_date: date) -> str:
         month = target_date.month
         if month in {12, 1, 2}:
             return "winter is a good time for proactive maintenance"
@@ -307,7 +318,7 @@ class PostCompositionService:
             return "summer demand can increase quickly, so planning ahead helps"
         return "fall is a great time to handle preventative upkeep"
 
-    def _generate_caption_openai(
+    def generate_caption(
         self,
         *,
         business_name: str,
@@ -323,6 +334,7 @@ class PostCompositionService:
         event_context: dict | None,
         media_tags: list[str],
         focus_keyword: str | None,
+        variant_index: int = 0,
     ) -> str | None:
         if not settings.OPENAI_API_KEY:
             return None
@@ -353,29 +365,19 @@ class PostCompositionService:
                 "natural location mention",
             ],
         }
-        payload = {
-            "model": "gpt-4o-mini",
-            "temperature": 0.6,
-            "messages": [
+        variants = self.completions.complete(
+            [
                 {"role": "system", "content": system},
-                {"role": "user", "content": str(user)},
+                {"role": "user", "content": json.dumps(user, sort_keys=True, default=str)},
             ],
-        }
-        headers = {
-            "Authorization": f"Bearer {settings.OPENAI_API_KEY}",
-            "Content-Type": "application/json",
-        }
-        try:
-            with httpx.Client(timeout=20.0) as client:
-                response = client.post("https://api.openai.com/v1/chat/completions", headers=headers, json=payload)
-                response.raise_for_status()
-                data = response.json()
-            message = data["choices"][0]["message"]["content"]
-            return str(message).strip() if message else None
-        except Exception:  # noqa: BLE001
+            n=CAPTION_VARIANTS,
+        )
+        if not variants:
             return None
+        # Cached prompts recur across a horizon; rotate through their variants instead of repeating one.
+        return variants[variant_index % len(variants)]
 
-    def _fallback_caption(
+    def fallback_caption(
         self,
         *,
         post_type: PostType,
@@ -438,10 +440,10 @@ class PostCompositionService:
         if tone == "concise":
             return f"{opener} {line_one} {cta}"
         text = f"{opener} {line_one} {line_two} {cta}"
-        return self._inject_focus_keyword(text, focus_keyword)
+        return self.inject_focus_keyword(text, focus_keyword)
 
     @staticmethod
-    def _inject_focus_keyword(text: str, focus_keyword: str | None) -> str:
+    def inject_focus_keyword(text: str, focus_keyword: str | None) -> str:
         if not focus_keyword:
             return text
         lowered = text.lower()
@@ -453,75 +455,89 @@ class PostCompositionService:
             return f"{text} {suffix}"
         return f"{text}. {suffix}"
 
-    def _recent_bodies(self, location_id: uuid.UUID, days: int = 60) -> list[str]:
+    def _recent_bodies(self, location_id: uuid.UUID, text: str, days: int = 60) -> list[str]:
+        """Bodies of recent posts that the reuse index flags as possible near-duplicates of `text`."""
         cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-        posts = (
-            self.db.query(Post)
-            .filter(Post.location_id == location_id)
-            .filter(Post.created_at >= cutoff)
-            .all()
-        )
+        posts = self.reuse_index.candidates(location_id, text, since=cutoff)
         return [post.body for post in posts if post.body]
 
-    def _is_similar_to_recent(self, caption: str, location_id: uuid.UUID, days: int = 45, threshold: float = 0.9) -> bool:
+    def _is_similar_to_recent(
+        self,
+        caption: str,
+        location_id: uuid.UUID,
+        days: int = 45,
+        threshold: float = 0.9,
+        *,
+        embedding: list[float] | None = None,
+        embedding_threshold: float = 0.90,
+    ) -> bool:
         cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-        recent_posts = (
-            self.db.query(Post)
-            .filter(Post.location_id == location_id)
-            .filter(Post.created_at >= cutoff)
-            .all()
-        )
-        for post in recent_posts:
-            if not post.body:
-                continue
-            post_embed = None
-            if post.ai_prompt_context:
-                post_embed = post.ai_prompt_context.get("embedding")
-            score = SequenceMatcher(None, caption.lower(), post.body.lower()).ratio()
-            if post_embed and self._embedding_sim(post_embed, caption):
+        lowered = caption.lower()
+        for body in self._recent_bodies(location_id, caption, days=days):
+            if SequenceMatcher(None, lowered, body.lower()).ratio() >= threshold:
                 return True
-            if score >= threshold:
-                return True
-        return False
+        if embedding is None:
+            embedding = self.embedding(caption)
+        return self.embedding_matches_recent(location_id, embedding, since=cutoff, threshold=embedding_threshold)
+
+    def embedding_matches_recent(
+        self,
+        location_id: uuid.UUID,
+        embedding: list[float] | None,
+        *,
+        since: datetime,
+        threshold: float = 0.90,
+    ) -> bool:
+        if not embedding:
+            return False
+        matches = self.embedding_index.top_k(location_id, embedding, k=1, since=since)
+        return bool(matches) and matches[0].similarity >= threshold
 
-    def _embedding(self, text: str) -> list[float] | None:
+    def embedding(self, text: str) -> list[float] | None:
         if not settings.OPENAI_API_KEY:
             return None
-        payload = {"input": text, "model": "text-embedding-3-small"}
+        payload = {"input": text, "model": EMBEDDING_MODEL}
         headers = {"Authorization": f"Bearer {settings.OPENAI_API_KEY}"}
         try:
             with httpx.Client(timeout=10.0) as client:
-                resp = client.post("https://api.openai.com/v1/embeddings", json=payload, headers=headers)
+                resp = client.post(f"{settings.OPENAI_API_BASE_URL}/embeddings", json=payload, headers=headers)
                 resp.raise_for_status()
                 data = resp.json()
             return data["data"][0]["embedding"]
         except Exception:  # noqa: BLE001
             return None
 
-    def _embedding_sim(self, stored_embedding: list[float], caption: str, threshold: float = 0.90) -> bool:
-        new_embedding = self._embedding(caption)
-        if not new_embedding or not stored_embedding:
-            return False
-        dot = sum(a * b for a, b in zip(stored_embedding, new_embedding))
-        norm_a = math.sqrt(sum(a * a for a in stored_embedding))
-        norm_b = math.sqrt(sum(b * b for b in new_embedding))
-        if not norm_a or not norm_b:
-            return False
-        sim = dot / (norm_a * norm_b)
-        return sim >= threshold
-
-    def _sync_gbp_media_best_effort(self, candidate: PostCandidate) -> None:
+    def _queue_gbp_media_sync_if_stale(self, candidate: PostCandidate) -> None:
         location = candidate.location
         if not location or not location.google_location_id:
             return
+        now = datetime.now(timezone.utc)
+        synced_at = location.media_last_synced_at
+        if synced_at and synced_at.tzinfo is None:
+            synced_at = synced_at.replace(tzinfo=timezone.utc)
+        interval = timedelta(minutes=settings.GBP_MEDIA_SYNC_MIN_INTERVAL_MINUTES)
+        if synced_at and now - synced_at < interval:
+            return
+        from backend.app.services.automation.actions import ActionService
+
+        # Composes within one sync interval share a queued sync; once the interval passes without
+        # a successful sync (the ledger did not move), the next compose may queue a retry.
+        bucket = int(now.timestamp() // interval.total_seconds())
         try:
-            self.gbp_sync.sync_media(candidate.organization_id, candidate.location_id)
+            ActionService(self.db).schedule_action(
+                organization_id=candidate.organization_id,
+                action_type=ActionType.SYNC_GBP_MEDIA,
+                run_at=now,
+                payload={"location_id": str(location.id)},
+                location_id=location.id,
+                dedupe_key=f"gbp_media_sync:{location.id}:{bucket}",
+            )
         except Exception:  # noqa: BLE001
-            # Keep automation resilient when GBP sync is unavailable.
+            # Keep automation resilient when the sync cannot be queued.
             return
 
     @staticmethod
-    def _fingerprint(text: str) -> str:
+    def fingerprint(text: str) -> str:
         import hashlib
 
         normalized = " ".join(text.lower().split())
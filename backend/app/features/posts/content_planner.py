@@ -9,10 +9,12 @@ from sqlalchemy.orm import Session
 from backend.app.models.content.content_plan import ContentPlan
 from backend.app.models.enums import ContentPlanStatus
 from backend.app.models.google_business.location import Location
+from backend.app.services.content.content_guardrails import GuardrailError
 from backend.app.services.posts.post_candidates import PostCandidateService
 from backend.app.services.posts.post_composition import PostCompositionService
 from backend.app.services.posts.post_scheduler import PostSchedulerService
 from backend.app.services.posts.post_jobs import PostJobService
+from backend.app.services.posts.posting_safety import PostingSafetyError
 from backend.app.services.operations.audit import AuditService
 
 
@@ -67,7 +69,12 @@ class ContentPlannerService:
                 entity_id=str(plan.id),
                 metadata={"target_date": str(target), "candidate_id": str(candidate.id)},
             )
-            self._hydrate_plan(plan)
+            try:
+                self._hydrate_plan(plan)
+            except (GuardrailError, PostingSafetyError) as exc:
+                # Guardrails or posting safety rules rejected this day; keep planning the rest.
+                self.db.rollback()
+                self._skip_plan(plan, str(exc))
         return created
 
     def _existing_plan(self, location_id: uuid.UUID, target_date: date) -> ContentPlan | None:
@@ -80,6 +87,20 @@ class ContentPlannerService:
             .one_or_none()
         )
 
+    def _skip_plan(self, plan: ContentPlan, reason: str) -> None:
+        plan.status = ContentPlanStatus.SKIPPED
+        plan.reason_json = {**(plan.reason_json or {}), "skip_reason": reason}
+        self.db.add(plan)
+        self.db.commit()
+        self.audit.log(
+            action="plan.skipped",
+            organization_id=plan.organization_id,
+            location_id=plan.location_id,
+            entity_type="content_plan",
+            entity_id=str(plan.id),
+            metadata={"candidate_id": str(plan.candidate_id), "reason": reason},
+        )
+
     def _hydrate_plan(self, plan: ContentPlan) -> None:
         if not plan.candidate_id:
             return
@@ -0,0 +1,154 @@
+"""MinHash/LSH index over post bodies for content-reuse checks.
+
+Each post body is reduced to a MinHash signature of its 5-character shingles (one
+permutation hashing, densified so short texts still fill every slot). The signature is
+cut into bands of two values and every band is stored as a hashed key, so finding the
+posts that could be near-duplicates of a text is one indexed lookup: posts sharing at
+least `MIN_BAND_MATCHES` band keys with it. Callers still confirm candidates with their
+exact similarity check; the index only decides which prior posts are worth comparing.
+
+Posts that were never indexed (NULL signature) are always returned as candidates so the
+lookup never hides content the exhaustive scan would have compared.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from hashlib import blake2b
+from typing import Iterable
+import uuid
+
+from sqlalchemy import delete, func, insert, or_, select
+from sqlalchemy.orm import Session
+
+from backend.app.models.enums import PostStatus
+from backend.app.models.posts.post import Post
+from backend.app.models.posts.post_minhash_band import PostMinhashBand
+
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+BAND_ROWS = 2
+NUM_BANDS = NUM_PERM // BAND_ROWS
+# Pairs at SequenceMatcher ratio >= 0.88 share roughly half their shingles or more, so
+# they agree on ~20 of 64 bands; six keeps the miss rate near 1e-5 at that boundary while
+# unrelated posts of the same business (shingle Jaccard ~0.15) agree on about one.
+MIN_BAND_MATCHES = 6
+_PROBE_ATTEMPTS = 16
+_BAND_SEED = 0x9E3779B97F4A7C15
+_MIX_MULTIPLIER = 0xBF58476D1CE4E5B9
+_KEY_MASK = (1 << 63) - 1
+
+
+def _probe_sequence(slot: int) -> list[int]:
+    return [
+        int.from_bytes(blake2b(f"{slot}:{attempt}".encode(), digest_size=8).digest(), "big") % NUM_PERM
+        for attempt in range(_PROBE_ATTEMPTS)
+    ]
+
+
+# Empty slots borrow from a fixed pseudo-random probe order, falling back to the next
+# filled slot, so densified signatures are identical across processes.
+_PROBES = [_probe_sequence(slot) for slot in range(NUM_PERM)]
+
+
+def normalize_text(text: str | None) -> str:
+    return " ".join(str(text or "").lower().split())
+
+
+def minhash_signature(text: str | None) -> list[int] | None:
+    normalized = normalize_text(text)
+    if not normalized:
+        return None
+    data = normalized.encode("utf-8")
+    width = min(SHINGLE_SIZE, len(data))
+    shingles = {data[start : start + width] for start in range(len(data) - width + 1)}
+    slots: list[int | None] = [None] * NUM_PERM
+    for shingle in shingles:
+        value, slot = divmod(int.from_bytes(blake2b(shingle, digest_size=8).digest(), "big"), NUM_PERM)
+        current = slots[slot]
+        if current is None or value < current:
+            slots[slot] = value
+    signature: list[int] = []
+    for slot, value in enumerate(slots):
+        if value is None:
+            value = _borrowed_value(slots, slot)
+        signature.append(value)
+    return signature
+
+
+def _borrowed_value(slots: list[int | None], slot: int) -> int:
+    for probe in _PROBES[slot]:
+        if slots[probe] is not None:
+            return slots[probe]
+    for offset in range(1, NUM_PERM):
+        value = slots[(slot + offset) % NUM_PERM]
+        if value is not None:
+            return value
+    raise ValueError("Cannot densify an empty signature")
+
+
+def band_keys(signature: list[int]) -> list[int]:
+    # Signature values are already uniform hashes, so a multiply/xor mix of each band's
+    # values (seeded by the band number) is enough to key it; keys fit a signed BIGINT.
+    keys: list[int] = []
+    for band in range(NUM_BANDS):
+        key = (band + 1) * _BAND_SEED
+        for value in signature[band * BAND_ROWS : (band + 1) * BAND_ROWS]:
+            key = ((key ^ value) * _MIX_MULTIPLIER) & _KEY_MASK
+        keys.append(key)
+    return keys
+
+
+class ContentReuseIndex:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def index(self, post: Post) -> None:
+        """Store the post's signature and band keys; the post must already be flushed."""
+        signature = minhash_signature(post.body)
+        if post.minhash_signature is not None:
+            self.db.execute(delete(PostMinhashBand).where(PostMinhashBand.post_id == post.id))
+        post.minhash_signature = signature
+        self.db.add(post)
+        if signature is None:
+            return
+        self.db.execute(
+            insert(PostMinhashBand.__table__),
+            [
+                {"post_id": post.id, "band": band, "location_id": post.location_id, "band_key": key}
+                for band, key in enumerate(band_keys(signature))
+            ],
+        )
+
+    def candidates(
+        self,
+        location_id: uuid.UUID,
+        text: str | None,
+        *,
+        since: datetime | None = None,
+        statuses: Iterable[PostStatus] | None = None,
+        exclude_post_id: uuid.UUID | None = None,
+        fingerprint: str | None = None,
+    ) -> list[Post]:
+        """Posts of the location that may be near-duplicates of `text` (or share `fingerprint`)."""
+        signature = minhash_signature(text)
+        conditions = [Post.minhash_signature.is_(None)]
+        if signature is not None:
+            matched = (
+                select(PostMinhashBand.post_id)
+                .where(PostMinhashBand.location_id == location_id)
+                .where(PostMinhashBand.band_key.in_(band_keys(signature)))
+                .group_by(PostMinhashBand.post_id)
+                .having(func.count() >= MIN_BAND_MATCHES)
+            )
+            conditions.append(Post.id.in_(matched))
+        if fingerprint:
+            conditions.append(Post.fingerprint == fingerprint)
+        query = self.db.query(Post).filter(Post.location_id == location_id).filter(or_(*conditions))
+        if since is not None:
+            query = query.filter(Post.created_at >= since)
+        if statuses is not None:
+            query = query.filter(Post.status.in_(tuple(statuses)))
+        if exclude_post_id:
+            query = query.filter(Post.id != exclude_post_id)
+        return query.all()
@@ -0,0 +1,139 @@
+"""Per-location index of post caption embeddings.
+
+Each post's vector is stored once (with its norm) when the post is created, so a
+near-duplicate check embeds only the new caption and ranks every indexed post of the
+location against it in a single query and one matrix pass.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+import math
+from typing import Sequence
+import uuid
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from backend.app.models.posts.post import Post
+from backend.app.models.posts.post_embedding import PostEmbedding
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+
+@dataclass(frozen=True)
+class EmbeddingMatch:
+    post_id: uuid.UUID
+    similarity: float
+
+
+class PostEmbeddingIndex:
+    def __init__(self, db: Session, *, model: str = EMBEDDING_MODEL) -> None:
+        self.db = db
+        self.model = model
+
+    def add(self, post: Post, vector: Sequence[float] | None) -> PostEmbedding | None:
+        """Index `post` under `vector`; a post that is already indexed keeps its first vector."""
+        norm = _norm(vector) if vector else 0.0
+        if not norm:
+            return None
+        if post.id is None:
+            self.db.flush()
+        existing = self.db.execute(
+            select(PostEmbedding).where(PostEmbedding.post_id == post.id)
+        ).scalar_one_or_none()
+        if existing:
+            return existing
+        entry = PostEmbedding(
+            organization_id=post.organization_id,
+            location_id=post.location_id,
+            post_id=post.id,
+            model=self.model,
+            dimensions=len(vector),
+            vector=[float(value) for value in vector],
+            norm=norm,
+        )
+        self.db.add(entry)
+        return entry
+
+    def add_many(self, entries: Sequence[tuple[uuid.UUID, uuid.UUID, uuid.UUID, Sequence[float]]]) -> None:
+        """Index new posts from (organization_id, location_id, post_id, vector) in one INSERT."""
+        rows = [
+            {
+                "organization_id": organization_id,
+                "location_id": location_id,
+                "post_id": post_id,
+                "model": self.model,
+                "dimensions": len(vector),
+                "vector": [float(value) for value in vector],
+                "norm": _norm(vector),
+            }
+            for organization_id, location_id, post_id, vector in entries
+            if vector and _norm(vector)
+        ]
+        if rows:
+            self.db.execute(insert(PostEmbedding), rows)
+
+    def top_k(
+        self,
+        location_id: uuid.UUID,
+        vector: Sequence[float],
+        *,
+        k: int = 5,
+        since: datetime | None = None,
+    ) -> list[EmbeddingMatch]:
+        """The `k` indexed posts of the location most cosine-similar to `vector`, best first."""
+        norm = _norm(vector) if vector else 0.0
+        if not norm or k <= 0:
+            return []
+        stmt = select(PostEmbedding.post_id, PostEmbedding.vector, PostEmbedding.norm).where(
+            PostEmbedding.location_id == location_id,
+            PostEmbedding.model == self.model,
+            PostEmbedding.dimensions == len(vector),
+        )
+        if since is not None:
+            stmt = stmt.where(PostEmbedding.created_at >= since)
+        rows = self.db.execute(stmt).all()
+        if not rows:
+            return []
+        similarities = _cosine_similarities(
+            [row.vector for row in rows], [row.norm for row in rows], vector, norm
+        )
+        ranked = sorted(zip(rows, similarities), key=lambda pair: pair[1], reverse=True)[:k]
+        return [EmbeddingMatch(post_id=row.post_id, similarity=similarity) for row, similarity in ranked]
+
+
+def cosine_similarity(left: Sequence[float], right: Sequence[float]) -> float:
+    """Cosine similarity of two vectors; 0.0 when either is empty or zero or they differ in length."""
+    if len(left) != len(right):
+        return 0.0
+    left_norm, right_norm = _norm(left), _norm(right)
+    if not left_norm or not right_norm:
+        return 0.0
+    return _cosine_similarities([list(left)], [left_norm], right, right_norm)[0]
+
+
+def _norm(vector: Sequence[float]) -> float:
+    return math.sqrt(sum(value * value for value in vector))
+
+
+def _cosine_similarities(
+    vectors: list[list[float]],
+    norms: list[float],
+    query: Sequence[float],
+    query_norm: float,
+) -> list[float]:
+    if np is not None:
+        matrix = np.asarray(vectors, dtype=np.float64)
+        dots = matrix @ np.asarray(query, dtype=np.float64)
+        return (dots / (np.asarray(norms, dtype=np.float64) * query_norm)).tolist()
+    return [
+        sum(a * b for a, b in zip(stored, query)) / (stored_norm * query_norm)
+        for stored, stored_norm in zip(vectors, norms)
+    ]
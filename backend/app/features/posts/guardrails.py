@@ -6,6 +6,10 @@ import re
 from backend.app.models.enums import PostType
 
 
+class GuardrailError(ValueError):
+    """Composed content was rejected by a content guardrail."""
+
+
 class ContentGuardrails:
     JOB_COMPLETION_PATTERNS = [
         r"\bjust\s+(finished|completed)\b",
@@ -288,6 +288,7 @@ class PostJobService:
         mapping.post_id = post_id
         mapping.status = "scheduled"
         self.db.add(mapping)
+        self._refresh_keyword_post_plan(mapping)
         self.db.commit()
 
     def _mark_mapping_status(self, *, post: Post, status: str) -> None:
@@ -304,3 +305,9 @@ class PostJobService:
             return
         mapping.status = status
         self.db.add(mapping)
+        self._refresh_keyword_post_plan(mapping)
+
+    def _refresh_keyword_post_plan(self, mapping: GbpPostKeywordMapping) -> None:
+        from backend.app.services.rank_tracking.keyword_strategy import refresh_dashboard_post_plan
+
+        refresh_dashboard_post_plan(self.db, mapping.campaign_cycle_id)
@@ -13,6 +13,7 @@ from backend.app.models.media.media_asset import MediaAsset
 from backend.app.models.media.media_upload_request import MediaUploadRequest
 from backend.app.models.media.client_upload import ClientUpload
 from backend.app.services.media.media_selection import MediaSelector
+from backend.app.services.media.media_tag_index import MediaTagIndex
 from backend.app.services.shared.validators import assert_location_in_org
 
 if TYPE_CHECKING:
@@ -98,6 +99,7 @@ class MediaManagementService:
         )
         self.db.add(asset)
         self.db.flush()
+        MediaTagIndex(self.db).index(asset)
         upload_record = ClientUpload(
             organization_id=organization_id,
             location_id=location_id,
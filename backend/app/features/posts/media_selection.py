@@ -2,10 +2,13 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
 import re
+from typing import Any, Sequence
 
+from sqlalchemy import case, func, or_, select, true
 from sqlalchemy.orm import Session
 
 from backend.app.models.media.media_asset import MediaAsset
+from backend.app.models.media.media_asset_tag import MediaAssetTag
 
 GENERAL_PHOTO_TAGS = {
     "team",
@@ -21,6 +24,27 @@ GENERAL_PHOTO_TAGS = {
 }
 
 
+def tokenize(value: str | None) -> set[str]:
+    if not value:
+        return set()
+    return {token for token in re.findall(r"[a-z0-9]+", value.lower()) if len(token) >= 3}
+
+
+def asset_tags(asset: Any) -> set[str]:
+    """Tag tokens of an asset: categories, shoot details, description, file name and metadata tags."""
+    tags: set[str] = set()
+    for value in asset.categories or []:
+        tags.update(tokenize(str(value)))
+    for value in (asset.job_type, asset.season, asset.shot_stage, asset.description, asset.file_name):
+        tags.update(tokenize(value))
+    metadata = asset.metadata_json or {}
+    raw_tags = metadata.get("tags") or metadata.get("service_tags") or []
+    if isinstance(raw_tags, list):
+        for value in raw_tags:
+            tags.update(tokenize(str(value)))
+    return tags
+
+
 class MediaSelector:
     def __init__(self, db: Session, freshness_days: int = 14) -> None:
         self.db = db
@@ -36,8 +60,59 @@ class MediaSelector:
         min_reuse_gap_days: int | None = None,
         mark_used: bool = True,
     ) -> MediaAsset | None:
-        query = self.db.query(MediaAsset).filter(MediaAsset.location_id == location_id)
-        assets = query.all()
+        """Pick the best asset of the location in one ranked query over the tag index.
+
+        Ranks exactly like `choose_asset`: relevant assets of the preferred source first, then
+        relevant assets of the other source, then everything else; within a pool, assets past
+        the reuse gap beat recently used ones, and ties go to never-used, least recently used,
+        least used and finally newest assets.
+        """
+        reuse_window = timedelta(days=min_reuse_gap_days) if min_reuse_gap_days is not None else self.reuse_window
+        cutoff = datetime.now(timezone.utc) - reuse_window
+        wanted = self._tokenize(service) | self._tokenize(theme)
+        if wanted:
+            relevant = (
+                select(MediaAssetTag.asset_id)
+                .where(MediaAssetTag.asset_id == MediaAsset.id)
+                .where(MediaAssetTag.tag.in_(sorted(wanted | GENERAL_PHOTO_TAGS)))
+                .exists()
+            )
+        else:
+            relevant = true()
+        is_upload = or_(MediaAsset.source.is_(None), MediaAsset.source.in_(("upload", "")))
+        pool = case((relevant, 0), else_=2) + case(
+            (is_upload, 0 if prefer_upload else 1), else_=1 if prefer_upload else 0
+        )
+        recently_used = case((MediaAsset.last_used_at > cutoff, 1), else_=0)
+        ever_used = case((MediaAsset.last_used_at.is_(None), 0), else_=1)
+        stmt = (
+            select(MediaAsset)
+            .where(MediaAsset.location_id == location_id)
+            .order_by(
+                pool,
+                recently_used,
+                ever_used,
+                MediaAsset.last_used_at.asc(),
+                func.coalesce(MediaAsset.usage_count, 0).asc(),
+                MediaAsset.created_at.desc(),
+            )
+            .limit(1)
+        )
+        chosen = self.db.execute(stmt).scalars().first()
+        if chosen and mark_used:
+            self.mark_used(chosen)
+        return chosen
+
+    def choose_asset(
+        self,
+        assets: Sequence[Any],
+        *,
+        theme: str | None = None,
+        service: str | None = None,
+        prefer_upload: bool = True,
+        min_reuse_gap_days: int | None = None,
+    ) -> Any | None:
+        """Rank already-loaded assets (anything with MediaAsset's attributes) without touching the session."""
         if not assets:
             return None
         reuse_window = timedelta(days=min_reuse_gap_days) if min_reuse_gap_days is not None else self.reuse_window
@@ -55,17 +130,17 @@ class MediaSelector:
         gbp = gbp + other
 
         ordered_pools = [uploads, gbp] if prefer_upload else [gbp, uploads]
-        pools: list[list[MediaAsset]] = []
+        pools: list[list[Any]] = []
         for pool in ordered_pools:
             pools.append([asset for asset in pool if relevance.get(asset.id, 0) > 0])
         for pool in ordered_pools:
             pools.append(list(pool))
 
-        chosen: MediaAsset | None = None
+        chosen = None
         for pool in pools:
             if not pool:
                 continue
-            eligible = [asset for asset in pool if not asset.last_used_at or asset.last_used_at <= cutoff]
+            eligible = [asset for asset in pool if not asset.last_used_at or self._as_aware(asset.last_used_at) <= cutoff]
             ranked_pool = eligible if eligible else pool
             chosen = sorted(
                 ranked_pool,
@@ -73,9 +148,6 @@ class MediaSelector:
             )[0]
             if chosen:
                 break
-
-        if chosen and mark_used:
-            self.mark_used(chosen)
         return chosen
 
     def mark_used(self, asset: MediaAsset, *, used_at: datetime | None = None) -> MediaAsset:
@@ -118,23 +190,11 @@ class MediaSelector:
         return score
 
     def _asset_tags(self, asset: MediaAsset) -> set[str]:
-        tags: set[str] = set()
-        for value in asset.categories or []:
-            tags.update(self._tokenize(str(value)))
-        for value in (asset.job_type, asset.season, asset.shot_stage, asset.description, asset.file_name):
-            tags.update(self._tokenize(value))
-        metadata = asset.metadata_json or {}
-        raw_tags = metadata.get("tags") or metadata.get("service_tags") or []
-        if isinstance(raw_tags, list):
-            for value in raw_tags:
-                tags.update(self._tokenize(str(value)))
-        return tags
+        return asset_tags(asset)
 
     @staticmethod
     def _tokenize(value: str | None) -> set[str]:
-        if not value:
-            return set()
-        return {token for token in re.findall(r"[a-z0-9]+", value.lower()) if len(token) >= 3}
+        return tokenize(value)
 
     @staticmethod
     def _as_aware(value: datetime | None) -> datetime:
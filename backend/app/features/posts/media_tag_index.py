@@ -0,0 +1,47 @@
+"""Inverted index of media asset tag tokens.
+
+Every asset's tag tokens (the same vocabulary `MediaSelector` ranks by) are stored as
+`media_asset_tags` rows when the asset is written, so selection tests relevance with an
+indexed lookup on ``(location_id, tag)`` instead of loading and re-tokenizing every asset of
+the location on each pick.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from backend.app.models.media.media_asset import MediaAsset
+from backend.app.models.media.media_asset_tag import MediaAssetTag
+from backend.app.services.media.media_selection import asset_tags
+
+MAX_TAG_LENGTH = 64
+
+
+def tag_rows(asset: Any) -> list[dict[str, Any]]:
+    """Index rows for an asset (anything with MediaAsset's attributes and an id)."""
+    return [
+        {"asset_id": asset.id, "tag": tag, "location_id": asset.location_id}
+        for tag in sorted(asset_tags(asset))
+        if len(tag) <= MAX_TAG_LENGTH
+    ]
+
+
+class MediaTagIndex:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def index(self, asset: MediaAsset) -> None:
+        """Replace the asset's tag rows; the asset must already be flushed."""
+        self.index_many([asset])
+
+    def index_many(self, assets: Iterable[MediaAsset]) -> None:
+        assets = list(assets)
+        if not assets:
+            return
+        self.db.execute(delete(MediaAssetTag).where(MediaAssetTag.asset_id.in_([asset.id for asset in assets])))
+        rows = [row for asset in assets for row in tag_rows(asset)]
+        if rows:
+            self.db.execute(insert(MediaAssetTag.__table__), rows)
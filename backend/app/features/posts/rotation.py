@@ -1,11 +1,49 @@
+"""Rotation of services, angles and CTAs across a location's posts.
+
+Each (location, key) pair keeps one compact `post_rotation_state` row: a usage count per
+value and a last-used ring of the most recently used distinct values (newest first, capped
+at `RECENT_LIMIT`). Picking only needs the last use of each value, so selection reads and
+rewrites a single bounded row no matter how long the location's history is. Writes are a
+compare-and-swap ``UPDATE ... RETURNING`` on the row's version, so concurrent composers
+never lose each other's uses.
+"""
+
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
-from typing import Iterable
+from typing import Any, Iterable, Mapping, Sequence
 
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
-from backend.app.models.posts.post_rotation_memory import PostRotationMemory
+from backend.app.models.posts.post_rotation_state import PostRotationState
+from backend.app.services.automation.action_fanout import dialect_insert
+from backend.app.services.shared.dates import as_utc
+
+RECENT_LIMIT = 32
+MAX_UPDATE_ATTEMPTS = 5
+
+
+def last_used_map(recent: Sequence[Sequence[str]] | None) -> dict[str, datetime]:
+    """The ring as ``{value: last_used_at}``."""
+    return {value: as_utc(datetime.fromisoformat(used_at)) for value, used_at in recent or []}
+
+
+def fold_uses(
+    counts: Mapping[str, int] | None,
+    recent: Sequence[Sequence[str]] | None,
+    uses: Iterable[tuple[str, datetime]],
+) -> tuple[dict[str, int], list[list[str]]]:
+    """Apply `uses` (value, used_at) to a state's counts and last-used ring."""
+    folded = dict(counts or {})
+    last_used = last_used_map(recent)
+    for value, used_at in uses:
+        used_at = as_utc(used_at)
+        folded[value] = folded.get(value, 0) + 1
+        if value not in last_used or used_at > last_used[value]:
+            last_used[value] = used_at
+    ordered = sorted(last_used.items(), key=lambda item: item[1], reverse=True)[:RECENT_LIMIT]
+    return folded, [[value, used_at.isoformat()] for value, used_at in ordered]
 
 
 class RotationEngine:
@@ -14,43 +52,96 @@ class RotationEngine:
         self.cooldown = timedelta(hours=cooldown_hours)
 
     def select_next(
-        self, *, organization_id, location_id, key: str, candidates: Iterable[str]
+        self,
+        *,
+        organization_id,
+        location_id,
+        key: str,
+        candidates: Iterable[str],
+        now: datetime | None = None,
     ) -> str | None:
-        now = datetime.now(timezone.utc)
-        memories = (
-            self.db.query(PostRotationMemory)
-            .filter(
-                PostRotationMemory.organization_id == organization_id,
-                PostRotationMemory.location_id == location_id,
-                PostRotationMemory.key == key,
-            )
-            .order_by(PostRotationMemory.last_used_at.desc())
-            .all()
-        )
+        candidates = list(candidates)
+        now = now or datetime.now(timezone.utc)
+        for _ in range(MAX_UPDATE_ATTEMPTS):
+            state = self.db.execute(
+                select(PostRotationState.counts, PostRotationState.recent, PostRotationState.version).where(
+                    PostRotationState.location_id == location_id,
+                    PostRotationState.key == key,
+                )
+            ).first()
+            if state is None:
+                self._create_state(organization_id=organization_id, location_id=location_id, key=key)
+                continue
+            choice = self.pick(last_used_map(state.recent), candidates, now=now)
+            if not choice:
+                return None
+            counts, recent = fold_uses(state.counts, state.recent, [(choice, now)])
+            swapped = self.db.execute(
+                update(PostRotationState)
+                .where(
+                    PostRotationState.location_id == location_id,
+                    PostRotationState.key == key,
+                    PostRotationState.version == state.version,
+                )
+                .values(counts=counts, recent=recent, version=PostRotationState.version + 1, updated_at=now)
+                .returning(PostRotationState.version)
+            ).first()
+            if swapped is not None:
+                self.db.commit()
+                return choice
+        raise RuntimeError(f"Rotation state for {key!r} kept changing; giving up after {MAX_UPDATE_ATTEMPTS} attempts")
+
+    def pick(self, last_used: Mapping[str, datetime], candidates: Sequence[str], *, now: datetime) -> str | None:
+        """The first candidate not used within the cooldown, given each value's last use."""
         cooldown_cutoff = now - self.cooldown
-        recent = {
-            memory.value
-            for memory in memories
-            if self._as_aware(memory.last_used_at) >= cooldown_cutoff
-        }
+        recent = {value for value, used_at in last_used.items() if as_utc(used_at) >= cooldown_cutoff}
         available = [value for value in candidates if value not in recent]
-        choice = available[0] if available else (candidates[0] if candidates else None)
-        if choice:
-            memory = PostRotationMemory(
-                organization_id=organization_id,
-                location_id=location_id,
-                key=key,
-                value=choice,
-                last_used_at=now,
+        return available[0] if available else (candidates[0] if candidates else None)
+
+    def record_many(self, states: Iterable[dict[str, Any]]) -> None:
+        """Upsert full state rows (organization_id, location_id, key, counts, recent) in one statement.
+
+        Used by batch planning, which folds its uses into states it loaded up front.
+        """
+        rows = list(states)
+        if not rows:
+            return
+        insert = dialect_insert(self.db)
+        if insert is None:
+            raise RuntimeError("Bulk rotation updates require Postgres or SQLite")
+        table = PostRotationState.__table__
+        stmt = insert(table).values(
+            [
+                {
+                    "tenant_id": row["organization_id"],
+                    "location_id": row["location_id"],
+                    "key": row["key"],
+                    "counts": row["counts"],
+                    "recent": row["recent"],
+                    "version": 0,
+                }
+                for row in rows
+            ]
+        )
+        self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.location_id, table.c.key],
+                set_={
+                    "counts": stmt.excluded.counts,
+                    "recent": stmt.excluded.recent,
+                    "version": table.c.version + 1,
+                },
             )
-            self.db.add(memory)
-            self.db.commit()
-        return choice
-
-    @staticmethod
-    def _as_aware(value: datetime | None) -> datetime:
-        if value is None:
-            return datetime.min.replace(tzinfo=timezone.utc)
-        if value.tzinfo is None:
-            return value.replace(tzinfo=timezone.utc)
-        return value
+        )
+
+    def _create_state(self, *, organization_id, location_id, key: str) -> None:
+        insert = dialect_insert(self.db)
+        if insert is None:
+            raise RuntimeError("Rotation state requires Postgres or SQLite")
+        table = PostRotationState.__table__
+        self.db.execute(
+            insert(table)
+            .values(tenant_id=organization_id, location_id=location_id, key=key, counts={}, recent=[], version=0)
+            .on_conflict_do_nothing(index_elements=[table.c.location_id, table.c.key])
+        )
+
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-from datetime import datetime, time, timedelta, timezone
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from difflib import SequenceMatcher
+from typing import Sequence
 import uuid
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
+from sqlalchemy import or_, select
 from sqlalchemy.orm import Session
 
 from backend.app.core.config import settings
@@ -12,6 +16,31 @@ from backend.app.models.enums import PostStatus
 from backend.app.models.google_business.location import Location
 from backend.app.models.identity.organization import Organization
 from backend.app.models.posts.post import Post
+from backend.app.models.posts.post_minhash_band import PostMinhashBand
+from backend.app.services.posts.content_reuse import (
+    MIN_BAND_MATCHES,
+    ContentReuseIndex,
+    band_keys,
+    minhash_signature,
+)
+from backend.app.services.posts.window_registry import WINDOW_RANGES
+
+# Band keys per lookup statement when validating posts in bulk.
+BAND_KEY_CHUNK = 20_000
+
+
+class PostingSafetyError(ValueError):
+    """A posting-safety rule (pause, cap, spacing, window, cooldown or reuse) rejected the post."""
+
+
+@dataclass(frozen=True)
+class PublishVerdict:
+    post_id: uuid.UUID
+    reason: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.reason is None
 
 
 class PostingSafetyService:
@@ -21,16 +50,12 @@ class PostingSafetyService:
     CONTENT_REUSE_COOLDOWN_DAYS = 90
     SIMILARITY_THRESHOLD = 0.88
     PUBLISH_EARLY_TOLERANCE = timedelta(minutes=5)
-    WINDOW_RANGES = {
-        "morning": (time(8, 0), time(10, 0)),
-        "midday": (time(11, 0), time(13, 0)),
-        "afternoon": (time(15, 0), time(17, 0)),
-        "evening": (time(18, 0), time(20, 0)),
-    }
+    WINDOW_RANGES = WINDOW_RANGES
     ACTIVE_STATUSES = (PostStatus.SCHEDULED, PostStatus.QUEUED, PostStatus.PUBLISHED)
 
     def __init__(self, db: Session) -> None:
         self.db = db
+        self.reuse_index = ContentReuseIndex(db)
 
     def validate(
         self,
@@ -47,7 +72,7 @@ class PostingSafetyService:
         org = self.db.get(Organization, organization_id)
         location = self.db.get(Location, location_id)
         self._ensure_not_paused(org=org, location=location)
-        cap = self._resolve_cap(org=org, location=location)
+        cap = self.resolve_cap(org=org, location=location)
         self._enforce_post_frequency(location_id=location_id, target_time=target_time, cap=cap)
         self._enforce_min_gap(location_id=location_id, target_time=target_time)
         self._enforce_schedule_window(location=location, target_time=target_time, window_id=window_id)
@@ -62,31 +87,149 @@ class PostingSafetyService:
             )
 
     def validate_publish_ready(self, post: Post, *, now: datetime | None = None) -> None:
-        if post.status == PostStatus.PUBLISHED or post.published_at or post.external_post_id:
-            return
-        if post.status not in {PostStatus.SCHEDULED, PostStatus.QUEUED}:
-            raise ValueError(f"Post status {post.status.value} is not publishable")
+        (verdict,) = self.validate_many([post], now=now)
+        if verdict.reason:
+            raise PostingSafetyError(verdict.reason)
+
+    def validate_many(self, posts: Sequence[Post], *, now: datetime | None = None) -> list[PublishVerdict]:
+        """Publish-readiness verdicts for `posts`, in order, without writing anything.
+
+        Pause state, weekly caps, the minimum gap and content reuse are evaluated in memory
+        against a fixed set of grouped queries over every target location, so the statement
+        count does not grow with the number of posts.
+        """
         now = self._normalize_dt(now or datetime.now(timezone.utc))
+        pending = [post for post in posts if not self._already_published(post)]
+        if not pending:
+            return [PublishVerdict(post.id) for post in posts]
+        organization_ids = {post.organization_id for post in pending}
+        location_ids = {post.location_id for post in pending}
+        orgs = {org.id: org for org in self.db.query(Organization).filter(Organization.id.in_(organization_ids))}
+        locations = {
+            location.id: location for location in self.db.query(Location).filter(Location.id.in_(location_ids))
+        }
+        published: dict[uuid.UUID, list[tuple[uuid.UUID, datetime]]] = defaultdict(list)
+        for row in self.db.execute(
+            select(Post.id, Post.location_id, Post.published_at).where(
+                Post.location_id.in_(location_ids),
+                Post.status == PostStatus.PUBLISHED,
+                Post.published_at >= now - timedelta(days=7),
+                Post.published_at <= now,
+            )
+        ):
+            published[row.location_id].append((row.id, self._normalize_dt(row.published_at)))
+        reuse = self._reuse_violations(pending, now=now)
+
+        verdicts = []
+        for post in posts:
+            reason = None
+            if not self._already_published(post):
+                org = orgs.get(post.organization_id)
+                location = locations.get(post.location_id)
+                reason = self._publish_violation(
+                    post,
+                    now=now,
+                    pause_reason=self._pause_reason(org=org, location=location),
+                    cap=self.resolve_cap(org=org, location=location),
+                    published=[entry for entry in published[post.location_id] if entry[0] != post.id],
+                ) or reuse.get(post.id)
+            verdicts.append(PublishVerdict(post.id, reason))
+        return verdicts
+
+    def _publish_violation(
+        self,
+        post: Post,
+        *,
+        now: datetime,
+        pause_reason: str | None,
+        cap: int | None,
+        published: Sequence[tuple[uuid.UUID, datetime]],
+    ) -> str | None:
+        if post.status not in {PostStatus.SCHEDULED, PostStatus.QUEUED}:
+            return f"Post status {post.status.value} is not publishable"
         scheduled_at = self._normalize_dt(post.scheduled_at)
         if scheduled_at and scheduled_at > now + self.PUBLISH_EARLY_TOLERANCE:
-            raise ValueError("Post is not due for publishing yet")
-        org = self.db.get(Organization, post.organization_id)
-        location = self.db.get(Location, post.location_id)
-        self._ensure_not_paused(org=org, location=location)
-        cap = self._resolve_cap(org=org, location=location)
-        self._enforce_publish_frequency(post=post, now=now, cap=cap)
-        self._enforce_publish_min_gap(post=post, now=now)
-        self._enforce_content_reuse(
-            location_id=post.location_id,
-            target_time=now,
-            body=post.body,
-            fingerprint=post.fingerprint,
-            exclude_post_id=post.id,
-        )
+            return "Post is not due for publishing yet"
+        if pause_reason:
+            return pause_reason
+        limit = cap if cap is not None else self.MAX_POSTS_PER_WEEK
+        if len(published) >= limit:
+            return "Maximum published posts per week exceeded for this location"
+        latest = max((published_at for _, published_at in published), default=None)
+        if latest and now - latest < timedelta(hours=self.MIN_GAP_HOURS):
+            return "Minimum gap between published posts not satisfied"
+        return None
+
+    def _reuse_violations(self, posts: Sequence[Post], *, now: datetime) -> dict[uuid.UUID, str]:
+        """Content-reuse verdicts for many posts, with the same candidate rules as the reuse index."""
+        probes = []
+        for post in posts:
+            normalized = self._normalize_text(post.body)
+            if normalized:
+                signature = minhash_signature(normalized)
+                probes.append((post, normalized, band_keys(signature) if signature else []))
+        if not probes:
+            return {}
+        location_ids = {post.location_id for post, _, _ in probes}
+        probes_by_key: dict[tuple[uuid.UUID, int], list[int]] = defaultdict(list)
+        for index, (post, _, keys) in enumerate(probes):
+            for key in keys:
+                probes_by_key[(post.location_id, key)].append(index)
+        band_matches: list[Counter] = [Counter() for _ in probes]
+        all_keys = sorted({key for _, key in probes_by_key})
+        for start in range(0, len(all_keys), BAND_KEY_CHUNK):
+            for row in self.db.execute(
+                select(PostMinhashBand.post_id, PostMinhashBand.location_id, PostMinhashBand.band_key).where(
+                    PostMinhashBand.location_id.in_(location_ids),
+                    PostMinhashBand.band_key.in_(all_keys[start : start + BAND_KEY_CHUNK]),
+                )
+            ):
+                for index in probes_by_key.get((row.location_id, row.band_key), ()):
+                    band_matches[index][row.post_id] += 1
+        matched = [{post_id for post_id, count in counts.items() if count >= MIN_BAND_MATCHES} for counts in band_matches]
+        fingerprints = {post.fingerprint for post, _, _ in probes if post.fingerprint}
+        conditions = [Post.minhash_signature.is_(None), Post.id.in_(set().union(*matched))]
+        if fingerprints:
+            conditions.append(Post.fingerprint.in_(fingerprints))
+        cutoff = now - timedelta(days=self.CONTENT_REUSE_COOLDOWN_DAYS)
+        priors: dict[uuid.UUID, list] = defaultdict(list)
+        for row in self.db.execute(
+            select(
+                Post.id,
+                Post.location_id,
+                Post.body,
+                Post.fingerprint,
+                Post.minhash_signature.is_(None).label("unsigned"),
+            )
+            .where(Post.location_id.in_(location_ids))
+            .where(Post.status.in_(self.ACTIVE_STATUSES))
+            .where(Post.created_at >= cutoff)
+            .where(or_(*conditions))
+        ):
+            priors[row.location_id].append(row)
+
+        violations: dict[uuid.UUID, str] = {}
+        for index, (post, normalized, _) in enumerate(probes):
+            for prior in priors[post.location_id]:
+                if prior.id == post.id:
+                    continue
+                if not (
+                    prior.unsigned
+                    or prior.id in matched[index]
+                    or (post.fingerprint and prior.fingerprint == post.fingerprint)
+                ):
+                    continue
+                violation = self.reuse_violation(normalized, post.fingerprint, prior.body, prior.fingerprint)
+                if violation:
+                    violations[post.id] = violation
+                    break
+        return violations
 
     def ensure_not_paused(self, *, organization_id: uuid.UUID, location_id: uuid.UUID) -> None:
+        """Explicit pre-publish step: persist a lapsed subscription's auto-pause, then check pauses."""
         org = self.db.get(Organization, organization_id)
         location = self.db.get(Location, location_id)
+        self.apply_subscription_pause(org)
         self._ensure_not_paused(org=org, location=location)
 
     def _enforce_post_frequency(self, *, location_id: uuid.UUID, target_time: datetime, cap: int | None) -> None:
@@ -101,7 +244,7 @@ class PostingSafetyService:
             .count()
         )
         if count >= limit:
-            raise ValueError("Maximum posts per week exceeded for this location")
+            raise PostingSafetyError("Maximum posts per week exceeded for this location")
 
     def _enforce_min_gap(self, *, location_id: uuid.UUID, target_time: datetime) -> None:
         previous_post = (
@@ -126,11 +269,11 @@ class PostingSafetyService:
         if previous_post and previous_post.scheduled_at:
             previous_time = self._normalize_dt(previous_post.scheduled_at)
             if target_time - previous_time < min_gap:
-                raise ValueError("Minimum gap between posts not satisfied")
+                raise PostingSafetyError("Minimum gap between posts not satisfied")
         if next_post and next_post.scheduled_at:
             next_time = self._normalize_dt(next_post.scheduled_at)
             if next_time - target_time < min_gap:
-                raise ValueError("Minimum gap between posts not satisfied")
+                raise PostingSafetyError("Minimum gap between posts not satisfied")
 
     def _enforce_bucket_cooldown(self, *, location_id: uuid.UUID, bucket: str, target_time: datetime) -> None:
         cutoff = target_time - timedelta(days=self.BUCKET_COOLDOWN_DAYS)
@@ -143,38 +286,7 @@ class PostingSafetyService:
             .first()
         )
         if recent:
-            raise ValueError("This bucket/topic was used too recently")
-
-    def _enforce_publish_frequency(self, *, post: Post, now: datetime, cap: int | None) -> None:
-        limit = cap if cap is not None else self.MAX_POSTS_PER_WEEK
-        window_start = now - timedelta(days=7)
-        count = (
-            self.db.query(Post)
-            .filter(Post.location_id == post.location_id)
-            .filter(Post.id != post.id)
-            .filter(Post.status == PostStatus.PUBLISHED)
-            .filter(Post.published_at >= window_start)
-            .filter(Post.published_at <= now)
-            .count()
-        )
-        if count >= limit:
-            raise ValueError("Maximum published posts per week exceeded for this location")
-
-    def _enforce_publish_min_gap(self, *, post: Post, now: datetime) -> None:
-        recent = (
-            self.db.query(Post)
-            .filter(Post.location_id == post.location_id)
-            .filter(Post.id != post.id)
-            .filter(Post.status == PostStatus.PUBLISHED)
-            .filter(Post.published_at != None)  # noqa: E711
-            .filter(Post.published_at <= now)
-            .order_by(Post.published_at.desc())
-            .first()
-        )
-        if recent and recent.published_at:
-            published_at = self._normalize_dt(recent.published_at)
-            if now - published_at < timedelta(hours=self.MIN_GAP_HOURS):
-                raise ValueError("Minimum gap between published posts not satisfied")
+            raise PostingSafetyError("This bucket/topic was used too recently")
 
     def _enforce_content_reuse(
         self,
@@ -189,27 +301,69 @@ class PostingSafetyService:
         if not normalized_body:
             return
         cutoff = target_time - timedelta(days=self.CONTENT_REUSE_COOLDOWN_DAYS)
-        query = (
-            self.db.query(Post)
-            .filter(Post.location_id == location_id)
-            .filter(Post.status.in_(self.ACTIVE_STATUSES))
-            .filter(Post.created_at >= cutoff)
+        candidates = self.reuse_index.candidates(
+            location_id,
+            normalized_body,
+            since=cutoff,
+            statuses=self.ACTIVE_STATUSES,
+            exclude_post_id=exclude_post_id,
+            fingerprint=fingerprint,
         )
-        if exclude_post_id:
-            query = query.filter(Post.id != exclude_post_id)
-        for prior in query.all():
-            if fingerprint and prior.fingerprint and prior.fingerprint == fingerprint:
-                raise ValueError("Same post content was used too recently")
-            prior_body = self._normalize_text(prior.body)
-            if not prior_body:
-                continue
-            if normalized_body == prior_body:
-                raise ValueError("Same post content was used too recently")
-            if (
-                min(len(normalized_body), len(prior_body)) >= 80
-                and SequenceMatcher(None, normalized_body, prior_body).ratio() >= self.SIMILARITY_THRESHOLD
-            ):
-                raise ValueError("Post content is too similar to recent content")
+        for prior in candidates:
+            violation = self.reuse_violation(normalized_body, fingerprint, prior.body, prior.fingerprint)
+            if violation:
+                raise PostingSafetyError(violation)
+
+    @classmethod
+    def reuse_violation(
+        cls,
+        normalized_body: str,
+        fingerprint: str | None,
+        prior_body: str | None,
+        prior_fingerprint: str | None,
+    ) -> str | None:
+        """Why `normalized_body` may not reuse one prior post's content, or None when it may."""
+        if fingerprint and prior_fingerprint and prior_fingerprint == fingerprint:
+            return "Same post content was used too recently"
+        prior_body = cls._normalize_text(prior_body)
+        if not prior_body:
+            return None
+        if normalized_body == prior_body:
+            return "Same post content was used too recently"
+        if (
+            min(len(normalized_body), len(prior_body)) >= 80
+            and SequenceMatcher(None, normalized_body, prior_body).ratio() >= cls.SIMILARITY_THRESHOLD
+        ):
+            return "Post content is too similar to recent content"
+        return None
+
+    @classmethod
+    def slot_violation(
+        cls,
+        scheduled: Sequence[tuple[datetime, str | None]],
+        *,
+        target_time: datetime,
+        bucket: str | None,
+        cap: int | None,
+    ) -> str | None:
+        """Frequency, minimum-gap and bucket-cooldown checks against already-loaded
+        `(scheduled_at, bucket)` pairs of a location's active posts."""
+        limit = cap if cap is not None else cls.MAX_POSTS_PER_WEEK
+        week_start = target_time - timedelta(days=7)
+        min_gap = timedelta(hours=cls.MIN_GAP_HOURS)
+        cooldown_start = target_time - timedelta(days=cls.BUCKET_COOLDOWN_DAYS)
+        in_week = 0
+        for scheduled_at, prior_bucket in scheduled:
+            scheduled_at = cls._normalize_dt(scheduled_at)
+            if week_start <= scheduled_at <= target_time:
+                in_week += 1
+            if abs(target_time - scheduled_at) < min_gap:
+                return "Minimum gap between posts not satisfied"
+            if bucket and prior_bucket == bucket and cooldown_start <= scheduled_at <= target_time:
+                return "This bucket/topic was used too recently"
+        if in_week >= limit:
+            return "Maximum posts per week exceeded for this location"
+        return None
 
     def _enforce_schedule_window(
         self,
@@ -222,7 +376,7 @@ class PostingSafetyService:
             return
         window = self.WINDOW_RANGES.get(window_id)
         if not window:
-            raise ValueError("Unknown posting window")
+            raise PostingSafetyError("Unknown posting window")
         timezone_name = location.timezone if location and location.timezone else "UTC"
         try:
             local_time = target_time.astimezone(ZoneInfo(timezone_name)).time()
@@ -230,30 +384,52 @@ class PostingSafetyService:
             local_time = target_time.astimezone(timezone.utc).time()
         start, end = window
         if not (start <= local_time <= end):
-            raise ValueError("Scheduled time is outside the selected posting window")
+            raise PostingSafetyError("Scheduled time is outside the selected posting window")
+
+    def apply_subscription_pause(self, org: Organization | None) -> bool:
+        """Persist the auto-pause of an organization whose cancelled subscription has lapsed.
+
+        This is the only write the safety checks imply; validation itself treats a lapsed
+        subscription as paused without touching the organization.
+        """
+        if not org or org.posting_paused or not self._subscription_lapsed(org):
+            return False
+        org.posting_paused = True
+        org.is_active = False
+        self.db.add(org)
+        self.db.commit()
+        return True
 
     def _ensure_not_paused(self, *, org: Organization | None, location: Location | None) -> None:
+        reason = self._pause_reason(org=org, location=location)
+        if reason:
+            raise PostingSafetyError(reason)
+
+    @classmethod
+    def _pause_reason(cls, *, org: Organization | None, location: Location | None) -> str | None:
         if settings.GLOBAL_POSTING_PAUSE:
-            raise ValueError("Posting is paused globally")
-        # Auto-pause if subscription expired
-        if org:
-            metadata = org.metadata_json or {}
-            cancel_at_period_end = metadata.get("cancel_at_period_end")
-            current_period_end = metadata.get("current_period_end")
-            if cancel_at_period_end and current_period_end:
-                now_ts = datetime.now(timezone.utc).timestamp()
-                if now_ts > current_period_end:
-                    org.posting_paused = True
-                    org.is_active = False
-                    self.db.add(org)
-                    self.db.commit()
-        if org and org.posting_paused:
-            raise ValueError("Posting is paused for this organization")
+            return "Posting is paused globally"
+        if org and (org.posting_paused or cls._subscription_lapsed(org)):
+            return "Posting is paused for this organization"
         if location and location.posting_paused:
-            raise ValueError("Posting is paused for this location")
+            return "Posting is paused for this location"
+        return None
+
+    @staticmethod
+    def _subscription_lapsed(org: Organization) -> bool:
+        metadata = org.metadata_json or {}
+        cancel_at_period_end = metadata.get("cancel_at_period_end")
+        current_period_end = metadata.get("current_period_end")
+        if not (cancel_at_period_end and current_period_end):
+            return False
+        return datetime.now(timezone.utc).timestamp() > current_period_end
+
+    @staticmethod
+    def _already_published(post: Post) -> bool:
+        return bool(post.status == PostStatus.PUBLISHED or post.published_at or post.external_post_id)
 
     @staticmethod
-    def _resolve_cap(*, org: Organization | None, location: Location | None) -> int | None:
+    def resolve_cap(*, org: Organization | None, location: Location | None) -> int | None:
         if location and location.posting_cap_per_week is not None:
             return location.posting_cap_per_week
         if org and org.posting_cap_per_week is not None:
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone, time
+from datetime import datetime, timezone
 import uuid
 
 from sqlalchemy.orm import Session
@@ -9,19 +9,12 @@ from backend.app.models.enums import PostStatus, PostType
 from backend.app.models.posts.post_candidate import PostCandidate
 from backend.app.models.posts.post import Post
 from backend.app.services.posts.posts import PostService
-from backend.app.services.posts.posting_windows import PostingWindowService, POSTING_WINDOWS
+from backend.app.services.posts.posting_windows import PostingWindowService
+from backend.app.services.posts.window_registry import window_range
 from backend.app.models.google_business.location import Location
 from zoneinfo import ZoneInfo
 from backend.app.services.shared.settings import SettingsService
 
-WINDOW_RANGES = {
-    "morning": (time(8, 0), time(10, 0)),
-    "midday": (time(11, 0), time(13, 0)),
-    "afternoon": (time(15, 0), time(17, 0)),
-    "evening": (time(18, 0), time(20, 0)),
-}
-
-
 class PostSchedulerService:
     def __init__(self, db: Session) -> None:
         self.db = db
@@ -89,7 +82,12 @@ class PostSchedulerService:
         return candidate
 
     def _resolve_datetime(self, candidate_date, window_id: str, timezone_name: str) -> datetime:
-        start, _ = WINDOW_RANGES.get(window_id, (time(9, 0), time(11, 0)))
-        local_tz = ZoneInfo(timezone_name)
-        local_dt = datetime.combine(candidate_date, start, tzinfo=local_tz)
-        return local_dt.astimezone(timezone.utc)
+        return resolve_window_datetime(candidate_date, window_id, timezone_name)
+
+
+def resolve_window_datetime(candidate_date, window_id: str, timezone_name: str) -> datetime:
+    """UTC start of `window_id` on `candidate_date` in the location's timezone."""
+    start, _ = window_range(window_id)
+    local_tz = ZoneInfo(timezone_name)
+    local_dt = datetime.combine(candidate_date, start, tzinfo=local_tz)
+    return local_dt.astimezone(timezone.utc)
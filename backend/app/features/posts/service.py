@@ -16,8 +16,12 @@ from backend.app.services.shared.validators import (
     assert_location_in_org,
     assert_connected_account_in_org,
 )
+from backend.app.services.content.caption_completions import CaptionCompletionCache
 from backend.app.services.content.captions import CaptionGenerator
+from backend.app.services.content.content_guardrails import GuardrailError
 from backend.app.services.media.media_selection import MediaSelector
+from backend.app.services.posts.content_reuse import ContentReuseIndex
+from backend.app.services.posts.post_embeddings import PostEmbeddingIndex
 from backend.app.services.posts.rotation import RotationEngine
 from backend.app.services.posts.scheduling import AutoScheduler
 from backend.app.services.posts.posting_safety import PostingSafetyService
@@ -36,6 +40,9 @@ class PostService:
         self.safety = PostingSafetyService(db)
         self.approvals = ApprovalService(db)
         self.settings = SettingsService(db)
+        self.embedding_index = PostEmbeddingIndex(db)
+        self.reuse_index = ContentReuseIndex(db)
+        self.completions = CaptionCompletionCache(db)
 
     def validate_scope(
         self,
@@ -94,7 +101,7 @@ class PostService:
             .first()
         )
         if existing:
-            raise ValueError("Similar content recently planned; deduped.")
+            raise GuardrailError("Similar content recently planned; deduped.")
         post = Post(
             organization_id=organization_id,
             location_id=location_id,
@@ -112,6 +119,11 @@ class PostService:
         )
         self.db.add(post)
         self.db.flush()
+        self.reuse_index.index(post)
+        # Composed captions carry their vector; index it once for near-duplicate checks.
+        embedding = context.get("embedding") if isinstance(context, dict) else None
+        if isinstance(embedding, list):
+            self.embedding_index.add(post, embedding)
 
         if media_asset_id:
             asset = self.db.get(MediaAsset, media_asset_id)
@@ -122,7 +134,7 @@ class PostService:
 
         brand_voice = brand_voice or {"tone": merged_settings.get("tone_of_voice")}
         banned_phrases = merged_settings.get("banned_phrases", [])
-        generator = CaptionGenerator(brand_voice, banned_phrases=banned_phrases)
+        generator = CaptionGenerator(brand_voice, banned_phrases=banned_phrases, completions=self.completions)
         for variant_payload in generator.generate_variants(
             base_prompt=base_prompt,
             services=services or [],
@@ -132,7 +144,7 @@ class PostService:
             post_type=post_type,
         ):
             if variant_payload["compliance_flags"].get("banned_phrases"):
-                raise ValueError("Caption contains banned or profane language")
+                raise GuardrailError("Caption contains banned or profane language")
             variant = PostVariant(
                 post_id=post.id,
                 body=variant_payload["body"],
@@ -140,7 +152,7 @@ class PostService:
             )
             self.db.add(variant)
 
-        if self._requires_pricing_approval(base_prompt):
+        if self.requires_pricing_approval(base_prompt):
             post.status = PostStatus.DRAFT
             self.db.add(post)
             self.approvals.create_request(
@@ -249,7 +261,8 @@ class PostService:
             dedupe_key=f"post:{post.id}",
         )
 
-    def _requires_pricing_approval(self, text: str) -> bool:
+    @staticmethod
+    def requires_pricing_approval(text: str) -> bool:
         lowered = text.lower()
         triggers = ["%", "discount", "sale", "save ", "$"]
         return any(token in lowered for token in triggers)
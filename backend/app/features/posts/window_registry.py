@@ -0,0 +1,34 @@
+"""The posting windows a post can be scheduled into, in local time of the location.
+
+Scheduling, safety checks and window selection all read window ids and hours from here.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import time
+
+
+@dataclass(frozen=True)
+class PostingWindow:
+    id: str
+    label: str
+    start: time
+    end: time
+
+
+WINDOWS: tuple[PostingWindow, ...] = (
+    PostingWindow("morning", "8-10am", time(8, 0), time(10, 0)),
+    PostingWindow("midday", "11-1pm", time(11, 0), time(13, 0)),
+    PostingWindow("afternoon", "3-5pm", time(15, 0), time(17, 0)),
+    PostingWindow("evening", "6-8pm", time(18, 0), time(20, 0)),
+)
+WINDOW_IDS: tuple[str, ...] = tuple(window.id for window in WINDOWS)
+WINDOW_RANGES: dict[str, tuple[time, time]] = {window.id: (window.start, window.end) for window in WINDOWS}
+POSTING_WINDOWS: list[dict[str, str]] = [{"id": window.id, "label": window.label} for window in WINDOWS]
+DEFAULT_RANGE = (time(9, 0), time(11, 0))
+
+
+def window_range(window_id: str | None) -> tuple[time, time]:
+    """Local (start, end) of `window_id`, or the default range for unknown ids."""
+    return WINDOW_RANGES.get(window_id or "", DEFAULT_RANGE)
@@ -0,0 +1,200 @@
+"""Thompson sampling of posting windows for many posts at once.
+
+Each (location, window) stat is a Beta posterior: alpha counts clicks and conversions,
+beta counts impressions that did not click, and windows without a stat get a modest
+Beta(1, 3) prior so known performers win. Locations with no stats at all pick uniformly.
+Stats for every requested location are read in one query and all draws come from one
+seedable generator (vectorized with numpy when it is installed), so choosing windows for
+a batch costs the same statements as choosing one. Outcomes are folded per window and
+applied as a single upsert of atomic increments.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, time
+import random
+from typing import Any, Iterable, Mapping, Sequence
+import uuid
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.app.models.posts.posting_window_stat import PostingWindowStat
+from backend.app.services.automation.action_fanout import dialect_insert
+from backend.app.services.posts.window_registry import POSTING_WINDOWS, WINDOW_IDS, WINDOWS
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+UNSEEN_PRIOR = (1, 3)
+WEEKDAY_KEYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+WINDOW_POSITIONS = {window_id: position for position, window_id in enumerate(WINDOW_IDS)}
+
+
+@dataclass(frozen=True)
+class WindowRequest:
+    location_id: uuid.UUID
+    business_hours: dict | None = None
+    timezone_name: str | None = None
+    target_date: date | None = None
+
+
+@dataclass(frozen=True)
+class WindowOutcome:
+    organization_id: uuid.UUID
+    location_id: uuid.UUID
+    window_id: str
+    impressions: int = 0
+    clicks: int = 0
+    conversions: int = 0
+
+
+def beta_params(stat: Any | None) -> tuple[int, int]:
+    """Beta posterior (alpha, beta) of a stat row; the unseen prior when there is none."""
+    if stat is None:
+        return UNSEEN_PRIOR
+    clicks = stat.clicks or 0
+    alpha = 1 + clicks + (stat.conversions or 0)
+    beta = 1 + max((stat.impressions or 0) - clicks, 0)
+    return alpha, beta
+
+
+def open_windows(business_hours: dict | None, timezone_name: str | None, target_date=None) -> list[dict[str, str]]:
+    """Windows whose start falls within the location's business hours on `target_date`."""
+    if not business_hours or not timezone_name or not isinstance(business_hours, dict):
+        return POSTING_WINDOWS
+    weekday = target_date.weekday() if target_date else 0
+    hours = business_hours.get(WEEKDAY_KEYS[weekday]) or business_hours.get("mon")
+    if not (isinstance(hours, (list, tuple)) and len(hours) == 2):
+        return POSTING_WINDOWS
+    tz = ZoneInfo(timezone_name)
+    open_h, open_m = map(int, hours[0].split(":"))
+    close_h, close_m = map(int, hours[1].split(":"))
+    open_time = time(hour=open_h, minute=open_m, tzinfo=tz)
+    close_time = time(hour=close_h, minute=close_m, tzinfo=tz)
+    filtered = [
+        posting_window
+        for posting_window, window in zip(POSTING_WINDOWS, WINDOWS)
+        if open_time <= window.start.replace(tzinfo=tz) <= close_time
+    ]
+    return filtered or POSTING_WINDOWS
+
+
+class WindowSelector:
+    def __init__(self, db: Session, *, seed: int | None = None) -> None:
+        self.db = db
+        self.rng = np.random.default_rng(seed) if np is not None else random.Random(seed)
+
+    def load_stats(self, location_ids: Iterable[uuid.UUID]) -> dict[uuid.UUID, dict[str, Any]]:
+        """Window stats keyed by location and window id, for all `location_ids` in one query."""
+        ids = set(location_ids)
+        stats: dict[uuid.UUID, dict[str, Any]] = defaultdict(dict)
+        if not ids:
+            return stats
+        for row in self.db.execute(
+            select(
+                PostingWindowStat.location_id,
+                PostingWindowStat.window_id,
+                PostingWindowStat.impressions,
+                PostingWindowStat.clicks,
+                PostingWindowStat.conversions,
+            ).where(PostingWindowStat.location_id.in_(ids))
+        ):
+            stats[row.location_id][row.window_id] = row
+        return stats
+
+    def choose_many(
+        self,
+        requests: Sequence[WindowRequest],
+        *,
+        stats: Mapping[uuid.UUID, Mapping[str, Any]] | None = None,
+    ) -> list[dict[str, str]]:
+        """One window per request, in order; stats are loaded when not given."""
+        if stats is None:
+            stats = self.load_stats(request.location_id for request in requests)
+        return self.sample(
+            [stats.get(request.location_id) or {} for request in requests],
+            [
+                open_windows(request.business_hours, request.timezone_name, request.target_date)
+                for request in requests
+            ],
+        )
+
+    def sample(
+        self,
+        stats: Sequence[Mapping[str, Any]],
+        windows: Sequence[Sequence[dict[str, str]]],
+    ) -> list[dict[str, str]]:
+        """Thompson-sample one of `windows[i]` from `stats[i]` for every draw, in one pass."""
+        if not stats:
+            return []
+        params = [
+            [beta_params(location_stats.get(window_id)) for window_id in WINDOW_IDS] for location_stats in stats
+        ]
+        uniform = [not location_stats for location_stats in stats]
+        if np is not None:
+            scores = self._np_scores(params, uniform)
+        else:
+            scores = [
+                [self.rng.random() if flat else self.rng.betavariate(a, b) for a, b in row]
+                for row, flat in zip(params, uniform)
+            ]
+        return [
+            max(candidates, key=lambda window: row[WINDOW_POSITIONS[window["id"]]])
+            for row, candidates in zip(scores, windows)
+        ]
+
+    def _np_scores(self, params: list[list[tuple[int, int]]], uniform: list[bool]):
+        matrix = np.asarray(params, dtype=np.float64)
+        scores = self.rng.beta(matrix[..., 0], matrix[..., 1])
+        flat = np.asarray(uniform)
+        if flat.any():
+            scores[flat] = self.rng.random((int(flat.sum()), len(WINDOW_IDS)))
+        return scores.tolist()
+
+    def record_many(self, outcomes: Iterable[WindowOutcome]) -> None:
+        """Add outcomes to their window stats as atomic increments, in one upsert; no commit."""
+        totals: dict[tuple[uuid.UUID, str], list] = {}
+        for outcome in outcomes:
+            entry = totals.setdefault(
+                (outcome.location_id, outcome.window_id), [outcome.organization_id, 0, 0, 0]
+            )
+            entry[1] += outcome.impressions
+            entry[2] += outcome.clicks
+            entry[3] += outcome.conversions
+        if not totals:
+            return
+        insert = dialect_insert(self.db)
+        if insert is None:
+            raise RuntimeError("Bulk window stat updates require Postgres or SQLite")
+        table = PostingWindowStat.__table__
+        stmt = insert(table).values(
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "tenant_id": organization_id,
+                    "location_id": location_id,
+                    "window_id": window_id,
+                    "impressions": impressions,
+                    "clicks": clicks,
+                    "conversions": conversions,
+                }
+                for (location_id, window_id), (organization_id, impressions, clicks, conversions) in totals.items()
+            ]
+        )
+        self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.location_id, table.c.window_id],
+                set_={
+                    "impressions": table.c.impressions + stmt.excluded.impressions,
+                    "clicks": table.c.clicks + stmt.excluded.clicks,
+                    "conversions": table.c.conversions + stmt.excluded.conversions,
+                },
+            )
+        )
+
@@ -1,25 +1,18 @@
 from __future__ import annotations
 
-import random
-from datetime import time
-from zoneinfo import ZoneInfo
+from typing import Mapping
 import uuid
 
 from sqlalchemy.orm import Session
 
 from backend.app.models.posts.posting_window_stat import PostingWindowStat
-
-POSTING_WINDOWS = [
-    {"id": "morning", "label": "8-10am"},
-    {"id": "midday", "label": "11-1pm"},
-    {"id": "afternoon", "label": "3-5pm"},
-    {"id": "evening", "label": "6-8pm"},
-]
+from backend.app.services.posts.window_selection import WindowOutcome, WindowRequest, WindowSelector, open_windows
 
 
 class PostingWindowService:
-    def __init__(self, db: Session) -> None:
+    def __init__(self, db: Session, *, seed: int | None = None) -> None:
         self.db = db
+        self.selector = WindowSelector(db, seed=seed)
 
     def choose_window(
         self,
@@ -30,61 +23,35 @@ class PostingWindowService:
         timezone_name: str | None = None,
         target_date=None,
     ) -> dict[str, str]:
-        stats = {
-            stat.window_id: stat
-            for stat in self.db.query(PostingWindowStat)
-            .filter(
-                PostingWindowStat.organization_id == organization_id,
-                PostingWindowStat.location_id == location_id,
-            )
-            .all()
-        }
-        windows = self._filter_by_business_hours(business_hours, timezone_name, target_date)
-        if not stats:
-            return random.choice(windows)
-        sampled = []
-        for window in windows:
-            stat = stats.get(window["id"])
-            if not stat:
-                sample = random.betavariate(1, 3)  # modest prior so known performers win
-            else:
-                alpha = 1 + (stat.clicks + stat.conversions)
-                impressions = stat.impressions
-                beta = 1 + max(impressions - stat.clicks, 0)
-                sample = random.betavariate(alpha, beta)
-            sampled.append((window, sample))
-        sampled.sort(key=lambda item: item[1], reverse=True)
-        return sampled[0][0]
+        (window,) = self.selector.choose_many(
+            [
+                WindowRequest(
+                    location_id=location_id,
+                    business_hours=business_hours,
+                    timezone_name=timezone_name,
+                    target_date=target_date,
+                )
+            ]
+        )
+        return window
+
+    def choose_from_stats(
+        self,
+        stats: Mapping[str, PostingWindowStat],
+        *,
+        business_hours: dict | None = None,
+        timezone_name: str | None = None,
+        target_date=None,
+    ) -> dict[str, str]:
+        """Thompson-sample a window from already-loaded stats keyed by window id."""
+        (window,) = self.selector.sample(
+            [stats], [self._filter_by_business_hours(business_hours, timezone_name, target_date)]
+        )
+        return window
 
     @staticmethod
     def _filter_by_business_hours(business_hours: dict | None, timezone_name: str | None, target_date=None) -> list[dict[str, str]]:
-        if not business_hours or not timezone_name:
-            return POSTING_WINDOWS
-        tz = ZoneInfo(timezone_name)
-        filtered: list[dict[str, str]] = []
-        if not isinstance(business_hours, dict):
-            return POSTING_WINDOWS
-        weekday = (target_date.weekday() if target_date else 0)
-        weekday_key = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"][weekday]
-        hours = business_hours.get(weekday_key) or business_hours.get("mon")
-        if not (isinstance(hours, (list, tuple)) and len(hours) == 2):
-            return POSTING_WINDOWS
-        open_h, open_m = map(int, hours[0].split(":"))
-        close_h, close_m = map(int, hours[1].split(":"))
-        open_time = time(hour=open_h, minute=open_m, tzinfo=tz)
-        close_time = time(hour=close_h, minute=close_m, tzinfo=tz)
-        window_map = {
-            "morning": (8, 0),
-            "midday": (11, 0),
-            "afternoon": (15, 0),
-            "evening": (18, 0),
-        }
-        for window in POSTING_WINDOWS:
-            w_start = window_map.get(window["id"], (9, 0))
-            start_local = time(hour=w_start[0], minute=w_start[1], tzinfo=tz)
-            if open_time <= start_local <= close_time:
-                filtered.append(window)
-        return filtered or POSTING_WINDOWS
+        return open_windows(business_hours, timezone_name, target_date)
 
     def record_result(
         self,
@@ -96,31 +63,25 @@ class PostingWindowService:
         clicks: int,
         conversions: int,
     ) -> PostingWindowStat:
-        stat = (
-            self.db.query(PostingWindowStat)
-            .filter(
-                PostingWindowStat.organization_id == organization_id,
-                PostingWindowStat.location_id == location_id,
-                PostingWindowStat.window_id == window_id,
-            )
-            .one_or_none()
+        self.selector.record_many(
+            [
+                WindowOutcome(
+                    organization_id=organization_id,
+                    location_id=location_id,
+                    window_id=window_id,
+                    impressions=impressions,
+                    clicks=clicks,
+                    conversions=conversions,
+                )
+            ]
         )
-        if not stat:
-            stat = PostingWindowStat(
-                organization_id=organization_id,
-                location_id=location_id,
-                window_id=window_id,
-            )
-            stat.impressions = 0
-            stat.clicks = 0
-            stat.conversions = 0
-        stat.impressions = (stat.impressions or 0) + impressions
-        stat.clicks = (stat.clicks or 0) + clicks
-        stat.conversions = (stat.conversions or 0) + conversions
-        self.db.add(stat)
         self.db.commit()
-        self.db.refresh(stat)
-        return stat
+        return (
+            self.db.query(PostingWindowStat)
+            .populate_existing()
+            .filter(PostingWindowStat.location_id == location_id, PostingWindowStat.window_id == window_id)
+            .one()
+        )
 
     @staticmethod
     def _performance(stat: PostingWindowStat | None) -> float:
@@ -0,0 +1,149 @@
+"""Columnar bulk writes for geo-grid scan points.
+
+A scan's points arrive as parallel arrays and are written without building ORM objects:
+a single COPY on Postgres/psycopg2, otherwise one batched INSERT per chunk (SQLAlchemy sends
+these as multi-row VALUES where the driver supports it). Duplicate cells are rejected by the
+``(geo_grid_scan_id, row_index, column_index)`` unique constraint.
+"""
+
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass, field
+import io
+import json
+from typing import Any, Callable, Iterable, Sequence
+import uuid
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from backend.app.models.rank_tracking.geo_grid_scan_point import GeoGridScanPoint
+
+INSERT_CHUNK_ROWS = 2000
+
+COPY_COLUMNS = (
+    "id",
+    "organization_id",
+    "location_id",
+    "geo_grid_scan_id",
+    "row_index",
+    "column_index",
+    "latitude",
+    "longitude",
+    "rank",
+    "in_pack",
+    "competitor_name",
+    "rank_band",
+    "color_hex",
+    "metadata_json",
+)
+
+RankColor = Callable[[int | None], tuple[str, str]]
+
+
+@dataclass
+class ScanPointColumns:
+    row_indexes: list[int] = field(default_factory=list)
+    column_indexes: list[int] = field(default_factory=list)
+    latitudes: list[float] = field(default_factory=list)
+    longitudes: list[float] = field(default_factory=list)
+    ranks: list[int | None] = field(default_factory=list)
+    competitor_names: list[str | None] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.row_indexes)
+
+    @classmethod
+    def from_points(cls, points: Iterable[Any]) -> "ScanPointColumns":
+        columns = cls()
+        for point in points:
+            columns.row_indexes.append(point.row_index)
+            columns.column_indexes.append(point.column_index)
+            columns.latitudes.append(point.latitude)
+            columns.longitudes.append(point.longitude)
+            columns.ranks.append(point.rank)
+            columns.competitor_names.append(point.competitor_name)
+        return columns
+
+
+@dataclass(frozen=True)
+class ScanPointBatch:
+    organization_id: uuid.UUID
+    location_id: uuid.UUID
+    scan_id: uuid.UUID
+    points: ScanPointColumns
+
+
+class GeoGridScanPointWriter:
+    def __init__(self, db: Session, *, rank_color: RankColor) -> None:
+        self.db = db
+        self.rank_color = rank_color
+
+    def write(self, batches: Sequence[ScanPointBatch]) -> int:
+        """Insert every batch's points; returns the number of rows written."""
+        rows = [row for batch in batches for row in self._rows(batch)]
+        if not rows:
+            return 0
+        if self._supports_copy():
+            self._copy(rows)
+        else:
+            for start in range(0, len(rows), INSERT_CHUNK_ROWS):
+                self.db.execute(insert(GeoGridScanPoint.__table__), rows[start : start + INSERT_CHUNK_ROWS])
+        return len(rows)
+
+    def _rows(self, batch: ScanPointBatch) -> list[dict[str, Any]]:
+        points = batch.points
+        rows: list[dict[str, Any]] = []
+        for index in range(len(points)):
+            rank = points.ranks[index]
+            rank_band, color_hex = self.rank_color(rank)
+            rows.append(
+                {
+                    "id": uuid.uuid4(),
+                    "organization_id": batch.organization_id,
+                    "location_id": batch.location_id,
+                    "geo_grid_scan_id": batch.scan_id,
+                    "row_index": points.row_indexes[index],
+                    "column_index": points.column_indexes[index],
+                    "latitude": points.latitudes[index],
+                    "longitude": points.longitudes[index],
+                    "rank": rank,
+                    "in_pack": rank is not None and rank <= 3,
+                    "competitor_name": points.competitor_names[index],
+                    "rank_band": rank_band,
+                    "color_hex": color_hex,
+                    "metadata_json": {},
+                }
+            )
+        return rows
+
+    def _supports_copy(self) -> bool:
+        bind = self.db.get_bind()
+        return bind.dialect.name == "postgresql" and bind.dialect.driver == "psycopg2"
+
+    def _copy(self, rows: list[dict[str, Any]]) -> None:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([self._copy_value(row[column]) for column in COPY_COLUMNS])
+        buffer.seek(0)
+        # Run on the session's own connection so the COPY joins the current transaction.
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {GeoGridScanPoint.__tablename__} ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _copy_value(value: Any) -> Any:
+        if value is None:
+            return ""
+        if isinstance(value, bool):
+            return "t" if value else "f"
+        if isinstance(value, dict):
+            return json.dumps(value)
+        return str(value)
@@ -0,0 +1,274 @@
+"""Whole-pool scoring for keyword campaign candidates.
+
+`KeywordScoringEngine` is built once per discovery context. Token tables, service tokens,
+city/state needles and the rank map index are compiled up front so each candidate is scanned
+once, and the weighted overall score is computed for the whole pool as a single matrix pass.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+import re
+from typing import Any, Iterable, Mapping, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# Column order of the score matrix; negative weights are applied as penalties.
+WEIGHT_COLUMNS = (
+    ("relevance", 1.0),
+    ("intent", 1.0),
+    ("ticket_value", 1.0),
+    ("search_volume", 1.0),
+    ("opportunity", 1.0),
+    ("current_rank", 1.0),
+    ("competition_penalty", -1.0),
+    ("already_dominant_penalty", -1.0),
+)
+
+NEAR_ME = "near me"
+
+
+class TokenAutomaton:
+    """Aho-Corasick matcher reporting which patterns occur as substrings of a text."""
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[frozenset[str]] = [frozenset()]
+        for pattern in patterns:
+            if pattern:
+                self._add(pattern)
+        self._link()
+
+    def _add(self, pattern: str) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(frozenset())
+            state = next_state
+        self._output[state] = self._output[state] | {pattern}
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = self._output[next_state] | self._output[self._fail[next_state]]
+
+    def matches(self, text: str) -> set[str]:
+        found: set[str] = set()
+        state = 0
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            if self._output[state]:
+                found |= self._output[state]
+        return found
+
+
+@dataclass(frozen=True)
+class CandidateScores:
+    relevance: float
+    search_volume: float
+    intent: float
+    ticket_value: float
+    competition: float
+    opportunity: float
+    current_rank_score: float
+    already_dominant_penalty: float
+    overall: float
+    current_rank: float | None
+
+
+class KeywordScoringEngine:
+    def __init__(
+        self,
+        *,
+        services: Sequence[str],
+        primary_category: str | None,
+        city: str | None,
+        state: str | None,
+        current_rank_map: Mapping[str, float],
+        scoring_weights: Mapping[str, float],
+        intent_tokens: Mapping[str, float],
+        ticket_tokens: Mapping[str, float],
+        stop_words: Iterable[str],
+    ) -> None:
+        self.stop_words = frozenset(stop_words)
+        self.city = city.lower() if city else None
+        self.state = state.lower() if state else None
+        self.intent_tokens = dict(intent_tokens)
+        self.ticket_tokens = dict(ticket_tokens)
+        self.service_tokens = self.token_set(list(services) + ([primary_category] if primary_category else []))
+        self.automaton = TokenAutomaton(
+            [*self.intent_tokens, *self.ticket_tokens, NEAR_ME, self.city or "", self.state or ""]
+        )
+        self.weights = [scoring_weights[name] * sign for name, sign in WEIGHT_COLUMNS]
+
+        self._rank_exact = dict(current_rank_map)
+        self._rank_values = list(current_rank_map.values())
+        self._rank_index: dict[str, list[int]] = {}
+        for position, known_keyword in enumerate(current_rank_map):
+            for token in set(known_keyword.split()):
+                self._rank_index.setdefault(token, []).append(position)
+
+    @classmethod
+    def for_context(
+        cls,
+        context: Any,
+        *,
+        intent_tokens: Mapping[str, float],
+        ticket_tokens: Mapping[str, float],
+        stop_words: Iterable[str],
+    ) -> "KeywordScoringEngine":
+        return cls(
+            services=context.services,
+            primary_category=context.primary_category,
+            city=context.city,
+            state=context.state,
+            current_rank_map=context.current_rank_map,
+            scoring_weights=context.scoring_weights,
+            intent_tokens=intent_tokens,
+            ticket_tokens=ticket_tokens,
+            stop_words=stop_words,
+        )
+
+    def token_set(self, values: Iterable[str | None]) -> set[str]:
+        tokens: set[str] = set()
+        for value in values:
+            if not value:
+                continue
+            for token in re.split(r"\s+", value.lower()):
+                cleaned = token.strip()
+                if cleaned and cleaned not in self.stop_words:
+                    tokens.add(cleaned)
+        return tokens
+
+    def resolve_rank(self, normalized_keyword: str) -> float | None:
+        """Exact rank, else the rank of the first known keyword with the largest token overlap."""
+        if normalized_keyword in self._rank_exact:
+            return self._rank_exact[normalized_keyword]
+        overlaps: dict[int, int] = {}
+        for token in set(normalized_keyword.split()):
+            for position in self._rank_index.get(token, ()):
+                overlaps[position] = overlaps.get(position, 0) + 1
+        if not overlaps:
+            return None
+        best = min(overlaps, key=lambda position: (-overlaps[position], position))
+        return self._rank_values[best]
+
+    def score(
+        self,
+        candidates: Sequence[Mapping[str, Any]],
+        *,
+        search_volumes: Sequence[int],
+        competitions: Sequence[float],
+    ) -> list[CandidateScores]:
+        """Score `candidates` (pool dicts with `normalized_keyword` / `target_service_area`)."""
+        rows: list[list[float]] = []
+        ranks: list[float | None] = []
+        for candidate, search_volume, competition in zip(candidates, search_volumes, competitions):
+            keyword = candidate["normalized_keyword"]
+            target_area = candidate.get("target_service_area")
+            matched = self.automaton.matches(keyword.lower())
+            current_rank = self.resolve_rank(keyword)
+            outside_city = bool(target_area and self.city and target_area.lower() != self.city)
+
+            relevance = 20.0
+            overlap = len(self.service_tokens & self.token_set([keyword]))
+            if overlap:
+                relevance += min(45.0, overlap * 15.0)
+            if self.city and self.city in matched:
+                relevance += 20
+            if self.state and self.state in matched:
+                relevance += 8
+            if outside_city:
+                relevance += 10
+            if NEAR_ME in matched:
+                relevance += 8
+
+            intent = 10.0
+            ticket = 20.0
+            for token in matched:
+                if token in self.intent_tokens:
+                    intent += self.intent_tokens[token]
+                if token in self.ticket_tokens:
+                    ticket += self.ticket_tokens[token]
+            if NEAR_ME in matched:
+                intent += 18
+
+            if current_rank is None:
+                opportunity = 65.0
+            elif current_rank <= 3:
+                opportunity = 22.0
+            elif current_rank <= 6:
+                opportunity = 56.0
+            elif current_rank <= 10:
+                opportunity = 78.0
+            else:
+                opportunity = 90.0
+            if outside_city:
+                opportunity += 8
+
+            rows.append(
+                [
+                    min(100.0, relevance),
+                    min(100.0, intent),
+                    min(100.0, ticket),
+                    min(100.0, (max(0, search_volume) / 350.0) * 100.0),
+                    min(100.0, opportunity),
+                    50.0 if current_rank is None else max(0.0, min(100.0, 100.0 - current_rank * 8.0)),
+                    max(0.0, min(100.0, competition * 100.0)),
+                    22.0 if current_rank is not None and current_rank <= 3.0 else 0.0,
+                ]
+            )
+            ranks.append(current_rank)
+
+        overall = self._weighted_totals(rows)
+        return [
+            CandidateScores(
+                relevance=row[0],
+                intent=row[1],
+                ticket_value=row[2],
+                search_volume=row[3],
+                opportunity=row[4],
+                current_rank_score=row[5],
+                competition=row[6],
+                already_dominant_penalty=row[7],
+                overall=total,
+                current_rank=rank,
+            )
+            for row, total, rank in zip(rows, overall, ranks)
+        ]
+
+    def _weighted_totals(self, rows: list[list[float]]) -> list[float]:
+        # Columns are accumulated left to right (not via a BLAS dot product) so totals are
+        # bit-identical to summing the weighted terms one candidate at a time.
+        if not rows:
+            return []
+        if np is not None:
+            matrix = np.asarray(rows, dtype=np.float64)
+            totals = matrix[:, 0] * self.weights[0]
+            for column, weight in enumerate(self.weights[1:], start=1):
+                totals = totals + matrix[:, column] * weight
+            return totals.tolist()
+        totals = [row[0] * self.weights[0] for row in rows]
+        for column, weight in enumerate(self.weights[1:], start=1):
+            totals = [total + row[column] * weight for total, row in zip(totals, rows)]
+        return totals
@@ -3,13 +3,19 @@ from __future__ import annotations
 import calendar
 from collections import defaultdict
 from dataclasses import dataclass
+from functools import cached_property
 from datetime import date, datetime, timedelta, timezone
+from contextlib import contextmanager
 from hashlib import sha256
+import json
+import logging
 import math
 import re
-from typing import Any, Iterable
+import time
+from typing import Any, Iterable, Iterator
 import uuid
 
+from sqlalchemy import and_, delete, func, insert, or_, select
 from sqlalchemy.orm import Session
 
 from backend.app.models.automation.action import Action
@@ -27,6 +33,14 @@ from backend.app.models.google_business.location import Location
 from backend.app.models.google_business.location_settings import LocationSettings
 from backend.app.models.identity.organization import Organization
 from backend.app.models.rank_tracking.selected_keyword import SelectedKeyword
+from backend.app.services.automation.action_fanout import FanOutSql
+from backend.app.services.rank_tracking.geo_grid_writer import (
+    GeoGridScanPointWriter,
+    ScanPointBatch,
+    ScanPointColumns,
+)
+from backend.app.services.rank_tracking.keyword_scoring import CandidateScores, KeywordScoringEngine
+from backend.app.services.shared.batching import chunks
 from backend.app.services.shared.settings import SettingsService
 from backend.app.services.shared.validators import assert_location_in_org
 from backend.app.services.rank_tracking.keyword_strategy_providers import (
@@ -38,6 +52,8 @@ from backend.app.services.rank_tracking.keyword_strategy_providers import (
     RankInsightsProvider,
 )
 
+logger = logging.getLogger(__name__)
+
 STOP_WORDS = {
     "and",
     "in",
@@ -115,6 +131,19 @@ IMAGE_THEME_ROTATION = [
 
 KEYWORD_SELECTION_TARGET = 10
 FOLLOWUP_SCAN_DELAY_DAYS = 21
+# Rows per multi-row INSERT; keeps bound parameters well under SQLite/Postgres limits.
+PERSIST_CHUNK_SIZE = 500
+
+# Cycle-scoped tables cleared before a rerun, children before parents.
+CYCLE_CHILD_MODELS = (
+    GeoGridScan,
+    GbpPostKeywordMapping,
+    GbpOptimizationAction,
+    SelectedKeyword,
+    KeywordScore,
+    KeywordCandidate,
+    KeywordDashboardAggregate,
+)
 
 
 @dataclass(frozen=True)
@@ -157,6 +186,149 @@ class ScoredCandidate:
     why_selected: str
 
 
+@dataclass(frozen=True)
+class ScanPointSnapshot:
+    geo_grid_scan_id: uuid.UUID
+    row_index: int
+    column_index: int
+    latitude: float
+    longitude: float
+    rank: int | None
+    rank_band: str | None
+    color_hex: str | None
+
+
+class CycleScanPointCache:
+    """All scan points of one campaign cycle, loaded in a single query and indexed by (scan, ring).
+
+    Points are held as plain snapshots so they stay readable after the session commits.
+    """
+
+    CENTER = "center"
+    EDGE = "edge"
+
+    def __init__(self, db: Session, cycle_id: uuid.UUID) -> None:
+        self.db = db
+        self.cycle_id = cycle_id
+        self._points: dict[uuid.UUID, list[ScanPointSnapshot]] | None = None
+        self._rings: dict[tuple[uuid.UUID, str], list[ScanPointSnapshot]] = {}
+
+    def points(self, scan_id: uuid.UUID) -> list[ScanPointSnapshot]:
+        return self._load().get(scan_id, [])
+
+    def ring(self, scan_id: uuid.UUID, ring: str) -> list[ScanPointSnapshot]:
+        self._load()
+        return self._rings.get((scan_id, ring), [])
+
+    def _load(self) -> dict[uuid.UUID, list[ScanPointSnapshot]]:
+        if self._points is not None:
+            return self._points
+        rows = self.db.execute(
+            select(
+                GeoGridScanPoint.geo_grid_scan_id,
+                GeoGridScanPoint.row_index,
+                GeoGridScanPoint.column_index,
+                GeoGridScanPoint.latitude,
+                GeoGridScanPoint.longitude,
+                GeoGridScanPoint.rank,
+                GeoGridScanPoint.rank_band,
+                GeoGridScanPoint.color_hex,
+                GeoGridScan.rows,
+                GeoGridScan.columns,
+            )
+            .join(GeoGridScan, GeoGridScan.id == GeoGridScanPoint.geo_grid_scan_id)
+            .where(GeoGridScan.campaign_cycle_id == self.cycle_id)
+        ).all()
+        points: dict[uuid.UUID, list[ScanPointSnapshot]] = defaultdict(list)
+        dimensions: dict[uuid.UUID, tuple[int, int]] = {}
+        for row in rows:
+            points[row.geo_grid_scan_id].append(ScanPointSnapshot(*row[:8]))
+            dimensions[row.geo_grid_scan_id] = (row.rows, row.columns)
+        for scan_id, scan_points in points.items():
+            center_row = max(point.row_index for point in scan_points) // 2
+            center_col = max(point.column_index for point in scan_points) // 2
+            self._rings[(scan_id, self.CENTER)] = [
+                point
+                for point in scan_points
+                if abs(point.row_index - center_row) <= 1 and abs(point.column_index - center_col) <= 1
+            ]
+            scan_rows, scan_columns = dimensions[scan_id]
+            edge_rows = {0, max(0, scan_rows - 1)}
+            edge_cols = {0, max(0, scan_columns - 1)}
+            self._rings[(scan_id, self.EDGE)] = [
+                point
+                for point in scan_points
+                if point.row_index in edge_rows or point.column_index in edge_cols
+            ]
+        self._points = dict(points)
+        return self._points
+
+
+DASHBOARD_SECTIONS = ("cycle", "overview", "keywords", "gbp_actions", "post_plan", "geo_grid", "audit")
+# Sections whose inputs change when a follow-up scan lands.
+FOLLOWUP_DASHBOARD_SECTIONS = ("cycle", "overview", "keywords", "geo_grid")
+
+
+class _DashboardInputs:
+    """Cycle rows shared by dashboard sections, each loaded at most once per render."""
+
+    def __init__(
+        self,
+        db: Session,
+        cycle: KeywordCampaignCycle,
+        *,
+        aggregate: KeywordDashboardAggregate | None = None,
+    ) -> None:
+        self.db = db
+        self.cycle = cycle
+        self._aggregate = aggregate
+
+    @cached_property
+    def aggregate(self) -> KeywordDashboardAggregate | None:
+        if self._aggregate is not None:
+            return self._aggregate
+        return (
+            self.db.query(KeywordDashboardAggregate)
+            .filter(KeywordDashboardAggregate.campaign_cycle_id == self.cycle.id)
+            .one_or_none()
+        )
+
+    @cached_property
+    def selected_keywords(self) -> list[SelectedKeyword]:
+        return (
+            self.db.query(SelectedKeyword)
+            .filter(SelectedKeyword.campaign_cycle_id == self.cycle.id)
+            .order_by(SelectedKeyword.rank_order.asc())
+            .all()
+        )
+
+    @cached_property
+    def actions(self) -> list[GbpOptimizationAction]:
+        return (
+            self.db.query(GbpOptimizationAction)
+            .filter(GbpOptimizationAction.campaign_cycle_id == self.cycle.id)
+            .order_by(GbpOptimizationAction.created_at.asc())
+            .all()
+        )
+
+    @cached_property
+    def mappings(self) -> list[GbpPostKeywordMapping]:
+        return (
+            self.db.query(GbpPostKeywordMapping)
+            .filter(GbpPostKeywordMapping.campaign_cycle_id == self.cycle.id)
+            .order_by(GbpPostKeywordMapping.publish_date.asc())
+            .all()
+        )
+
+    @cached_property
+    def scans_by_keyword(self) -> dict[str, dict[str, GeoGridScan]]:
+        scans = self.db.query(GeoGridScan).filter(GeoGridScan.campaign_cycle_id == self.cycle.id).all()
+        by_keyword: dict[str, dict[str, GeoGridScan]] = defaultdict(dict)
+        for scan in scans:
+            by_keyword[scan.keyword][scan.scan_type] = scan
+        return by_keyword
+
+
 class KeywordCampaignService:
     def __init__(
         self,
@@ -174,6 +346,9 @@ class KeywordCampaignService:
         self.geo_grid_provider = geo_grid_provider or MockGeoGridProvider(db)
         self.gbp_insights = LocalGbpInsightsProvider(db)
         self.rank_insights = RankInsightsProvider(db)
+        # Per-stage wall time (ms) of the most recent run_cycle; also stored on the job run.
+        self.last_stage_timings: dict[str, float] = {}
+        self._scan_point_caches: dict[uuid.UUID, CycleScanPointCache] = {}
 
     def run_cycle(
         self,
@@ -222,34 +397,44 @@ class KeywordCampaignService:
             self.db.add(cycle)
             self.db.commit()
 
-            self._clear_cycle_children(cycle.id)
+            timings: dict[str, float] = {}
+            with _timed_stage(timings, "clear_children"):
+                self._clear_cycle_children(cycle.id)
 
-            context = self._build_discovery_context(organization_id=organization_id, location=location)
-            scored = self._score_candidates(location=location, context=context)
-            selected, _rejected = self._select_candidates(scored)
+            with _timed_stage(timings, "discovery"):
+                context = self._build_discovery_context(organization_id=organization_id, location=location)
+            with _timed_stage(timings, "scoring"):
+                scored = self._score_candidates(location=location, context=context)
+            with _timed_stage(timings, "selection"):
+                selected, _rejected = self._select_candidates(scored)
             if len(selected) != KEYWORD_SELECTION_TARGET:
                 raise ValueError("Keyword selection failed to produce exactly 10 keywords")
 
-            selected_rows = self._persist_keyword_candidates_and_scores(
-                cycle=cycle,
-                location=location,
-                scored_candidates=scored,
-                selected=selected,
-                score_weights=context.scoring_weights,
-            )
-            self._sync_location_keyword_targets(location=location, selected_keywords=selected_rows)
-            self._create_gbp_optimization_actions(
-                cycle=cycle,
-                location=location,
-                selected_keywords=selected_rows,
-                context=context,
-            )
-            self._create_monthly_post_plan(
-                cycle=cycle,
-                location=location,
-                selected_keywords=selected_rows,
-            )
-            self._run_geo_grid_scans_for_cycle(cycle=cycle, selected_keywords=selected_rows, scan_type="baseline")
+            with _timed_stage(timings, "persist_candidates"):
+                selected_rows = self._persist_keyword_candidates_and_scores(
+                    cycle=cycle,
+                    location=location,
+                    scored_candidates=scored,
+                    selected=selected,
+                    score_weights=context.scoring_weights,
+                )
+            with _timed_stage(timings, "sync_targets"):
+                self._sync_location_keyword_targets(location=location, selected_keywords=selected_rows)
+            with _timed_stage(timings, "optimization_actions"):
+                self._create_gbp_optimization_actions(
+                    cycle=cycle,
+                    location=location,
+                    selected_keywords=selected_rows,
+                    context=context,
+                )
+            with _timed_stage(timings, "post_plan"):
+                self._create_monthly_post_plan(
+                    cycle=cycle,
+                    location=location,
+                    selected_keywords=selected_rows,
+                )
+            with _timed_stage(timings, "geo_grid_scans"):
+                self._run_geo_grid_scans_for_cycle(cycle=cycle, selected_keywords=selected_rows, scan_type="baseline")
             cycle.baseline_scanned_at = datetime.now(timezone.utc)
             cycle.followup_due_at = datetime.now(timezone.utc) + timedelta(days=FOLLOWUP_SCAN_DELAY_DAYS)
             cycle.status = "completed"
@@ -261,9 +446,21 @@ class KeywordCampaignService:
             }
             self.db.add(cycle)
             self.db.commit()
-            self._schedule_followup_scan(cycle)
-            self._rebuild_dashboard_aggregate(cycle)
-            self._finish_job_run(job, status="completed", details={"cycle_id": str(cycle.id)})
+            with _timed_stage(timings, "schedule_followup"):
+                self._schedule_followup_scan(cycle)
+            with _timed_stage(timings, "dashboard_aggregate"):
+                self._rebuild_dashboard_aggregate(cycle)
+            self.last_stage_timings = timings
+            logger.info(
+                "Keyword cycle %s stage timings (ms): %s",
+                cycle.id,
+                ", ".join(f"{stage}={elapsed}" for stage, elapsed in timings.items()),
+            )
+            self._finish_job_run(
+                job,
+                status="completed",
+                details={"cycle_id": str(cycle.id), "stage_timings_ms": timings},
+            )
             self.db.refresh(cycle)
             return cycle
         except Exception as exc:  # noqa: BLE001
@@ -308,7 +505,7 @@ class KeywordCampaignService:
                 cycle.status = "completed"
             self.db.add(cycle)
             self.db.commit()
-            self._rebuild_dashboard_aggregate(cycle)
+            self._rebuild_dashboard_aggregate(cycle, sections=FOLLOWUP_DASHBOARD_SECTIONS)
             self._finish_job_run(job, status="completed", details={"cycle_id": str(cycle.id)})
             self.db.refresh(cycle)
             return cycle
@@ -342,79 +539,209 @@ class KeywordCampaignService:
         location_id: uuid.UUID,
         cycle_id: uuid.UUID | None = None,
     ) -> dict[str, Any]:
+        payload, _etag = self.dashboard_payload(
+            organization_id=organization_id,
+            location_id=location_id,
+            cycle_id=cycle_id,
+        )
+        return payload
+
+    def dashboard_payload(
+        self,
+        *,
+        organization_id: uuid.UUID,
+        location_id: uuid.UUID,
+        cycle_id: uuid.UUID | None = None,
+    ) -> tuple[dict[str, Any], str]:
+        """Dashboard payload and its ETag, served from the cycle's materialized aggregate."""
+        cycle = self._dashboard_cycle(organization_id=organization_id, location_id=location_id, cycle_id=cycle_id)
+        if not cycle:
+            payload = self._empty_dashboard_payload()
+            return payload, _payload_digest(payload)
+        aggregate = (
+            self.db.query(KeywordDashboardAggregate)
+            .filter(KeywordDashboardAggregate.campaign_cycle_id == cycle.id)
+            .one_or_none()
+        )
+        if aggregate is None:
+            body = _json_ready(self._dashboard_sections(cycle, DASHBOARD_SECTIONS))
+            body_etag = _payload_digest(body)
+        else:
+            if aggregate.payload_json is None:
+                self._materialize_dashboard(aggregate, cycle)
+                self.db.commit()
+            body = aggregate.payload_json
+            body_etag = aggregate.payload_etag
+        history = self._dashboard_history(organization_id=organization_id, location_id=location_id)
+        payload = self._assemble_dashboard(body, history)
+        return payload, _payload_digest({"body": body_etag, "history": history})
+
+    def build_live_dashboard_payload(
+        self,
+        *,
+        organization_id: uuid.UUID,
+        location_id: uuid.UUID,
+        cycle_id: uuid.UUID | None = None,
+    ) -> dict[str, Any]:
+        """Recompute the dashboard from the cycle tables, bypassing the materialized payload."""
+        cycle = self._dashboard_cycle(organization_id=organization_id, location_id=location_id, cycle_id=cycle_id)
+        if not cycle:
+            return self._empty_dashboard_payload()
+        body = self._dashboard_sections(cycle, DASHBOARD_SECTIONS)
+        history = self._dashboard_history(organization_id=organization_id, location_id=location_id)
+        return self._assemble_dashboard(body, history)
+
+    def refresh_dashboard_payload(self, cycle_id: uuid.UUID, *, sections: Iterable[str]) -> bool:
+        """Re-render `sections` of an already materialized payload; the caller commits.
+
+        Returns False when the cycle has no materialized payload yet (the next read builds it).
+        """
+        materialized = _materialized_dashboard(self.db, cycle_id)
+        if materialized is None:
+            return False
+        self._materialize_dashboard(*materialized, sections=sections)
+        return True
+
+    def _materialize_dashboard(
+        self,
+        aggregate: KeywordDashboardAggregate,
+        cycle: KeywordCampaignCycle,
+        *,
+        sections: Iterable[str] | None = None,
+    ) -> None:
+        full = sections is None or aggregate.payload_json is None
+        requested = DASHBOARD_SECTIONS if full else tuple(sections)
+        body = {} if full else dict(aggregate.payload_json)
+        body.update(_json_ready(self._dashboard_sections(cycle, requested, aggregate=aggregate)))
+        _store_dashboard_body(self.db, aggregate, body)
+
+    def _dashboard_cycle(
+        self,
+        *,
+        organization_id: uuid.UUID,
+        location_id: uuid.UUID,
+        cycle_id: uuid.UUID | None,
+    ) -> KeywordCampaignCycle | None:
         if cycle_id:
             cycle = self.db.get(KeywordCampaignCycle, cycle_id)
             if not cycle:
                 raise ValueError("Campaign cycle not found")
             if cycle.organization_id != organization_id or cycle.location_id != location_id:
                 raise ValueError("Campaign cycle does not belong to this organization/location")
-        else:
-            cycle = (
-                self.db.query(KeywordCampaignCycle)
-                .filter(
-                    KeywordCampaignCycle.organization_id == organization_id,
-                    KeywordCampaignCycle.location_id == location_id,
-                )
-                .order_by(KeywordCampaignCycle.cycle_year.desc(), KeywordCampaignCycle.cycle_month.desc())
-                .first()
+            return cycle
+        return (
+            self.db.query(KeywordCampaignCycle)
+            .filter(
+                KeywordCampaignCycle.organization_id == organization_id,
+                KeywordCampaignCycle.location_id == location_id,
             )
-        if not cycle:
-            return {
-                "has_data": False,
-                "cycle": None,
-                "overview": {},
-                "keywords": [],
-                "opportunities": {},
-                "gbp_actions": [],
-                "post_plan": [],
-                "geo_grid": {},
-                "history": [],
-                "audit": {},
-            }
+            .order_by(KeywordCampaignCycle.cycle_year.desc(), KeywordCampaignCycle.cycle_month.desc())
+            .first()
+        )
 
-        aggregate = (
+    @staticmethod
+    def _empty_dashboard_payload() -> dict[str, Any]:
+        return {
+            "has_data": False,
+            "cycle": None,
+            "overview": {},
+            "keywords": [],
+            "opportunities": {},
+            "gbp_actions": [],
+            "post_plan": [],
+            "geo_grid": {},
+            "history": [],
+            "audit": {},
+        }
+
+    @staticmethod
+    def _assemble_dashboard(body: dict[str, Any], history: list[dict[str, Any]]) -> dict[str, Any]:
+        return {
+            "has_data": True,
+            "cycle": body["cycle"],
+            "overview": body["overview"],
+            "keywords": body["keywords"],
+            "opportunities": body["opportunities"],
+            "gbp_actions": body["gbp_actions"],
+            "post_plan": body["post_plan"],
+            "geo_grid": body["geo_grid"],
+            "history": history,
+            "audit": body["audit"],
+            "data_sources": body["data_sources"],
+        }
+
+    def _dashboard_history(self, *, organization_id: uuid.UUID, location_id: uuid.UUID) -> list[dict[str, Any]]:
+        history_rows = (
             self.db.query(KeywordDashboardAggregate)
-            .filter(KeywordDashboardAggregate.campaign_cycle_id == cycle.id)
-            .one_or_none()
-        )
-        selected_keywords = (
-            self.db.query(SelectedKeyword)
-            .filter(SelectedKeyword.campaign_cycle_id == cycle.id)
-            .order_by(SelectedKeyword.rank_order.asc())
-            .all()
-        )
-        actions = (
-            self.db.query(GbpOptimizationAction)
-            .filter(GbpOptimizationAction.campaign_cycle_id == cycle.id)
-            .order_by(GbpOptimizationAction.created_at.asc())
-            .all()
-        )
-        mappings = (
-            self.db.query(GbpPostKeywordMapping)
-            .filter(GbpPostKeywordMapping.campaign_cycle_id == cycle.id)
-            .order_by(GbpPostKeywordMapping.publish_date.asc())
-            .all()
-        )
-        scans = (
-            self.db.query(GeoGridScan)
-            .filter(GeoGridScan.campaign_cycle_id == cycle.id)
+            .filter(
+                KeywordDashboardAggregate.organization_id == organization_id,
+                KeywordDashboardAggregate.location_id == location_id,
+            )
+            .order_by(KeywordDashboardAggregate.created_at.desc())
+            .limit(18)
             .all()
         )
-        if scans:
-            scan_points = (
-                self.db.query(GeoGridScanPoint)
-                .filter(GeoGridScanPoint.geo_grid_scan_id.in_([scan.id for scan in scans]))
-                .all()
-            )
-        else:
-            scan_points = []
-        points_by_scan: dict[uuid.UUID, list[GeoGridScanPoint]] = defaultdict(list)
-        for point in scan_points:
-            points_by_scan[point.geo_grid_scan_id].append(point)
-        scans_by_keyword: dict[str, dict[str, GeoGridScan]] = defaultdict(dict)
-        for scan in scans:
-            scans_by_keyword[scan.keyword][scan.scan_type] = scan
+        return [
+            {
+                "cycle_id": str(item.campaign_cycle_id),
+                "cycle_label": item.cycle_label,
+                "avg_baseline_rank": item.avg_baseline_rank,
+                "avg_followup_rank": item.avg_followup_rank,
+                "avg_rank_change": item.avg_rank_change,
+                "posts_generated_from_keywords": item.posts_generated_from_keywords,
+                "gbp_updates_applied": item.gbp_updates_applied,
+            }
+            for item in history_rows
+        ]
+
+    def _dashboard_sections(
+        self,
+        cycle: KeywordCampaignCycle,
+        sections: Iterable[str],
+        *,
+        aggregate: KeywordDashboardAggregate | None = None,
+    ) -> dict[str, Any]:
+        inputs = _DashboardInputs(self.db, cycle, aggregate=aggregate)
+        body: dict[str, Any] = {}
+        for section in sections:
+            body.update(getattr(self, f"_dashboard_{section}_section")(cycle, inputs))
+        return body
 
+    @staticmethod
+    def _dashboard_cycle_section(cycle: KeywordCampaignCycle, inputs: "_DashboardInputs") -> dict[str, Any]:
+        return {
+            "cycle": {
+                "id": str(cycle.id),
+                "cycle_year": cycle.cycle_year,
+                "cycle_month": cycle.cycle_month,
+                "trigger_source": cycle.trigger_source,
+                "status": cycle.status,
+                "followup_due_at": cycle.followup_due_at,
+                "baseline_scanned_at": cycle.baseline_scanned_at,
+                "followup_scanned_at": cycle.followup_scanned_at,
+            }
+        }
+
+    @staticmethod
+    def _dashboard_overview_section(cycle: KeywordCampaignCycle, inputs: "_DashboardInputs") -> dict[str, Any]:
+        aggregate = inputs.aggregate
+        return {
+            "overview": {
+                "cycle_month": f"{calendar.month_name[cycle.cycle_month]} {cycle.cycle_year}",
+                "target_keywords": aggregate.target_keywords_count if aggregate else len(inputs.selected_keywords),
+                "avg_baseline_rank": aggregate.avg_baseline_rank if aggregate else None,
+                "avg_followup_rank": aggregate.avg_followup_rank if aggregate else None,
+                "avg_improvement": aggregate.avg_rank_change if aggregate else None,
+                "posts_generated": aggregate.posts_generated_from_keywords if aggregate else len(inputs.mappings),
+                "gbp_updates_applied": aggregate.gbp_updates_applied if aggregate else 0,
+                "visibility_baseline": aggregate.visibility_baseline if aggregate else None,
+                "visibility_followup": aggregate.visibility_followup if aggregate else None,
+            }
+        }
+
+    @staticmethod
+    def _dashboard_keywords_section(cycle: KeywordCampaignCycle, inputs: "_DashboardInputs") -> dict[str, Any]:
+        scans_by_keyword = inputs.scans_by_keyword
         keyword_rows: list[dict[str, Any]] = []
         opportunities: dict[str, list[dict[str, Any]]] = {
             "high_ticket_opportunities": [],
@@ -422,7 +749,7 @@ class KeywordCampaignService:
             "service_area_expansion": [],
             "underperforming_high_value_terms": [],
         }
-        for row in selected_keywords:
+        for row in inputs.selected_keywords:
             baseline = scans_by_keyword.get(row.keyword, {}).get("baseline")
             followup = scans_by_keyword.get(row.keyword, {}).get("followup")
             baseline_rank = baseline.average_rank if baseline else row.current_rank
@@ -465,67 +792,11 @@ class KeywordCampaignService:
                 opportunities["underperforming_high_value_terms"].append(
                     {"keyword": row.keyword, "reason": row.why_selected}
                 )
+        return {"keywords": keyword_rows, "opportunities": opportunities}
 
-        geo_payload: dict[str, Any] = {}
-        for keyword, per_type in scans_by_keyword.items():
-            baseline = per_type.get("baseline")
-            followup = per_type.get("followup")
-            geo_payload[keyword] = {
-                "baseline": self._serialize_scan(baseline, points_by_scan.get(baseline.id, [])) if baseline else None,
-                "followup": self._serialize_scan(followup, points_by_scan.get(followup.id, [])) if followup else None,
-                "delta": self._scan_delta(baseline, followup),
-            }
-
-        history_rows = (
-            self.db.query(KeywordDashboardAggregate)
-            .filter(
-                KeywordDashboardAggregate.organization_id == organization_id,
-                KeywordDashboardAggregate.location_id == location_id,
-            )
-            .order_by(KeywordDashboardAggregate.created_at.desc())
-            .limit(18)
-            .all()
-        )
-        history = [
-            {
-                "cycle_id": str(item.campaign_cycle_id),
-                "cycle_label": item.cycle_label,
-                "avg_baseline_rank": item.avg_baseline_rank,
-                "avg_followup_rank": item.avg_followup_rank,
-                "avg_rank_change": item.avg_rank_change,
-                "posts_generated_from_keywords": item.posts_generated_from_keywords,
-                "gbp_updates_applied": item.gbp_updates_applied,
-            }
-            for item in history_rows
-        ]
-
-        audit = self._build_audit_payload(cycle=cycle)
-
+    @staticmethod
+    def _dashboard_gbp_actions_section(cycle: KeywordCampaignCycle, inputs: "_DashboardInputs") -> dict[str, Any]:
         return {
-            "has_data": True,
-            "cycle": {
-                "id": str(cycle.id),
-                "cycle_year": cycle.cycle_year,
-                "cycle_month": cycle.cycle_month,
-                "trigger_source": cycle.trigger_source,
-                "status": cycle.status,
-                "followup_due_at": cycle.followup_due_at,
-                "baseline_scanned_at": cycle.baseline_scanned_at,
-                "followup_scanned_at": cycle.followup_scanned_at,
-            },
-            "overview": {
-                "cycle_month": f"{calendar.month_name[cycle.cycle_month]} {cycle.cycle_year}",
-                "target_keywords": aggregate.target_keywords_count if aggregate else len(selected_keywords),
-                "avg_baseline_rank": aggregate.avg_baseline_rank if aggregate else None,
-                "avg_followup_rank": aggregate.avg_followup_rank if aggregate else None,
-                "avg_improvement": aggregate.avg_rank_change if aggregate else None,
-                "posts_generated": aggregate.posts_generated_from_keywords if aggregate else len(mappings),
-                "gbp_updates_applied": aggregate.gbp_updates_applied if aggregate else 0,
-                "visibility_baseline": aggregate.visibility_baseline if aggregate else None,
-                "visibility_followup": aggregate.visibility_followup if aggregate else None,
-            },
-            "keywords": keyword_rows,
-            "opportunities": opportunities,
             "gbp_actions": [
                 {
                     "id": str(action.id),
@@ -537,8 +808,13 @@ class KeywordCampaignService:
                     "applied_at": action.applied_at,
                     "notes": action.notes,
                 }
-                for action in actions
-            ],
+                for action in inputs.actions
+            ]
+        }
+
+    @staticmethod
+    def _dashboard_post_plan_section(cycle: KeywordCampaignCycle, inputs: "_DashboardInputs") -> dict[str, Any]:
+        return {
             "post_plan": [
                 {
                     "id": str(item.id),
@@ -553,11 +829,26 @@ class KeywordCampaignService:
                     "status": item.status,
                     "post_id": str(item.post_id) if item.post_id else None,
                 }
-                for item in mappings
-            ],
-            "geo_grid": geo_payload,
-            "history": history,
-            "audit": audit,
+                for item in inputs.mappings
+            ]
+        }
+
+    def _dashboard_geo_grid_section(self, cycle: KeywordCampaignCycle, inputs: "_DashboardInputs") -> dict[str, Any]:
+        point_cache = self.scan_point_cache(cycle.id)
+        geo_payload: dict[str, Any] = {}
+        for keyword, per_type in inputs.scans_by_keyword.items():
+            baseline = per_type.get("baseline")
+            followup = per_type.get("followup")
+            geo_payload[keyword] = {
+                "baseline": self._serialize_scan(baseline, point_cache.points(baseline.id)) if baseline else None,
+                "followup": self._serialize_scan(followup, point_cache.points(followup.id)) if followup else None,
+                "delta": self._scan_delta(baseline, followup),
+            }
+        return {"geo_grid": geo_payload}
+
+    def _dashboard_audit_section(self, cycle: KeywordCampaignCycle, inputs: "_DashboardInputs") -> dict[str, Any]:
+        return {
+            "audit": self._build_audit_payload(cycle=cycle),
             "data_sources": cycle.data_sources_json or {},
         }
 
@@ -684,33 +975,20 @@ class KeywordCampaignService:
         return cycle
 
     def _clear_cycle_children(self, cycle_id: uuid.UUID) -> None:
-        scan_ids = [row.id for row in self.db.query(GeoGridScan).filter(GeoGridScan.campaign_cycle_id == cycle_id).all()]
-        if scan_ids:
-            (
-                self.db.query(GeoGridScanPoint)
-                .filter(GeoGridScanPoint.geo_grid_scan_id.in_(scan_ids))
-                .delete(synchronize_session=False)
+        scan_ids = select(GeoGridScan.id).where(GeoGridScan.campaign_cycle_id == cycle_id)
+        self.db.execute(
+            delete(GeoGridScanPoint)
+            .where(GeoGridScanPoint.geo_grid_scan_id.in_(scan_ids))
+            .execution_options(synchronize_session=False)
+        )
+        for model in CYCLE_CHILD_MODELS:
+            self.db.execute(
+                delete(model)
+                .where(model.campaign_cycle_id == cycle_id)
+                .execution_options(synchronize_session=False)
             )
-        self.db.query(GeoGridScan).filter(GeoGridScan.campaign_cycle_id == cycle_id).delete(synchronize_session=False)
-        self.db.query(GbpPostKeywordMapping).filter(
-            GbpPostKeywordMapping.campaign_cycle_id == cycle_id
-        ).delete(synchronize_session=False)
-        self.db.query(GbpOptimizationAction).filter(
-            GbpOptimizationAction.campaign_cycle_id == cycle_id
-        ).delete(synchronize_session=False)
-        self.db.query(SelectedKeyword).filter(
-            SelectedKeyword.campaign_cycle_id == cycle_id
-        ).delete(synchronize_session=False)
-        self.db.query(KeywordScore).filter(
-            KeywordScore.campaign_cycle_id == cycle_id
-        ).delete(synchronize_session=False)
-        self.db.query(KeywordCandidate).filter(
-            KeywordCandidate.campaign_cycle_id == cycle_id
-        ).delete(synchronize_session=False)
-        self.db.query(KeywordDashboardAggregate).filter(
-            KeywordDashboardAggregate.campaign_cycle_id == cycle_id
-        ).delete(synchronize_session=False)
         self.db.commit()
+        self._invalidate_scan_points(cycle_id)
 
     def _build_discovery_context(self, *, organization_id: uuid.UUID, location: Location) -> DiscoveryContext:
         settings_json = dict(location.settings.settings_json or {}) if location.settings else {}
@@ -787,25 +1065,36 @@ class KeywordCampaignService:
             location=location,
             keywords=[candidate["keyword"] for candidate in candidates],
         )
-        scored: list[ScoredCandidate] = []
-        for candidate in candidates:
-            keyword = candidate["keyword"]
-            metric = metrics.get(keyword)
-            if not metric:
-                continue
-            current_rank = self._resolve_rank(context.current_rank_map, keyword)
-            scored.append(
-                self._score_single_candidate(
-                    candidate=candidate,
-                    context=context,
-                    search_volume=metric.search_volume,
-                    competition=metric.competition,
-                    current_rank=current_rank,
-                )
+        measured = [(candidate, metrics.get(candidate["keyword"])) for candidate in candidates]
+        measured = [(candidate, metric) for candidate, metric in measured if metric]
+        engine = self.scoring_engine(context)
+        scores = engine.score(
+            [candidate for candidate, _metric in measured],
+            search_volumes=[metric.search_volume for _candidate, metric in measured],
+            competitions=[metric.competition for _candidate, metric in measured],
+        )
+        scored = [
+            self._scored_candidate(
+                candidate=candidate,
+                context=context,
+                scores=score,
+                search_volume=metric.search_volume,
+                competition=metric.competition,
             )
+            for (candidate, metric), score in zip(measured, scores)
+        ]
         scored.sort(key=lambda item: item.overall_score, reverse=True)
         return scored
 
+    @staticmethod
+    def scoring_engine(context: DiscoveryContext) -> KeywordScoringEngine:
+        return KeywordScoringEngine.for_context(
+            context,
+            intent_tokens=INTENT_TOKENS,
+            ticket_tokens=HIGH_TICKET_TOKENS,
+            stop_words=STOP_WORDS,
+        )
+
     def _build_candidate_pool(self, *, location: Location, context: DiscoveryContext) -> list[dict[str, Any]]:
         pool: dict[str, dict[str, Any]] = {}
         services = list(context.services)
@@ -909,67 +1198,46 @@ class KeywordCampaignService:
         deduped.sort(key=lambda item: item["keyword"])
         return deduped[:220]
 
-    def _score_single_candidate(
+    def _scored_candidate(
         self,
         *,
         candidate: dict[str, Any],
         context: DiscoveryContext,
+        scores: CandidateScores,
         search_volume: int,
         competition: float,
-        current_rank: float | None,
     ) -> ScoredCandidate:
-        keyword = candidate["keyword"]
-        normalized = candidate["normalized_keyword"]
-        relevance = self._relevance_score(keyword=normalized, context=context, target_area=candidate.get("target_service_area"))
-        volume_score = min(100.0, (max(0, search_volume) / 350.0) * 100.0)
-        intent_score = self._intent_score(normalized)
-        ticket_score = self._ticket_value_score(normalized)
-        competition_score = max(0.0, min(100.0, competition * 100.0))
-        opportunity = self._opportunity_score(current_rank=current_rank, target_area=candidate.get("target_service_area"), city=context.city)
-        current_rank_score = self._current_rank_score(current_rank)
-        already_dominant_penalty = 22.0 if current_rank is not None and current_rank <= 3.0 else 0.0
-
-        weights = context.scoring_weights
-        overall = (
-            relevance * weights["relevance"]
-            + intent_score * weights["intent"]
-            + ticket_score * weights["ticket_value"]
-            + volume_score * weights["search_volume"]
-            + opportunity * weights["opportunity"]
-            + current_rank_score * weights["current_rank"]
-            - competition_score * weights["competition_penalty"]
-            - already_dominant_penalty * weights["already_dominant_penalty"]
-        )
+        current_rank = scores.current_rank
         classifications = self._classifications(
             target_area=candidate.get("target_service_area"),
             city=context.city,
-            ticket_score=ticket_score,
-            competition_score=competition_score,
+            ticket_score=scores.ticket_value,
+            competition_score=scores.competition,
             current_rank=current_rank,
-            opportunity_score=opportunity,
+            opportunity_score=scores.opportunity,
         )
         why_selected = self._selection_explanation(
             search_volume=search_volume,
-            competition_score=competition_score,
+            competition_score=scores.competition,
             classifications=classifications,
             current_rank=current_rank,
         )
         return ScoredCandidate(
-            keyword=keyword,
-            normalized_keyword=normalized,
+            keyword=candidate["keyword"],
+            normalized_keyword=candidate["normalized_keyword"],
             cluster_key=candidate["cluster_key"],
             target_service_area=candidate.get("target_service_area"),
             candidate_type=candidate.get("candidate_type"),
             source_tags=list(candidate.get("source_tags") or []),
-            relevance_score=round(relevance, 2),
-            local_volume_score=round(volume_score, 2),
-            intent_score=round(intent_score, 2),
-            ticket_value_score=round(ticket_score, 2),
-            competition_score=round(competition_score, 2),
-            opportunity_score=round(opportunity, 2),
-            current_rank_score=round(current_rank_score, 2),
-            already_dominant_penalty=round(already_dominant_penalty, 2),
-            overall_score=round(overall, 2),
+            relevance_score=round(scores.relevance, 2),
+            local_volume_score=round(scores.search_volume, 2),
+            intent_score=round(scores.intent, 2),
+            ticket_value_score=round(scores.ticket_value, 2),
+            competition_score=round(scores.competition, 2),
+            opportunity_score=round(scores.opportunity, 2),
+            current_rank_score=round(scores.current_rank_score, 2),
+            already_dominant_penalty=round(scores.already_dominant_penalty, 2),
+            overall_score=round(scores.overall, 2),
             search_volume=search_volume,
             competition_estimate=round(competition, 4),
             current_rank=round(current_rank, 2) if current_rank is not None else None,
@@ -1052,80 +1320,94 @@ class KeywordCampaignService:
         score_weights: dict[str, float],
     ) -> list[SelectedKeyword]:
         selected_lookup = {item.normalized_keyword: index + 1 for index, item in enumerate(selected)}
+        candidate_rows: list[dict[str, Any]] = []
+        score_rows: list[dict[str, Any]] = []
         selected_rows: list[SelectedKeyword] = []
         for scored in scored_candidates:
             is_selected = scored.normalized_keyword in selected_lookup
-            candidate = KeywordCandidate(
-                organization_id=cycle.organization_id,
-                location_id=cycle.location_id,
-                campaign_cycle_id=cycle.id,
-                keyword=scored.keyword,
-                normalized_keyword=scored.normalized_keyword,
-                cluster_key=scored.cluster_key,
-                target_service_area=scored.target_service_area,
-                candidate_type=scored.candidate_type,
-                source_tags=scored.source_tags,
-                rejection_reason=None if is_selected else "Lower score or duplicate cluster than selected set",
-                is_selected=is_selected,
+            candidate_id = uuid.uuid4()
+            candidate_rows.append(
+                {
+                    "id": candidate_id,
+                    "organization_id": cycle.organization_id,
+                    "location_id": cycle.location_id,
+                    "campaign_cycle_id": cycle.id,
+                    "keyword": scored.keyword,
+                    "normalized_keyword": scored.normalized_keyword,
+                    "cluster_key": scored.cluster_key,
+                    "target_service_area": scored.target_service_area,
+                    "candidate_type": scored.candidate_type,
+                    "source_tags": scored.source_tags,
+                    "rejection_reason": None if is_selected else "Lower score or duplicate cluster than selected set",
+                    "is_selected": is_selected,
+                }
             )
-            self.db.add(candidate)
-            self.db.flush()
-
-            score = KeywordScore(
-                organization_id=cycle.organization_id,
-                location_id=cycle.location_id,
-                campaign_cycle_id=cycle.id,
-                candidate_id=candidate.id,
-                relevance_score=scored.relevance_score,
-                local_volume_score=scored.local_volume_score,
-                intent_score=scored.intent_score,
-                ticket_value_score=scored.ticket_value_score,
-                competition_score=scored.competition_score,
-                opportunity_score=scored.opportunity_score,
-                current_rank_score=scored.current_rank_score,
-                already_dominant_penalty=scored.already_dominant_penalty,
-                overall_score=scored.overall_score,
-                search_volume=scored.search_volume,
-                competition_estimate=scored.competition_estimate,
-                current_rank=scored.current_rank,
-                score_weights_json=score_weights,
-                classifications_json=scored.classifications,
-                rationale=scored.why_selected,
+            score_rows.append(
+                {
+                    "id": uuid.uuid4(),
+                    "organization_id": cycle.organization_id,
+                    "location_id": cycle.location_id,
+                    "campaign_cycle_id": cycle.id,
+                    "candidate_id": candidate_id,
+                    "relevance_score": scored.relevance_score,
+                    "local_volume_score": scored.local_volume_score,
+                    "intent_score": scored.intent_score,
+                    "ticket_value_score": scored.ticket_value_score,
+                    "competition_score": scored.competition_score,
+                    "opportunity_score": scored.opportunity_score,
+                    "current_rank_score": scored.current_rank_score,
+                    "already_dominant_penalty": scored.already_dominant_penalty,
+                    "overall_score": scored.overall_score,
+                    "search_volume": scored.search_volume,
+                    "competition_estimate": scored.competition_estimate,
+                    "current_rank": scored.current_rank,
+                    "score_weights_json": score_weights,
+                    "classifications_json": scored.classifications,
+                    "rationale": scored.why_selected,
+                }
             )
-            self.db.add(score)
 
             if is_selected:
                 rank_order = selected_lookup[scored.normalized_keyword]
-                selected_row = SelectedKeyword(
-                    organization_id=cycle.organization_id,
-                    location_id=cycle.location_id,
-                    campaign_cycle_id=cycle.id,
-                    candidate_id=candidate.id,
-                    rank_order=rank_order,
-                    keyword=scored.keyword,
-                    target_service_area=scored.target_service_area,
-                    search_volume=scored.search_volume,
-                    competition_estimate=scored.competition_estimate,
-                    current_rank=scored.current_rank,
-                    intent_level=self._intent_label(scored.intent_score),
-                    competition_level=self._competition_label(scored.competition_score),
-                    selection_bucket=self._selection_bucket(scored.classifications),
-                    why_selected=scored.why_selected,
-                    score_breakdown_json={
-                        "relevance_score": scored.relevance_score,
-                        "local_volume_score": scored.local_volume_score,
-                        "intent_score": scored.intent_score,
-                        "ticket_value_score": scored.ticket_value_score,
-                        "competition_score": scored.competition_score,
-                        "opportunity_score": scored.opportunity_score,
-                        "current_rank_score": scored.current_rank_score,
-                        "already_dominant_penalty": scored.already_dominant_penalty,
-                        "overall_score": scored.overall_score,
-                    },
-                    classifications_json=scored.classifications,
+                selected_rows.append(
+                    SelectedKeyword(
+                        id=uuid.uuid4(),
+                        organization_id=cycle.organization_id,
+                        location_id=cycle.location_id,
+                        campaign_cycle_id=cycle.id,
+                        candidate_id=candidate_id,
+                        rank_order=rank_order,
+                        keyword=scored.keyword,
+                        target_service_area=scored.target_service_area,
+                        search_volume=scored.search_volume,
+                        competition_estimate=scored.competition_estimate,
+                        current_rank=scored.current_rank,
+                        intent_level=self._intent_label(scored.intent_score),
+                        competition_level=self._competition_label(scored.competition_score),
+                        selection_bucket=self._selection_bucket(scored.classifications),
+                        why_selected=scored.why_selected,
+                        score_breakdown_json={
+                            "relevance_score": scored.relevance_score,
+                            "local_volume_score": scored.local_volume_score,
+                            "intent_score": scored.intent_score,
+                            "ticket_value_score": scored.ticket_value_score,
+                            "competition_score": scored.competition_score,
+                            "opportunity_score": scored.opportunity_score,
+                            "current_rank_score": scored.current_rank_score,
+                            "already_dominant_penalty": scored.already_dominant_penalty,
+                            "overall_score": scored.overall_score,
+                        },
+                        classifications_json=scored.classifications,
+                    )
                 )
-                self.db.add(selected_row)
-                selected_rows.append(selected_row)
+
+        # Candidates and scores are write-only here, so they skip the unit of work: ids are
+        # generated up front and each table gets one multi-row INSERT per chunk.
+        for chunk in chunks(candidate_rows, PERSIST_CHUNK_SIZE):
+            self.db.execute(insert(KeywordCandidate).values(chunk))
+        for chunk in chunks(score_rows, PERSIST_CHUNK_SIZE):
+            self.db.execute(insert(KeywordScore).values(chunk))
+        self.db.add_all(selected_rows)
         self.db.commit()
         selected_rows.sort(key=lambda item: item.rank_order)
         return selected_rows
@@ -1261,6 +1543,8 @@ class KeywordCampaignService:
             location.settings.settings_json = settings_json
             self.db.add(location.settings)
         self.db.commit()
+        if self.refresh_dashboard_payload(cycle.id, sections=("gbp_actions",)):
+            self.db.commit()
 
     def _create_monthly_post_plan(
         self,
@@ -1315,68 +1599,44 @@ class KeywordCampaignService:
         if not location:
             raise ValueError("Location not found")
         grid_config = self._grid_config(location)
-        for selected in selected_keywords:
-            existing = (
-                self.db.query(GeoGridScan)
-                .filter(
-                    GeoGridScan.campaign_cycle_id == cycle.id,
-                    GeoGridScan.keyword == selected.keyword,
-                    GeoGridScan.scan_type == scan_type,
-                )
-                .one_or_none()
+        existing_scans = {
+            scan.keyword: scan
+            for scan in self.db.query(GeoGridScan).filter(
+                GeoGridScan.campaign_cycle_id == cycle.id,
+                GeoGridScan.scan_type == scan_type,
             )
+        }
+        as_of = datetime.now(timezone.utc).date()
+        batches: list[ScanPointBatch] = []
+        rescanned_ids: list[uuid.UUID] = []
+        for selected in selected_keywords:
+            existing = existing_scans.get(selected.keyword)
             if existing and existing.status == "completed":
                 continue
             if existing:
-                (
-                    self.db.query(GeoGridScanPoint)
-                    .filter(GeoGridScanPoint.geo_grid_scan_id == existing.id)
-                    .delete(synchronize_session=False)
-                )
+                rescanned_ids.append(existing.id)
                 scan = existing
             else:
                 scan = GeoGridScan(
+                    id=uuid.uuid4(),
                     organization_id=cycle.organization_id,
                     location_id=cycle.location_id,
                     campaign_cycle_id=cycle.id,
                     selected_keyword_id=selected.id,
                     keyword=selected.keyword,
                     scan_type=scan_type,
-                    status="running",
                 )
-                self.db.add(scan)
-                self.db.flush()
             result = self.geo_grid_provider.run_scan(
                 location=location,
                 keyword=selected.keyword,
                 scan_type=scan_type,
                 grid_config=grid_config,
-                as_of=datetime.now(timezone.utc).date(),
+                as_of=as_of,
             )
-            ranks: list[int] = []
-            visibility_sum = 0.0
-            for point in result.points:
-                rank_band, color_hex = self._rank_color(point.rank)
-                if point.rank is not None:
-                    ranks.append(point.rank)
-                    visibility_sum += self._visibility_contribution(point.rank)
-                entry = GeoGridScanPoint(
-                    organization_id=cycle.organization_id,
-                    location_id=cycle.location_id,
-                    geo_grid_scan_id=scan.id,
-                    row_index=point.row_index,
-                    column_index=point.column_index,
-                    latitude=point.latitude,
-                    longitude=point.longitude,
-                    rank=point.rank,
-                    in_pack=point.rank is not None and point.rank <= 3,
-                    competitor_name=point.competitor_name,
-                    rank_band=rank_band,
-                    color_hex=color_hex,
-                    metadata_json={},
-                )
-                self.db.add(entry)
-            total_points = len(result.points)
+            points = ScanPointColumns.from_points(result.points)
+            ranks = [rank for rank in points.ranks if rank is not None]
+            visibility_sum = sum(self._visibility_contribution(rank) for rank in ranks)
+            total_points = len(points)
             scan.status = "completed"
             scan.scan_date = datetime.now(timezone.utc)
             scan.center_latitude = result.center_latitude
@@ -1392,8 +1652,25 @@ class KeywordCampaignService:
             scan.visibility_score = round((visibility_sum / total_points) * 100.0, 2) if total_points else None
             scan.metadata_json = {"grid_config": grid_config}
             self.db.add(scan)
-            self.db.flush()
+            batches.append(
+                ScanPointBatch(
+                    organization_id=cycle.organization_id,
+                    location_id=cycle.location_id,
+                    scan_id=scan.id,
+                    points=points,
+                )
+            )
+        if rescanned_ids:
+            self.db.execute(
+                delete(GeoGridScanPoint)
+                .where(GeoGridScanPoint.geo_grid_scan_id.in_(rescanned_ids))
+                .execution_options(synchronize_session=False)
+            )
+        # Scans are flushed in one batch before their points reference them.
+        self.db.flush()
+        GeoGridScanPointWriter(self.db, rank_color=self._rank_color).write(batches)
         self.db.commit()
+        self._invalidate_scan_points(cycle.id)
 
     def _schedule_followup_scan(self, cycle: KeywordCampaignCycle) -> None:
         run_at = cycle.followup_due_at or (datetime.now(timezone.utc) + timedelta(days=FOLLOWUP_SCAN_DELAY_DAYS))
@@ -1414,7 +1691,12 @@ class KeywordCampaignService:
             dedupe_key=dedupe_key,
         )
 
-    def _rebuild_dashboard_aggregate(self, cycle: KeywordCampaignCycle) -> None:
+    def _rebuild_dashboard_aggregate(
+        self,
+        cycle: KeywordCampaignCycle,
+        *,
+        sections: Iterable[str] | None = None,
+    ) -> None:
         existing = (
             self.db.query(KeywordDashboardAggregate)
             .filter(KeywordDashboardAggregate.campaign_cycle_id == cycle.id)
@@ -1469,8 +1751,9 @@ class KeywordCampaignService:
             .count()
         )
 
-        service_improvement = self._service_area_improvement(baseline_scans, followup_scans, cycle.id)
-        edge_improvement = self._edge_improvement(baseline_scans, followup_scans, cycle.id)
+        point_cache = self.scan_point_cache(cycle.id)
+        service_improvement = self._service_area_improvement(baseline_scans, followup_scans, point_cache)
+        edge_improvement = self._edge_improvement(baseline_scans, followup_scans, point_cache)
         target = existing or KeywordDashboardAggregate(
             organization_id=cycle.organization_id,
             location_id=cycle.location_id,
@@ -1492,7 +1775,7 @@ class KeywordCampaignService:
             "baseline_scan_count": len(baseline_scans),
             "followup_scan_count": len(followup_scans),
         }
-        self.db.add(target)
+        self._materialize_dashboard(target, cycle, sections=sections)
         self.db.commit()
 
     def _build_audit_payload(self, *, cycle: KeywordCampaignCycle) -> dict[str, Any]:
@@ -1533,7 +1816,7 @@ class KeywordCampaignService:
             "data_sources": cycle.data_sources_json or {},
         }
 
-    def _serialize_scan(self, scan: GeoGridScan, points: list[GeoGridScanPoint]) -> dict[str, Any]:
+    def _serialize_scan(self, scan: GeoGridScan, points: list[ScanPointSnapshot]) -> dict[str, Any]:
         return {
             "id": str(scan.id),
             "scan_type": scan.scan_type,
@@ -1604,31 +1887,24 @@ class KeywordCampaignService:
         self,
         baseline_scans: list[GeoGridScan],
         followup_scans: list[GeoGridScan],
-        cycle_id: uuid.UUID,
+        point_cache: CycleScanPointCache,
     ) -> float | None:
-        if not baseline_scans or not followup_scans:
-            return None
-        baseline_by_keyword = {scan.keyword: scan for scan in baseline_scans}
-        followup_by_keyword = {scan.keyword: scan for scan in followup_scans}
-        deltas: list[float] = []
-        for keyword, baseline in baseline_by_keyword.items():
-            followup = followup_by_keyword.get(keyword)
-            if not followup:
-                continue
-            base_points = self._scan_points_for_center(baseline.id)
-            follow_points = self._scan_points_for_center(followup.id)
-            base_avg = self._average([point.rank for point in base_points if point.rank is not None])
-            follow_avg = self._average([point.rank for point in follow_points if point.rank is not None])
-            if base_avg is None or follow_avg is None:
-                continue
-            deltas.append(base_avg - follow_avg)
-        return round(sum(deltas) / len(deltas), 2) if deltas else None
+        return self._ring_improvement(baseline_scans, followup_scans, point_cache, CycleScanPointCache.CENTER)
 
     def _edge_improvement(
         self,
         baseline_scans: list[GeoGridScan],
         followup_scans: list[GeoGridScan],
-        cycle_id: uuid.UUID,
+        point_cache: CycleScanPointCache,
+    ) -> float | None:
+        return self._ring_improvement(baseline_scans, followup_scans, point_cache, CycleScanPointCache.EDGE)
+
+    def _ring_improvement(
+        self,
+        baseline_scans: list[GeoGridScan],
+        followup_scans: list[GeoGridScan],
+        point_cache: CycleScanPointCache,
+        ring: str,
     ) -> float | None:
         if not baseline_scans or not followup_scans:
             return None
@@ -1639,8 +1915,8 @@ class KeywordCampaignService:
             followup = followup_by_keyword.get(keyword)
             if not followup:
                 continue
-            base_points = self._scan_points_for_edge(baseline.id, rows=baseline.rows, columns=baseline.columns)
-            follow_points = self._scan_points_for_edge(followup.id, rows=followup.rows, columns=followup.columns)
+            base_points = point_cache.ring(baseline.id, ring)
+            follow_points = point_cache.ring(followup.id, ring)
             base_avg = self._average([point.rank for point in base_points if point.rank is not None])
             follow_avg = self._average([point.rank for point in follow_points if point.rank is not None])
             if base_avg is None or follow_avg is None:
@@ -1648,37 +1924,15 @@ class KeywordCampaignService:
             deltas.append(base_avg - follow_avg)
         return round(sum(deltas) / len(deltas), 2) if deltas else None
 
-    def _scan_points_for_center(self, scan_id: uuid.UUID) -> list[GeoGridScanPoint]:
-        points = (
-            self.db.query(GeoGridScanPoint)
-            .filter(GeoGridScanPoint.geo_grid_scan_id == scan_id)
-            .all()
-        )
-        if not points:
-            return []
-        max_row = max(point.row_index for point in points)
-        max_col = max(point.column_index for point in points)
-        center_row = max_row // 2
-        center_col = max_col // 2
-        result: list[GeoGridScanPoint] = []
-        for point in points:
-            if abs(point.row_index - center_row) <= 1 and abs(point.column_index - center_col) <= 1:
-                result.append(point)
-        return result
+    def scan_point_cache(self, cycle_id: uuid.UUID) -> CycleScanPointCache:
+        cache = self._scan_point_caches.get(cycle_id)
+        if cache is None:
+            cache = CycleScanPointCache(self.db, cycle_id)
+            self._scan_point_caches[cycle_id] = cache
+        return cache
 
-    def _scan_points_for_edge(self, scan_id: uuid.UUID, *, rows: int, columns: int) -> list[GeoGridScanPoint]:
-        points = (
-            self.db.query(GeoGridScanPoint)
-            .filter(GeoGridScanPoint.geo_grid_scan_id == scan_id)
-            .all()
-        )
-        edge_rows = {0, max(0, rows - 1)}
-        edge_cols = {0, max(0, columns - 1)}
-        return [
-            point
-            for point in points
-            if point.row_index in edge_rows or point.column_index in edge_cols
-        ]
+    def _invalidate_scan_points(self, cycle_id: uuid.UUID) -> None:
+        self._scan_point_caches.pop(cycle_id, None)
 
     def _historical_keywords(self, *, location_id: uuid.UUID) -> list[str]:
         rows = (
@@ -1704,77 +1958,6 @@ class KeywordCampaignService:
                     values.append(label)
         return [self._clean_term(item) for item in values if self._clean_term(item)]
 
-    def _resolve_rank(self, rank_map: dict[str, float], keyword: str) -> float | None:
-        normalized = self._normalize_keyword(keyword)
-        if normalized in rank_map:
-            return rank_map[normalized]
-        tokens = normalized.split()
-        best_match: tuple[int, float] | None = None
-        for known_keyword, rank in rank_map.items():
-            known_tokens = known_keyword.split()
-            overlap = len(set(tokens) & set(known_tokens))
-            if overlap == 0:
-                continue
-            if best_match is None or overlap > best_match[0]:
-                best_match = (overlap, rank)
-        return best_match[1] if best_match else None
-
-    def _relevance_score(self, *, keyword: str, context: DiscoveryContext, target_area: str | None) -> float:
-        score = 20.0
-        service_tokens = self._token_set(context.services + ([context.primary_category] if context.primary_category else []))
-        keyword_tokens = self._token_set([keyword])
-        overlap = len(service_tokens & keyword_tokens)
-        if overlap:
-            score += min(45.0, overlap * 15.0)
-        if context.city and context.city.lower() in keyword:
-            score += 20
-        if context.state and context.state.lower() in keyword:
-            score += 8
-        if target_area and context.city and target_area.lower() != context.city.lower():
-            score += 10
-        if "near me" in keyword:
-            score += 8
-        return min(100.0, score)
-
-    def _intent_score(self, keyword: str) -> float:
-        score = 10.0
-        lowered = keyword.lower()
-        for token, value in INTENT_TOKENS.items():
-            if token in lowered:
-                score += value
-        if "near me" in lowered:
-            score += 18
-        return min(100.0, score)
-
-    def _ticket_value_score(self, keyword: str) -> float:
-        score = 20.0
-        lowered = keyword.lower()
-        for token, value in HIGH_TICKET_TOKENS.items():
-            if token in lowered:
-                score += value
-        return min(100.0, score)
-
-    def _opportunity_score(self, *, current_rank: float | None, target_area: str | None, city: str | None) -> float:
-        if current_rank is None:
-            score = 65.0
-        elif current_rank <= 3:
-            score = 22.0
-        elif current_rank <= 6:
-            score = 56.0
-        elif current_rank <= 10:
-            score = 78.0
-        else:
-            score = 90.0
-        if target_area and city and target_area.lower() != city.lower():
-            score += 8
-        return min(100.0, score)
-
-    @staticmethod
-    def _current_rank_score(current_rank: float | None) -> float:
-        if current_rank is None:
-            return 50.0
-        return max(0.0, min(100.0, 100.0 - current_rank * 8.0))
-
     def _classifications(
         self,
         *,
@@ -2011,18 +2194,6 @@ class KeywordCampaignService:
                 return value
         return None
 
-    @staticmethod
-    def _token_set(values: Iterable[str | None]) -> set[str]:
-        tokens: set[str] = set()
-        for value in values:
-            if not value:
-                continue
-            for token in re.split(r"\s+", value.lower()):
-                cleaned = token.strip()
-                if cleaned and cleaned not in STOP_WORDS:
-                    tokens.add(cleaned)
-        return tokens
-
     @staticmethod
     def _dedupe_preserve(values: Iterable[str]) -> list[str]:
         result: list[str] = []
@@ -2047,43 +2218,43 @@ class KeywordCampaignSchedulerService:
         self.action_service = ActionService(db)
 
     def schedule_monthly_campaigns(self, *, reference_date: date | None = None) -> int:
+        """Enqueue this month's campaign for every eligible location in one INSERT ... SELECT.
+
+        Eligibility (`_onboarding_completed` and `_has_core_profile_fields`) is evaluated
+        in SQL rather than per location.
+        """
         target = reference_date or datetime.now(timezone.utc).date()
-        scheduled = 0
-        organizations = (
-            self.db.query(Organization)
-            .filter(Organization.is_active == True)  # noqa: E712
-            .all()
+        period = f"{target.year:04d}-{target.month:02d}"
+        sql = self.action_service.fanout_sql()
+        org_id = sql.uuid_text(Organization.id)
+        location_id = sql.uuid_text(Location.id)
+        result = self.action_service.schedule_actions_from_select(
+            action_type=ActionType.RUN_KEYWORD_CAMPAIGN,
+            run_at=datetime.now(timezone.utc),
+            select_from=Location.__table__.join(
+                Organization.__table__, Organization.id == Location.organization_id
+            ).outerjoin(LocationSettings.__table__, LocationSettings.location_id == Location.id),
+            where=[
+                Organization.is_active == True,  # noqa: E712
+                Location.status == LocationStatus.ACTIVE,
+                self._onboarding_completed_sql(sql),
+                self._has_core_profile_fields_sql(sql),
+            ],
+            organization_id=Organization.id,
+            location_id=Location.id,
+            dedupe_key=sql.concat("keyword-monthly-action:", org_id, ":", location_id, f":{period}"),
+            payload=sql.json_object(
+                {
+                    "organization_id": org_id,
+                    "location_id": location_id,
+                    "cycle_year": target.year,
+                    "cycle_month": target.month,
+                    "trigger_source": "monthly",
+                    "onboarding_triggered": False,
+                }
+            ),
         )
-        for org in organizations:
-            locations = (
-                self.db.query(Location)
-                .filter(Location.organization_id == org.id)
-                .filter(Location.status == LocationStatus.ACTIVE)
-                .all()
-            )
-            for location in locations:
-                if not self._is_monthly_eligible(org, location):
-                    continue
-                dedupe_key = f"keyword-monthly-action:{org.id}:{location.id}:{target.year:04d}-{target.month:02d}"
-                if self._has_action(dedupe_key):
-                    continue
-                self.action_service.schedule_action(
-                    organization_id=org.id,
-                    action_type=ActionType.RUN_KEYWORD_CAMPAIGN,
-                    run_at=datetime.now(timezone.utc),
-                    payload={
-                        "organization_id": str(org.id),
-                        "location_id": str(location.id),
-                        "cycle_year": target.year,
-                        "cycle_month": target.month,
-                        "trigger_source": "monthly",
-                        "onboarding_triggered": False,
-                    },
-                    location_id=location.id,
-                    dedupe_key=dedupe_key,
-                )
-                scheduled += 1
-        return scheduled
+        return result.created
 
     def schedule_onboarding_first_runs(self) -> int:
         today = datetime.now(timezone.utc).date()
@@ -2137,9 +2308,6 @@ class KeywordCampaignSchedulerService:
                 scheduled += 1
         return scheduled
 
-    def _is_monthly_eligible(self, organization: Organization, location: Location) -> bool:
-        return self._onboarding_completed(organization) and self._has_core_profile_fields(location)
-
     def _is_ready_for_first_run(self, organization: Organization, location: Location) -> bool:
         if not self._onboarding_completed(organization):
             return False
@@ -2162,6 +2330,36 @@ class KeywordCampaignSchedulerService:
         onboarding = metadata.get("onboarding") if isinstance(metadata.get("onboarding"), dict) else {}
         return bool(onboarding.get("completed") is True)
 
+    def _has_core_profile_fields_sql(self, sql: FanOutSql) -> Any:
+        """SQL form of `_has_core_profile_fields`."""
+        business_type = func.coalesce(
+            sql.nonblank(sql.json_string(Location.address, "primaryCategory")),
+            sql.nonblank(sql.json_string(LocationSettings.settings_json, "business_type")),
+        )
+        gbp_ready = or_(
+            func.coalesce(Location.google_location_id, "") != "",
+            sql.json_is_true(LocationSettings.settings_json, "gbp_ready"),
+        )
+        return and_(
+            business_type.is_not(None),
+            sql.json_nonempty_array(LocationSettings.services),
+            gbp_ready,
+        )
+
+    def _onboarding_completed_sql(self, sql: FanOutSql) -> Any:
+        """SQL form of `_onboarding_completed`."""
+        status = func.lower(
+            func.coalesce(
+                func.nullif(sql.json_string(Organization.metadata_json, "onboarding_status"), ""),
+                func.nullif(sql.json_string(Organization.metadata_json, "status"), ""),
+                "",
+            )
+        )
+        return or_(
+            status.in_(["completed", "activated"]),
+            sql.json_is_true(Organization.metadata_json, "onboarding", "completed"),
+        )
+
     def _has_action(self, dedupe_key: str) -> bool:
         existing = (
             self.db.query(Action)
@@ -2176,3 +2374,69 @@ class KeywordCampaignSchedulerService:
             stripped = value.strip()
             return stripped if stripped else None
         return None
+
+
+def refresh_dashboard_post_plan(db: Session, cycle_id: uuid.UUID) -> bool:
+    """Re-render only the post plan of a materialized dashboard payload; the caller commits.
+
+    The section reads nothing but the cycle's post mappings, so post status changes refresh it
+    without building a campaign service. Returns False when there is no payload yet.
+    """
+    materialized = _materialized_dashboard(db, cycle_id)
+    if materialized is None:
+        return False
+    aggregate, cycle = materialized
+    inputs = _DashboardInputs(db, cycle, aggregate=aggregate)
+    section = KeywordCampaignService._dashboard_post_plan_section(cycle, inputs)
+    _store_dashboard_body(db, aggregate, {**aggregate.payload_json, **_json_ready(section)})
+    return True
+
+
+def _materialized_dashboard(
+    db: Session, cycle_id: uuid.UUID
+) -> tuple[KeywordDashboardAggregate, KeywordCampaignCycle] | None:
+    db.flush()
+    aggregate = (
+        db.query(KeywordDashboardAggregate)
+        .filter(KeywordDashboardAggregate.campaign_cycle_id == cycle_id)
+        .one_or_none()
+    )
+    cycle = db.get(KeywordCampaignCycle, cycle_id)
+    if aggregate is None or aggregate.payload_json is None or cycle is None:
+        return None
+    return aggregate, cycle
+
+
+def _store_dashboard_body(db: Session, aggregate: KeywordDashboardAggregate, body: dict[str, Any]) -> None:
+    aggregate.payload_json = body
+    aggregate.payload_version = (aggregate.payload_version or 0) + 1
+    aggregate.payload_etag = _payload_digest(body)
+    aggregate.payload_refreshed_at = datetime.now(timezone.utc)
+    db.add(aggregate)
+
+
+@contextmanager
+def _timed_stage(timings: dict[str, float], stage: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = round((time.perf_counter() - started) * 1000, 2)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _json_ready(payload: dict[str, Any]) -> dict[str, Any]:
+    """Round-trip through JSON so stored payloads match what the API would render."""
+    return json.loads(json.dumps(payload, default=_json_default))
+
+
+def _payload_digest(payload: Any) -> str:
+    encoded = json.dumps(payload, default=_json_default, sort_keys=True, separators=(",", ":"))
+    return sha256(encoded.encode("utf-8")).hexdigest()
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
@@ -19,6 +19,27 @@ router = APIRouter(
 )
 
 
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {value.strip().removeprefix("W/") for value in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _cached_dashboard(
+    service: KeywordCampaignService,
+    response: Response,
+    if_none_match: str | None,
+    **kwargs,
+) -> dict | Response:
+    payload, digest = service.dashboard_payload(**kwargs)
+    etag = f'"{digest}"'
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return payload
+
+
 class RunKeywordCampaignRequest(BaseModel):
     organization_id: uuid.UUID
     location_id: uuid.UUID
@@ -96,14 +117,16 @@ def run_followup(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
 
 
-@router.get("/locations/{location_id}/dashboard")
+@router.get("/locations/{location_id}/dashboard", response_model=None)
 def keyword_strategy_dashboard(
     location_id: uuid.UUID,
+    response: Response,
     organization_id: uuid.UUID = Query(...),
     cycle_id: uuid.UUID | None = Query(None),
+    if_none_match: str | None = Header(None),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
-) -> dict:
+) -> dict | Response:
     access = AccessService(db)
     try:
         access.resolve_org(user_id=current_user.id, organization_id=organization_id)
@@ -111,7 +134,10 @@ def keyword_strategy_dashboard(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(exc)) from exc
     service = KeywordCampaignService(db)
     try:
-        return service.build_dashboard_payload(
+        return _cached_dashboard(
+            service,
+            response,
+            if_none_match,
             organization_id=organization_id,
             location_id=location_id,
             cycle_id=cycle_id,
@@ -155,13 +181,15 @@ def list_keyword_cycles(
     ]
 
 
-@router.get("/cycles/{cycle_id}")
+@router.get("/cycles/{cycle_id}", response_model=None)
 def get_keyword_cycle(
     cycle_id: uuid.UUID,
+    response: Response,
     organization_id: uuid.UUID = Query(...),
+    if_none_match: str | None = Header(None),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
-) -> dict:
+) -> dict | Response:
     access = AccessService(db)
     try:
         access.resolve_org(user_id=current_user.id, organization_id=organization_id)
@@ -173,7 +201,10 @@ def get_keyword_cycle(
     row = db.get(KeywordCampaignCycle, cycle_id)
     if not row or row.organization_id != organization_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Campaign cycle not found")
-    return service.build_dashboard_payload(
+    return _cached_dashboard(
+        service,
+        response,
+        if_none_match,
         organization_id=organization_id,
         location_id=row.location_id,
         cycle_id=cycle_id,
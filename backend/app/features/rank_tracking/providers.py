@@ -8,6 +8,10 @@ from random import Random
 from typing import Protocol, Sequence
 import uuid
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
 from sqlalchemy.orm import Session
 
 from backend.app.models.google_business.location import Location
@@ -151,6 +155,65 @@ class GeoGridScanResult:
     points: list[GeoGridScanPointResult]
 
 
+MAX_GRID_SIZE = 21
+
+
+@dataclass(frozen=True)
+class GridLayout:
+    """Row-major grid cells as parallel arrays."""
+
+    rows: int
+    columns: int
+    row_indexes: list[int]
+    column_indexes: list[int]
+    latitudes: list[float]
+    longitudes: list[float]
+    center_distances: list[float]
+
+
+def build_grid_layout(
+    *,
+    rows: int,
+    columns: int,
+    center_latitude: float,
+    center_longitude: float,
+    spacing_miles: float,
+) -> GridLayout:
+    """Lay out a rows x columns grid (clamped to 1..MAX_GRID_SIZE) centred on a point."""
+    rows = max(1, min(MAX_GRID_SIZE, rows))
+    columns = max(1, min(MAX_GRID_SIZE, columns))
+    step = spacing_miles / 69.0
+    center_row = rows // 2
+    center_col = columns // 2
+    if np is not None:
+        row_grid, col_grid = np.meshgrid(np.arange(rows), np.arange(columns), indexing="ij")
+        row_offsets = (row_grid - center_row).ravel()
+        col_offsets = (col_grid - center_col).ravel()
+        return GridLayout(
+            rows=rows,
+            columns=columns,
+            row_indexes=row_grid.ravel().tolist(),
+            column_indexes=col_grid.ravel().tolist(),
+            latitudes=(center_latitude + row_offsets * step).tolist(),
+            longitudes=(center_longitude + col_offsets * step).tolist(),
+            center_distances=np.sqrt(row_offsets**2 + col_offsets**2).tolist(),
+        )
+    row_indexes = [row for row in range(rows) for _ in range(columns)]
+    column_indexes = list(range(columns)) * rows
+    return GridLayout(
+        rows=rows,
+        columns=columns,
+        row_indexes=row_indexes,
+        column_indexes=column_indexes,
+        latitudes=[center_latitude + (row - center_row) * step for row in row_indexes],
+        longitudes=[center_longitude + (col - center_col) * step for col in column_indexes],
+        center_distances=[
+            math.sqrt((row - center_row) ** 2 + (col - center_col) ** 2)
+            for row, col in zip(row_indexes, column_indexes)
+        ],
+    )
+
+
 class GeoGridProvider(Protocol):
     def run_scan(
         self,
@@ -189,44 +252,45 @@ class MockGeoGridProvider:
         center_lat = float(location.latitude or grid_config.get("center_latitude") or 37.7749)
         center_lng = float(location.longitude or grid_config.get("center_longitude") or -122.4194)
 
-        distance_step_deg = spacing_miles / 69.0
-        center_row = rows // 2
-        center_col = columns // 2
+        layout = build_grid_layout(
+            rows=rows,
+            columns=columns,
+            center_latitude=center_lat,
+            center_longitude=center_lng,
+            spacing_miles=spacing_miles,
+        )
         seed = int(sha256(f"{location.id}:{keyword}:{as_of.isoformat()}".encode("utf-8")).hexdigest()[:10], 16)
         rng = Random(seed)
         baseline_bias = self._historical_bias(location=location, keyword=keyword)
         followup_bonus = 1.8 if scan_type == "followup" else 0.0
 
+        # Draws stay sequential so a given seed keeps producing the same grid.
         points: list[GeoGridScanPointResult] = []
-        for row in range(rows):
-            for col in range(columns):
-                lat = center_lat + (row - center_row) * distance_step_deg
-                lng = center_lng + (col - center_col) * distance_step_deg
-                distance_factor = math.sqrt((row - center_row) ** 2 + (col - center_col) ** 2)
-                noise = rng.uniform(-1.8, 1.8)
-                raw_rank = 5.5 + baseline_bias + distance_factor * 1.3 + noise - followup_bonus
-                if raw_rank > 18 and rng.random() > 0.55:
-                    rank = None
-                else:
-                    rank = max(1, min(20, int(round(raw_rank))))
-                points.append(
-                    GeoGridScanPointResult(
-                        row_index=row,
-                        column_index=col,
-                        latitude=lat,
-                        longitude=lng,
-                        rank=rank,
-                        competitor_name="Competitor Co" if rank and rank > 3 else None,
-                    )
+        for index, distance_factor in enumerate(layout.center_distances):
+            noise = rng.uniform(-1.8, 1.8)
+            raw_rank = 5.5 + baseline_bias + distance_factor * 1.3 + noise - followup_bonus
+            if raw_rank > 18 and rng.random() > 0.55:
+                rank = None
+            else:
+                rank = max(1, min(20, int(round(raw_rank))))
+            points.append(
+                GeoGridScanPointResult(
+                    row_index=layout.row_indexes[index],
+                    column_index=layout.column_indexes[index],
+                    latitude=layout.latitudes[index],
+                    longitude=layout.longitudes[index],
+                    rank=rank,
+                    competitor_name="Competitor Co" if rank and rank > 3 else None,
                 )
+            )
 
         return GeoGridScanResult(
             center_latitude=center_lat,
             center_longitude=center_lng,
             radius_miles=radius_miles,
             spacing_miles=spacing_miles,
-            rows=rows,
-            columns=columns,
+            rows=layout.rows,
+            columns=layout.columns,
             points=points,
         )
 
@@ -8,6 +8,7 @@ from .billing.billing_subscription import BillingSubscription
 from .billing.stripe_webhook_event import StripeWebhookEvent
 from .content.brand_voice import BrandVoice
 from .content.bucket_performance import BucketPerformance
+from .content.caption_completion import CaptionCompletion
 from .content.content_item import ContentItem
 from .content.content_plan import ContentPlan
 from .content.content_template import ContentTemplate
@@ -15,6 +16,7 @@ from .content.daily_signal import DailySignal
 from .google_business.attribute_template import AttributeTemplate
 from .google_business.connected_account import ConnectedAccount
 from .google_business.gbp_connection import GbpConnection
+from .google_business.gbp_sync_watermark import GbpSyncWatermark
 from .google_business.listing_audit import ListingAudit
 from .google_business.location import Location
 from .google_business.location_settings import LocationSettings
@@ -30,6 +32,7 @@ from .identity.user import User
 from .media.client_upload import ClientUpload
 from .media.media_album import MediaAlbum
 from .media.media_asset import MediaAsset
+from .media.media_asset_tag import MediaAssetTag
 from .media.media_upload_request import MediaUploadRequest
 from .media.photo_request import PhotoRequest
 from .operations.alert import Alert
@@ -40,10 +43,12 @@ from .operations.rate_limit_state import RateLimitState
 from .posts.post import Post
 from .posts.post_attempt import PostAttempt
 from .posts.post_candidate import PostCandidate
+from .posts.post_embedding import PostEmbedding
 from .posts.post_job import PostJob
 from .posts.post_media_attachment import PostMediaAttachment
 from .posts.post_metrics_daily import PostMetricsDaily
-from .posts.post_rotation_memory import PostRotationMemory
+from .posts.post_minhash_band import PostMinhashBand
+from .posts.post_rotation_state import PostRotationState
 from .posts.post_variant import PostVariant
 from .posts.posting_window_stat import PostingWindowStat
 from .rank_tracking.campaign_job_run import CampaignJobRun
@@ -77,6 +82,7 @@ __all__ = [
     "Location",
     "LocationSettings",
     "MediaAsset",
+    "MediaAssetTag",
     "MediaAlbum",
     "LocationKeyword",
     "GeoGridPoint",
@@ -96,7 +102,7 @@ __all__ = [
     "Organization",
     "Post",
     "PostMediaAttachment",
-    "PostRotationMemory",
+    "PostRotationState",
     "PostVariant",
     "QnaEntry",
     "User",
@@ -108,6 +114,7 @@ __all__ = [
     "DashboardSnapshot",
     "OrganizationInvite",
     "GbpConnection",
+    "GbpSyncWatermark",
     "OrgAutomationSettings",
     "LocationAutomationSettings",
     "ImpersonationSession",
@@ -115,9 +122,12 @@ __all__ = [
     "BrandVoice",
     "DailySignal",
     "PostCandidate",
+    "PostEmbedding",
     "PostMetricsDaily",
+    "PostMinhashBand",
     "PostingWindowStat",
     "BucketPerformance",
+    "CaptionCompletion",
     "ContentItem",
     "ContentPlan",
     "PostJob",
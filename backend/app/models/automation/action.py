@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, Enum as SQLEnum, ForeignKey, Index, Integer, String, event
+from sqlalchemy import DateTime, Enum as SQLEnum, ForeignKey, Index, Integer, String, event, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -17,6 +17,7 @@ class Action(Base, UUIDPrimaryKeyMixin, TimestampMixin):
     __table_args__ = (
         Index("ix_action_run_at", "run_at"),
         Index("ix_action_status", "status"),
+        Index("ix_action_status_priority_run_at", "status", text("priority DESC"), "run_at"),
     )
 
     tenant_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=False)
@@ -45,6 +46,7 @@ class Action(Base, UUIDPrimaryKeyMixin, TimestampMixin):
     payload: Mapped[dict | None] = mapped_column(JSONB, default=dict)
     run_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     locked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    locked_by: Mapped[str | None] = mapped_column(String(255))
     attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     max_attempts: Mapped[int] = mapped_column(Integer, default=5, nullable=False)
     priority: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.app.db.base import Base
+from backend.app.models.mixins import TimestampMixin
+
+
+class CaptionCompletion(Base, TimestampMixin):
+    """Cached caption completions for one prompt, keyed by the hash of the full request."""
+
+    __tablename__ = "caption_completions"
+    __table_args__ = (
+        Index("ix_caption_completions_expires_at", "expires_at"),
+    )
+
+    prompt_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    model: Mapped[str] = mapped_column(String(64), nullable=False)
+    variants: Mapped[list[str]] = mapped_column(JSONB, nullable=False, default=list)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -47,6 +47,7 @@ class ActionType(str, Enum):
     SYNC_GOOGLE_LOCATIONS = "sync_google_locations"
     SYNC_GBP_REVIEWS = "sync_gbp_reviews"
     SYNC_GBP_POSTS = "sync_gbp_posts"
+    SYNC_GBP_MEDIA = "sync_gbp_media"
     COMPUTE_DAILY_SIGNALS = "compute_daily_signals"
     GENERATE_POST_CANDIDATES = "generate_post_candidates"
     COMPOSE_POST_CANDIDATE = "compose_post_candidate"
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.app.db.base import Base
+from backend.app.models.mixins import TimestampMixin
+
+
+class GbpSyncWatermark(Base, TimestampMixin):
+    """How far a location's GBP resource listing (reviews, localPosts, media) has been synced.
+
+    `update_time` is the newest remote `updateTime` written by a completed run. While a run
+    is paging, `page_token` and `cursor_update_time` record its progress so an interrupted
+    run resumes where it stopped.
+    """
+
+    __tablename__ = "gbp_sync_watermarks"
+
+    organization_id: Mapped[uuid.UUID] = mapped_column(
+        "tenant_id", UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False
+    )
+    location_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("locations.id", ondelete="CASCADE"), primary_key=True
+    )
+    resource: Mapped[str] = mapped_column(String(32), primary_key=True)
+    update_time: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    page_token: Mapped[str | None] = mapped_column(String(1024))
+    cursor_update_time: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    last_synced_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
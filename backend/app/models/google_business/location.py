@@ -41,6 +41,7 @@ class Location(Base, UUIDPrimaryKeyMixin, TimestampMixin):
     posting_cap_per_week: Mapped[int | None] = mapped_column(Integer)
     last_sync_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     reviews_last_synced_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    media_last_synced_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
     organization = relationship("Organization", back_populates="locations")
     connected_account = relationship("ConnectedAccount", back_populates="locations")
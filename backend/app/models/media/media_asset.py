@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Integer, String
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Integer, String, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -14,6 +14,17 @@ from backend.app.models.mixins import TimestampMixin, UUIDPrimaryKeyMixin
 
 class MediaAsset(Base, UUIDPrimaryKeyMixin, TimestampMixin):
     __tablename__ = "media_assets"
+    __table_args__ = (
+        # Sync upserts a location's imported GBP media by its resource name.
+        Index(
+            "uq_media_asset_gbp_external",
+            "location_id",
+            "source_external_id",
+            unique=True,
+            postgresql_where=text("source = 'gbp'"),
+            sqlite_where=text("source = 'gbp'"),
+        ),
+    )
 
     # Physical DB column is `tenant_id`; keep the Python attribute as
     # organization_id for the existing service/API surface.
@@ -47,6 +58,8 @@ class MediaAsset(Base, UUIDPrimaryKeyMixin, TimestampMixin):
     job_type: Mapped[str | None] = mapped_column(String(128))
     season: Mapped[str | None] = mapped_column(String(64))
     shot_stage: Mapped[str | None] = mapped_column(String(32))
+    # Hash of the GBP media item as last imported; GBP media has no updateTime.
+    external_hash: Mapped[str | None] = mapped_column(String(64))
     upload_request_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("media_upload_requests.id")
     )
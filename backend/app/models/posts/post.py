@@ -19,6 +19,8 @@ class Post(Base, UUIDPrimaryKeyMixin, TimestampMixin):
         Index("ix_post_location", "location_id"),
         Index("ix_post_scheduled", "scheduled_at"),
         Index("ix_post_status", "status"),
+        # Sync upserts a tenant's imported GBP posts by their resource name.
+        Index("uq_post_tenant_external", "tenant_id", "external_post_id", unique=True),
     )
 
     # Physical DB column is `tenant_id`; keep the Python attribute as
@@ -47,6 +49,8 @@ class Post(Base, UUIDPrimaryKeyMixin, TimestampMixin):
     cta: Mapped[dict | None] = mapped_column(JSONB, default=dict)
     rotation_context: Mapped[dict | None] = mapped_column(JSONB, default=dict)
     external_post_id: Mapped[str | None] = mapped_column(String(255), index=True)
+    # GBP `updateTime` of the synced local post; sync only overwrites the row with newer data.
+    external_updated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     bucket: Mapped[str | None] = mapped_column(String(64))
     topic_tags: Mapped[list[str] | None] = mapped_column(JSONB, default=list)
     media_asset_id: Mapped[uuid.UUID | None] = mapped_column(
@@ -54,6 +58,8 @@ class Post(Base, UUIDPrimaryKeyMixin, TimestampMixin):
     )
     window_id: Mapped[str | None] = mapped_column(String(32))
     fingerprint: Mapped[str | None] = mapped_column(String(255), index=True)
+    # MinHash of the normalized body; NULL until the post is indexed for content-reuse lookups.
+    minhash_signature: Mapped[list[int] | None] = mapped_column(JSONB)
 
     organization = relationship("Organization")
     location = relationship("Location")
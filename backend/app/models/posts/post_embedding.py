@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import Float, ForeignKey, Index, Integer, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.app.db.base import Base
+from backend.app.models.mixins import TimestampMixin, UUIDPrimaryKeyMixin
+
+
+class PostEmbedding(Base, UUIDPrimaryKeyMixin, TimestampMixin):
+    __tablename__ = "post_embeddings"
+    __table_args__ = (
+        UniqueConstraint("post_id", name="uq_post_embedding_post"),
+        Index("ix_post_embedding_location_created", "location_id", "created_at"),
+    )
+
+    organization_id: Mapped[uuid.UUID] = mapped_column(
+        "tenant_id", UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False
+    )
+    location_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("locations.id"), nullable=False
+    )
+    post_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("posts.id", ondelete="CASCADE"), nullable=False
+    )
+    model: Mapped[str] = mapped_column(String(64), nullable=False)
+    dimensions: Mapped[int] = mapped_column(Integer, nullable=False)
+    vector: Mapped[list[float]] = mapped_column(JSONB, nullable=False)
+    norm: Mapped[float] = mapped_column(Float, nullable=False)
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import BigInteger, ForeignKey, Index, SmallInteger
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.app.db.base import Base
+
+
+class PostMinhashBand(Base):
+    """One LSH band key of a post body's MinHash signature."""
+
+    __tablename__ = "post_minhash_bands"
+    __table_args__ = (
+        Index("ix_post_minhash_band_lookup", "location_id", "band_key"),
+    )
+
+    post_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True
+    )
+    band: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    location_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("locations.id"), nullable=False
+    )
+    band_key: Mapped[int] = mapped_column(BigInteger, nullable=False)
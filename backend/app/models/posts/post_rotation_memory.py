@@ -1,29 +0,0 @@
-from __future__ import annotations
-
-import uuid
-from datetime import datetime
-
-from sqlalchemy import DateTime, ForeignKey, Index, String
-from sqlalchemy.dialects.postgresql import JSONB, UUID
-from sqlalchemy.orm import Mapped, mapped_column
-
-from backend.app.db.base import Base
-from backend.app.models.mixins import TimestampMixin, UUIDPrimaryKeyMixin
-
-
-class PostRotationMemory(Base, UUIDPrimaryKeyMixin, TimestampMixin):
-    __tablename__ = "post_rotation_memory"
-    __table_args__ = (
-        Index("ix_rotation_location", "location_id"),
-    )
-
-    organization_id: Mapped[uuid.UUID] = mapped_column(
-        "tenant_id", UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False
-    )
-    location_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("locations.id"), nullable=False
-    )
-    key: Mapped[str] = mapped_column(String(128), nullable=False)
-    value: Mapped[str] = mapped_column(String(255), nullable=False)
-    last_used_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
-    metadata_json: Mapped[dict | None] = mapped_column(JSONB, default=dict)
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.app.db.base import Base
+from backend.app.models.mixins import TimestampMixin
+
+
+class PostRotationState(Base, TimestampMixin):
+    """Rotation state of one key (service, angle, CTA, ...) for a location.
+
+    `counts` maps each value to how often it was used; `recent` is the last-used ring of
+    ``[value, iso_timestamp]`` pairs, newest first.
+    """
+
+    __tablename__ = "post_rotation_state"
+
+    organization_id: Mapped[uuid.UUID] = mapped_column(
+        "tenant_id", UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False
+    )
+    location_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("locations.id", ondelete="CASCADE"), primary_key=True
+    )
+    key: Mapped[str] = mapped_column(String(128), primary_key=True)
+    counts: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    recent: Mapped[list] = mapped_column(JSONB, nullable=False, default=list)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
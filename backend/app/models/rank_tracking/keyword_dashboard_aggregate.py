@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+from datetime import datetime
 import uuid
 
-from sqlalchemy import Float, ForeignKey, Index, Integer, String, UniqueConstraint
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, UniqueConstraint
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -39,6 +40,11 @@ class KeywordDashboardAggregate(Base, UUIDPrimaryKeyMixin, TimestampMixin):
     service_area_improvement: Mapped[float | None] = mapped_column(Float)
     edge_of_grid_improvement: Mapped[float | None] = mapped_column(Float)
     summary_json: Mapped[dict | None] = mapped_column(JSONB, default=dict)
+    # Rendered dashboard payload for the cycle (everything except location history).
+    payload_json: Mapped[dict | None] = mapped_column(JSONB)
+    payload_version: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    payload_etag: Mapped[str | None] = mapped_column(String(64))
+    payload_refreshed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
     organization = relationship("Organization")
     location = relationship("Location")
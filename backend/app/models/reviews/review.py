@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import uuid
+from datetime import datetime
 
-from sqlalchemy import Enum, ForeignKey, Index, Integer, String
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Integer, String
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -43,6 +44,8 @@ class Review(Base, UUIDPrimaryKeyMixin, TimestampMixin):
         default=ReviewStatus.NEW,
     )
     metadata_json: Mapped[dict | None] = mapped_column(JSONB, default=dict)
+    # GBP `updateTime` of the synced review; sync only overwrites the row with newer data.
+    external_updated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
     location = relationship("Location")
     replies = relationship("ReviewReply", back_populates="review", cascade="all,delete")
@@ -0,0 +1,5 @@
+import sys
+
+import backend.app.features.actions.fanout as _module
+
+sys.modules[__name__] = _module
@@ -0,0 +1,5 @@
+import sys
+
+import backend.app.features.google_business.sync_engine as _module
+
+sys.modules[__name__] = _module
@@ -0,0 +1,5 @@
+import sys
+
+import backend.app.features.posts.content_reuse as _module
+
+sys.modules[__name__] = _module
@@ -0,0 +1,5 @@
+import sys
+
+import backend.app.features.posts.embedding_index as _module
+
+sys.modules[__name__] = _module
@@ -0,0 +1,5 @@
+import sys
+
+import backend.app.features.posts.window_registry as _module
+
+sys.modules[__name__] = _module
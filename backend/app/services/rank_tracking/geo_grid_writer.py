@@ -0,0 +1,5 @@
+import sys
+
+import backend.app.features.rank_tracking.geo_grid_writer as _module
+
+sys.modules[__name__] = _module
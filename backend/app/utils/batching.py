@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+from typing import Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+def chunks(rows: Sequence[T], size: int) -> list[list[T]]:
+    """`rows` split into consecutive lists of at most `size` items, for bounded bulk statements."""
+    return [list(rows[index : index + size]) for index in range(0, len(rows), size)]
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+
+
+def day_start(day: date) -> datetime:
+    """Midnight UTC at the start of `day`."""
+    return datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc)
+
+
+def as_utc(value: datetime) -> datetime:
+    """`value` in UTC; naive values (as SQLite returns them) are taken to be UTC already."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime, timezone
 from functools import lru_cache
-from typing import Any
+from typing import Any, Iterable
 
 from sqlalchemy.orm import Session
 
@@ -56,6 +56,32 @@ class SettingsService:
             if location_id
             else None
         )
+        return self._merge(org_settings, loc_settings)
+
+    def merged_many(
+        self, organization_id: uuid.UUID, location_ids: Iterable[uuid.UUID]
+    ) -> dict[uuid.UUID, dict[str, Any]]:
+        """`merged` for several locations of one organization, in two queries."""
+        location_ids = list(location_ids)
+        org_settings = (
+            self.db.query(OrgSettings)
+            .filter(OrgSettings.organization_id == organization_id)
+            .one_or_none()
+        )
+        loc_settings = (
+            {
+                row.location_id: row
+                for row in self.db.query(LocationSettings).filter(LocationSettings.location_id.in_(location_ids))
+            }
+            if location_ids
+            else {}
+        )
+        return {
+            location_id: self._merge(org_settings, loc_settings.get(location_id)) for location_id in location_ids
+        }
+
+    @staticmethod
+    def _merge(org_settings: OrgSettings | None, loc_settings: LocationSettings | None) -> dict[str, Any]:
         merged = DEFAULT_SETTINGS | (org_settings.settings_json if org_settings and org_settings.settings_json else {})
         if loc_settings and loc_settings.settings_json:
             merged |= loc_settings.settings_json
@@ -69,27 +95,33 @@ class SettingsService:
     def verified_offers(
         self, organization_id: uuid.UUID, location_id: uuid.UUID | None = None, *, as_of: datetime | None = None
     ) -> list[dict[str, Any]]:
-        merged = self.merged(organization_id, location_id)
+        return self.offers_in(self.merged(organization_id, location_id), as_of=as_of)
+
+    def verified_events(
+        self, organization_id: uuid.UUID, location_id: uuid.UUID | None = None, *, as_of: datetime | None = None
+    ) -> list[dict[str, Any]]:
+        return self.events_in(self.merged(organization_id, location_id), as_of=as_of)
+
+    @classmethod
+    def offers_in(cls, merged: dict[str, Any], *, as_of: datetime | None = None) -> list[dict[str, Any]]:
         as_of = as_of or datetime.now(timezone.utc)
         offers = merged.get("verified_offers") or []
         legacy = merged.get("offers") or []
         return [
             offer
-            for offer in self._normalized_campaigns([*offers, *legacy], expected_type="offer")
-            if self._is_active(offer, as_of=as_of)
+            for offer in cls._normalized_campaigns([*offers, *legacy], expected_type="offer")
+            if cls._is_active(offer, as_of=as_of)
         ]
 
-    def verified_events(
-        self, organization_id: uuid.UUID, location_id: uuid.UUID | None = None, *, as_of: datetime | None = None
-    ) -> list[dict[str, Any]]:
-        merged = self.merged(organization_id, location_id)
+    @classmethod
+    def events_in(cls, merged: dict[str, Any], *, as_of: datetime | None = None) -> list[dict[str, Any]]:
         as_of = as_of or datetime.now(timezone.utc)
         events = merged.get("verified_events") or []
         legacy = merged.get("events") or []
         return [
             event
-            for event in self._normalized_campaigns([*events, *legacy], expected_type="event")
-            if self._is_active(event, as_of=as_of)
+            for event in cls._normalized_campaigns([*events, *legacy], expected_type="event")
+            if cls._is_active(event, as_of=as_of)
         ]
 
     @staticmethod
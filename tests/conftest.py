@@ -8,7 +8,7 @@ import uuid
 import pytest
 from fastapi.testclient import TestClient
 from fastapi import Request
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Session, sessionmaker
@@ -34,6 +34,28 @@ fernet_module = pytest.importorskip("cryptography.fernet")
 Fernet = fernet_module.Fernet
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-benchmarks",
+        action="store_true",
+        default=False,
+        help="run the wall-clock tests marked with @pytest.mark.benchmark",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: wall-clock timing comparison, skipped unless --run-benchmarks")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-benchmarks"):
+        return
+    skip = pytest.mark.skip(reason="benchmark; pass --run-benchmarks to run")
+    for item in items:
+        if item.get_closest_marker("benchmark"):
+            item.add_marker(skip)
+
+
 @compiles(JSONB, "sqlite")
 def _compile_jsonb_sqlite(element, compiler, **kw):
     return "JSON"
@@ -120,3 +142,27 @@ def worker_session_factory(engine, monkeypatch):
     TestingSessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
     monkeypatch.setattr(worker_tasks, "SessionLocal", TestingSessionLocal)
     return TestingSessionLocal
+
+
+@pytest.fixture
+def file_sessions(tmp_path):
+    """Session factory over a file-backed database, for code that opens sessions in threads."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'threads.db'}", connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def _pragmas(dbapi_connection, _record):
+        dbapi_connection.execute("PRAGMA journal_mode=WAL")
+        dbapi_connection.execute("PRAGMA synchronous=OFF")
+
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield sessionmaker(bind=engine, expire_on_commit=False)
+    finally:
+        engine.dispose()
+
+
+@pytest.fixture
+def file_db_session(file_sessions) -> Generator[Session, None, None]:
+    """A session on its own database, for code paths that roll back and would end `db_session`'s transaction."""
+    with file_sessions() as session:
+        yield session
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import time
+import uuid
+
+import pytest
+
+from backend.app.models.automation.action import Action
+from backend.app.models.enums import ActionType, OrganizationType
+from backend.app.models.google_business.location import Location
+from backend.app.models.identity.organization import Organization
+from backend.app.services.automation.actions import ActionExecutor, ServiceContainer
+from backend.app.services.google_business.gbp_sync import GbpSyncService
+from backend.app.services.rank_tracking.rank_tracking import RankTrackingService
+
+
+def _org_location(db_session):
+    org = Organization(name="Executor Org", org_type=OrganizationType.AGENCY)
+    db_session.add(org)
+    db_session.flush()
+    location = Location(organization_id=org.id, name="Executor Location", timezone="UTC")
+    db_session.add(location)
+    db_session.commit()
+    return org, location
+
+
+def _action(org, location, action_type: ActionType, payload: dict) -> Action:
+    return Action(
+        organization_id=org.id,
+        location_id=location.id,
+        action_type=action_type,
+        run_at=datetime.now(timezone.utc),
+        payload=payload,
+    )
+
+
+def test_executor_construction_builds_no_services(db_session):
+    executor = ActionExecutor(db_session)
+    assert executor.services.built == set()
+
+
+def test_rank_check_builds_only_declared_services(db_session, monkeypatch):
+    org, location = _org_location(db_session)
+    recorded: list[uuid.UUID] = []
+    monkeypatch.setattr(
+        RankTrackingService,
+        "record_snapshot",
+        lambda self, **kwargs: recorded.append(kwargs["keyword_id"]),
+    )
+    executor = ActionExecutor(db_session)
+    action = _action(
+        org,
+        location,
+        ActionType.CHECK_RANKINGS,
+        {
+            "location_id": str(location.id),
+            "keyword_ids": [str(uuid.uuid4())],
+            "grid_point_ids": [str(uuid.uuid4())],
+        },
+    )
+
+    result = executor.execute(action)
+
+    assert result == {"status": "rank_snapshots_recorded"}
+    assert len(recorded) == 1
+    assert executor.required_services(ActionType.CHECK_RANKINGS) == ("rank_service",)
+    # RankTrackingService is built with the shared ActionService.
+    assert executor.services.built == {"rank_service", "action_service"}
+
+
+def test_sync_reviews_builds_only_declared_services(db_session, monkeypatch):
+    org, location = _org_location(db_session)
+    monkeypatch.setattr(GbpSyncService, "sync_reviews", lambda self, org_id, loc_id: 3)
+    executor = ActionExecutor(db_session)
+    action = _action(org, location, ActionType.SYNC_GBP_REVIEWS, {"location_id": str(location.id)})
+
+    result = executor.execute(action)
+
+    assert result == {"status": "reviews_synced", "count": 3}
+    assert executor.required_services(ActionType.SYNC_GBP_REVIEWS) == ("gbp_sync", "gbp_sync_coordinator")
+    assert executor.services.built == {"gbp_sync"}
+
+
+def test_services_are_cached_per_session(db_session):
+    first = ActionExecutor(db_session)
+    second = ActionExecutor(db_session)
+    assert first.services is second.services
+    assert first.keyword_campaigns is second.keyword_campaigns
+
+
+def test_each_action_type_builds_a_subset_of_services(db_session):
+    total = len(ServiceContainer(db_session)._factories)
+    for action_type in ActionType:
+        db_session.info.pop(ServiceContainer.SESSION_INFO_KEY, None)
+        executor = ActionExecutor(db_session)
+        for name in executor.required_services(action_type):
+            getattr(executor, name)
+        assert len(executor.services.built) < total, action_type
+
+
+@pytest.mark.benchmark
+def test_executor_construction_benchmark(db_session):
+    """Executor setup per action type: eager (every service) vs lazy (declared services only)."""
+    rounds = 20
+    eager_total = 0.0
+    lazy_total = 0.0
+    for action_type in ActionType:
+        for _ in range(rounds):
+            db_session.info.pop(ServiceContainer.SESSION_INFO_KEY, None)
+            started = time.perf_counter()
+            executor = ActionExecutor(db_session)
+            executor.services.resolve_all()
+            eager_total += time.perf_counter() - started
+
+            db_session.info.pop(ServiceContainer.SESSION_INFO_KEY, None)
+            started = time.perf_counter()
+            executor = ActionExecutor(db_session)
+            for name in executor.required_services(action_type):
+                getattr(executor, name)
+            lazy_total += time.perf_counter() - started
+    assert lazy_total < eager_total
@@ -2,9 +2,13 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
 
+from sqlalchemy import event
+
+from backend.app.models.automation.action import Action
 from backend.app.models.enums import ActionStatus, ActionType, OrganizationType
 from backend.app.models.identity.organization import Organization
-from backend.app.services.automation.actions import ActionService
+from backend.app.models.operations.audit_log import AuditLog
+from backend.app.services.automation.actions import BULK_INSERT_CHUNK_SIZE, ActionService, ActionSpec
 
 
 def test_action_lifecycle_retry_and_dead_letter(db_session):
@@ -118,5 +122,79 @@ def test_legacy_action_path_ensures_tenant_row(db_session, monkeypatch):
     assert captured["plan_tier"] == org.plan_tier
 
 
+def test_schedule_actions_bulk_uses_fixed_statement_count(db_session, engine):
+    org = Organization(name="Bulk Org", org_type=OrganizationType.AGENCY)
+    db_session.add(org)
+    db_session.commit()
+    service = ActionService(db_session)
+    run_at = datetime.now(timezone.utc) + timedelta(minutes=5)
+    total = 10_000
+    specs = [
+        ActionSpec(
+            organization_id=org.id,
+            action_type=ActionType.PLAN_CONTENT,
+            run_at=run_at,
+            payload={"index": index},
+            dedupe_key=f"bulk:{org.id}:{index}",
+        )
+        for index in range(total)
+    ]
+
+    statements: list[str] = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        result = service.schedule_actions_bulk(specs)
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+
+    chunks = -(-total // BULK_INSERT_CHUNK_SIZE)
+    assert len(result.created) == total
+    assert result.deduplicated == []
+    # One multi-row INSERT per chunk for actions, and one per chunk for audit rows.
+    assert len(statements) == 2 * chunks
+    assert db_session.query(Action).filter(Action.organization_id == org.id).count() == total
+    assert (
+        db_session.query(AuditLog)
+        .filter(AuditLog.organization_id == org.id, AuditLog.action == "action.scheduled")
+        .count()
+        == total
+    )
+
+
+def test_schedule_actions_bulk_reports_deduplicated_specs(db_session):
+    org = Organization(name="Bulk Dedupe Org", org_type=OrganizationType.AGENCY)
+    db_session.add(org)
+    db_session.commit()
+    service = ActionService(db_session)
+    run_at = datetime.now(timezone.utc)
+    existing = service.schedule_action(
+        organization_id=org.id,
+        action_type=ActionType.CUSTOM,
+        run_at=run_at,
+        dedupe_key=f"bulk-dedupe:{org.id}:a",
+    )
+    specs = [
+        ActionSpec(organization_id=org.id, action_type=ActionType.CUSTOM, run_at=run_at, dedupe_key=key)
+        for key in (f"bulk-dedupe:{org.id}:a", f"bulk-dedupe:{org.id}:b", f"bulk-dedupe:{org.id}:b")
+    ]
+    specs.append(ActionSpec(organization_id=org.id, action_type=ActionType.CUSTOM, run_at=run_at))
+
+    result = service.schedule_actions_bulk(specs)
+
+    assert [spec.dedupe_key for spec in result.created] == [f"bulk-dedupe:{org.id}:b", None]
+    assert [spec.dedupe_key for spec in result.deduplicated] == [
+        f"bulk-dedupe:{org.id}:b",
+        f"bulk-dedupe:{org.id}:a",
+    ]
+    created = db_session.get(Action, result.created_ids[0])
+    assert created.status == ActionStatus.PENDING
+    assert created.tenant_id == org.id
+    assert existing.id not in result.created_ids
+
+
 def _ensure_aware(dt: datetime) -> datetime:
     return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
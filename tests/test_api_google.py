@@ -11,6 +11,7 @@ from backend.app.core.config import settings
 from backend.app.models.enums import OrganizationType
 from backend.app.models.identity.organization import Organization
 from backend.app.services.google_business.google import GoogleBusinessClient, GoogleOAuthService
+from backend.app.services.google_business.transport import GbpTransport, set_transport
 from pydantic import AnyHttpUrl
 
 
@@ -141,7 +142,7 @@ def test_google_business_client_lists_accounts_from_account_management_api(monke
     client = GoogleBusinessClient("access-token")
     calls = []
 
-    def fake_get(self, endpoint, params=None):
+    def fake_get(self, endpoint, params=None, **kwargs):
         calls.append((endpoint, dict(params or {})))
         if len(calls) == 1:
             return {
@@ -173,7 +174,7 @@ def test_google_business_client_lists_locations_with_read_mask(monkeypatch):
     client = GoogleBusinessClient("access-token")
     calls = []
 
-    def fake_get(self, endpoint, params=None):
+    def fake_get(self, endpoint, params=None, **kwargs):
         calls.append((endpoint, dict(params or {})))
         if len(calls) == 1:
             return {
@@ -216,32 +217,23 @@ def test_google_errors_do_not_echo_provider_response_body():
     assert "secret-access-token" not in str(exc_info.value.detail)
 
 
-def test_google_oauth_errors_do_not_echo_provider_response_body(monkeypatch):
-    class FakeClient:
-        def __init__(self, *args, **kwargs):
-            pass
-
-        def __enter__(self):
-            return self
-
-        def __exit__(self, *args):
-            return None
+def test_google_oauth_errors_do_not_echo_provider_response_body():
+    def handler(request):
+        return httpx.Response(
+            400,
+            request=request,
+            text='{"error":"invalid_grant","refresh_token":"secret-refresh-token"}',
+        )
 
-        def post(self, url, data):
-            request = httpx.Request("POST", url)
-            return httpx.Response(
-                400,
-                request=request,
-                text='{"error":"invalid_grant","refresh_token":"secret-refresh-token"}',
+    set_transport(GbpTransport(transport=httpx.MockTransport(handler)))
+    try:
+        with pytest.raises(HTTPException) as exc_info:
+            GoogleOAuthService._post(
+                "https://oauth2.googleapis.com/token",
+                {"refresh_token": "secret-refresh-token"},
             )
-
-    monkeypatch.setattr(httpx, "Client", FakeClient)
-
-    with pytest.raises(HTTPException) as exc_info:
-        GoogleOAuthService._post(
-            "https://oauth2.googleapis.com/token",
-            {"refresh_token": "secret-refresh-token"},
-        )
+    finally:
+        set_transport(None)
 
     assert exc_info.value.detail == "Google OAuth request failed"
     assert "secret-refresh-token" not in str(exc_info.value.detail)
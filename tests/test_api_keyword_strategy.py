@@ -69,3 +69,37 @@ def test_keyword_strategy_run_and_dashboard_endpoint(api_client, db_session):
     assert payload["has_data"] is True
     assert len(payload["keywords"]) == 10
     assert payload["cycle"]["id"] == cycle_id
+
+
+def test_keyword_dashboard_endpoint_supports_etag(api_client, db_session):
+    user, org, location = _seed(api_client, db_session)
+    run = api_client.post(
+        "/api/keyword-strategy/run",
+        json={
+            "user_id": str(user.id),
+            "organization_id": str(org.id),
+            "location_id": str(location.id),
+            "trigger_source": "manual",
+        },
+    )
+    cycle_id = run.json()["cycle_id"]
+    url = f"/api/keyword-strategy/locations/{location.id}/dashboard"
+    params = {"user_id": str(user.id), "organization_id": str(org.id), "cycle_id": cycle_id}
+
+    first = api_client.get(url, params=params)
+    etag = first.headers["ETag"]
+    assert first.status_code == 200
+    assert etag.startswith('"')
+
+    cached = api_client.get(url, params=params, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+
+    api_client.post(
+        f"/api/keyword-strategy/cycles/{cycle_id}/followup",
+        params={"user_id": str(user.id), "organization_id": str(org.id)},
+    )
+    refreshed = api_client.get(url, params=params, headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["ETag"] != etag
+    assert all(entry["followup"] for entry in refreshed.json()["geo_grid"].values())
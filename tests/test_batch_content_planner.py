@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event
+
+from backend.app.models.automation.action import Action
+from backend.app.models.automation.approval_request import ApprovalRequest
+from backend.app.models.content.content_plan import ContentPlan
+from backend.app.models.content.daily_signal import DailySignal
+from backend.app.models.enums import ActionType, ApprovalCategory, ContentPlanStatus, OrganizationType, PostStatus
+from backend.app.models.google_business.location import Location
+from backend.app.models.identity.organization import Organization
+from backend.app.models.posts.post import Post
+from backend.app.models.posts.post_candidate import PostCandidate
+from backend.app.models.posts.post_embedding import PostEmbedding
+from backend.app.models.posts.post_job import PostJob
+from backend.app.models.posts.post_minhash_band import PostMinhashBand
+from backend.app.services.automation.actions import ActionExecutor
+from backend.app.services.content.batch_planner import BatchContentPlanner
+from backend.app.services.posts.post_composition import PostCompositionService
+from backend.app.services.posts.posting_safety import PostingSafetyService
+
+
+def _setup(db_session, count: int, name: str = "Batch Org") -> tuple[Organization, list[Location]]:
+    org = Organization(name=name, org_type=OrganizationType.AGENCY)
+    db_session.add(org)
+    db_session.flush()
+    locations = [
+        Location(
+            name=f"Batch Location {index}",
+            organization_id=org.id,
+            timezone="UTC",
+            address={"city": "Austin", "state": "TX", "category": "Roofing"},
+        )
+        for index in range(count)
+    ]
+    db_session.add_all(locations)
+    db_session.flush()
+    db_session.add_all(
+        DailySignal(
+            organization_id=org.id,
+            location_id=location.id,
+            signal_date=datetime.now(timezone.utc).date(),
+            days_since_post=10,
+            review_count_7d=3,
+            rank_delta_7d=-2,
+            extra_metrics={"posts_last_7d": 0, "new_media_14d": 2, "gbp_connection_ok": True},
+        )
+        for location in locations
+    )
+    db_session.commit()
+    return org, locations
+
+
+def _count_statements(engine, fn):
+    statements: list[str] = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        result = fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+    return result, statements
+
+
+def _assert_safe_spacing(planned) -> None:
+    by_location = defaultdict(list)
+    for item in planned:
+        by_location[item.location_id].append(item.scheduled_at)
+    for times in by_location.values():
+        times.sort()
+        for earlier, later in zip(times, times[1:]):
+            assert later - earlier >= timedelta(hours=PostingSafetyService.MIN_GAP_HOURS)
+        for current in times:
+            in_week = [value for value in times if current - timedelta(days=7) <= value <= current]
+            assert len(in_week) <= PostingSafetyService.MAX_POSTS_PER_WEEK
+
+
+def test_dry_run_returns_horizon_without_writing(db_session):
+    org, locations = _setup(db_session, 2)
+
+    plan = BatchContentPlanner(db_session).plan(organization_id=org.id, locations=locations, dry_run=True)
+
+    assert plan.dry_run
+    assert {item.location_id for item in plan.planned} == {location.id for location in locations}
+    _assert_safe_spacing(plan.planned)
+    assert "Minimum gap between posts not satisfied" in {skip.reason for skip in plan.skipped}
+    assert all(item.caption and item.window_id for item in plan.planned)
+    assert db_session.query(ContentPlan).count() == 0
+    assert db_session.query(PostCandidate).count() == 0
+    assert db_session.query(Post).count() == 0
+    assert db_session.query(PostJob).count() == 0
+
+
+def test_batch_plan_persists_plans_posts_and_jobs(db_session):
+    org, locations = _setup(db_session, 2)
+    planner = BatchContentPlanner(db_session)
+
+    plan = planner.plan(organization_id=org.id, locations=locations, horizon_days=7)
+
+    planned = len(plan.planned)
+    assert planned >= 4
+    assert db_session.query(ContentPlan).filter(ContentPlan.status == ContentPlanStatus.SCHEDULED).count() == planned
+    assert db_session.query(PostCandidate).filter(PostCandidate.status == PostStatus.SCHEDULED).count() == planned
+    assert db_session.query(PostJob).count() == planned
+    posts = db_session.query(Post).filter(Post.status == PostStatus.SCHEDULED).all()
+    assert len(posts) == planned
+    assert all(post.minhash_signature for post in posts)
+    assert db_session.query(PostMinhashBand).count() == planned * 64
+    actions = db_session.query(Action).filter(Action.action_type == ActionType.EXECUTE_POST_JOB).all()
+    assert {action.payload["post_job_id"] for action in actions} == {str(item.job_id) for item in plan.planned}
+    candidate = db_session.get(PostCandidate, plan.planned[0].candidate_id)
+    assert candidate.reason_json["post_id"] == str(plan.planned[0].post_id)
+
+    # Planned days keep their plans, and the rest of the week is now blocked by the posts just written.
+    again = planner.plan(organization_id=org.id, locations=locations, horizon_days=7)
+    assert again.planned == []
+    assert db_session.query(ContentPlan).count() == planned
+
+
+def test_pricing_captions_are_saved_as_drafts_awaiting_approval(db_session, monkeypatch):
+    org, locations = _setup(db_session, 1)
+    monkeypatch.setattr(
+        PostCompositionService,
+        "inject_focus_keyword",
+        lambda self, caption, keyword: f"{caption} Ask about our $49 roof inspection.",
+    )
+
+    plan = BatchContentPlanner(db_session).plan(organization_id=org.id, locations=locations, horizon_days=7)
+
+    assert plan.planned and all(item.requires_approval for item in plan.planned)
+    posts = db_session.query(Post).all()
+    assert {post.status for post in posts} == {PostStatus.DRAFT}
+    assert "$49" in posts[0].body
+    assert db_session.query(PostJob).count() == 0
+    assert db_session.query(Action).filter(Action.action_type == ActionType.EXECUTE_POST_JOB).count() == 0
+    requests = db_session.query(ApprovalRequest).all()
+    assert {request.payload["post_id"] for request in requests} == {str(post.id) for post in posts}
+    assert {(request.category, request.reason) for request in requests} == {
+        (ApprovalCategory.GBP_EDIT, "Pricing or discount language detected")
+    }
+    assert db_session.query(ContentPlan).filter(ContentPlan.status == ContentPlanStatus.SELECTED).count() == len(posts)
+
+
+def test_plan_content_action_supports_dry_run(db_session):
+    org, locations = _setup(db_session, 2)
+    action = Action(
+        organization_id=org.id,
+        action_type=ActionType.PLAN_CONTENT,
+        run_at=datetime.now(timezone.utc),
+        payload={"horizon_days": 7, "dry_run": True},
+    )
+
+    result = ActionExecutor(db_session).execute(action)
+
+    assert result["status"] == "dry_run"
+    assert result["plans_created"] == 0
+    assert result["days_planned"] >= 4
+    assert db_session.query(ContentPlan).count() == 0
+
+
+def test_batch_plan_checks_and_indexes_caption_embeddings(db_session, monkeypatch):
+    org, locations = _setup(db_session, 1)
+    # Every caption embeds to the same vector, so only the first planned day passes the check.
+    monkeypatch.setattr(PostCompositionService, "embedding", lambda self, text: [0.6, 0.8, 0.0])
+
+    plan = BatchContentPlanner(db_session).plan(organization_id=org.id, locations=locations, horizon_days=7)
+
+    assert len(plan.planned) == 1
+    assert "Caption too similar to recent content" in {skip.reason for skip in plan.skipped}
+    entry = db_session.query(PostEmbedding).one()
+    assert entry.post_id == plan.planned[0].post_id
+    assert entry.vector == [0.6, 0.8, 0.0]
+
+    later = BatchContentPlanner(db_session).plan(organization_id=org.id, locations=locations, horizon_days=14)
+    assert later.planned == []
+
+
+def test_batch_plan_statements_do_not_grow_with_locations(db_session, engine):
+    org, few = _setup(db_session, 3, name="Few Org")
+    other, many = _setup(db_session, 12, name="Many Org")
+
+    few_plan, few_statements = _count_statements(
+        engine, lambda: BatchContentPlanner(db_session).plan(organization_id=org.id, locations=few, dry_run=True)
+    )
+    many_plan, many_statements = _count_statements(
+        engine, lambda: BatchContentPlanner(db_session).plan(organization_id=other.id, locations=many, dry_run=True)
+    )
+
+    assert len(many_plan.planned) > len(few_plan.planned)
+    assert len(many_statements) == len(few_statements)
+
+
+def test_batch_planner_persists_200_locations_in_bulk(db_session, engine):
+    org, locations = _setup(db_session, 200)
+    planner = BatchContentPlanner(db_session)
+
+    preview = planner.plan(organization_id=org.id, locations=locations, horizon_days=14, dry_run=True)
+    plan, statements = _count_statements(
+        engine, lambda: planner.plan(organization_id=org.id, locations=locations, horizon_days=14)
+    )
+
+    assert len(preview.planned) == len(plan.planned)
+    assert len(plan.planned) >= 200 * 4
+    _assert_safe_spacing(plan.planned)
+    assert db_session.query(PostJob).count() == len(plan.planned)
+    # Prefetch and bulk writes only; nothing is issued per location or per day.
+    assert len(statements) < 50
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import random
+import threading
+
+import pytest
+
+from backend.app.core.config import settings
+from backend.app.models.content.caption_completion import CaptionCompletion
+from backend.app.models.content.content_plan import ContentPlan
+from backend.app.models.content.daily_signal import DailySignal
+from backend.app.models.enums import ContentPlanStatus, OrganizationType, PostType
+from backend.app.models.google_business.location import Location
+from backend.app.models.identity.organization import Organization
+from backend.app.models.posts.post_candidate import PostCandidate
+from backend.app.models.posts.post_variant import PostVariant
+from backend.app.services.content.batch_planner import BatchContentPlanner
+from backend.app.services.content.caption_completions import CaptionCompletionCache, prompt_hash, prompt_seed
+from backend.app.services.content.captions import CaptionGenerator
+from backend.app.services.content.content_guardrails import GuardrailError
+from backend.app.services.content.content_planner import ContentPlannerService
+from backend.app.services.posts.posts import PostService
+
+FILLER = (
+    "Our crew explains every option in plain language and leaves the site tidy. "
+    "Homeowners get a written summary with photos after each visit. "
+    "Scheduling is flexible, including early mornings for busy families. "
+    "We check the details that are easy to miss and point out simple upkeep steps. "
+    "Questions are always welcome before, during, and after the work. "
+    "Every recommendation comes with the reasoning behind it."
+).split(". ")
+
+
+class StubCompletions:
+    def __init__(self) -> None:
+        self.requests: list[dict] = []
+        self.content: str | None = None
+
+    def reply(self, payload: dict) -> dict:
+        self.requests.append(payload)
+        try:
+            prompt = json.loads(payload["messages"][-1]["content"])
+        except ValueError:
+            prompt = {}
+        rng = random.Random(payload.get("seed"))
+        choices = []
+        for index in range(payload.get("n", 1)):
+            lines = rng.sample(FILLER, 3)
+            opening = f"{prompt.get('business_name', 'Our team')} helps customers in {prompt.get('location', 'town')}"
+            body = f"{opening} with {prompt.get('service', 'service')} (option {index + 1}). {'. '.join(lines)}. "
+            content = self.content or body + prompt.get("cta", "Call today.")
+            choices.append({"index": index, "message": {"content": content}})
+        return {"choices": choices}
+
+
+@pytest.fixture()
+def openai_stub(monkeypatch):
+    stub = StubCompletions()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):  # noqa: N802
+            payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            if not self.path.endswith("/chat/completions"):
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = json.dumps(stub.reply(payload)).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "OPENAI_API_BASE_URL", f"http://127.0.0.1:{server.server_address[1]}/v1")
+    try:
+        yield stub
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _setup_locations(file_db_session, count: int) -> tuple[Organization, list[Location]]:
+    org = Organization(name="Caption Cache Org", org_type=OrganizationType.AGENCY)
+    file_db_session.add(org)
+    file_db_session.flush()
+    # Same-brand locations (one name, one service area) share their prompts.
+    locations = [
+        Location(
+            organization_id=org.id,
+            name="Summit Roofing",
+            timezone="UTC",
+            address={"city": "Austin", "state": "TX", "category": "Roofing"},
+        )
+        for _ in range(count)
+    ]
+    file_db_session.add_all(locations)
+    file_db_session.flush()
+    file_db_session.add_all(
+        DailySignal(
+            organization_id=org.id,
+            location_id=location.id,
+            signal_date=datetime.now(timezone.utc).date(),
+            days_since_post=10,
+            review_count_7d=3,
+            rank_delta_7d=-2,
+            extra_metrics={"posts_last_7d": 0, "new_media_14d": 2, "gbp_connection_ok": True},
+        )
+        for location in locations
+    )
+    file_db_session.commit()
+    return org, locations
+
+
+def test_identical_prompts_are_served_from_the_cache_with_a_stable_seed(file_db_session, openai_stub):
+    cache = CaptionCompletionCache(file_db_session)
+    messages = [{"role": "user", "content": json.dumps({"service": "roof repair", "cta": "Call today."})}]
+
+    first = cache.complete(messages, n=3)
+    second = cache.complete(messages, n=3)
+
+    assert len(first) == 3 and len(set(first)) == 3
+    assert second == first
+    assert len(openai_stub.requests) == 1
+    request = openai_stub.requests[0]
+    key = prompt_hash({"model": request["model"], "temperature": request["temperature"], "n": 3, "messages": messages})
+    assert request["seed"] == prompt_seed(key)
+
+    entry = file_db_session.get(CaptionCompletion, key)
+    entry.expires_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+    file_db_session.flush()
+    assert cache.complete(messages, n=3) == first
+    assert len(openai_stub.requests) == 2
+    assert openai_stub.requests[1]["seed"] == request["seed"]
+    expires_at = file_db_session.get(CaptionCompletion, key).expires_at
+    assert expires_at.replace(tzinfo=timezone.utc) > datetime.now(timezone.utc)
+
+
+def test_expired_completions_are_purged(file_db_session, openai_stub):
+    cache = CaptionCompletionCache(file_db_session)
+    stale = [{"role": "user", "content": "stale"}]
+    fresh = [{"role": "user", "content": "fresh"}]
+    cache.complete(stale)
+    cache.complete(fresh)
+    now = datetime.now(timezone.utc)
+    file_db_session.query(CaptionCompletion).filter(CaptionCompletion.model == cache.model).update(
+        {"expires_at": now - timedelta(hours=1)}
+    )
+    cache.complete(fresh, n=2)
+
+    assert cache.purge_expired(now=now) == 2
+    assert [entry.variants for entry in file_db_session.query(CaptionCompletion)] == [cache.complete(fresh, n=2)]
+    assert len(openai_stub.requests) == 3
+
+
+def test_caption_generator_requests_all_variants_in_one_completion(file_db_session, openai_stub):
+    generator = CaptionGenerator({"tone": "bold"}, completions=CaptionCompletionCache(file_db_session))
+    kwargs = dict(base_prompt="Spring roof checkups", services=["Roof Repair"], keywords=[], locations=["Austin"])
+
+    variants = generator.generate_variants(count=4, **kwargs)
+    repeated = generator.generate_variants(count=4, **kwargs)
+
+    assert len(variants) == 4
+    assert len(openai_stub.requests) == 1
+    assert openai_stub.requests[0]["n"] == 4
+    assert [variant["body"] for variant in repeated] == [variant["body"] for variant in variants]
+
+
+def test_flagged_completions_fall_back_to_template_variants(file_db_session, openai_stub):
+    # "Hello" and "shell" contain a profanity-list substring; the post must still be created.
+    openai_stub.content = "Hello from our shell team"
+    org, (location,) = _setup_locations(file_db_session, 1)
+
+    post = PostService(file_db_session).create_post(
+        organization_id=org.id,
+        location_id=location.id,
+        connected_account_id=None,
+        post_type=PostType.UPDATE,
+        base_prompt="Spring roof checkups",
+        scheduled_at=None,
+        context={},
+        services=["Roof Repair"],
+        schedule_publish_action=False,
+    )
+
+    assert len(openai_stub.requests) == 1
+    bodies = [variant.body for variant in file_db_session.query(PostVariant).filter(PostVariant.post_id == post.id)]
+    assert len(bodies) == 3
+    assert all(body.startswith("Spring roof checkups Roof Repair") for body in bodies)
+
+
+def test_fourteen_day_plans_make_a_bounded_number_of_llm_calls(file_db_session, openai_stub):
+    org, (first, second) = _setup_locations(file_db_session, 2)
+    planner = ContentPlannerService(file_db_session)
+
+    planner.plan_horizon(organization_id=org.id, location=first, horizon_days=14)
+    composed = (
+        file_db_session.query(PostCandidate)
+        .filter(PostCandidate.location_id == first.id, PostCandidate.proposed_caption.isnot(None))
+        .count()
+    )
+    first_calls = len(openai_stub.requests)
+    assert composed >= 2
+    assert 1 <= first_calls <= composed
+    assert first_calls == file_db_session.query(CaptionCompletion).count()
+    assert all(request["n"] == 3 for request in openai_stub.requests)
+
+    planner.plan_horizon(organization_id=org.id, location=second, horizon_days=14)
+    second_composed = (
+        file_db_session.query(PostCandidate)
+        .filter(PostCandidate.location_id == second.id, PostCandidate.proposed_caption.isnot(None))
+        .count()
+    )
+    hit_rate = 1 - (len(openai_stub.requests) - first_calls) / second_composed
+    assert hit_rate == 1.0
+    assert file_db_session.query(ContentPlan).filter(ContentPlan.location_id == second.id).count() >= 2
+
+
+def test_batch_planner_captions_come_from_cached_completions(file_db_session, openai_stub):
+    org, locations = _setup_locations(file_db_session, 2)
+
+    plan = BatchContentPlanner(file_db_session).plan(organization_id=org.id, locations=locations, horizon_days=14)
+
+    assert len(plan.planned) >= 4
+    assert all("(option " in item.caption for item in plan.planned)
+    # Same-brand locations share prompts, so requests stay below the number of captions and variant sets.
+    assert 1 <= len(openai_stub.requests) < 2 * len(plan.planned)
+    assert len(openai_stub.requests) == file_db_session.query(CaptionCompletion).count()
+
+
+def test_plan_horizon_skips_rejected_days_and_raises_other_errors(file_db_session, monkeypatch):
+    org, (first, second) = _setup_locations(file_db_session, 2)
+    planner = ContentPlannerService(file_db_session)
+
+    def reject(candidate_id, **kwargs):
+        raise GuardrailError("Caption too similar to recent content")
+
+    monkeypatch.setattr(planner.composer, "compose", reject)
+    (plan,) = planner.plan_horizon(organization_id=org.id, location=first, horizon_days=1)
+    file_db_session.refresh(plan)
+    assert plan.status == ContentPlanStatus.SKIPPED
+    assert plan.reason_json["skip_reason"] == "Caption too similar to recent content"
+
+    def fail(candidate_id, **kwargs):
+        raise ValueError("Post candidate not found")
+
+    monkeypatch.setattr(planner.composer, "compose", fail)
+    with pytest.raises(ValueError, match="Post candidate not found"):
+        planner.plan_horizon(organization_id=org.id, location=second, horizon_days=1)
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from difflib import SequenceMatcher
+import random
+import time
+import uuid
+
+import pytest
+from sqlalchemy import insert
+
+from backend.app.models.enums import OrganizationType, PostStatus, PostType
+from backend.app.models.google_business.location import Location
+from backend.app.models.identity.organization import Organization
+from backend.app.models.posts.post import Post
+from backend.app.models.posts.post_minhash_band import PostMinhashBand
+from backend.app.services.content.content_guardrails import ContentGuardrails
+from backend.app.services.posts.content_reuse import (
+    MIN_BAND_MATCHES,
+    ContentReuseIndex,
+    band_keys,
+    minhash_signature,
+    normalize_text,
+)
+from backend.app.services.posts.posting_safety import PostingSafetyService
+
+SERVICES = ["roof repair", "gutter cleaning", "siding install", "storm damage", "attic insulation", "skylight repair"]
+WORDS = (
+    "shingle flashing ridge vent leak inspection estimate warranty crew storm season winter spring "
+    "homeowners neighbors local licensed insured quality durable energy efficient moisture mold ice dam "
+    "downspout fascia soffit drip edge underlayment valley chimney decking nails sealant granules hail "
+    "wind tarp emergency same-day free honest upfront pricing financing options family owned trusted "
+    "reliable fast cleanup debris magnet sweep photos report checklist maintenance tips guide protect "
+    "autumn summer heat sun rain snow gusts branches leaves clog overflow basement foundation garage porch "
+    "deck patio window door trim paint cedar vinyl aluminum copper steel metal slate tile asphalt rubber "
+    "membrane flat low slope steep pitch gable hip dormer turret skylight attic ventilation intake exhaust "
+    "fan ridge-cap starter course step counter kickout cricket saddle boot pipe collar stack cap screen "
+    "guard helmet seamless hanger bracket spike ferrule elbow extension splash block rain barrel grading "
+    "drainage erosion landscaping mulch bed curb appeal resale value insurance claim adjuster deductible "
+    "documentation paperwork permit code inspector county township borough city suburb neighborhood street "
+    "block corner ranch colonial victorian bungalow cape craftsman farmhouse duplex townhome condo church "
+    "school office warehouse storefront restaurant clinic apartment landlord tenant manager association "
+    "board budget schedule calendar appointment visit walkthrough drone camera thermal scan infrared "
+    "moisture-meter sample swatch color palette charcoal weathered wood driftwood slate-gray barkwood "
+    "hickory pewter shakewood oyster mission brown desert tan estate onyx black"
+).split()
+CTAS = ["Call today to schedule a consultation.", "Contact us today to book service.", "Message our team to get started."]
+
+
+def _caption(rng: random.Random) -> str:
+    sentences = []
+    for _ in range(rng.randint(2, 4)):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(6, 14))]
+        words.insert(rng.randrange(len(words)), rng.choice(SERVICES))
+        sentences.append(" ".join(words).capitalize() + ".")
+    return " ".join(sentences) + " " + rng.choice(CTAS)
+
+
+def _mutate(rng: random.Random, text: str) -> str:
+    words = text.split(" ")
+    for _ in range(rng.randint(1, 8)):
+        position = rng.randrange(len(words))
+        operation = rng.random()
+        if operation < 0.3:
+            words[position] = rng.choice(WORDS)
+        elif operation < 0.5:
+            words.insert(position, rng.choice(WORDS))
+        elif operation < 0.65 and len(words) > 3:
+            del words[position]
+        elif operation < 0.8:
+            letters = list(words[position])
+            letters[rng.randrange(len(letters))] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+            words[position] = "".join(letters)
+        else:
+            words[position] = words[position].upper()
+    return " ".join(words)
+
+
+def _band_matches(first: str, second: str) -> int:
+    return sum(a == b for a, b in zip(band_keys(minhash_signature(first)), band_keys(minhash_signature(second))))
+
+
+def _setup_location(db_session) -> tuple[Organization, Location]:
+    org = Organization(name="Reuse Org", org_type=OrganizationType.AGENCY)
+    db_session.add(org)
+    db_session.flush()
+    location = Location(name="Reuse Location", organization_id=org.id, timezone="UTC")
+    db_session.add(location)
+    db_session.commit()
+    return org, location
+
+
+def _bulk_posts(db_session, org: Organization, location: Location, bodies: list[str]) -> list[uuid.UUID]:
+    created_at = datetime.now(timezone.utc) - timedelta(days=10)
+    post_rows = []
+    band_rows = []
+    for body in bodies:
+        post_id = uuid.uuid4()
+        signature = minhash_signature(body)
+        post_rows.append(
+            {
+                "id": post_id,
+                "organization_id": org.id,
+                "location_id": location.id,
+                "post_type": PostType.UPDATE,
+                "status": PostStatus.PUBLISHED,
+                "body": body,
+                "minhash_signature": signature,
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+        )
+        # Raw driver rows (SQLite stores UUIDs as 32 hex characters) keep the 64-rows-per-post
+        # band table cheap to seed at 20k posts.
+        band_rows.extend(
+            (post_id.hex, band, location.id.hex, key) for band, key in enumerate(band_keys(signature))
+        )
+    db_session.execute(insert(Post), post_rows)
+    db_session.connection().exec_driver_sql(
+        "INSERT INTO post_minhash_bands (post_id, band, location_id, band_key) VALUES (?, ?, ?, ?)",
+        band_rows,
+    )
+    db_session.commit()
+    return [row["id"] for row in post_rows]
+
+
+def test_minhash_signature_is_stable_and_normalized():
+    text = "Spring roof inspection:   call today to book service."
+    assert minhash_signature(text) == minhash_signature(text.upper().replace(" ", "  "))
+    assert minhash_signature("   ") is None
+    assert len(minhash_signature("ok")) == 128
+    assert _band_matches(text, text) == len(band_keys(minhash_signature(text)))
+
+
+def test_lsh_never_misses_pairs_the_exhaustive_checks_flag():
+    rng = random.Random(20240611)
+    flagged = 0
+    for _ in range(1500):
+        original = _caption(rng)
+        variant = _mutate(rng, original)
+        first, second = normalize_text(original), normalize_text(variant)
+        safety_hit = (
+            min(len(first), len(second)) >= 80
+            and SequenceMatcher(None, first, second).ratio() >= PostingSafetyService.SIMILARITY_THRESHOLD
+        )
+        guardrail_hit = SequenceMatcher(None, variant.lower(), original.lower()).ratio() >= 0.9
+        if not (safety_hit or guardrail_hit):
+            continue
+        flagged += 1
+        assert _band_matches(original, variant) >= MIN_BAND_MATCHES, (original, variant)
+    assert flagged > 500
+
+
+def test_safety_and_guardrails_use_indexed_candidates(db_session):
+    org, location = _setup_location(db_session)
+    rng = random.Random(5)
+    bodies = [_caption(rng) for _ in range(200)]
+    post_ids = _bulk_posts(db_session, org, location, bodies)
+    legacy = Post(organization_id=org.id, location_id=location.id, body="Legacy post without a signature.")
+    legacy.status = PostStatus.PUBLISHED
+    db_session.add(legacy)
+    db_session.commit()
+
+    index = ContentReuseIndex(db_session)
+    near_duplicate = _mutate(random.Random(1), bodies[42])
+    candidates = index.candidates(location.id, near_duplicate)
+    candidate_ids = {post.id for post in candidates}
+    assert post_ids[42] in candidate_ids
+    assert legacy.id in candidate_ids
+    assert len(candidates) < 20
+
+    errors = ContentGuardrails().validate(
+        bodies[42],
+        post_type=PostType.UPDATE,
+        service=None,
+        location=None,
+        has_verified_offer=False,
+        has_verified_event=False,
+        recent_texts=[post.body for post in index.candidates(location.id, bodies[42])],
+    )
+    assert "too_repetitive" in errors
+
+    safety = PostingSafetyService(db_session)
+    try:
+        safety._enforce_content_reuse(
+            location_id=location.id,
+            target_time=datetime.now(timezone.utc),
+            body=bodies[42],
+            fingerprint=None,
+        )
+    except ValueError as exc:
+        assert "recently" in str(exc)
+    else:  # pragma: no cover
+        raise AssertionError("exact reuse was not detected")
+
+
+def test_created_posts_are_indexed(db_session):
+    org, location = _setup_location(db_session)
+    post = Post(organization_id=org.id, location_id=location.id, body="Gutter cleaning keeps water off your fascia.")
+    db_session.add(post)
+    db_session.flush()
+    index = ContentReuseIndex(db_session)
+    index.index(post)
+    index.index(post)
+    db_session.commit()
+    assert post.minhash_signature == minhash_signature(post.body)
+    assert db_session.query(PostMinhashBand).filter(PostMinhashBand.post_id == post.id).count() == 64
+
+
+def _reuse_candidates(db_session, location, probe):
+    safety = PostingSafetyService(db_session)
+    return safety.reuse_index.candidates(
+        location.id,
+        probe,
+        since=datetime.now(timezone.utc) - timedelta(days=90),
+        statuses=PostingSafetyService.ACTIVE_STATUSES,
+    )
+
+
+def _near_duplicates(probe, posts):
+    normalized_probe = normalize_text(probe)
+    return [
+        post
+        for post in posts
+        if SequenceMatcher(None, normalized_probe, normalize_text(post.body)).ratio() >= 0.88
+    ]
+
+
+def test_reuse_index_narrows_20k_posts_to_a_few_candidates(db_session):
+    org, location = _setup_location(db_session)
+    rng = random.Random(99)
+    bodies = [_caption(rng) for _ in range(20_000)]
+    _bulk_posts(db_session, org, location, bodies)
+    probe = _mutate(random.Random(3), bodies[12_345])
+
+    candidates = _reuse_candidates(db_session, location, probe)
+
+    assert [post.body for post in _near_duplicates(probe, candidates)] == [bodies[12_345]]
+    assert len(candidates) < 50
+
+
+@pytest.mark.benchmark
+def test_content_reuse_benchmark_20k_posts(db_session):
+    org, location = _setup_location(db_session)
+    rng = random.Random(99)
+    bodies = [_caption(rng) for _ in range(20_000)]
+    _bulk_posts(db_session, org, location, bodies)
+    probe = _mutate(random.Random(3), bodies[12_345])
+
+    started = time.perf_counter()
+    _near_duplicates(probe, _reuse_candidates(db_session, location, probe))
+    indexed_elapsed = time.perf_counter() - started
+
+    normalized_probe = normalize_text(probe)
+    sample = bodies[:2_000]
+    started = time.perf_counter()
+    for body in sample:
+        SequenceMatcher(None, normalized_probe, normalize_text(body)).ratio()
+    exhaustive_estimate = (time.perf_counter() - started) * (len(bodies) / len(sample))
+
+    assert indexed_elapsed < exhaustive_estimate
@@ -4,7 +4,7 @@ from datetime import datetime, timedelta, timezone
 
 from backend.app.models.enums import MediaType, OrganizationType
 from backend.app.models.media.media_asset import MediaAsset
-from backend.app.models.posts.post_rotation_memory import PostRotationMemory
+from backend.app.models.posts.post_rotation_state import PostRotationState
 from backend.app.models.identity.organization import Organization
 from backend.app.models.google_business.location import Location
 from backend.app.services.content.captions import CaptionGenerator
@@ -26,12 +26,12 @@ def test_rotation_engine_respects_cooldown(db_session):
     org, location = _org_location(db_session)
     engine = RotationEngine(db_session, cooldown_hours=48)
     now = datetime.now(timezone.utc)
-    recent = PostRotationMemory(
+    recent = PostRotationState(
         organization_id=org.id,
         location_id=location.id,
         key="service",
-        value="HVAC",
-        last_used_at=now - timedelta(hours=1),
+        counts={"HVAC": 1},
+        recent=[["HVAC", (now - timedelta(hours=1)).isoformat()]],
     )
     db_session.add(recent)
     db_session.commit()
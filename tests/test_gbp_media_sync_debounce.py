@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from backend.app.core.config import settings
+from backend.app.features.google_business import sync as gbp_sync_module
+from backend.app.features.posts import composition as composition_module
+from backend.app.models.automation.action import Action
+from backend.app.models.content.content_plan import ContentPlan
+from backend.app.models.content.daily_signal import DailySignal
+from backend.app.models.enums import ActionType, OrganizationType
+from backend.app.models.google_business.location import Location
+from backend.app.models.identity.organization import Organization
+from backend.app.models.media.media_asset import MediaAsset
+from backend.app.services.automation.actions import ActionExecutor
+from backend.app.services.content.content_planner import ContentPlannerService
+from backend.app.services.google_business.google import GbpPage
+from backend.app.services.posts.post_composition import PostCompositionService
+
+
+class FakeGoogleBusinessClient:
+    def __init__(self) -> None:
+        self.media_calls = 0
+
+    def media_pages(self, location_name: str, *, page_token: str | None = None):
+        self.media_calls += 1
+        items = [
+            {
+                "name": f"{location_name}/media/roof-1",
+                "googleUrl": "https://example.com/roof-1.jpg",
+                "mediaFormat": "PHOTO",
+            }
+        ]
+        return [GbpPage(items, None)]
+
+
+def _setup(file_db_session) -> tuple[Organization, Location]:
+    org = Organization(name="Media Sync Org", org_type=OrganizationType.AGENCY)
+    file_db_session.add(org)
+    file_db_session.flush()
+    location = Location(
+        organization_id=org.id,
+        name="Media Sync Location",
+        timezone="UTC",
+        google_location_id="locations/media-sync",
+        address={"city": "Austin", "state": "TX", "category": "Roofing"},
+    )
+    file_db_session.add(location)
+    file_db_session.flush()
+    file_db_session.add(
+        DailySignal(
+            organization_id=org.id,
+            location_id=location.id,
+            signal_date=datetime.now(timezone.utc).date(),
+            days_since_post=10,
+            review_count_7d=3,
+            rank_delta_7d=-2,
+            extra_metrics={"posts_last_7d": 0, "new_media_14d": 2, "gbp_connection_ok": True},
+        )
+    )
+    file_db_session.commit()
+    return org, location
+
+
+def _sync_actions(file_db_session, location: Location) -> list[Action]:
+    return (
+        file_db_session.query(Action)
+        .filter(Action.location_id == location.id, Action.action_type == ActionType.SYNC_GBP_MEDIA)
+        .all()
+    )
+
+
+def test_plan_horizon_queues_one_media_sync_instead_of_listing_per_compose(file_db_session, monkeypatch):
+    client = FakeGoogleBusinessClient()
+    monkeypatch.setattr(gbp_sync_module.GbpSyncService, "_client", lambda self, org_id: client)
+    org, location = _setup(file_db_session)
+
+    planner = ContentPlannerService(file_db_session)
+    plans = planner.plan_horizon(organization_id=org.id, location=location, horizon_days=14)
+
+    assert len(plans) >= 2
+    assert client.media_calls == 0
+    (queued,) = _sync_actions(file_db_session, location)
+    assert queued.payload == {"location_id": str(location.id)}
+
+    result = ActionExecutor(file_db_session).execute(queued)
+    assert result == {"status": "media_synced", "count": 1}
+    assert client.media_calls == 1
+    file_db_session.refresh(location)
+    assert location.media_last_synced_at is not None
+    assert file_db_session.query(MediaAsset).filter(MediaAsset.source == "gbp").count() == 1
+
+    # A fresh ledger means a full replan neither lists media nor queues another sync.
+    file_db_session.query(ContentPlan).delete()
+    file_db_session.commit()
+    ContentPlannerService(file_db_session).plan_horizon(organization_id=org.id, location=location, horizon_days=14)
+    assert client.media_calls == 1
+    assert len(_sync_actions(file_db_session, location)) == 1
+
+
+def test_stale_media_ledger_queues_a_new_sync(file_db_session, monkeypatch):
+    client = FakeGoogleBusinessClient()
+    monkeypatch.setattr(gbp_sync_module.GbpSyncService, "_client", lambda self, org_id: client)
+    org, location = _setup(file_db_session)
+    location.media_last_synced_at = datetime.now(timezone.utc) - timedelta(
+        minutes=settings.GBP_MEDIA_SYNC_MIN_INTERVAL_MINUTES + 1
+    )
+    file_db_session.commit()
+
+    ContentPlannerService(file_db_session).plan_horizon(organization_id=org.id, location=location, horizon_days=3)
+
+    assert client.media_calls == 0
+    assert len(_sync_actions(file_db_session, location)) == 1
+
+
+def test_failed_media_sync_is_requeued_after_the_sync_interval(file_db_session, monkeypatch):
+    org, location = _setup(file_db_session)
+    composer = PostCompositionService(file_db_session)
+    candidate = SimpleNamespace(organization_id=org.id, location=location)
+    interval = timedelta(minutes=settings.GBP_MEDIA_SYNC_MIN_INTERVAL_MINUTES)
+
+    def compose_at(moment: datetime) -> None:
+        class FrozenDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return moment
+
+        monkeypatch.setattr(composition_module, "datetime", FrozenDatetime)
+        composer._queue_gbp_media_sync_if_stale(candidate)
+
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    start = epoch + (datetime.now(timezone.utc) - epoch) // interval * interval
+    compose_at(start)
+    compose_at(start + timedelta(minutes=1))
+    assert len(_sync_actions(file_db_session, location)) == 1
+
+    # The queued sync failed, so the ledger is still stale one interval later and a retry is queued.
+    compose_at(start + interval)
+    assert len(_sync_actions(file_db_session, location)) == 2
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from itertools import islice
+
+import httpx
+import pytest
+
+from backend.app.core.config import settings
+from backend.app.models.enums import OrganizationType
+from backend.app.models.google_business.location import Location
+from backend.app.models.identity.organization import Organization
+from backend.app.models.media.media_asset import MediaAsset
+from backend.app.models.reviews.review import Review
+from backend.app.services.google_business.gbp_sync import GbpSyncService
+from backend.app.services.google_business.google import GoogleBusinessClient
+from backend.app.services.google_business.transport import GbpTransport
+
+ITEM_KEYS = {"media": "mediaItems"}
+
+
+class PagedApi:
+    """MockTransport handler serving `totals[items_key]` items in pages of the requested size."""
+
+    def __init__(self, totals: dict[str, int]) -> None:
+        self.totals = totals
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        path = request.url.path
+        segment = path.rsplit("/", 1)[-1]
+        items_key = ITEM_KEYS.get(segment, segment)
+        total = self.totals[items_key]
+        size = int(request.url.params.get("pageSize", 10))
+        start = int(request.url.params.get("pageToken", 0))
+        parent = path.split("/v1/", 1)[-1].rsplit("/", 1)[0]
+        items = [self._item(items_key, f"{parent}/{segment}", index) for index in range(start, min(start + size, total))]
+        body: dict = {items_key: items}
+        if start + size < total:
+            body["nextPageToken"] = str(start + size)
+        return httpx.Response(200, json=body)
+
+    @staticmethod
+    def _item(items_key: str, collection: str, index: int) -> dict:
+        name = f"{collection}/{index}"
+        if items_key == "reviews":
+            return {"name": name, "comment": f"Review {index}", "starRating": "FIVE", "reviewer": {"displayName": "Pat"}}
+        if items_key == "localPosts":
+            return {"name": name, "summary": f"Post {index}"}
+        if items_key == "mediaItems":
+            return {"name": name, "googleUrl": f"https://example.com/{index}.jpg", "mediaFormat": "PHOTO"}
+        return {"name": name}
+
+    def pages(self, items_key: str) -> int:
+        segment = next((segment for segment, key in ITEM_KEYS.items() if key == items_key), items_key)
+        return sum(1 for request in self.requests if request.url.path.endswith(f"/{segment}"))
+
+
+@pytest.fixture()
+def paged(monkeypatch):
+    monkeypatch.setattr(settings, "GOOGLE_BUSINESS_API_BASE_URL", "https://gbp.example.test/v1")
+    monkeypatch.setattr(settings, "GOOGLE_ACCOUNT_MANAGEMENT_API_BASE_URL", "https://gbp.example.test/v1")
+
+    def build(totals: dict[str, int]) -> tuple[PagedApi, GoogleBusinessClient]:
+        api = PagedApi(totals)
+        return api, GoogleBusinessClient("token", transport=GbpTransport(transport=httpx.MockTransport(api)))
+
+    return build
+
+
+@pytest.mark.parametrize(
+    ("method", "items_key", "total", "page_size"),
+    [
+        ("list_reviews", "reviews", 137, 50),
+        ("list_local_posts", "localPosts", 230, 100),
+        ("list_media", "mediaItems", 201, 100),
+    ],
+)
+def test_location_list_endpoints_follow_every_page(paged, method, items_key, total, page_size):
+    api, client = paged({items_key: total})
+    items = getattr(client, method)("locations/1")
+
+    segment = "media" if items_key == "mediaItems" else items_key
+    assert [item["name"] for item in items] == [f"locations/1/{segment}/{index}" for index in range(total)]
+    assert api.pages(items_key) == -(-total // page_size)
+    assert {request.url.params["pageSize"] for request in api.requests} == {str(page_size)}
+    assert [request.url.params.get("pageToken") for request in api.requests][:2] == [None, str(page_size)]
+
+
+def test_account_and_location_listings_still_paginate(paged):
+    api, client = paged({"accounts": 45, "locations": 250})
+    assert len(client.list_accounts()) == 45
+    assert api.pages("accounts") == 3
+    locations = client.list_locations("accounts/9")
+    assert len(locations) == 250
+    assert api.pages("locations") == 3
+    assert all("readMask" in request.url.params for request in api.requests if request.url.path.endswith("/locations"))
+
+
+def test_iterators_fetch_pages_lazily(paged):
+    api, client = paged({"reviews": 500})
+    first = list(islice(client.iter_reviews("locations/1"), 60))
+    assert len(first) == 60
+    assert api.pages("reviews") == 2
+
+
+def test_max_pages_and_repeated_tokens_stop_paging(paged):
+    api, client = paged({"reviews": 500})
+    pages = list(client.paginate("https://gbp.example.test/v1/locations/1/reviews", "reviews", page_size=10, max_pages=3))
+    assert [len(page) for page in pages] == [10, 10, 10]
+    assert api.pages("reviews") == 3
+
+    calls = []
+
+    def looping(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json={"reviews": [{"name": "r"}], "nextPageToken": "same"})
+
+    client = GoogleBusinessClient("token", transport=GbpTransport(transport=httpx.MockTransport(looping)))
+    assert len(client.list_reviews("locations/1")) == 2
+    assert len(calls) == 2
+
+
+def _location(db_session) -> tuple[Organization, Location]:
+    org = Organization(name="Paging Org", org_type=OrganizationType.AGENCY)
+    db_session.add(org)
+    db_session.flush()
+    location = Location(name="Paging HQ", organization_id=org.id, timezone="UTC", google_location_id="locations/77")
+    db_session.add(location)
+    db_session.commit()
+    return org, location
+
+
+def test_sync_reviews_is_no_longer_truncated_to_the_first_page(db_session, paged):
+    org, location = _location(db_session)
+    api, client = paged({"reviews": 320, "mediaItems": 150, "localPosts": 120})
+    service = GbpSyncService(db_session)
+    service._client = lambda org_id: client  # type: ignore[method-assign]
+
+    assert service.sync_reviews(org.id, location.id) == 320
+    assert db_session.query(Review).filter(Review.location_id == location.id).count() == 320
+    assert api.pages("reviews") == 7
+
+    assert service.sync_media(org.id, location.id) == 150
+    assert db_session.query(MediaAsset).filter(MediaAsset.location_id == location.id).count() == 150
+    assert service.sync_posts(org.id, location.id) == 120
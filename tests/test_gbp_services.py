@@ -9,6 +9,7 @@ from backend.app.models.posts.post import Post
 from backend.app.models.reviews.review import Review
 from backend.app.services.google_business.gbp_publishing import GbpPublishingService
 from backend.app.services.google_business.gbp_sync import GbpSyncService
+from backend.app.services.google_business.google import GbpPage
 
 
 class _FakeClient:
@@ -19,8 +20,8 @@ class _FakeClient:
         self.published.append((location_name, payload))
         return {"name": f"{location_name}/posts/1"}
 
-    def list_reviews(self, location_name: str):
-        return [
+    def review_pages(self, location_name: str, *, page_token: str | None = None):
+        items = [
             {
                 "name": f"{location_name}/reviews/1",
                 "comment": "Great service",
@@ -28,14 +29,16 @@ class _FakeClient:
                 "reviewer": {"displayName": "Pat"},
             }
         ]
+        return [GbpPage(items, None)]
 
-    def list_local_posts(self, location_name: str):
-        return [
+    def local_post_pages(self, location_name: str, *, page_token: str | None = None):
+        items = [
             {
                 "name": f"{location_name}/localPosts/1",
                 "summary": "Synced post",
             }
         ]
+        return [GbpPage(items, None)]
 
     def reply_to_review(self, review_name: str, comment: str):
         return {"name": review_name, "comment": comment}
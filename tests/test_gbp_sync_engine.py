@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import copy
+import json
+
+from fastapi import HTTPException
+import httpx
+from sqlalchemy import event
+import pytest
+
+from backend.app.core.config import settings
+from backend.app.models.enums import OrganizationType
+from backend.app.models.google_business.gbp_sync_watermark import GbpSyncWatermark
+from backend.app.models.google_business.location import Location
+from backend.app.models.identity.organization import Organization
+from backend.app.models.media.media_asset import MediaAsset
+from backend.app.models.posts.post import Post
+from backend.app.models.reviews.review import Review
+from backend.app.services.google_business.gbp_sync_engine import (
+    MEDIA_CREATED,
+    MEDIA_REMOVED,
+    POST_CREATED,
+    REVIEW_CREATED,
+    REVIEW_EDITED,
+    RESOURCE_REVIEWS,
+    GbpSyncEngine,
+    SyncChange,
+)
+from backend.app.services.google_business.google import GoogleBusinessClient
+from backend.app.services.google_business.transport import GbpTransport, RetryPolicy
+
+# A recorded listing of one location, page by page, as the API returned it (reviews are
+# requested newest update first).
+RECORDED = json.loads(
+    """
+    {
+      "locations/9/reviews": [
+        {"reviews": [
+          {"name": "locations/9/reviews/r5", "starRating": "FIVE", "comment": "Fast crew", "updateTime": "2026-09-05T10:00:00Z", "reviewer": {"displayName": "Ana"}},
+          {"name": "locations/9/reviews/r4", "starRating": "FOUR", "comment": "Good work", "updateTime": "2026-09-04T10:00:00Z", "reviewer": {"displayName": "Ben"}}
+         ], "nextPageToken": "1"},
+        {"reviews": [
+          {"name": "locations/9/reviews/r3", "starRating": "THREE", "comment": "Okay", "updateTime": "2026-09-03T10:00:00Z", "reviewer": {"displayName": "Cy"}},
+          {"name": "locations/9/reviews/r2", "starRating": "TWO", "comment": "Late", "updateTime": "2026-09-02T10:00:00Z", "reviewer": {"displayName": "Di"}}
+         ], "nextPageToken": "2"},
+        {"reviews": [
+          {"name": "locations/9/reviews/r1", "starRating": "FIVE", "comment": "Great", "updateTime": "2026-09-01T10:00:00Z", "reviewer": {"displayName": "Ed"}}
+        ]}
+      ],
+      "locations/9/localPosts": [
+        {"localPosts": [
+          {"name": "locations/9/localPosts/p2", "summary": "Storm season inspections are open", "updateTime": "2026-09-02T09:00:00Z"},
+          {"name": "locations/9/localPosts/p1", "summary": "Meet our new gutter crew", "updateTime": "2026-09-01T09:00:00Z"}
+         ], "nextPageToken": "1"},
+        {"localPosts": [
+          {"name": "locations/9/localPosts/p0", "summary": "Spring roof checkups", "updateTime": "2026-08-01T09:00:00Z"}
+        ]}
+      ],
+      "locations/9/media": [
+        {"mediaItems": [
+          {"name": "locations/9/media/m1", "googleUrl": "https://example.com/m1.jpg", "mediaFormat": "PHOTO", "createTime": "2026-08-01T00:00:00Z"},
+          {"name": "locations/9/media/m2", "googleUrl": "https://example.com/m2.jpg", "mediaFormat": "PHOTO", "createTime": "2026-08-02T00:00:00Z", "description": "Seamless gutter install"}
+         ], "nextPageToken": "1"},
+        {"mediaItems": [
+          {"name": "locations/9/media/m3", "googleUrl": "https://example.com/m3.mp4", "mediaFormat": "VIDEO", "createTime": "2026-08-03T00:00:00Z"}
+        ]}
+      ]
+    }
+    """
+)
+
+
+class Replay:
+    """MockTransport handler serving recorded pages; the page token is the page index."""
+
+    def __init__(self, recording: dict) -> None:
+        self.recording = copy.deepcopy(recording)
+        self.requests: list[httpx.Request] = []
+        self.fail_on: tuple[str, str] | None = None
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        resource = request.url.path.split("/v1/", 1)[-1]
+        token = request.url.params.get("pageToken")
+        if self.fail_on == (resource, token):
+            return httpx.Response(503, json={"error": "unavailable"})
+        return httpx.Response(200, json=self.recording[resource][int(token or 0)])
+
+    def tokens(self, resource: str) -> list[str | None]:
+        return [
+            request.url.params.get("pageToken") for request in self.requests if request.url.path.endswith(resource)
+        ]
+
+
+@pytest.fixture()
+def replay(monkeypatch):
+    monkeypatch.setattr(settings, "GOOGLE_BUSINESS_API_BASE_URL", "https://gbp.example.test/v1")
+    api = Replay(RECORDED)
+    transport = GbpTransport(
+        policy=RetryPolicy(max_attempts=1), transport=httpx.MockTransport(api), sleep=lambda _: None
+    )
+    return api, GoogleBusinessClient("token", transport=transport)
+
+
+@pytest.fixture()
+def location(db_session) -> Location:
+    org = Organization(name="Watermark Org", org_type=OrganizationType.AGENCY)
+    db_session.add(org)
+    db_session.flush()
+    location = Location(name="Watermark HQ", organization_id=org.id, timezone="UTC", google_location_id="locations/9")
+    db_session.add(location)
+    db_session.commit()
+    return location
+
+
+def _sync_all(engine: GbpSyncEngine, client: GoogleBusinessClient, location: Location) -> None:
+    engine.sync_reviews(client, location)
+    engine.sync_posts(client, location)
+    engine.sync_media(client, location)
+
+
+def test_replaying_the_recorded_stream_writes_nothing_the_second_time(db_session, engine, replay, location):
+    api, client = replay
+    changes: list[SyncChange] = []
+    sync = GbpSyncEngine(db_session, listeners=[changes.append])
+
+    _sync_all(sync, client, location)
+    assert db_session.query(Review).filter(Review.location_id == location.id).count() == 5
+    assert db_session.query(Post).filter(Post.location_id == location.id).count() == 3
+    assert db_session.query(MediaAsset).filter(MediaAsset.location_id == location.id).count() == 3
+    assert [change.kind for change in changes].count(REVIEW_CREATED) == 5
+    assert [change.kind for change in changes].count(POST_CREATED) == 3
+    assert [change.kind for change in changes].count(MEDIA_CREATED) == 3
+    assert db_session.get(Post, changes[5].record_id).minhash_signature is not None
+    watermark = db_session.get(GbpSyncWatermark, (location.id, RESOURCE_REVIEWS))
+    assert watermark.update_time.isoformat().startswith("2026-09-05T10:00:00")
+    assert watermark.page_token is None
+
+    api.requests.clear()
+    changes.clear()
+    statements: list[str] = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        _sync_all(sync, client, location)
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+
+    writes = [
+        sql
+        for sql in statements
+        if sql.lstrip().split()[0].upper() in {"INSERT", "UPDATE", "DELETE"} and "locations" not in sql.split()[1:3]
+    ]
+    assert writes == []
+    assert changes == []
+    # Reviews and posts stop on their first page; media has no updateTime and is rescanned.
+    assert api.tokens("/reviews") == [None]
+    assert api.tokens("/localPosts") == [None]
+    assert api.tokens("/media") == [None, "1"]
+
+
+def test_edits_and_removals_are_written_and_reported(db_session, replay, location):
+    api, client = replay
+    changes: list[SyncChange] = []
+    sync = GbpSyncEngine(db_session, listeners=[changes.append])
+    _sync_all(sync, client, location)
+    changes.clear()
+
+    reviews = api.recording["locations/9/reviews"]
+    edited = reviews[1]["reviews"].pop()
+    edited.update({"comment": "Late, but they fixed it", "updateTime": "2026-09-06T08:00:00Z"})
+    reviews[0]["reviews"].insert(0, edited)
+    api.recording["locations/9/media"][1]["mediaItems"] = []
+    api.requests.clear()
+
+    _sync_all(sync, client, location)
+
+    assert [(change.kind, change.external_id) for change in changes] == [
+        (REVIEW_EDITED, "locations/9/reviews/r2"),
+        (MEDIA_REMOVED, "locations/9/media/m3"),
+    ]
+    db_session.expire_all()
+    review = db_session.query(Review).filter(Review.external_review_id == "locations/9/reviews/r2").one()
+    assert review.comment == "Late, but they fixed it"
+    removed = db_session.query(MediaAsset).filter(MediaAsset.source_external_id == "locations/9/media/m3").one()
+    assert "gbp_removed_at" in removed.metadata_json
+    assert api.tokens("/reviews") == [None]
+
+    # Replaying the edited stream reports nothing again, including the removal.
+    changes.clear()
+    _sync_all(sync, client, location)
+    assert changes == []
+
+
+def test_interrupted_review_sync_resumes_from_the_saved_page_token(db_session, replay, location):
+    api, client = replay
+    sync = GbpSyncEngine(db_session)
+    api.fail_on = ("locations/9/reviews", "2")
+
+    with pytest.raises(HTTPException):
+        sync.sync_reviews(client, location)
+    watermark = db_session.get(GbpSyncWatermark, (location.id, RESOURCE_REVIEWS))
+    assert watermark.page_token == "2"
+    assert watermark.update_time is None
+    assert db_session.query(Review).filter(Review.location_id == location.id).count() == 4
+
+    api.fail_on = None
+    api.requests.clear()
+    result = sync.sync_reviews(client, location)
+    assert api.tokens("/reviews") == ["2"]
+    assert result.written == 1
+    db_session.refresh(watermark)
+    assert watermark.page_token is None
+    assert watermark.update_time.isoformat().startswith("2026-09-05T10:00:00")
+
+
+def test_organizations_listing_the_same_gbp_resources_keep_their_own_rows(db_session, replay, location):
+    api, client = replay
+    other_org = Organization(name="Second Agency", org_type=OrganizationType.AGENCY)
+    db_session.add(other_org)
+    db_session.flush()
+    shared = Location(name="Shared HQ", organization_id=other_org.id, timezone="UTC", google_location_id="locations/10")
+    db_session.add(shared)
+    db_session.commit()
+    # The second location lists the very same GBP resources.
+    for resource in ("reviews", "localPosts", "media"):
+        api.recording[f"locations/10/{resource}"] = api.recording[f"locations/9/{resource}"]
+    changes: list[SyncChange] = []
+    sync = GbpSyncEngine(db_session, listeners=[changes.append])
+
+    _sync_all(sync, client, location)
+    first_ids = {change.record_id for change in changes}
+    changes.clear()
+    _sync_all(sync, client, shared)
+
+    # Review ids stay unique across tenants: the first organization's reviews are left alone.
+    assert [change.kind for change in changes] == [POST_CREATED] * 3 + [MEDIA_CREATED] * 3
+    assert db_session.query(Review).filter(Review.organization_id == location.organization_id).count() == 5
+    assert not first_ids & {change.record_id for change in changes}
+    for owner in (location, shared):
+        assert db_session.query(Post).filter(Post.organization_id == owner.organization_id).count() == 3
+        assert db_session.query(MediaAsset).filter(MediaAsset.location_id == owner.id).count() == 3
+
+
+def test_truncated_media_listing_marks_nothing_removed(db_session, replay, location):
+    api, client = replay
+    changes: list[SyncChange] = []
+    sync = GbpSyncEngine(db_session, listeners=[changes.append])
+    sync.sync_media(client, location)
+    changes.clear()
+
+    # The API repeats page 1's token, so paging stops before the listing is complete.
+    api.recording["locations/9/media"][1] = {"mediaItems": [], "nextPageToken": "1"}
+    sync.sync_media(client, location)
+
+    assert changes == []
+    db_session.expire_all()
+    assets = db_session.query(MediaAsset).filter(MediaAsset.location_id == location.id).all()
+    assert all("gbp_removed_at" not in asset.metadata_json for asset in assets)
+
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from collections import defaultdict
+import threading
+import time
+
+import httpx
+import pytest
+
+from backend.app.core.config import settings
+from backend.app.models.automation.action import Action
+from backend.app.models.enums import ActionStatus, ActionType, OrganizationType
+from backend.app.models.google_business.location import Location
+from backend.app.models.identity.organization import Organization
+from backend.app.models.posts.post import Post
+from backend.app.models.reviews.review import Review
+from backend.app.services.automation.actions import ActionExecutor
+from backend.app.services.google_business.gbp_connections import GbpConnectionService
+from backend.app.services.google_business.gbp_sync_fanout import GbpSyncCoordinator
+from backend.app.services.google_business.transport import GbpTransport, RetryPolicy, set_transport
+from worker.app import tasks as worker_tasks
+
+LATENCY_SECONDS = 0.05
+
+
+class SlowApi:
+    """MockTransport handler adding fixed latency and tracking in-flight calls per bearer token."""
+
+    def __init__(self, *, throttled_token: str | None = None) -> None:
+        self.lock = threading.Lock()
+        self.in_flight: dict[str, int] = defaultdict(int)
+        self.peak: dict[str, int] = defaultdict(int)
+        self.calls: dict[str, int] = defaultdict(int)
+        self.throttled_token = throttled_token
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        token = request.headers["Authorization"].removeprefix("Bearer ")
+        with self.lock:
+            self.calls[token] += 1
+            self.in_flight[token] += 1
+            self.peak[token] = max(self.peak[token], self.in_flight[token])
+        try:
+            time.sleep(LATENCY_SECONDS)
+        finally:
+            with self.lock:
+                self.in_flight[token] -= 1
+        if token == self.throttled_token:
+            return httpx.Response(429, headers={"Retry-After": "90"}, json={"error": "quota"})
+        parent, segment = request.url.path.split("/v1/", 1)[-1].rsplit("/", 1)
+        if segment == "reviews":
+            body = {"reviews": [{"name": f"{parent}/reviews/1", "starRating": "FIVE", "comment": "Great"}]}
+        elif segment == "localPosts":
+            body = {"localPosts": [{"name": f"{parent}/localPosts/1", "summary": "Spring roof checkups"}]}
+        else:
+            body = {"mediaItems": [{"name": f"{parent}/media/1", "googleUrl": "https://example.com/1.jpg"}]}
+        return httpx.Response(200, json=body)
+
+
+@pytest.fixture()
+def slow_api(monkeypatch):
+    monkeypatch.setattr(settings, "GOOGLE_BUSINESS_API_BASE_URL", "https://gbp.example.test/v1")
+
+    def install(api: SlowApi) -> SlowApi:
+        set_transport(
+            GbpTransport(policy=RetryPolicy(max_attempts=1), transport=httpx.MockTransport(api), sleep=lambda _: None)
+        )
+        return api
+
+    yield install
+    set_transport(None)
+
+
+def _account(sessions, name: str, token: str, locations: int) -> tuple:
+    with sessions() as db:
+        org = Organization(name=name, org_type=OrganizationType.AGENCY)
+        db.add(org)
+        db.flush()
+        rows = [
+            Location(
+                name=f"{name} {index:02d}",
+                organization_id=org.id,
+                timezone="UTC",
+                google_location_id=f"locations/{name.lower()}-{index}",
+            )
+            for index in range(locations)
+        ]
+        db.add_all(rows)
+        db.commit()
+        GbpConnectionService(db).upsert_connection(
+            organization_id=org.id,
+            google_account_email=f"{name.lower()}@example.com",
+            account_resource_name=f"accounts/{name.lower()}",
+            scopes=[],
+            access_token=token,
+            refresh_token=None,
+            expires_in=3600,
+        )
+        return org.id, [row.id for row in rows]
+
+
+def test_fan_out_syncs_every_location_within_the_account_cap(file_sessions, slow_api):
+    api = slow_api(SlowApi())
+    org_id, location_ids = _account(file_sessions, "Acme", "token-acme", 12)
+
+    outcomes = GbpSyncCoordinator(file_sessions, max_concurrency=4).sync_locations(org_id)
+
+    assert [outcome.location_id for outcome in outcomes] == location_ids
+    assert all(outcome.ok for outcome in outcomes)
+    assert {outcome.counts["reviews"] for outcome in outcomes} == {1}
+    assert api.calls["token-acme"] == 12 * 3
+    assert api.peak["token-acme"] <= 4
+    with file_sessions() as db:
+        assert db.query(Review).count() == 12
+
+
+@pytest.mark.benchmark
+def test_fan_out_beats_sequential_sync_benchmark(file_sessions, slow_api):
+    slow_api(SlowApi())
+    org_id, _ = _account(file_sessions, "Acme", "token-acme", 12)
+
+    started = time.perf_counter()
+    GbpSyncCoordinator(file_sessions, max_concurrency=4).sync_locations(org_id)
+    assert time.perf_counter() - started < 12 * 3 * LATENCY_SECONDS / 2
+
+
+def test_each_account_has_its_own_cap_and_throttling_stops_only_that_account(file_sessions, slow_api):
+    api = slow_api(SlowApi(throttled_token="token-busy"))
+    calm_org, _ = _account(file_sessions, "Calm", "token-calm", 6)
+    busy_org, _ = _account(file_sessions, "Busy", "token-busy", 6)
+
+    results = {}
+
+    def run(org_id) -> None:
+        results[org_id] = GbpSyncCoordinator(file_sessions, max_concurrency=2).sync_locations(org_id)
+
+    threads = [threading.Thread(target=run, args=(org_id,)) for org_id in (calm_org, busy_org)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert api.peak["token-calm"] <= 2
+    assert api.peak["token-busy"] <= 2
+    assert all(outcome.ok for outcome in results[calm_org])
+    assert [outcome.error for outcome in results[busy_org]] == ["rate_limited"] * 6
+    # Only the locations already running when the first 429 arrived reached the API.
+    assert api.calls["token-busy"] <= 2
+    assert {outcome.retry_after_seconds for outcome in results[busy_org]} <= {90, None}
+
+
+def test_beat_enqueues_one_multi_location_sync_per_account_and_the_executor_fans_it_out(
+    file_sessions, slow_api, monkeypatch
+):
+    api = slow_api(SlowApi())
+    monkeypatch.setattr(worker_tasks, "SessionLocal", file_sessions)
+    org_id, location_ids = _account(file_sessions, "Fleet", "token-fleet", 6)
+
+    assert worker_tasks._schedule_gbp_syncs() == {"scheduled": 2, "deduplicated": 0}
+    assert worker_tasks._schedule_gbp_syncs() == {"scheduled": 0, "deduplicated": 2}
+    with file_sessions() as db:
+        actions = db.query(Action).filter(Action.organization_id == org_id).order_by(Action.action_type).all()
+        assert {action.action_type for action in actions} == {ActionType.SYNC_GBP_REVIEWS, ActionType.SYNC_GBP_POSTS}
+        assert all(action.payload["location_ids"] == [str(value) for value in location_ids] for action in actions)
+        executor = ActionExecutor(db)
+        for action in actions:
+            assert "gbp_sync_coordinator" in executor.required_services(action.action_type)
+
+    results = [worker_tasks._execute_action(str(action.id)) for action in actions]
+
+    assert {result["status"] for result in results} == {"reviews_synced", "posts_synced"}
+    assert all(result["failed"] == 0 and len(result["locations"]) == 6 for result in results)
+    assert api.calls["token-fleet"] == 6 * 3
+    assert api.peak["token-fleet"] <= settings.GBP_SYNC_MAX_CONCURRENCY_PER_ACCOUNT
+    with file_sessions() as db:
+        assert db.query(Review).count() == 6
+        assert db.query(Post).count() == 6
+        statuses = {db.get(Action, action.id).status for action in actions}
+        assert statuses == {ActionStatus.SUCCEEDED}
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import threading
+import time
+import uuid
+
+import httpx
+import pytest
+
+from backend.app.core.config import settings
+from backend.app.models.enums import OrganizationType
+from backend.app.models.google_business.gbp_connection import GbpConnection
+from backend.app.models.identity.organization import Organization
+from backend.app.services.google_business.gbp_connections import GbpConnectionService
+from backend.app.services.google_business.google import GoogleOAuthService
+from backend.app.services.google_business.token_refresh import advisory_key, token_cache
+from backend.app.services.google_business.transport import GbpTransport, RetryPolicy, set_transport
+
+THREADS = 8
+
+
+class TokenEndpoint:
+    """MockTransport handler for Google's token endpoint, counting refresh grants."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.refreshes = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        assert b"grant_type=refresh_token" in request.content
+        with self.lock:
+            self.refreshes += 1
+            issued = self.refreshes
+        time.sleep(0.05)
+        return httpx.Response(200, json={"access_token": f"fresh-{issued}", "expires_in": 3600})
+
+
+@pytest.fixture()
+def token_endpoint(monkeypatch):
+    monkeypatch.setattr(settings, "GOOGLE_CLIENT_ID", "client-id")
+    monkeypatch.setattr(settings, "GOOGLE_CLIENT_SECRET", "client-secret")
+    endpoint = TokenEndpoint()
+    set_transport(GbpTransport(policy=RetryPolicy(max_attempts=1), transport=httpx.MockTransport(endpoint)))
+    token_cache.clear()
+    yield endpoint
+    set_transport(None)
+    token_cache.clear()
+
+
+def _connection(sessions, *, expires_in: int) -> uuid.UUID:
+    with sessions() as db:
+        org = Organization(name="Token Org", org_type=OrganizationType.AGENCY)
+        db.add(org)
+        db.commit()
+        GbpConnectionService(db).upsert_connection(
+            organization_id=org.id,
+            google_account_email="owner@example.com",
+            account_resource_name="accounts/1",
+            scopes=[],
+            access_token="stale",
+            refresh_token="refresh-token",
+            expires_in=expires_in,
+        )
+        return org.id
+
+
+def _expire_in(sessions, org_id: uuid.UUID, seconds: int) -> None:
+    with sessions() as db:
+        connection = db.query(GbpConnection).filter(GbpConnection.organization_id == org_id).one()
+        connection.access_token_expires_at = datetime.now(timezone.utc) + timedelta(seconds=seconds)
+        db.commit()
+
+
+def _burst(sessions, org_id: uuid.UUID) -> list[str]:
+    barrier = threading.Barrier(THREADS)
+    tokens: list[str] = []
+    errors: list[BaseException] = []
+
+    def worker() -> None:
+        try:
+            with sessions() as db:
+                service = GbpConnectionService(db)
+                connection = service.get_by_org(org_id)
+                barrier.wait()
+                tokens.append(
+                    service.ensure_access_token(connection, refresh_callback=GoogleOAuthService().refresh_access_token)
+                )
+        except BaseException as exc:  # noqa: BLE001
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    return tokens
+
+
+def test_burst_at_expiry_refreshes_once_per_expiry_window(file_sessions, token_endpoint):
+    org_id = _connection(file_sessions, expires_in=10)
+
+    assert _burst(file_sessions, org_id) == ["fresh-1"] * THREADS
+    assert token_endpoint.refreshes == 1
+
+    # The refreshed token is reused until it nears expiry again.
+    assert _burst(file_sessions, org_id) == ["fresh-1"] * THREADS
+    assert token_endpoint.refreshes == 1
+
+    _expire_in(file_sessions, org_id, 10)
+    assert _burst(file_sessions, org_id) == ["fresh-2"] * THREADS
+    assert token_endpoint.refreshes == 2
+
+
+def test_proactive_refresh_happens_once_without_blocking_valid_tokens(file_sessions, token_endpoint):
+    org_id = _connection(file_sessions, expires_in=settings.GBP_TOKEN_REFRESH_LEAD_SECONDS - 60)
+
+    tokens = _burst(file_sessions, org_id)
+    assert token_endpoint.refreshes == 1
+    assert set(tokens) <= {"stale", "fresh-1"}
+    assert "fresh-1" in tokens
+    with file_sessions() as db:
+        connection = db.query(GbpConnection).filter(GbpConnection.organization_id == org_id).one()
+        expires_at = connection.access_token_expires_at.replace(tzinfo=timezone.utc)
+    assert expires_at - datetime.now(timezone.utc) > timedelta(minutes=55)
+    assert _burst(file_sessions, org_id) == ["fresh-1"] * THREADS
+    assert token_endpoint.refreshes == 1
+
+
+def test_decrypted_tokens_are_cached_until_the_token_changes(db_session, monkeypatch):
+    org = Organization(name="Cache Org", org_type=OrganizationType.AGENCY)
+    db_session.add(org)
+    db_session.commit()
+    service = GbpConnectionService(db_session)
+    connection = service.upsert_connection(
+        organization_id=org.id,
+        google_account_email=None,
+        account_resource_name=None,
+        scopes=[],
+        access_token="first",
+        refresh_token=None,
+        expires_in=3600,
+    )
+    decrypt = service.encryptor.decrypt
+    calls: list[str] = []
+
+    def counting_decrypt(value: str) -> str:
+        calls.append(value)
+        return decrypt(value)
+
+    monkeypatch.setattr(service.encryptor, "decrypt", counting_decrypt)
+
+    def refresh(refresh_token: str) -> dict:
+        raise AssertionError("a valid token must not be refreshed")
+
+    assert service.ensure_access_token(connection, refresh_callback=refresh) == "first"
+    assert service.ensure_access_token(connection, refresh_callback=refresh) == "first"
+    assert len(calls) == 1
+
+    service.upsert_connection(
+        organization_id=org.id,
+        google_account_email=None,
+        account_resource_name=None,
+        scopes=[],
+        access_token="second",
+        refresh_token=None,
+        expires_in=3600,
+    )
+    assert service.ensure_access_token(connection, refresh_callback=refresh) == "second"
+    assert len(calls) == 2
+    assert -(2**63) <= advisory_key(uuid.uuid4()) < 2**63
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import random
+import threading
+
+import httpx
+from fastapi import HTTPException
+import pytest
+
+from backend.app.core.config import settings
+from backend.app.services.google_business.google import GoogleBusinessClient
+from backend.app.services.google_business.transport import (
+    TIMEOUTS,
+    GbpTransport,
+    RetryPolicy,
+    get_transport,
+    retry_after_seconds,
+    set_transport,
+)
+from backend.app.services.operations.rate_limits import RateLimitError
+
+
+class Script:
+    """MockTransport handler answering with a scripted sequence of (status, headers)."""
+
+    def __init__(self, *responses: tuple[int, dict[str, str]]) -> None:
+        self.responses = list(responses)
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        status_code, headers = self.responses.pop(0) if self.responses else (200, {})
+        body = {"mediaItems": [{"name": "media/1"}]} if status_code == 200 else {"error": status_code}
+        return httpx.Response(status_code, headers=headers, json=body)
+
+
+def _client(script: Script, sleeps: list[float], *, max_attempts: int = 4) -> GoogleBusinessClient:
+    transport = GbpTransport(
+        policy=RetryPolicy(max_attempts=max_attempts, base_delay=0.5, max_delay=30.0),
+        transport=httpx.MockTransport(script),
+        sleep=sleeps.append,
+        rng=random.Random(1),
+    )
+    return GoogleBusinessClient("token", transport=transport)
+
+
+def test_429_sequence_honors_retry_after_then_succeeds():
+    script = Script((429, {"Retry-After": "2"}), (429, {"Retry-After": "3"}), (200, {}))
+    sleeps: list[float] = []
+    client = _client(script, sleeps)
+
+    assert client.list_media("locations/1") == [{"name": "media/1"}]
+    assert len(script.requests) == 3
+    assert sleeps == [2.0, 3.0]
+
+
+def test_503_sequence_on_reads_uses_jittered_backoff_and_maps_final_failure():
+    script = Script(*[(503, {})] * 5)
+    sleeps: list[float] = []
+    client = _client(script, sleeps)
+
+    with pytest.raises(HTTPException) as exc_info:
+        client.list_reviews("locations/1")
+    assert exc_info.value.status_code == 502
+    assert len(script.requests) == 4
+    assert len(sleeps) == 3
+    for attempt, delay in enumerate(sleeps, start=1):
+        assert 0 <= delay <= 0.5 * 2 ** (attempt - 1)
+
+
+def test_writes_retry_429_but_not_5xx():
+    script = Script((503, {}))
+    sleeps: list[float] = []
+    client = _client(script, sleeps)
+    with pytest.raises(HTTPException):
+        client.create_local_post("locations/1", {"summary": "hi"})
+    assert len(script.requests) == 1
+    assert sleeps == []
+
+    script = Script((429, {"Retry-After": "1"}), (200, {}))
+    client = _client(script, sleeps)
+    client.create_local_post("locations/1", {"summary": "hi"})
+    assert len(script.requests) == 2
+    assert json.loads(script.requests[1].content) == {"summary": "hi"}
+
+
+def test_persistent_or_long_rate_limits_raise_rate_limit_error():
+    script = Script(*[(429, {})] * 4)
+    sleeps: list[float] = []
+    with pytest.raises(RateLimitError) as exc_info:
+        _client(script, sleeps).list_local_posts("locations/1")
+    assert len(script.requests) == 4
+    assert len(sleeps) == 3
+    assert exc_info.value.retry_after_seconds == 60
+
+    # A Retry-After beyond the backoff cap is handed to the job scheduler, not slept through.
+    script = Script((429, {"Retry-After": "120"}))
+    sleeps = []
+    with pytest.raises(RateLimitError) as exc_info:
+        _client(script, sleeps).list_local_posts("locations/1")
+    assert len(script.requests) == 1
+    assert sleeps == []
+    assert exc_info.value.retry_after_seconds == 120
+
+
+def test_connection_errors_are_retried_and_timeouts_follow_endpoint_class():
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        if len(seen) == 1:
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200, json={"mediaItems": []})
+
+    sleeps: list[float] = []
+    transport = GbpTransport(transport=httpx.MockTransport(handler), sleep=sleeps.append, rng=random.Random(2))
+    client = GoogleBusinessClient("token", transport=transport)
+    assert client.list_media("locations/1") == []
+    client.create_local_post("locations/1", {"summary": "hi"})
+    client.get_location("locations/1")
+
+    assert len(seen) == 4
+    assert len(sleeps) == 1
+    assert [request.extensions["timeout"] for request in seen[1:]] == [
+        TIMEOUTS["media"].as_dict(),
+        TIMEOUTS["write"].as_dict(),
+        TIMEOUTS["read"].as_dict(),
+    ]
+
+
+def test_retry_after_accepts_http_dates():
+    response = httpx.Response(429, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+    assert retry_after_seconds(response) == 0.0
+    assert retry_after_seconds(httpx.Response(429, headers={"Retry-After": "7"})) == 7.0
+    assert retry_after_seconds(httpx.Response(429)) is None
+
+
+def test_clients_share_one_pooled_transport_and_reuse_connections(monkeypatch):
+    connections: list[int] = []
+    statuses = iter([503, 200, 200, 200, 200, 200])
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            connections.append(self.client_address[1])
+
+        def do_GET(self):  # noqa: N802
+            status_code = next(statuses, 200)
+            body = json.dumps({"reviews": [], "localPosts": []}).encode()
+            self.send_response(status_code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):  # noqa: D401
+            return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(settings, "GOOGLE_BUSINESS_API_BASE_URL", f"http://127.0.0.1:{server.server_port}/v1")
+    shared = GbpTransport(sleep=lambda _: None)
+    set_transport(shared)
+    try:
+        first = GoogleBusinessClient("token-a")
+        second = GoogleBusinessClient("token-b")
+        assert first.transport is second.transport is get_transport()
+        assert first.list_reviews("locations/1") == []
+        assert second.list_local_posts("locations/1") == []
+        assert first.list_reviews("locations/2") == []
+        assert second.list_local_posts("locations/2") == []
+    finally:
+        set_transport(None)
+        shared.close()
+        server.shutdown()
+        server.server_close()
+
+    assert len(connections) == 1
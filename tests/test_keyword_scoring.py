@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import random
+import re
+
+from backend.app.services.rank_tracking.keyword_scoring import TokenAutomaton
+from backend.app.services.rank_tracking.keyword_strategy import (
+    DEFAULT_SCORE_WEIGHTS,
+    HIGH_TICKET_TOKENS,
+    INTENT_TOKENS,
+    STOP_WORDS,
+    DiscoveryContext,
+    KeywordCampaignService,
+)
+
+SERVICES = ["ac repair", "furnace replacement", "air duct cleaning", "water heater replacement", "heat pump install"]
+MODIFIERS = ["", "emergency", "same day", "24/7", "urgent", "quote", "consultation", "installation", "repair"]
+AREAS = ["Austin", "Round Rock", "Cedar Park", "Pflugerville", None]
+
+
+def _context() -> DiscoveryContext:
+    return DiscoveryContext(
+        primary_category="HVAC contractor",
+        secondary_categories=[],
+        services=list(SERVICES),
+        city="Austin",
+        state="TX",
+        service_area_cities=["Round Rock", "Cedar Park", "Pflugerville"],
+        existing_description=None,
+        website_url=None,
+        historical_keywords=[],
+        gbp_search_terms=[],
+        current_rank_map={
+            "ac repair austin": 2.0,
+            "furnace replacement": 7.5,
+            "air duct cleaning round rock": 12.0,
+            "heat pump": 4.0,
+            "emergency hvac": 9.0,
+        },
+        scoring_weights=dict(DEFAULT_SCORE_WEIGHTS),
+    )
+
+
+def _pool(size: int) -> tuple[list[dict], dict[str, tuple[int, float]]]:
+    rng = random.Random(7)
+    pool: list[dict] = []
+    metrics: dict[str, tuple[int, float]] = {}
+    for index in range(size):
+        service = rng.choice(SERVICES)
+        area = rng.choice(AREAS)
+        parts = [rng.choice(MODIFIERS), service, area or "", "tx" if rng.random() < 0.2 else "", "near me" if rng.random() < 0.15 else ""]
+        keyword = " ".join(part for part in parts if part) + f" v{index}"
+        normalized = KeywordCampaignService._normalize_keyword(keyword)
+        pool.append(
+            {
+                "keyword": keyword,
+                "normalized_keyword": normalized,
+                "cluster_key": KeywordCampaignService._cluster_key(normalized),
+                "target_service_area": area,
+                "candidate_type": "synthetic",
+                "source_tags": ["synthetic"],
+            }
+        )
+        metrics[keyword] = (rng.randint(0, 450), round(rng.uniform(0.05, 0.99), 2))
+    return pool, metrics
+
+
+def _legacy_overall(candidate: dict, context: DiscoveryContext, search_volume: int, competition: float) -> tuple:
+    """Per-candidate scoring as implemented before the scoring engine."""
+
+    def token_set(values):
+        tokens = set()
+        for value in values:
+            if value:
+                tokens |= {t.strip() for t in re.split(r"\s+", value.lower()) if t.strip() and t.strip() not in STOP_WORDS}
+        return tokens
+
+    keyword = candidate["normalized_keyword"]
+    target_area = candidate.get("target_service_area")
+    rank = None
+    if keyword in context.current_rank_map:
+        rank = context.current_rank_map[keyword]
+    else:
+        best = None
+        for known, value in context.current_rank_map.items():
+            overlap = len(set(keyword.split()) & set(known.split()))
+            if overlap and (best is None or overlap > best[0]):
+                best = (overlap, value)
+        rank = best[1] if best else None
+
+    relevance = 20.0
+    overlap = len(token_set(context.services + [context.primary_category]) & token_set([keyword]))
+    if overlap:
+        relevance += min(45.0, overlap * 15.0)
+    if context.city.lower() in keyword:
+        relevance += 20
+    if context.state.lower() in keyword:
+        relevance += 8
+    if target_area and target_area.lower() != context.city.lower():
+        relevance += 10
+    if "near me" in keyword:
+        relevance += 8
+    relevance = min(100.0, relevance)
+    intent = 10.0 + sum(value for token, value in INTENT_TOKENS.items() if token in keyword)
+    intent = min(100.0, intent + (18 if "near me" in keyword else 0))
+    ticket = min(100.0, 20.0 + sum(value for token, value in HIGH_TICKET_TOKENS.items() if token in keyword))
+    volume = min(100.0, (max(0, search_volume) / 350.0) * 100.0)
+    competition_score = max(0.0, min(100.0, competition * 100.0))
+    if rank is None:
+        opportunity = 65.0
+    elif rank <= 3:
+        opportunity = 22.0
+    elif rank <= 6:
+        opportunity = 56.0
+    elif rank <= 10:
+        opportunity = 78.0
+    else:
+        opportunity = 90.0
+    if target_area and target_area.lower() != context.city.lower():
+        opportunity += 8
+    opportunity = min(100.0, opportunity)
+    rank_score = 50.0 if rank is None else max(0.0, min(100.0, 100.0 - rank * 8.0))
+    penalty = 22.0 if rank is not None and rank <= 3.0 else 0.0
+    weights = context.scoring_weights
+    overall = (
+        relevance * weights["relevance"]
+        + intent * weights["intent"]
+        + ticket * weights["ticket_value"]
+        + volume * weights["search_volume"]
+        + opportunity * weights["opportunity"]
+        + rank_score * weights["current_rank"]
+        - competition_score * weights["competition_penalty"]
+        - penalty * weights["already_dominant_penalty"]
+    )
+    return round(relevance, 2), round(intent, 2), round(ticket, 2), round(opportunity, 2), rank, round(overall, 2)
+
+
+def test_token_automaton_reports_overlapping_matches():
+    automaton = TokenAutomaton(["install", "installation", "replacement", "ac replacement", "24/7"])
+    assert automaton.matches("ac replacement installation") == {"install", "installation", "replacement", "ac replacement"}
+    assert automaton.matches("furnace tune up") == set()
+
+
+def test_scoring_engine_matches_legacy_rankings_for_5k_pool():
+    context = _context()
+    pool, metrics = _pool(5000)
+
+    legacy = [
+        (candidate["normalized_keyword"], *_legacy_overall(candidate, context, *metrics[candidate["keyword"]]))
+        for candidate in pool
+    ]
+
+    service = KeywordCampaignService.__new__(KeywordCampaignService)
+    engine = KeywordCampaignService.scoring_engine(context)
+    scores = engine.score(
+        pool,
+        search_volumes=[metrics[candidate["keyword"]][0] for candidate in pool],
+        competitions=[metrics[candidate["keyword"]][1] for candidate in pool],
+    )
+    scored = [
+        service._scored_candidate(
+            candidate=candidate,
+            context=context,
+            scores=score,
+            search_volume=metrics[candidate["keyword"]][0],
+            competition=metrics[candidate["keyword"]][1],
+        )
+        for candidate, score in zip(pool, scores)
+    ]
+
+    assert [
+        (
+            item.normalized_keyword,
+            item.relevance_score,
+            item.intent_score,
+            item.ticket_value_score,
+            item.opportunity_score,
+            item.current_rank,
+            item.overall_score,
+        )
+        for item in scored
+    ] == legacy
+    legacy.sort(key=lambda row: row[-1], reverse=True)
+    scored.sort(key=lambda item: item.overall_score, reverse=True)
+    assert [item.normalized_keyword for item in scored] == [row[0] for row in legacy]
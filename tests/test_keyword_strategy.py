@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+import json
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event
+
 from backend.app.models.automation.action import Action
 from backend.app.models.enums import ActionType, LocationStatus, MembershipRole, OrganizationType
 from backend.app.models.google_business.location import Location
@@ -7,10 +12,22 @@ from backend.app.models.google_business.location_settings import LocationSetting
 from backend.app.models.identity.membership import Membership
 from backend.app.models.identity.organization import Organization
 from backend.app.models.identity.user import User
+from backend.app.models.rank_tracking.campaign_job_run import CampaignJobRun
+from backend.app.models.rank_tracking.keyword_campaign_cycle import KeywordCampaignCycle
+from backend.app.models.rank_tracking.keyword_candidate import KeywordCandidate
+from backend.app.models.rank_tracking.keyword_dashboard_aggregate import KeywordDashboardAggregate
+from backend.app.models.rank_tracking.keyword_score import KeywordScore
 from backend.app.models.rank_tracking.selected_keyword import SelectedKeyword
 from backend.app.models.rank_tracking.geo_grid_scan import GeoGridScan
+from backend.app.models.rank_tracking.geo_grid_scan_point import GeoGridScanPoint
 from backend.app.models.rank_tracking.gbp_post_keyword_mapping import GbpPostKeywordMapping
-from backend.app.services.rank_tracking.keyword_strategy import KeywordCampaignService, KeywordCampaignSchedulerService
+from backend.app.services.rank_tracking.keyword_strategy_providers import build_grid_layout
+from backend.app.services.rank_tracking.keyword_strategy import (
+    KeywordCampaignSchedulerService,
+    KeywordCampaignService,
+    ScoredCandidate,
+    refresh_dashboard_post_plan,
+)
 
 
 def _seed_location(db_session):
@@ -129,3 +146,242 @@ def test_onboarding_scheduler_is_one_time(db_session):
         .all()
     )
     assert len(queued) == 1
+
+
+def _scored_candidate(index: int) -> ScoredCandidate:
+    return ScoredCandidate(
+        keyword=f"hvac keyword {index}",
+        normalized_keyword=f"hvac keyword {index}",
+        cluster_key=f"cluster-{index}",
+        target_service_area="Austin",
+        candidate_type="service",
+        source_tags=["services"],
+        relevance_score=50.0,
+        local_volume_score=40.0,
+        intent_score=30.0,
+        ticket_value_score=20.0,
+        competition_score=10.0,
+        opportunity_score=60.0,
+        current_rank_score=5.0,
+        already_dominant_penalty=0.0,
+        overall_score=100.0 - index * 0.1,
+        search_volume=100 + index,
+        competition_estimate=0.4,
+        current_rank=None,
+        classifications=["core_service"],
+        why_selected="Strong local intent",
+    )
+
+
+def test_persist_candidates_uses_constant_statements(db_session, engine):
+    org, location = _seed_location(db_session)
+    cycle = KeywordCampaignCycle(
+        organization_id=org.id,
+        location_id=location.id,
+        cycle_year=2026,
+        cycle_month=1,
+        trigger_source="manual",
+    )
+    db_session.add(cycle)
+    db_session.commit()
+    service = KeywordCampaignService(db_session)
+    scored = [_scored_candidate(index) for index in range(220)]
+
+    statements: list[str] = []
+
+    def _record(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        service._clear_cycle_children(cycle.id)
+        selected_rows = service._persist_keyword_candidates_and_scores(
+            cycle=cycle,
+            location=location,
+            scored_candidates=scored,
+            selected=scored[:10],
+            score_weights={"relevance": 1.0},
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    # One DELETE per cycle child table (plus scan points), one INSERT each for candidates,
+    # scores and selected keywords.
+    writes = [sql for sql in statements if sql.lstrip().upper().startswith(("INSERT", "DELETE"))]
+    assert len(writes) == 11
+    assert len(statements) <= 12
+    assert [row.rank_order for row in selected_rows] == list(range(1, 11))
+
+    assert db_session.query(KeywordCandidate).filter(KeywordCandidate.campaign_cycle_id == cycle.id).count() == 220
+    assert db_session.query(KeywordScore).filter(KeywordScore.campaign_cycle_id == cycle.id).count() == 220
+    selected_candidates = {
+        row.candidate_id
+        for row in db_session.query(SelectedKeyword).filter(SelectedKeyword.campaign_cycle_id == cycle.id)
+    }
+    flagged = {
+        row.id
+        for row in db_session.query(KeywordCandidate).filter(
+            KeywordCandidate.campaign_cycle_id == cycle.id,
+            KeywordCandidate.is_selected.is_(True),
+        )
+    }
+    assert selected_candidates == flagged
+
+
+def test_keyword_cycle_records_stage_timings(db_session):
+    org, location = _seed_location(db_session)
+    service = KeywordCampaignService(db_session)
+
+    cycle = service.run_cycle(organization_id=org.id, location_id=location.id, trigger_source="manual")
+
+    timings = service.last_stage_timings
+    assert {"clear_children", "scoring", "persist_candidates", "geo_grid_scans", "dashboard_aggregate"} <= set(timings)
+    assert all(elapsed >= 0 for elapsed in timings.values())
+    job = (
+        db_session.query(CampaignJobRun)
+        .filter(CampaignJobRun.location_id == location.id, CampaignJobRun.job_type == "keyword_campaign_cycle")
+        .one()
+    )
+    assert job.details_json["cycle_id"] == str(cycle.id)
+    assert job.details_json["stage_timings_ms"] == timings
+
+
+def test_grid_layout_clamps_size_and_matches_row_major_cells():
+    layout = build_grid_layout(rows=25, columns=3, center_latitude=30.0, center_longitude=-97.0, spacing_miles=1.0)
+
+    assert (layout.rows, layout.columns) == (21, 3)
+    assert len(layout.latitudes) == 63
+    assert list(zip(layout.row_indexes, layout.column_indexes))[:4] == [(0, 0), (0, 1), (0, 2), (1, 0)]
+    center = layout.row_indexes.index(10) + 1
+    assert layout.center_distances[center] == 0.0
+    assert layout.latitudes[center] == 30.0
+    assert layout.longitudes[center] == -97.0
+
+
+def test_geo_grid_scans_write_points_in_bulk(db_session, engine):
+    org, location = _seed_location(db_session)
+    location.settings.settings_json = {
+        **location.settings.settings_json,
+        "geo_grid_config": {"rows": 15, "columns": 15},
+    }
+    cycle = KeywordCampaignCycle(
+        organization_id=org.id,
+        location_id=location.id,
+        cycle_year=2026,
+        cycle_month=2,
+        trigger_source="manual",
+    )
+    db_session.add(cycle)
+    db_session.flush()
+    selected = [
+        SelectedKeyword(
+            organization_id=org.id,
+            location_id=location.id,
+            campaign_cycle_id=cycle.id,
+            rank_order=index + 1,
+            keyword=f"hvac keyword {index}",
+        )
+        for index in range(50)
+    ]
+    db_session.add_all(selected)
+    db_session.commit()
+    service = KeywordCampaignService(db_session)
+
+    statements: list[str] = []
+
+    def _record(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        service._run_geo_grid_scans_for_cycle(cycle=cycle, selected_keywords=selected, scan_type="baseline")
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    # Existing-scan lookup, one batched scan INSERT and ceil(50 * 225 / 2000) point INSERTs.
+    assert len(statements) <= 1 + 1 + 6 + 2
+    scans = db_session.query(GeoGridScan).filter(GeoGridScan.campaign_cycle_id == cycle.id).all()
+    assert len(scans) == 50
+    assert all(scan.total_points == 225 and scan.rows == 15 for scan in scans)
+    assert (
+        db_session.query(GeoGridScanPoint)
+        .filter(GeoGridScanPoint.geo_grid_scan_id.in_([scan.id for scan in scans]))
+        .count()
+        == 50 * 225
+    )
+
+
+def test_dashboard_reads_scan_points_once_per_cycle(db_session, engine):
+    org, location = _seed_location(db_session)
+    service = KeywordCampaignService(db_session)
+    cycle = service.run_cycle(organization_id=org.id, location_id=location.id, trigger_source="manual")
+
+    statements: list[str] = []
+
+    def _record(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    def _point_queries() -> int:
+        return sum(1 for sql in statements if sql.lstrip().upper().startswith("SELECT") and "geo_grid_scan_points" in sql)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        first = service.build_dashboard_payload(organization_id=org.id, location_id=location.id, cycle_id=cycle.id)
+        cold_queries = _point_queries()
+        service.build_dashboard_payload(organization_id=org.id, location_id=location.id, cycle_id=cycle.id)
+        warm_queries = _point_queries() - cold_queries
+
+        service.run_followup_scan(cycle_id=cycle.id)
+        statements.clear()
+        refreshed = service.build_dashboard_payload(organization_id=org.id, location_id=location.id, cycle_id=cycle.id)
+        followup_queries = _point_queries()
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+    assert len(first["keywords"]) == 10
+    assert cold_queries <= 1
+    assert warm_queries == 0
+    assert followup_queries <= 1
+    followups = [entry["followup"] for entry in refreshed["geo_grid"].values()]
+    assert len(followups) == 10
+    assert all(scan and scan["cells"] for scan in followups)
+
+
+def _comparable(payload):
+    # SQLite drops tzinfo on reload, so live reads render naive timestamps while the
+    # materialized payload was rendered from the aware values written in the same session.
+    return json.loads(json.dumps(jsonable_encoder(payload)).replace("+00:00", ""))
+
+
+def test_materialized_dashboard_matches_live_payload(db_session):
+    org, location = _seed_location(db_session)
+    service = KeywordCampaignService(db_session)
+    cycle = service.run_cycle(organization_id=org.id, location_id=location.id, trigger_source="manual")
+    scope = {"organization_id": org.id, "location_id": location.id, "cycle_id": cycle.id}
+
+    aggregate = db_session.query(KeywordDashboardAggregate).filter_by(campaign_cycle_id=cycle.id).one()
+    assert aggregate.payload_json is not None
+    assert _comparable(service.build_dashboard_payload(**scope)) == _comparable(service.build_live_dashboard_payload(**scope))
+
+    service.run_followup_scan(cycle_id=cycle.id)
+    db_session.refresh(aggregate)
+    version_after_followup = aggregate.payload_version
+    assert version_after_followup >= 2
+    assert _comparable(service.build_dashboard_payload(**scope)) == _comparable(service.build_live_dashboard_payload(**scope))
+
+    mapping = db_session.query(GbpPostKeywordMapping).filter_by(campaign_cycle_id=cycle.id).first()
+    mapping.status = "published"
+    assert service.refresh_dashboard_payload(cycle.id, sections=("post_plan",))
+    db_session.commit()
+    assert aggregate.payload_version == version_after_followup + 1
+    materialized = service.build_dashboard_payload(**scope)
+    assert _comparable(materialized) == _comparable(service.build_live_dashboard_payload(**scope))
+    assert any(item["status"] == "published" for item in materialized["post_plan"])
+
+    mapping.status = "failed"
+    assert refresh_dashboard_post_plan(db_session, cycle.id)
+    db_session.commit()
+    assert aggregate.payload_version == version_after_followup + 2
+    materialized = service.build_dashboard_payload(**scope)
+    assert _comparable(materialized) == _comparable(service.build_live_dashboard_payload(**scope))
+    assert any(item["status"] == "failed" for item in materialized["post_plan"])
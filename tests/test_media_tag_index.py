@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import random
+from types import SimpleNamespace
+import uuid
+
+from sqlalchemy import event, insert
+
+from backend.app.models.enums import MediaType, OrganizationType
+from backend.app.models.google_business.location import Location
+from backend.app.models.identity.organization import Organization
+from backend.app.models.media.media_asset import MediaAsset
+from backend.app.models.media.media_asset_tag import MediaAssetTag
+from backend.app.services.google_business.gbp_sync import GbpSyncService
+from backend.app.services.google_business.google import GbpPage
+from backend.app.services.media.media_management import MediaManagementService
+from backend.app.services.media.media_selection import MediaSelector
+from backend.app.services.media.media_tag_index import tag_rows
+
+CATEGORY_POOL = ["roof repair", "roof replacement", "gutter cleaning", "siding", "storm damage", "promo"]
+SEASONS = ["spring", "summer", "autumn", "winter", None]
+SOURCES = ["upload", "upload", "gbp", "drive"]
+
+
+def _setup_org(db_session, *, locations: int = 1, google_location_id: str | None = None):
+    org = Organization(name="Media Index Org", org_type=OrganizationType.AGENCY)
+    db_session.add(org)
+    db_session.flush()
+    created = []
+    for index in range(locations):
+        location = Location(
+            organization_id=org.id,
+            name=f"Media Index Location {index}",
+            timezone="UTC",
+            google_location_id=google_location_id,
+        )
+        db_session.add(location)
+        created.append(location)
+    db_session.commit()
+    return org, created
+
+
+def _tags(db_session, asset_id) -> set[str]:
+    return {row.tag for row in db_session.query(MediaAssetTag).filter(MediaAssetTag.asset_id == asset_id)}
+
+
+def _bulk_assets(db_session, org: Organization, location: Location, count: int, rng: random.Random) -> None:
+    now = datetime.now(timezone.utc)
+    asset_rows = []
+    tag_values = []
+    for index in range(count):
+        categories = rng.sample(CATEGORY_POOL, rng.randint(0, 2))
+        if rng.random() < 0.01:
+            categories.append("crew")
+        if rng.random() < 0.001:
+            categories.append("skylight")
+        roll = rng.random()
+        if roll < 0.02:
+            last_used_at = None
+        elif roll < 0.5:
+            last_used_at = now - timedelta(days=3, seconds=index * 7 + rng.randint(0, 6))
+        else:
+            last_used_at = now - timedelta(days=30, seconds=index * 7 + rng.randint(0, 6))
+        row = {
+            "id": uuid.uuid4(),
+            "organization_id": org.id,
+            "location_id": location.id,
+            "file_name": f"IMG_{index:05d}.jpg",
+            "source": rng.choice(SOURCES),
+            "media_type": MediaType.IMAGE,
+            "categories": categories,
+            "season": rng.choice(SEASONS),
+            "storage_url": f"https://example.com/{location.id}/{index}.jpg",
+            "metadata_json": {},
+            "last_used_at": last_used_at,
+            "usage_count": rng.randint(0, 4),
+            "created_at": now - timedelta(days=400, seconds=index),
+            "updated_at": now,
+        }
+        asset_rows.append(row)
+        # Fill the attributes tag extraction reads that the bulk rows leave unset.
+        row_view = SimpleNamespace(job_type=None, shot_stage=None, description=None, **row)
+        tag_values.extend((tag["asset_id"].hex, tag["tag"], location.id.hex) for tag in tag_rows(row_view))
+    db_session.execute(insert(MediaAsset), asset_rows)
+    db_session.connection().exec_driver_sql(
+        "INSERT INTO media_asset_tags (asset_id, tag, location_id) VALUES (?, ?, ?)", tag_values
+    )
+    db_session.commit()
+
+
+def test_upload_and_gbp_sync_index_asset_tags(db_session):
+    org, (location,) = _setup_org(db_session, google_location_id="locations/tags")
+    uploaded = MediaManagementService(db_session).upload_media(
+        organization_id=org.id,
+        location_id=location.id,
+        storage_url="s3://bucket/roof.jpg",
+        file_name="roof.jpg",
+        media_type=MediaType.IMAGE,
+        categories=["Roof Repair"],
+        season="Winter",
+    )
+    assert {"roof", "repair", "winter"} <= _tags(db_session, uploaded.id)
+
+    description = {"value": None}
+
+    class FakeClient:
+        def media_pages(self, location_name: str, *, page_token: str | None = None):
+            items = [
+                {
+                    "name": f"{location_name}/media/gutter-1",
+                    "googleUrl": "https://example.com/gutter-1.jpg",
+                    "mediaFormat": "PHOTO",
+                    "description": description["value"],
+                }
+            ]
+            return [GbpPage(items, None)]
+
+    sync = GbpSyncService(db_session)
+    sync._client = lambda org_id: FakeClient()  # type: ignore[method-assign]
+    sync.sync_media(org.id, location.id)
+    gbp_asset = db_session.query(MediaAsset).filter(MediaAsset.source == "gbp").one()
+    assert "gutter" in _tags(db_session, gbp_asset.id)
+    assert "seamless" not in _tags(db_session, gbp_asset.id)
+
+    description["value"] = "Seamless gutter install"
+    sync.sync_media(org.id, location.id)
+    assert {"gutter", "seamless", "install"} <= _tags(db_session, gbp_asset.id)
+
+
+def test_indexed_selection_matches_in_memory_ranking_at_10k_assets(db_session, engine):
+    org, locations = _setup_org(db_session, locations=2)
+    rng = random.Random(1515)
+    for location in locations:
+        _bulk_assets(db_session, org, location, 10_000, rng)
+    location = locations[0]
+    selector = MediaSelector(db_session)
+    loaded = db_session.query(MediaAsset).filter(MediaAsset.location_id == location.id).all()
+    probes = [
+        {"service": "roof repair"},
+        {"service": "Storm Damage", "theme": "promo", "prefer_upload": False},
+        {"service": "skylight", "min_reuse_gap_days": 0},
+        {"service": "chimney sweep"},
+        {"service": "chimney sweep", "prefer_upload": False, "min_reuse_gap_days": 60},
+        {"theme": "winter"},
+        {},
+        {"prefer_upload": False, "min_reuse_gap_days": 1},
+    ]
+
+    statements: list[str] = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    for probe in probes:
+        expected = selector.choose_asset(loaded, **probe)
+
+        statements.clear()
+        event.listen(engine, "before_cursor_execute", _count)
+        try:
+            picked = selector.pick_asset(location_id=location.id, mark_used=False, **probe)
+        finally:
+            event.remove(engine, "before_cursor_execute", _count)
+        assert picked.id == expected.id, probe
+        assert len(statements) == 1
@@ -2,10 +2,16 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
 
+from sqlalchemy import event
+
+import backend.app.features.posts.candidates as candidates_module
+from backend.app.models.content.bucket_performance import BucketPerformance, DEFAULT_TOPIC_KEY
 from backend.app.models.content.daily_signal import DailySignal
-from backend.app.models.enums import OrganizationType
+from backend.app.models.enums import OrganizationType, PostStatus
 from backend.app.models.google_business.location import Location
+from backend.app.models.google_business.location_settings import LocationSettings
 from backend.app.models.identity.organization import Organization
+from backend.app.models.posts.post import Post
 from backend.app.services.posts.post_candidates import PostCandidateService
 
 
@@ -42,3 +48,86 @@ def test_generate_post_candidate_scores_high_when_stale(db_session):
     candidate = service.generate(organization_id=org.id, location_id=location.id)
     assert candidate is not None
     assert candidate.score and candidate.score > 40
+
+
+def _signal(db_session, org, location) -> DailySignal:
+    signal = DailySignal(
+        organization_id=org.id,
+        location_id=location.id,
+        signal_date=datetime.now(timezone.utc).date(),
+        days_since_post=10,
+        review_count_7d=3,
+        avg_rating_30d=4.5,
+        rank_delta_7d=-2,
+        extra_metrics={"posts_last_7d": 0, "new_media_14d": 2, "gbp_connection_ok": True},
+    )
+    db_session.add(signal)
+    db_session.commit()
+    return signal
+
+
+def test_bucket_scoring_uses_prefetched_history_and_performance(db_session):
+    org, location = _setup(db_session)
+    _signal(db_session, org, location)
+    now = datetime.now(timezone.utc)
+    db_session.add(
+        Post(
+            organization_id=org.id,
+            location_id=location.id,
+            body="Recent spotlight",
+            bucket="service_spotlight",
+            status=PostStatus.PUBLISHED,
+            published_at=now - timedelta(days=3),
+        )
+    )
+    db_session.add(
+        BucketPerformance(
+            organization_id=org.id,
+            location_id=location.id,
+            bucket="faq",
+            topic_tag=DEFAULT_TOPIC_KEY,
+            score=30.0,
+            last_engaged_at=now - timedelta(days=9),
+        )
+    )
+    db_session.commit()
+
+    candidate = PostCandidateService(db_session).generate(organization_id=org.id, location_id=location.id)
+
+    assert candidate is not None
+    assert candidate.bucket == "faq"
+    reasons = candidate.reason_json
+    # 30 * (1 - elapsed / 45) with elapsed measured from midnight of the target date.
+    assert 23.0 < reasons["bucket_faq_score"] < 25.0
+    assert reasons["bucket_performance_score"] == reasons["bucket_faq_score"]
+    assert reasons["bucket_proof_score"] == 0.0
+
+
+def test_candidate_generation_statement_count_is_independent_of_bucket_count(db_session, engine, monkeypatch):
+    def _run(bucket_count: int) -> int:
+        org, location = _setup(db_session)
+        buckets = [{"id": f"bucket_{index}", "cooldown_days": 7 + index} for index in range(bucket_count)]
+        db_session.add(
+            LocationSettings(
+                location_id=location.id,
+                settings_json={"content_mix": {bucket["id"]: 1.0 for bucket in buckets}},
+            )
+        )
+        db_session.commit()
+        _signal(db_session, org, location)
+        monkeypatch.setattr(candidates_module, "BUCKETS", buckets)
+        service = PostCandidateService(db_session)
+        statements: list[str] = []
+
+        def _record(_conn, _cursor, statement, *_args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            candidate = service.generate(organization_id=org.id, location_id=location.id)
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+        assert candidate is not None
+        return len(statements)
+
+    assert _run(2) == _run(6) == _run(24)
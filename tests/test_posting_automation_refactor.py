@@ -10,11 +10,14 @@ from backend.app.models.media.media_asset import MediaAsset
 from backend.app.models.identity.organization import Organization
 from backend.app.models.posts.post import Post
 from backend.app.models.posts.post_candidate import PostCandidate
+from backend.app.models.posts.post_embedding import PostEmbedding
 from backend.app.services.content.content_guardrails import ContentGuardrails
 from backend.app.services.google_business.gbp_sync import GbpSyncService
+from backend.app.services.google_business.google import GbpPage
 from backend.app.services.media.media_management import MediaManagementService
 from backend.app.services.media.media_selection import MediaSelector
 from backend.app.services.posts.post_composition import PostCompositionService
+from backend.app.services.posts.post_embeddings import PostEmbeddingIndex
 from backend.app.services.posts.post_scheduler import PostSchedulerService
 
 
@@ -78,14 +81,15 @@ def test_unified_library_contains_uploaded_and_gbp_assets(db_session):
     )
 
     class FakeClient:
-        def list_media(self, location_name: str):
-            return [
+        def media_pages(self, location_name: str, *, page_token: str | None = None):
+            items = [
                 {
                     "name": f"{location_name}/media/1",
                     "googleUrl": "https://example.com/gbp1.jpg",
                     "mediaFormat": "PHOTO",
                 }
             ]
+            return [GbpPage(items, None)]
 
     sync = GbpSyncService(db_session)
     sync._client = lambda org_id: FakeClient()  # type: ignore[method-assign]
@@ -108,14 +112,15 @@ def test_photo_source_metadata_is_tracked(db_session):
     assert uploaded.usage_count == 0
 
     class FakeClient:
-        def list_media(self, location_name: str):
-            return [
+        def media_pages(self, location_name: str, *, page_token: str | None = None):
+            items = [
                 {
                     "name": f"{location_name}/media/ext-9",
                     "googleUrl": "https://example.com/ext-9.jpg",
                     "mediaFormat": "PHOTO",
                 }
             ]
+            return [GbpPage(items, None)]
 
     sync = GbpSyncService(db_session)
     sync._client = lambda org_id: FakeClient()  # type: ignore[method-assign]
@@ -311,6 +316,61 @@ def test_generated_post_is_scheduled_and_persisted(db_session):
     assert post.body == candidate.proposed_caption
 
 
+def test_scheduled_post_indexes_composed_embedding_once(db_session, monkeypatch):
+    org, location = _setup_org_location(db_session)
+    monkeypatch.setattr(PostCompositionService, "embedding", lambda self, text: [0.6, 0.8, 0.0])
+    candidate = PostCompositionService(db_session).compose(
+        _candidate(db_session, org, location, bucket="service_spotlight").id
+    )
+    PostSchedulerService(db_session).schedule(candidate.id)
+    post = db_session.query(Post).filter(Post.location_id == location.id).one()
+    entry = db_session.query(PostEmbedding).filter(PostEmbedding.post_id == post.id).one()
+    assert entry.vector == [0.6, 0.8, 0.0]
+    assert entry.dimensions == 3
+    assert PostEmbeddingIndex(db_session).add(post, [0.0, 1.0, 0.0]) is entry
+
+
+def test_similarity_check_embeds_only_the_new_caption(db_session):
+    org, location = _setup_org_location(db_session)
+    posts = [
+        Post(
+            organization_id=org.id,
+            location_id=location.id,
+            post_type=PostType.UPDATE,
+            body=f"Archive update {index}: seasonal gutter checklist #{index * 7}",
+        )
+        for index in range(500)
+    ]
+    db_session.add_all(posts)
+    db_session.flush()
+    index = PostEmbeddingIndex(db_session)
+    for position, post in enumerate(posts):
+        # Unit vectors spread around the circle; only post 0 points the same way as the probe.
+        angle = 0.2 + position * 0.01
+        index.add(post, [1.0, angle, 0.0])
+    db_session.commit()
+
+    service = PostCompositionService(db_session)
+    calls: list[str] = []
+
+    def stub_embedding(text: str) -> list[float]:
+        calls.append(text)
+        return [1.0, 0.2, 0.0]
+
+    service.embedding = stub_embedding
+    assert service._is_similar_to_recent("Roof repair tips for Media homeowners.", location.id)
+    assert calls == ["Roof repair tips for Media homeowners."]
+
+    calls.clear()
+    service.embedding = lambda text: calls.append(text) or [0.0, 0.0, 1.0]
+    assert not service._is_similar_to_recent("Roof repair tips for Media homeowners.", location.id)
+    assert len(calls) == 1
+
+    matches = index.top_k(location.id, [1.0, 0.2, 0.0], k=3)
+    assert [match.post_id for match in matches] == [posts[0].id, posts[1].id, posts[2].id]
+    assert matches[0].similarity > matches[1].similarity > matches[2].similarity
+
+
 def test_photo_usage_count_and_last_used_update_when_scheduled(db_session):
     org, location = _setup_org_location(db_session)
     asset = MediaAsset(
@@ -1,12 +1,24 @@
 from __future__ import annotations
 
+from collections import Counter
+from datetime import date, timedelta
 import random
+import time
+import uuid
+
+import pytest
+
+from sqlalchemy import event, insert
 
 from backend.app.models.enums import OrganizationType
 from backend.app.models.google_business.location import Location
 from backend.app.models.identity.organization import Organization
 from backend.app.models.posts.posting_window_stat import PostingWindowStat
+from backend.app.services.posts.posting_safety import PostingSafetyService
+from backend.app.services.posts.post_scheduler import resolve_window_datetime
 from backend.app.services.posts.posting_windows import PostingWindowService
+from backend.app.services.posts.window_registry import WINDOW_IDS, WINDOW_RANGES
+from backend.app.services.posts.window_selection import WindowOutcome, WindowRequest, WindowSelector
 
 
 def _org_and_location(db_session):
@@ -19,7 +31,7 @@ def _org_and_location(db_session):
     return org, location
 
 
-def test_posting_window_service_prefers_high_performance(monkeypatch, db_session):
+def test_posting_window_service_prefers_high_performance(db_session):
     org, location = _org_and_location(db_session)
     db_session.add(
         PostingWindowStat(
@@ -43,10 +55,150 @@ def test_posting_window_service_prefers_high_performance(monkeypatch, db_session
     )
     db_session.commit()
 
-    def deterministic(alpha, beta):
-        return alpha / (alpha + beta)
+    service = PostingWindowService(db_session, seed=11)
+    picks = Counter(service.choose_window(org.id, location.id)["id"] for _ in range(400))
+    assert picks.most_common(1)[0][0] == "evening"
+    assert picks["morning"] == min(picks[window_id] for window_id in WINDOW_IDS)
+
+
+
+def _locations_with_stats(db_session, count: int) -> tuple[Organization, list[Location]]:
+    org = Organization(name="Window Batch Org", org_type=OrganizationType.AGENCY)
+    db_session.add(org)
+    db_session.flush()
+    locations = [Location(name=f"Window {i}", organization_id=org.id, timezone="UTC") for i in range(count)]
+    db_session.add_all(locations)
+    db_session.flush()
+    rng = random.Random(3)
+    rows = []
+    # The last five locations have no stats and pick uniformly.
+    for location in locations[:-5]:
+        for window_id in WINDOW_IDS[: rng.randint(1, len(WINDOW_IDS))]:
+            impressions = rng.randint(10, 500)
+            clicks = rng.randint(0, impressions // 5)
+            rows.append(
+                {
+                    "id": uuid.uuid4(),
+                    "organization_id": org.id,
+                    "location_id": location.id,
+                    "window_id": window_id,
+                    "impressions": impressions,
+                    "clicks": clicks,
+                    "conversions": rng.randint(0, clicks),
+                }
+            )
+    db_session.execute(insert(PostingWindowStat), rows)
+    db_session.commit()
+    return org, locations
+
+
+def _requests(locations: list[Location], count: int) -> list[WindowRequest]:
+    hours = {"mon": ["10:00", "21:00"], "sat": ["07:00", "12:00"]}
+    return [
+        WindowRequest(
+            location_id=locations[index % len(locations)].id,
+            business_hours=hours if index % 3 == 0 else None,
+            timezone_name="UTC",
+            target_date=date(2026, 3, 2) + timedelta(days=index % 7),
+        )
+        for index in range(count)
+    ]
+
+
+def test_window_hours_come_from_the_registry():
+    assert PostingSafetyService.WINDOW_RANGES is WINDOW_RANGES
+    for window_id, (start, _) in WINDOW_RANGES.items():
+        assert resolve_window_datetime(date(2026, 3, 2), window_id, "UTC").time() == start
+
+
+def test_seeded_selection_is_deterministic(db_session):
+    _, locations = _locations_with_stats(db_session, 40)
+    requests = _requests(locations, 400)
+
+    first = [window["id"] for window in WindowSelector(db_session, seed=42).choose_many(requests)]
+    second = [window["id"] for window in WindowSelector(db_session, seed=42).choose_many(requests)]
+    other = [window["id"] for window in WindowSelector(db_session, seed=43).choose_many(requests)]
+    assert first == second
+    assert first != other
+    assert set(first) == set(WINDOW_IDS)
 
-    monkeypatch.setattr(random, "betavariate", deterministic)
+    for request, window_id in zip(requests, first):
+        if request.business_hours and request.target_date.weekday() == 0:
+            assert window_id != "morning"
+        if request.business_hours and request.target_date.weekday() == 5:
+            assert window_id in {"morning", "midday"}
+
+    first_service = PostingWindowService(db_session, seed=5)
+    second_service = PostingWindowService(db_session, seed=5)
+    assert [first_service.choose_window(None, location.id)["id"] for location in locations] == [
+        second_service.choose_window(None, location.id)["id"] for location in locations
+    ]
+
+
+def test_record_many_applies_atomic_increments_in_one_statement(db_session, engine):
+    org, location = _org_and_location(db_session)
     service = PostingWindowService(db_session)
-    choice = service.choose_window(org.id, location.id)
-    assert choice["id"] == "evening"
+    service.record_result(
+        organization_id=org.id,
+        location_id=location.id,
+        window_id="morning",
+        impressions=10,
+        clicks=2,
+        conversions=1,
+    )
+    statements: list[str] = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    outcomes = [
+        WindowOutcome(org.id, location.id, "morning", impressions=1, clicks=1),
+        WindowOutcome(org.id, location.id, "morning", impressions=1, conversions=1),
+        WindowOutcome(org.id, location.id, "evening", impressions=5, clicks=1),
+    ]
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        service.selector.record_many(outcomes)
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+    db_session.commit()
+
+    assert len(statements) == 1
+    assert "clicks = (posting_window_stats.clicks + excluded.clicks)" in statements[0]
+    stats = {
+        stat.window_id: (stat.impressions, stat.clicks, stat.conversions)
+        for stat in db_session.query(PostingWindowStat)
+        .populate_existing()
+        .filter(PostingWindowStat.location_id == location.id)
+    }
+    assert stats == {"morning": (12, 3, 2), "evening": (5, 1, 0)}
+
+
+def test_choose_windows_for_10k_posts_uses_one_statement(db_session, engine):
+    _, locations = _locations_with_stats(db_session, 500)
+    requests = _requests(locations, 10_000)
+    selector = WindowSelector(db_session, seed=7)
+    statements: list[str] = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        windows = selector.choose_many(requests)
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+
+    assert len(windows) == 10_000
+    assert len(statements) == 1
+
+
+@pytest.mark.benchmark
+def test_choose_windows_for_10k_posts_benchmark(db_session):
+    _, locations = _locations_with_stats(db_session, 500)
+    requests = _requests(locations, 10_000)
+    selector = WindowSelector(db_session, seed=7)
+
+    started = time.perf_counter()
+    selector.choose_many(requests)
+    assert time.perf_counter() - started < 5
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+import random
+
+from sqlalchemy import event
+
+from backend.app.models.enums import OrganizationType
+from backend.app.models.google_business.location import Location
+from backend.app.models.identity.organization import Organization
+from backend.app.models.posts.post_rotation_state import PostRotationState
+from backend.app.services.posts.rotation import RECENT_LIMIT, RotationEngine, fold_uses
+
+VALUES = [f"service-{index}" for index in range(12)]
+
+
+def _setup(db_session, count: int = 1) -> tuple[Organization, list[Location]]:
+    org = Organization(name="Rotation Org", org_type=OrganizationType.AGENCY)
+    db_session.add(org)
+    db_session.flush()
+    locations = [Location(organization_id=org.id, name=f"Rotation {index}", timezone="UTC") for index in range(count)]
+    db_session.add_all(locations)
+    db_session.commit()
+    return org, locations
+
+
+def _history(rng: random.Random, size: int, now: datetime) -> list[tuple[str, datetime]]:
+    uses = [(rng.choice(VALUES), now - timedelta(minutes=rng.randint(0, 30 * 24 * 60))) for _ in range(size)]
+    return sorted(uses, key=lambda use: use[1])
+
+
+def _seed_state(db_session, org, location, uses) -> None:
+    counts, recent = fold_uses({}, [], uses)
+    db_session.add(
+        PostRotationState(organization_id=org.id, location_id=location.id, key="service", counts=counts, recent=recent)
+    )
+    db_session.commit()
+
+
+def _legacy_pick(history: list[tuple[str, datetime]], candidates: list[str], now: datetime, cooldown: timedelta):
+    # The per-event algorithm the state row replaces: scan every use of the key.
+    recent = {value for value, used_at in history if used_at >= now - cooldown}
+    available = [value for value in candidates if value not in recent]
+    return available[0] if available else (candidates[0] if candidates else None)
+
+
+def test_rotation_sequence_matches_per_event_history(db_session):
+    org, (location,) = _setup(db_session)
+    rng = random.Random(1818)
+    now = datetime.now(timezone.utc)
+    history = _history(rng, 2_000, now)
+    _seed_state(db_session, org, location, history)
+    engine = RotationEngine(db_session)
+
+    expected, actual = [], []
+    for _ in range(80):
+        now += timedelta(hours=rng.randint(1, 40))
+        candidates = rng.sample(VALUES, rng.randint(1, 6))
+        choice = _legacy_pick(history, candidates, now, engine.cooldown)
+        history.append((choice, now))
+        expected.append(choice)
+        actual.append(
+            engine.select_next(
+                organization_id=org.id, location_id=location.id, key="service", candidates=candidates, now=now
+            )
+        )
+
+    assert actual == expected
+    state = db_session.get(PostRotationState, (location.id, "service"))
+    db_session.refresh(state)
+    assert state.counts == dict(Counter(value for value, _ in history))
+    assert state.version == 80
+
+
+def test_selection_cost_does_not_grow_with_history(db_session, engine):
+    org, (short, long) = _setup(db_session, 2)
+    rng = random.Random(7)
+    now = datetime.now(timezone.utc)
+    _seed_state(db_session, org, short, _history(rng, 10, now))
+    _seed_state(db_session, org, long, _history(rng, 50_000, now))
+    rotation = RotationEngine(db_session)
+
+    def _statements(location: Location) -> list[str]:
+        statements: list[str] = []
+
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _count)
+        try:
+            rotation.select_next(organization_id=org.id, location_id=location.id, key="service", candidates=VALUES)
+        finally:
+            event.remove(engine, "before_cursor_execute", _count)
+        return statements
+
+    assert len(_statements(short)) == len(_statements(long)) == 2
+    long_state = db_session.get(PostRotationState, (long.id, "service"))
+    db_session.refresh(long_state)
+    assert len(long_state.recent) <= min(RECENT_LIMIT, len(VALUES))
+    assert sum(long_state.counts.values()) == 50_001
+
+    # A key without state gets its row created on first use.
+    choice = rotation.select_next(organization_id=org.id, location_id=short.id, key="cta", candidates=["Call"])
+    assert choice == "Call"
+    assert db_session.get(PostRotationState, (short.id, "cta")).counts == {"Call": 1}
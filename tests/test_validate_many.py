@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import random
+import uuid
+
+from sqlalchemy import event, insert
+import pytest
+
+from backend.app.models.enums import OrganizationType, PostStatus, PostType
+from backend.app.models.google_business.location import Location
+from backend.app.models.identity.organization import Organization
+from backend.app.models.posts.post import Post
+from backend.app.services.posts.content_reuse import band_keys, minhash_signature
+from backend.app.services.posts.posting_safety import PostingSafetyService
+
+WORDS = (
+    "roof gutter siding storm attic skylight shingle flashing ridge vent leak inspection estimate warranty "
+    "crew season winter spring homeowners neighbors licensed insured durable energy moisture chimney hail "
+    "wind tarp emergency pricing financing family trusted cleanup photos report maintenance tips guide"
+).split()
+
+
+def _body(rng: random.Random, label: str) -> str:
+    return f"{label}: " + " ".join(rng.choice(WORDS) for _ in range(24)) + ". Call today to book service."
+
+
+def _rows(org: Organization, location: Location, bodies, *, status, created_at, **fields) -> list[dict]:
+    rows = []
+    for body in bodies:
+        rows.append(
+            {
+                "id": uuid.uuid4(),
+                "organization_id": org.id,
+                "location_id": location.id,
+                "post_type": PostType.UPDATE,
+                "status": status,
+                "body": body,
+                "minhash_signature": minhash_signature(body),
+                "created_at": created_at,
+                "updated_at": created_at,
+                **fields,
+            }
+        )
+    return rows
+
+
+def _seed(db_session, rows: list[dict]) -> None:
+    db_session.execute(insert(Post), rows)
+    band_rows = [
+        (row["id"].hex, band, row["location_id"].hex, key)
+        for row in rows
+        for band, key in enumerate(band_keys(row["minhash_signature"]))
+    ]
+    db_session.connection().exec_driver_sql(
+        "INSERT INTO post_minhash_bands (post_id, band, location_id, band_key) VALUES (?, ?, ?, ?)",
+        band_rows,
+    )
+    db_session.commit()
+
+
+@pytest.fixture
+def bulk_batch(db_session):
+    rng = random.Random(19)
+    now = datetime.now(timezone.utc)
+    org = Organization(name="Bulk Publish Org", org_type=OrganizationType.AGENCY)
+    db_session.add(org)
+    db_session.flush()
+    locations = [Location(name=f"Bulk Location {i}", organization_id=org.id, timezone="UTC") for i in range(50)]
+    locations[0].posting_paused = True
+    db_session.add_all(locations)
+    db_session.commit()
+
+    prior_rows = []
+    pending_rows = []
+    reused_body = _body(rng, "Reused")
+    for index, location in enumerate(locations):
+        if index == 1:
+            published_at = [now - timedelta(days=days) for days in (2, 4, 6)]
+        elif index == 2:
+            published_at = [now - timedelta(hours=10)]
+        else:
+            published_at = [now - timedelta(days=5)]
+        prior_bodies = [_body(rng, f"Prior {index}-{n}") for n in range(len(published_at))]
+        if index == 3:
+            prior_bodies[0] = reused_body
+        for row, at in zip(
+            _rows(org, location, prior_bodies, status=PostStatus.PUBLISHED, created_at=now - timedelta(days=20)),
+            published_at,
+        ):
+            row["published_at"] = at
+            prior_rows.append(row)
+
+        bodies = [_body(rng, f"Pending {index}-{n}") for n in range(20)]
+        if index == 3:
+            bodies[0] = reused_body
+        rows = _rows(
+            org,
+            location,
+            bodies,
+            status=PostStatus.SCHEDULED,
+            created_at=now - timedelta(days=1),
+            scheduled_at=now - timedelta(minutes=1),
+        )
+        if index == 4:
+            rows[0]["scheduled_at"] = now + timedelta(days=2)
+            rows[1]["status"] = PostStatus.DRAFT
+        pending_rows.extend(rows)
+    _seed(db_session, prior_rows + pending_rows)
+    posts = db_session.query(Post).filter(Post.id.in_([row["id"] for row in pending_rows])).all()
+    order = {row["id"]: position for position, row in enumerate(pending_rows)}
+    posts.sort(key=lambda post: order[post.id])
+    return now, locations, posts
+
+
+def test_validate_many_checks_1000_posts_in_bounded_statements(db_session, engine, bulk_batch):
+    now, locations, posts = bulk_batch
+    assert len(posts) == 1000
+    safety = PostingSafetyService(db_session)
+    statements: list[str] = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        verdicts = safety.validate_many(posts, now=now)
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+
+    assert len(statements) <= 10
+    assert not [sql for sql in statements if sql.lstrip().split()[0].upper() in {"INSERT", "UPDATE", "DELETE"}]
+    assert [verdict.post_id for verdict in verdicts] == [post.id for post in posts]
+
+    reasons = {}
+    for post, verdict in zip(posts, verdicts):
+        if verdict.reason:
+            reasons.setdefault(verdict.reason, set()).add(post.location_id)
+    by_location = {location.id: index for index, location in enumerate(locations)}
+    failing = {
+        reason: sorted(by_location[location_id] for location_id in location_ids)
+        for reason, location_ids in reasons.items()
+    }
+    assert failing == {
+        "Posting is paused for this location": [0],
+        "Maximum published posts per week exceeded for this location": [1],
+        "Minimum gap between published posts not satisfied": [2],
+        "Same post content was used too recently": [3],
+        "Post is not due for publishing yet": [4],
+        "Post status draft is not publishable": [4],
+    }
+    assert sum(not verdict.ok for verdict in verdicts) == 20 + 20 + 20 + 1 + 2
+
+
+def test_validate_many_matches_single_post_checks(db_session, bulk_batch):
+    now, _, posts = bulk_batch
+    safety = PostingSafetyService(db_session)
+    verdicts = safety.validate_many(posts, now=now)
+    for post, verdict in list(zip(posts, verdicts))[::37] + list(zip(posts, verdicts))[:100:20]:
+        try:
+            safety.validate_publish_ready(post, now=now)
+        except ValueError as exc:
+            assert str(exc) == verdict.reason
+        else:
+            assert verdict.ok
+
+
+def test_validate_many_leaves_lapsed_subscription_unpaused(db_session):
+    org = Organization(
+        name="Lapsed Org",
+        org_type=OrganizationType.AGENCY,
+        metadata_json={"cancel_at_period_end": True, "current_period_end": 1},
+    )
+    db_session.add(org)
+    db_session.flush()
+    location = Location(name="Lapsed Location", organization_id=org.id, timezone="UTC")
+    db_session.add(location)
+    db_session.flush()
+    post = Post(organization_id=org.id, location_id=location.id, body="Spring gutter cleaning is open.")
+    post.status = PostStatus.SCHEDULED
+    db_session.add(post)
+    db_session.commit()
+
+    safety = PostingSafetyService(db_session)
+    (verdict,) = safety.validate_many([post])
+    assert verdict.reason == "Posting is paused for this organization"
+    assert not org.posting_paused
+
+    with pytest.raises(ValueError):
+        safety.ensure_not_paused(organization_id=org.id, location_id=location.id)
+    db_session.refresh(org)
+    assert org.posting_paused
+    assert not org.is_active
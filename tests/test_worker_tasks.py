@@ -3,6 +3,7 @@ from __future__ import annotations
 from datetime import datetime, timedelta, timezone
 
 import pytest
+from sqlalchemy import event
 
 from backend.app.models.automation.action import Action as ActionModel
 from backend.app.models.enums import (
@@ -15,13 +16,16 @@ from backend.app.models.enums import (
     OrganizationType,
 )
 from backend.app.models.identity.organization import Organization
+from backend.app.models.operations.audit_log import AuditLog
 from backend.app.models.google_business.location import Location
 from backend.app.models.google_business.location_settings import LocationSettings
 from backend.app.services.media.media_management import MediaManagementService
 from backend.app.services.rank_tracking.competitor_monitoring import CompetitorMonitoringService
 from backend.app.services.automation.automation_rules import AutomationRuleService
-from backend.app.services.automation.actions import ActionService
+from backend.app.services.automation.actions import ActionService, ActionSpec
+from worker.app import routing
 from worker.app import tasks as worker_tasks
+from worker.app.celery_app import celery_app
 
 
 def test_dispatch_due_actions_triggers_execution(
@@ -39,18 +43,147 @@ def test_dispatch_due_actions_triggers_execution(
 
     triggered: list[str] = []
 
-    class StubTask:
-        @staticmethod
-        def delay(action_id: str):
-            triggered.append(action_id)
+    def _publish(queue, action_ids):
+        triggered.extend(str(action_id) for action_id in action_ids)
 
-    monkeypatch.setattr(worker_tasks, "execute_action", StubTask())
+    monkeypatch.setattr(worker_tasks, "_publish_actions", _publish)
 
     result = worker_tasks._dispatch_due_actions()
     assert result["dispatched"] == 1
     assert triggered == [str(action.id)]
 
 
+def test_dispatch_due_actions_drains_backlog_in_batches(
+    db_session, worker_session_factory, monkeypatch
+):
+    org = Organization(name="Backlog Org", org_type=OrganizationType.AGENCY)
+    db_session.add(org)
+    db_session.commit()
+    service = ActionService(db_session)
+    actions = [
+        service.schedule_action(
+            organization_id=org.id,
+            action_type=ActionType.CUSTOM,
+            run_at=datetime.now(timezone.utc) - timedelta(minutes=1),
+            priority=index,
+        )
+        for index in range(5)
+    ]
+
+    published: list[list[str]] = []
+    monkeypatch.setattr(
+        worker_tasks, "_publish_actions", lambda queue, ids: published.append([str(i) for i in ids])
+    )
+    monkeypatch.setattr(worker_tasks.settings, "ACTION_DISPATCH_BATCH_SIZE", 2)
+
+    result = worker_tasks._dispatch_due_actions()
+
+    assert result == {"dispatched": 5, "batches": 3}
+    assert [len(batch) for batch in published] == [2, 2, 1]
+    # Highest priority is claimed first.
+    assert set(published[0]) == {str(actions[4].id), str(actions[3].id)}
+    for action in actions:
+        db_session.refresh(action)
+        assert action.status == ActionStatus.QUEUED
+        assert action.locked_by == worker_tasks._dispatcher_id()
+
+
+def test_dispatch_due_actions_stops_at_time_budget(
+    db_session, worker_session_factory, monkeypatch
+):
+    org = Organization(name="Budget Org", org_type=OrganizationType.AGENCY)
+    db_session.add(org)
+    db_session.commit()
+    service = ActionService(db_session)
+    for _ in range(3):
+        service.schedule_action(
+            organization_id=org.id,
+            action_type=ActionType.CUSTOM,
+            run_at=datetime.now(timezone.utc) - timedelta(minutes=1),
+        )
+
+    monkeypatch.setattr(worker_tasks, "_publish_actions", lambda queue, ids: None)
+    monkeypatch.setattr(worker_tasks.settings, "ACTION_DISPATCH_BATCH_SIZE", 1)
+    monkeypatch.setattr(worker_tasks.settings, "ACTION_DISPATCH_TIME_BUDGET_SECONDS", 0)
+
+    result = worker_tasks._dispatch_due_actions()
+
+    assert result == {"dispatched": 1, "batches": 1}
+
+
+def test_dispatch_routes_publish_ahead_of_planning_backlog(
+    db_session, worker_session_factory, monkeypatch
+):
+    org = Organization(name="Routing Org", org_type=OrganizationType.AGENCY)
+    db_session.add(org)
+    db_session.commit()
+    service = ActionService(db_session)
+    now = datetime.now(timezone.utc)
+    service.schedule_actions_bulk(
+        [
+            ActionSpec(
+                organization_id=org.id,
+                action_type=ActionType.PLAN_CONTENT,
+                run_at=now - timedelta(hours=1),
+                priority=5,
+            )
+            for _ in range(500)
+        ]
+    )
+    publish = service.schedule_action(
+        organization_id=org.id,
+        action_type=ActionType.PUBLISH_GBP_POST,
+        run_at=now - timedelta(minutes=1),
+    )
+
+    executed: list[tuple[ActionType, str]] = []
+
+    def _record(self, action):
+        if action.organization_id == org.id:
+            executed.append((action.action_type, str(action.id)))
+        return {"status": "recorded"}
+
+    monkeypatch.setattr(worker_tasks.ActionExecutor, "execute", _record)
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+
+    result = worker_tasks._dispatch_due_actions()
+
+    assert result["dispatched"] >= 501
+    assert len(executed) == 501
+    assert executed[0] == (ActionType.PUBLISH_GBP_POST, str(publish.id))
+    assert {action_type for action_type, _ in executed[1:]} == {ActionType.PLAN_CONTENT}
+
+
+def test_action_types_route_to_named_queues():
+    assert routing.queue_for_action(ActionType.PUBLISH_GBP_POST) == routing.PUBLISH_QUEUE
+    assert routing.queue_for_action(ActionType.REFRESH_GOOGLE_TOKEN) == routing.PUBLISH_QUEUE
+    assert routing.queue_for_action(ActionType.SYNC_GBP_REVIEWS) == routing.SYNC_QUEUE
+    assert routing.queue_for_action(ActionType.SYNC_GBP_MEDIA) == routing.SYNC_QUEUE
+    assert routing.queue_for_action(ActionType.PLAN_CONTENT) == routing.PLANNING_QUEUE
+    assert routing.queue_for_action(ActionType.RUN_KEYWORD_CAMPAIGN) == routing.ANALYTICS_QUEUE
+    assert routing.queue_for_action(ActionType.CUSTOM) == routing.DEFAULT_QUEUE
+    routes = celery_app.conf.task_routes
+    for queue in routing.QUEUE_ORDER:
+        task = worker_tasks.execute_action_by_queue[queue]
+        assert routes[task.name] == {"queue": queue}
+        assert task.rate_limit == routing.queue_rate_limit(queue)
+
+
+def test_worker_concurrency_follows_single_queue(monkeypatch):
+    monkeypatch.setitem(worker_tasks.settings.ACTION_QUEUE_CONCURRENCY, "publish", 7)
+
+    class Conf:
+        worker_concurrency = None
+
+    conf = Conf()
+    routing.apply_worker_concurrency(conf, {"queues": ["publish"]})
+    assert conf.worker_concurrency == 7
+
+    conf = Conf()
+    routing.apply_worker_concurrency(conf, {"queues": "publish,planning"})
+    assert conf.worker_concurrency is None
+
+
 def test_execute_action_marks_success(db_session, worker_session_factory):
     org = Organization(name="Exec Org", org_type=OrganizationType.AGENCY)
     db_session.add(org)
@@ -192,6 +325,167 @@ def test_schedule_automation_rules_creates_actions(db_session, worker_session_fa
     assert result["scheduled"] >= 1
 
 
+def test_plan_content_dedupes_within_bucket(db_session, worker_session_factory):
+    org = Organization(name="Plan Bucket Org", org_type=OrganizationType.AGENCY)
+    db_session.add(org)
+    db_session.commit()
+
+    first = worker_tasks._plan_content()
+    second = worker_tasks._plan_content()
+    assert first["scheduled"] >= 1
+    assert second["scheduled"] == 0
+    assert second["deduplicated"] >= 1
+
+
+def test_org_fanout_tick_uses_constant_statements(db_session, worker_session_factory, engine):
+    def _add_orgs(count: int, label: str) -> list:
+        orgs = [Organization(name=f"{label} {index}", org_type=OrganizationType.AGENCY) for index in range(count)]
+        db_session.add_all(orgs)
+        db_session.commit()
+        return orgs
+
+    def _tick() -> tuple[dict, int]:
+        statements: list[str] = []
+
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _count)
+        try:
+            result = worker_tasks._connection_health()
+        finally:
+            event.remove(engine, "before_cursor_execute", _count)
+        return result, len(statements)
+
+    small = _add_orgs(5, "Fanout Small")
+    small_result, small_statements = _tick()
+    large = _add_orgs(5000, "Fanout Large")
+    large_result, large_statements = _tick()
+
+    assert small_result["scheduled"] >= 5
+    assert large_result["scheduled"] == 5000
+    assert large_statements == small_statements
+    assert large_statements <= 3
+
+    bucket = worker_tasks._period_bucket(datetime.now(timezone.utc), minutes=30)
+    sample = large[123]
+    action = (
+        db_session.query(ActionModel)
+        .filter(ActionModel.dedupe_key == f"connection_health:{sample.id}:{bucket}")
+        .one()
+    )
+    assert action.organization_id == sample.id
+    assert action.tenant_id == sample.id
+    assert action.action_type == ActionType.REFRESH_GOOGLE_TOKEN
+    assert action.status == ActionStatus.PENDING
+    assert action.payload == {"organization_id": str(sample.id)}
+    assert db_session.query(ActionModel).filter(ActionModel.organization_id.in_([o.id for o in small])).count() == 5
+
+    assert large_result["deduplicated"] >= 5
+
+    audit = (
+        db_session.query(AuditLog)
+        .filter(AuditLog.action == "action.scheduled", AuditLog.organization_id.in_([o.id for o in large]))
+        .all()
+    )
+    assert len(audit) == 5000
+    entry = next(entry for entry in audit if entry.entity_id == str(action.id))
+    assert entry.organization_id == sample.id
+    assert entry.entity_type == "action"
+    assert entry.metadata_json == {"action_type": "refresh_google_token"}
+
+
+def test_schedule_keyword_campaigns_monthly_filters_ineligible_locations(db_session, worker_session_factory):
+    completed = Organization(
+        name="Keyword Eligibility Org",
+        org_type=OrganizationType.AGENCY,
+        metadata_json={"onboarding": {"completed": True}},
+    )
+    pending = Organization(
+        name="Keyword Pending Org",
+        org_type=OrganizationType.AGENCY,
+        metadata_json={"onboarding_status": "in_progress"},
+    )
+    db_session.add_all([completed, pending])
+    db_session.flush()
+
+    def _location(org, name, *, address, services, settings_json, google_location_id=None):
+        location = Location(
+            name=name,
+            organization_id=org.id,
+            timezone="UTC",
+            status=LocationStatus.ACTIVE,
+            google_location_id=google_location_id,
+            address=address,
+        )
+        db_session.add(location)
+        db_session.flush()
+        db_session.add(
+            LocationSettings(location_id=location.id, services=services, settings_json=settings_json)
+        )
+        return location
+
+    eligible = _location(
+        completed,
+        "Eligible",
+        address={"city": "Austin"},
+        services=["drain cleaning"],
+        settings_json={"business_type": "Plumber", "gbp_ready": True},
+    )
+    _location(
+        completed,
+        "No Services",
+        address={"primaryCategory": "Plumber"},
+        services=[],
+        settings_json={"gbp_ready": True},
+    )
+    _location(
+        completed,
+        "Not GBP Ready",
+        address={"primaryCategory": "Plumber"},
+        services=["drain cleaning"],
+        settings_json={"gbp_ready": "yes"},
+    )
+    _location(
+        completed,
+        "Blank Category",
+        address={"primaryCategory": "   "},
+        services=["drain cleaning"],
+        settings_json={},
+        google_location_id="accounts/1/locations/blank",
+    )
+    _location(
+        pending,
+        "Pending Org Location",
+        address={"primaryCategory": "Plumber"},
+        services=["drain cleaning"],
+        settings_json={"gbp_ready": True},
+    )
+    db_session.commit()
+
+    worker_tasks._schedule_keyword_campaigns_monthly()
+
+    actions = (
+        db_session.query(ActionModel)
+        .filter(ActionModel.organization_id.in_([completed.id, pending.id]))
+        .all()
+    )
+    assert [action.location_id for action in actions] == [eligible.id]
+    today = datetime.now(timezone.utc).date()
+    assert actions[0].dedupe_key == (
+        f"keyword-monthly-action:{completed.id}:{eligible.id}:{today.year:04d}-{today.month:02d}"
+    )
+    assert actions[0].payload == {
+        "organization_id": str(completed.id),
+        "location_id": str(eligible.id),
+        "cycle_year": today.year,
+        "cycle_month": today.month,
+        "trigger_source": "monthly",
+        "onboarding_triggered": False,
+    }
+    assert worker_tasks._schedule_keyword_campaigns_monthly()["scheduled"] == 0
+
+
 def test_schedule_keyword_campaigns_monthly_creates_actions(db_session, worker_session_factory):
     org = Organization(
         name="Keyword Monthly Org",
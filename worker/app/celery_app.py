@@ -1,7 +1,8 @@
-from celery import Celery
+from celery import Celery, signals
 from celery.schedules import crontab
 
 from backend.app.core.config import settings
+from .routing import DEFAULT_QUEUE, apply_worker_concurrency, task_queues, task_routes
 
 broker = settings.CELERY_BROKER_URL
 backend = settings.CELERY_RESULT_BACKEND
@@ -19,8 +20,22 @@ celery_app.conf.update(
     result_serializer="json",
     timezone="UTC",
     enable_utc=True,
+    task_queues=task_queues(),
+    task_default_queue=DEFAULT_QUEUE,
+    task_routes=task_routes(),
+    # Redis consumes queues in declaration order, so publish work drains before planning.
+    broker_transport_options={"queue_order_strategy": "priority"},
+    worker_prefetch_multiplier=1,
 )
 
+
+@signals.celeryd_init.connect
+def _configure_queue_concurrency(sender=None, conf=None, options=None, **kwargs):
+    # `celery worker -Q publish` picks up ACTION_QUEUE_CONCURRENCY["publish"].
+    if conf is not None:
+        apply_worker_concurrency(conf, options or {})
+
+
 celery_app.conf.beat_schedule = {
     "dispatch-due-actions": {
         "task": "actions.dispatch_due",
@@ -38,6 +53,10 @@ celery_app.conf.beat_schedule = {
         "task": "actions.connection_health",
         "schedule": crontab(minute="*/30"),
     },
+    "schedule-gbp-syncs": {
+        "task": "actions.schedule_gbp_syncs",
+        "schedule": crontab(minute=5),  # hourly
+    },
     "schedule-keyword-campaigns-monthly": {
         "task": "actions.schedule_keyword_campaigns_monthly",
         "schedule": crontab(minute=10, hour=2, day_of_month="1"),
@@ -46,4 +65,8 @@ celery_app.conf.beat_schedule = {
         "task": "actions.schedule_keyword_campaigns_onboarding",
         "schedule": crontab(minute="*/10"),
     },
+    "purge-caption-completions": {
+        "task": "maintenance.purge_caption_completions",
+        "schedule": crontab(minute=20),  # hourly
+    },
 }
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+from kombu import Queue
+
+from backend.app.core.config import settings
+from backend.app.models.enums import ActionType
+
+PUBLISH_QUEUE = "publish"
+SYNC_QUEUE = "sync"
+PLANNING_QUEUE = "planning"
+ANALYTICS_QUEUE = "analytics"
+DEFAULT_QUEUE = "default"
+
+# Consumption order: workers listening on several queues drain earlier ones first.
+QUEUE_ORDER = (PUBLISH_QUEUE, SYNC_QUEUE, PLANNING_QUEUE, ANALYTICS_QUEUE, DEFAULT_QUEUE)
+
+ACTION_QUEUES: dict[ActionType, str] = {
+    ActionType.PUBLISH_GBP_POST: PUBLISH_QUEUE,
+    ActionType.PUBLISH_QA: PUBLISH_QUEUE,
+    ActionType.EXECUTE_POST_JOB: PUBLISH_QUEUE,
+    ActionType.REFRESH_GOOGLE_TOKEN: PUBLISH_QUEUE,
+    ActionType.SYNC_GOOGLE_LOCATIONS: SYNC_QUEUE,
+    ActionType.SYNC_GBP_REVIEWS: SYNC_QUEUE,
+    ActionType.SYNC_GBP_POSTS: SYNC_QUEUE,
+    ActionType.SYNC_GBP_MEDIA: SYNC_QUEUE,
+    ActionType.PLAN_CONTENT: PLANNING_QUEUE,
+    ActionType.GENERATE_POST_CANDIDATES: PLANNING_QUEUE,
+    ActionType.COMPOSE_POST_CANDIDATE: PLANNING_QUEUE,
+    ActionType.SCHEDULE_POST: PLANNING_QUEUE,
+    ActionType.RUN_AUTOMATION_RULES: PLANNING_QUEUE,
+    ActionType.REQUEST_MEDIA_UPLOAD: PLANNING_QUEUE,
+    ActionType.CHECK_RANKINGS: ANALYTICS_QUEUE,
+    ActionType.MONITOR_COMPETITORS: ANALYTICS_QUEUE,
+    ActionType.COMPUTE_DAILY_SIGNALS: ANALYTICS_QUEUE,
+    ActionType.RUN_KEYWORD_CAMPAIGN: ANALYTICS_QUEUE,
+    ActionType.RUN_KEYWORD_FOLLOWUP_SCAN: ANALYTICS_QUEUE,
+}
+
+# Beat-driven fan-out tasks; the dispatcher itself stays on the default queue.
+SCHEDULER_TASK_QUEUES = {
+    "actions.schedule_automation_rules": PLANNING_QUEUE,
+    "actions.plan_content": PLANNING_QUEUE,
+    "actions.connection_health": PLANNING_QUEUE,
+    "actions.schedule_gbp_syncs": PLANNING_QUEUE,
+    "actions.schedule_keyword_campaigns_monthly": PLANNING_QUEUE,
+    "actions.schedule_keyword_campaigns_onboarding": PLANNING_QUEUE,
+}
+
+
+def queue_for_action(action_type: ActionType) -> str:
+    return ACTION_QUEUES.get(action_type, DEFAULT_QUEUE)
+
+
+def action_types_for_queue(queue: str) -> list[ActionType]:
+    return [action_type for action_type in ActionType if queue_for_action(action_type) == queue]
+
+
+def execute_task_name(queue: str) -> str:
+    return f"actions.execute.{queue}"
+
+
+def queue_rate_limit(queue: str) -> str | None:
+    return settings.ACTION_QUEUE_RATE_LIMITS.get(queue) or None
+
+
+def queue_concurrency(queue: str) -> int | None:
+    return settings.ACTION_QUEUE_CONCURRENCY.get(queue)
+
+
+def task_queues() -> list[Queue]:
+    return [Queue(queue, routing_key=queue) for queue in QUEUE_ORDER]
+
+
+def task_routes() -> dict[str, dict[str, str]]:
+    routes = {execute_task_name(queue): {"queue": queue} for queue in QUEUE_ORDER}
+    routes.update({name: {"queue": queue} for name, queue in SCHEDULER_TASK_QUEUES.items()})
+    return routes
+
+
+def concurrency_for_worker_queues(queues: Iterable[str] | str | None) -> int | None:
+    """Concurrency configured for a worker that consumes exactly one action queue."""
+    if not queues:
+        return None
+    names = [name.strip() for name in queues.split(",")] if isinstance(queues, str) else list(queues)
+    if len(names) != 1:
+        return None
+    return queue_concurrency(names[0])
+
+
+def apply_worker_concurrency(conf: Any, options: dict[str, Any]) -> None:
+    concurrency = concurrency_for_worker_queues(options.get("queues"))
+    if concurrency and not options.get("concurrency"):
+        conf.worker_concurrency = concurrency
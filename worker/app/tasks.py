@@ -1,37 +1,80 @@
+import os
+import socket
+import time
 import uuid
 from datetime import datetime, timezone
-from typing import Any, Dict, cast
+from typing import Any, Callable, Dict, List, Sequence, cast
 
+from celery import group
 from celery.app.task import Task
 from celery.utils.log import get_task_logger
+from sqlalchemy import select
 
 from .celery_app import celery_app
+from .routing import QUEUE_ORDER, action_types_for_queue, execute_task_name, queue_rate_limit
 from backend.app.core.config import settings
 from backend.app.db.session import SessionLocal
 from backend.app.models.automation.action import Action
-from backend.app.models.enums import ActionStatus, ActionType
+from backend.app.models.enums import ActionStatus, ActionType, GbpConnectionStatus
+from backend.app.models.google_business.gbp_connection import GbpConnection
+from backend.app.models.google_business.location import Location
 from backend.app.models.identity.organization import Organization
 from backend.app.services.google_business.gbp_connections import GbpConnectionService
-from backend.app.services.automation.actions import ActionExecutor, ActionService
+from backend.app.services.automation.action_fanout import FanOutSql
+from backend.app.services.automation.actions import ActionExecutor, ActionService, ActionSpec
+from backend.app.services.content.caption_completions import CaptionCompletionCache
 from backend.app.services.rank_tracking.keyword_strategy import KeywordCampaignSchedulerService
 
 logger = get_task_logger(__name__)
 
+# Hourly multi-location syncs per connected account; the posts sync also refreshes media.
+GBP_SYNC_ACTIONS = (
+    (ActionType.SYNC_GBP_REVIEWS, "gbp_sync_reviews"),
+    (ActionType.SYNC_GBP_POSTS, "gbp_sync_posts"),
+)
+
 
 def _dispatch_due_actions() -> Dict[str, int]:
     db = SessionLocal()
+    batch_size = settings.ACTION_DISPATCH_BATCH_SIZE
+    deadline = time.monotonic() + settings.ACTION_DISPATCH_TIME_BUDGET_SECONDS
+    locked_by = _dispatcher_id()
+    dispatched = 0
+    batches = 0
     try:
         service = ActionService(db)
-        actions = service.fetch_due_actions(settings.ACTION_DISPATCH_BATCH_SIZE)
-        dispatched = 0
-        for action in actions:
-            execute_action.delay(str(action.id))
-            dispatched += 1
-        return {"dispatched": dispatched}
+        # Drain the backlog within one beat tick. Every round claims from each queue in
+        # QUEUE_ORDER, so a planning backlog never delays publish work by more than a batch.
+        while True:
+            drained = True
+            for queue in QUEUE_ORDER:
+                action_ids = service.claim_due_actions(
+                    batch_size,
+                    locked_by=locked_by,
+                    action_types=action_types_for_queue(queue),
+                )
+                if action_ids:
+                    _publish_actions(queue, action_ids)
+                    dispatched += len(action_ids)
+                    batches += 1
+                if len(action_ids) >= batch_size:
+                    drained = False
+            if drained or time.monotonic() >= deadline:
+                break
+        return {"dispatched": dispatched, "batches": batches}
     finally:
         db.close()
 
 
+def _publish_actions(queue: str, action_ids: Sequence[uuid.UUID]) -> None:
+    task = execute_action_by_queue[queue]
+    group(task.s(str(action_id)) for action_id in action_ids).apply_async()
+
+
+def _dispatcher_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
 def _execute_action(action_id: str) -> Dict[str, Any]:
     db = SessionLocal()
     service = ActionService(db)
@@ -64,67 +107,96 @@ def _execute_action(action_id: str) -> Dict[str, Any]:
 
 
 def _schedule_automation_rules() -> Dict[str, int]:
-    db = SessionLocal()
-    scheduled = 0
-    try:
-        service = ActionService(db)
-        now = datetime.now(timezone.utc)
-        bucket = _period_bucket(now, minutes=15)
-        org_ids = [org_id for (org_id,) in db.query(Organization.id).all()]
-        for org_id in org_ids:
-            service.schedule_action(
-                organization_id=org_id,
-                action_type=ActionType.RUN_AUTOMATION_RULES,
-                run_at=now,
-                payload={"organization_id": str(org_id)},
-                dedupe_key=f"automation_rules:{org_id}:{bucket}",
-            )
-            scheduled += 1
-        return {"scheduled": scheduled}
-    finally:
-        db.close()
+    return _schedule_per_organization(
+        ActionType.RUN_AUTOMATION_RULES,
+        key_prefix="automation_rules",
+        minutes=15,
+        payload=lambda sql: {"organization_id": sql.uuid_text(Organization.id)},
+    )
 
 
 def _plan_content() -> Dict[str, int]:
+    return _schedule_per_organization(
+        ActionType.PLAN_CONTENT,
+        key_prefix="plan_content",
+        minutes=240,
+        payload=lambda sql: {"horizon_days": 14},
+    )
+
+
+def _connection_health() -> Dict[str, int]:
+    return _schedule_per_organization(
+        ActionType.REFRESH_GOOGLE_TOKEN,
+        key_prefix="connection_health",
+        minutes=30,
+        payload=lambda sql: {"organization_id": sql.uuid_text(Organization.id)},
+    )
+
+
+def _schedule_per_organization(
+    action_type: ActionType,
+    *,
+    key_prefix: str,
+    minutes: int,
+    payload: Callable[[FanOutSql], Dict[str, Any]],
+) -> Dict[str, int]:
+    """Enqueue one action per organization for the current period in a single INSERT ... SELECT."""
     db = SessionLocal()
-    scheduled = 0
     try:
         service = ActionService(db)
+        sql = service.fanout_sql()
         now = datetime.now(timezone.utc)
-        bucket = _period_bucket(now, minutes=240)
-        org_ids = [org_id for (org_id,) in db.query(Organization.id).all()]
-        for org_id in org_ids:
-            service.schedule_action(
-                organization_id=org_id,
-                action_type=ActionType.PLAN_CONTENT,
-                run_at=now,
-                payload={"horizon_days": 14},
-                dedupe_key=f"plan_content:{org_id}:{bucket}",
-            )
-            scheduled += 1
-        return {"scheduled": scheduled}
+        bucket = _period_bucket(now, minutes=minutes)
+        result = service.schedule_actions_from_select(
+            action_type=action_type,
+            run_at=now,
+            select_from=Organization,
+            where=[],
+            organization_id=Organization.id,
+            dedupe_key=sql.concat(f"{key_prefix}:", sql.uuid_text(Organization.id), f":{bucket}"),
+            payload=sql.json_object(payload(sql)),
+        )
+        return {"scheduled": result.created, "deduplicated": result.deduplicated}
     finally:
         db.close()
 
 
-def _connection_health() -> Dict[str, int]:
+def _schedule_gbp_syncs() -> Dict[str, int]:
+    """Enqueue one sync per resource for each connected account, covering all its linked locations.
+
+    The executor fans each action out over `payload["location_ids"]` concurrently, within the
+    Google account's concurrency cap.
+    """
     db = SessionLocal()
-    scheduled = 0
     try:
-        service = ActionService(db)
-        now = datetime.now(timezone.utc)
-        bucket = _period_bucket(now, minutes=30)
-        org_ids = [org_id for (org_id,) in db.query(Organization.id).all()]
-        for org_id in org_ids:
-            service.schedule_action(
-                organization_id=org_id,
-                action_type=ActionType.REFRESH_GOOGLE_TOKEN,
-                run_at=now,
-                payload={"organization_id": str(org_id)},
-                dedupe_key=f"connection_health:{org_id}:{bucket}",
+        rows = db.execute(
+            select(GbpConnection.organization_id, Location.id)
+            .join(Location, Location.organization_id == GbpConnection.organization_id)
+            .where(
+                GbpConnection.status == GbpConnectionStatus.CONNECTED,
+                Location.google_location_id.is_not(None),
             )
-            scheduled += 1
-        return {"scheduled": scheduled}
+            .order_by(GbpConnection.organization_id, Location.name, Location.id)
+        ).all()
+        location_ids: Dict[uuid.UUID, List[str]] = {}
+        for organization_id, location_id in rows:
+            location_ids.setdefault(organization_id, []).append(str(location_id))
+        now = datetime.now(timezone.utc)
+        bucket = _period_bucket(now, minutes=60)
+        result = ActionService(db).schedule_actions_bulk(
+            [
+                ActionSpec(
+                    organization_id=organization_id,
+                    action_type=action_type,
+                    run_at=now,
+                    payload={"location_ids": ids},
+                    dedupe_key=f"{key_prefix}:{organization_id}:{bucket}",
+                )
+                for organization_id, ids in location_ids.items()
+                for action_type, key_prefix in GBP_SYNC_ACTIONS
+            ]
+        )
+        return {"scheduled": len(result.created), "deduplicated": len(result.deduplicated)}
     finally:
         db.close()
 
@@ -149,6 +221,16 @@ def _schedule_keyword_campaigns_onboarding() -> Dict[str, int]:
         db.close()
 
 
+def _purge_caption_completions() -> Dict[str, int]:
+    db = SessionLocal()
+    try:
+        purged = CaptionCompletionCache(db).purge_expired()
+        db.commit()
+        return {"purged": purged}
+    finally:
+        db.close()
+
+
 def _period_bucket(value: datetime, *, minutes: int) -> str:
     minute = (value.minute // minutes) * minutes if minutes < 60 else 0
     hour = value.hour if minutes < 60 else (value.hour // (minutes // 60)) * (minutes // 60)
@@ -159,6 +241,15 @@ dispatch_due_actions = cast(
     Task, celery_app.task(name="actions.dispatch_due")(_dispatch_due_actions)
 )
 execute_action = cast(Task, celery_app.task(name="actions.execute")(_execute_action))
+execute_action_by_queue: Dict[str, Task] = {
+    queue: cast(
+        Task,
+        celery_app.task(name=execute_task_name(queue), rate_limit=queue_rate_limit(queue))(
+            _execute_action
+        ),
+    )
+    for queue in QUEUE_ORDER
+}
 sched_automation_rules = cast(
     Task, celery_app.task(name="actions.schedule_automation_rules")(_schedule_automation_rules)
 )
@@ -168,6 +259,9 @@ plan_content = cast(
 connection_health = cast(
     Task, celery_app.task(name="actions.connection_health")(_connection_health)
 )
+schedule_gbp_syncs = cast(
+    Task, celery_app.task(name="actions.schedule_gbp_syncs")(_schedule_gbp_syncs)
+)
 schedule_keyword_campaigns_monthly = cast(
     Task,
     celery_app.task(name="actions.schedule_keyword_campaigns_monthly")(
@@ -180,3 +274,7 @@ schedule_keyword_campaigns_onboarding = cast(
         _schedule_keyword_campaigns_onboarding
     ),
 )
+purge_caption_completions = cast(
+    Task,
+    celery_app.task(name="maintenance.purge_caption_completions")(_purge_caption_completions),
+)